@@ -0,0 +1,137 @@
+"""
+In-process LRU caches for analysis intermediates.
+
+Each cache holds arbitrary objects under hashable keys and evicts the
+least recently used entries once the sizes reported on insertion exceed
+its byte budget. Caches are per worker process; decoded audio shared
+between workers lives in app.audio_store instead.
+
+A request that misses can still be answered from an entry computed with
+other settings when its result is a slice of that entry: the frames of
+a coarser time step, the bands below a lower maximum frequency, or the
+frames of a selection analyzed over the same samples. The entries are
+matched by LRUCache.derive; what is a slice of what is decided from the
+frame and frequency grids the analysis would use, so a derived result is
+the one a direct computation returns.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+import numpy as np
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by the total size of its entries."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, nbytes: int) -> None:
+        """Insert value, evicting older entries. Values larger than the budget aren't kept."""
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                _, (_, size) = self._entries.popitem(last=False)
+                self._bytes -= size
+
+    def derive(self, rule: Callable[[Hashable, Any], Any | None]) -> Any | None:
+        """
+        Apply rule to the entries, most recently used first, and return
+        the first result that isn't None (its entry counts as used).
+        The rule runs under the cache's lock, so it must be cheap.
+        """
+        with self._lock:
+            for key in reversed(self._entries):
+                result = rule(key, self._entries[key][0])
+                if result is not None:
+                    self._entries.move_to_end(key)
+                    return result
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+
+@dataclass
+class FrameMatrix:
+    """
+    An analysis of every frame of one analysis sound: values [time, bin]
+    on the frame grid `times` and the frequency grid `frequencies`.
+    """
+    times: np.ndarray
+    frequencies: np.ndarray
+    values: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return self.times.nbytes + self.frequencies.nbytes + self.values.nbytes
+
+    def slice(self, times: np.ndarray, frequencies: np.ndarray) -> "FrameMatrix | None":
+        """
+        The part of the matrix on the given grids, or None unless every
+        frame time is one of this matrix's and the frequencies are the
+        first of its frequencies.
+        """
+        n_frequencies = len(frequencies)
+        if n_frequencies > len(self.frequencies) or not np.allclose(
+            self.frequencies[:n_frequencies], frequencies, rtol=1e-9, atol=0.0
+        ):
+            return None
+        rows = frames_on_grid(self.times, times)
+        if rows is None:
+            return None
+        return FrameMatrix(self.times[rows], self.frequencies[:n_frequencies], self.values[rows, :n_frequencies])
+
+
+def frames_on_grid(grid: np.ndarray, times: np.ndarray, tolerance: float = 1e-9) -> np.ndarray | None:
+    """
+    Indices of the frames of a sorted time grid at the given times (within
+    tolerance seconds), or None unless every time has its frame.
+    """
+    if len(times) == 0:
+        return np.empty(0, dtype=np.intp)
+    if len(grid) == 0:
+        return None
+    # The first frame at or after each time, less the tolerance
+    rows = np.minimum(np.searchsorted(grid, times - tolerance), len(grid) - 1)
+    if np.any(np.abs(grid[rows] - times) > tolerance):
+        return None
+    return rows
+
+
+# Sounds resampled to an analysis rate, keyed by content, selection and rate
+RESAMPLED_SOUNDS = LRUCache(int(os.environ.get("LINGUAI_RESAMPLE_CACHE_BYTES", 256 * 1024 ** 2)))
+
+# Spectrogram dB matrices (FrameMatrix of every frame), keyed by content,
+# analyzed region, analysis rate, engine and settings
+SPECTROGRAMS = LRUCache(int(os.environ.get("LINGUAI_SPECTROGRAM_CACHE_BYTES", 256 * 1024 ** 2)))
+
+# Encoded spectrogram images, keyed by their spectrogram and render settings
+SPECTROGRAM_IMAGES = LRUCache(int(os.environ.get("LINGUAI_IMAGE_CACHE_BYTES", 64 * 1024 ** 2)))
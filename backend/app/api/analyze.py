@@ -3,16 +3,58 @@
 import math
 import os
 import tempfile
+import time
 from pathlib import Path
+from typing import Generic, TypeVar
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Form, UploadFile, HTTPException
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from linguai_core import Annotation, IntervalMeasurements, cepstral, fast_pitch, resample, spectrogram_image, stft
+from linguai_core.acoustic import FORMANT_ENGINES, PITCH_MODES, SPECTROGRAM_ENGINES
+from linguai_core.channels import AnalysisCancelled, analyze_channels, parse_channels
+
+from app import analysis_cache, audio_store, compute, http_cache, metrics, scheduler, serialization
+from app.api import textgrid
 
 router = APIRouter()
 
 # 100MB file size limit (covers ~20 min at 44.1kHz/16-bit/mono)
 MAX_FILE_SIZE = 100 * 1024 * 1024
 
+# Effective analysis window lengths (seconds) used by the endpoints below
+SPECTROGRAM_WINDOW = 0.005
+FORMANT_WINDOW = 0.025
+
+# Largest rendered spectrogram image side, and the finest default time step
+# (the coarsest is SPECTROGRAM_WINDOW, so no audio falls between frames)
+MAX_IMAGE_SIZE = 4096
+MIN_IMAGE_TIME_STEP = 0.002
+
+# Resample only when the analysis rate saves at least this fraction of samples
+MIN_RESAMPLE_RATIO = 0.9
+
+# Spectrograms resample only below this fraction of the upload's rate:
+# resampling costs about as much as Praat's spectrogram of the original,
+# so it pays off from 48 kHz to 10 kHz but not from 44.1 kHz
+SPECTROGRAM_RESAMPLE_RATIO = 0.2
+
+# Time linguai_core.resample takes per sample per channel of the upload
+# (0.24 s for a minute at 44.1 kHz on one core), and the share of a
+# deadline's time left that resampling a whole selection may take up front
+RESAMPLE_COST = 1e-7
+RESAMPLE_DEADLINE_SHARE = 0.5
+
+# Frames looked at beyond a block by Praat's pitch path finder, for deadline-bound pitch analyses (seconds)
+PITCH_CONTEXT = 0.25
+
+# Worker processes for per-channel analyses; 0 means one per channel, up to the CPU count
+CHANNEL_WORKERS = int(os.environ.get("LINGUAI_CHANNEL_WORKERS", 0))
+
+# Output formats of the measurements table
+MEASUREMENT_FORMATS = {"json": "application/json", "csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
 # Supported audio formats (via pydub conversion)
 SUPPORTED_FORMATS = {'.wav', '.mp3', '.flac', '.ogg', '.m4a', '.aac', '.wma', '.aiff', '.aif'}
 
@@ -24,6 +66,15 @@ class SupportedFormatsResponse(BaseModel):
     note: str
 
 
+ResultT = TypeVar("ResultT")
+
+
+class ChannelsResponse(BaseModel, Generic[ResultT]):
+    """Results of an analysis per channel (channels=all or a list), in the order of `channels`"""
+    channels: list[int]
+    results: list[ResultT]
+
+
 @router.get("/formats", response_model=SupportedFormatsResponse)
 async def get_supported_formats():
     """
@@ -64,6 +115,11 @@ class FormantResponse(BaseModel):
     f2: list[float | None]
     f3: list[float | None]
     f4: list[float | None]
+    # engine=lpc only
+    f5: list[float | None] | None = None
+    bandwidths: list[list[float | None]] | None = None  # [formant][time], B1-B5
+    partial: bool = False
+    computed_until: float | None = None
 
 
 class PitchResponse(BaseModel):
@@ -71,6 +127,60 @@ class PitchResponse(BaseModel):
     times: list[float]
     frequencies: list[float | None]
     unit: str = "Hz"
+    partial: bool = False
+    computed_until: float | None = None
+
+
+# Frame-track responses of an analysis cut short by its deadline_ms have
+# partial set, and hold the frames before computed_until (seconds) only
+
+# Compact responses (response_format=compact) describe the uniform frame
+# times as an axis and send tracks with gaps as their defined runs only
+
+
+class Axis(BaseModel):
+    """Uniformly spaced points: point i is at start + i * step"""
+    start: float
+    step: float
+    n: int
+
+
+class Segment(BaseModel):
+    """A run of defined track values, the first at frame index `start`"""
+    start: int
+    values: list[float]
+
+
+class CompactSpectrogramResponse(BaseModel):
+    """Spectrogram data response with implicit time and frequency axes"""
+    time: Axis
+    frequency: Axis
+    intensities: list[list[float]]  # 2D array [time][frequency]
+    duration: float
+    sample_rate: int
+
+
+class CompactFormantResponse(BaseModel):
+    """Formant tracking response with an implicit time axis"""
+    time: Axis
+    f1: list[Segment]
+    f2: list[Segment]
+    f3: list[Segment]
+    f4: list[Segment]
+    # engine=lpc only
+    f5: list[Segment] | None = None
+    bandwidths: list[list[Segment]] | None = None  # [formant], B1-B5
+    partial: bool = False
+    computed_until: float | None = None
+
+
+class CompactPitchResponse(BaseModel):
+    """Pitch tracking response with an implicit time axis; unvoiced frames are omitted"""
+    time: Axis
+    frequencies: list[Segment]
+    unit: str = "Hz"
+    partial: bool = False
+    computed_until: float | None = None
 
 
 def _convert_to_wav_ffmpeg(src_path: str, dst_path: str) -> None:
@@ -87,20 +197,21 @@ def _convert_to_wav_ffmpeg(src_path: str, dst_path: str) -> None:
         )
 
     try:
-        result = subprocess.run(
-            [
-                ffmpeg_path,
-                "-y",  # Overwrite output
-                "-i", src_path,  # Input file
-                "-acodec", "pcm_s16le",  # 16-bit PCM
-                "-ar", "44100",  # 44.1 kHz sample rate
-                "-ac", "1",  # Mono (or use 2 for stereo if needed)
-                dst_path,
-            ],
-            capture_output=True,
-            text=True,
-            timeout=120,  # 2 minute timeout
-        )
+        with metrics.stage("transcode"):
+            result = subprocess.run(
+                [
+                    ffmpeg_path,
+                    "-y",  # Overwrite output
+                    "-i", src_path,  # Input file
+                    "-acodec", "pcm_s16le",  # 16-bit PCM
+                    # Keep the source sample rate and channels; analyses
+                    # resample and select channels as they need
+                    dst_path,
+                ],
+                capture_output=True,
+                text=True,
+                timeout=120,  # 2 minute timeout
+            )
 
         if result.returncode != 0:
             raise Exception(result.stderr or "ffmpeg conversion failed")
@@ -117,13 +228,16 @@ def _convert_to_wav_ffmpeg(src_path: str, dst_path: str) -> None:
         )
 
 
-async def _save_upload_to_temp(file: UploadFile) -> str:
+async def _read_upload(file: UploadFile) -> tuple[bytes, str]:
     """
-    Save uploaded file to temp location with size validation.
-    Converts non-WAV formats to WAV using ffmpeg.
+    Read an uploaded file with size and format validation.
+    Returns its content and lower-cased extension.
     Supports: WAV, MP3, FLAC, OGG, M4A, AAC, WMA, AIFF
     """
-    content = await file.read()
+    with metrics.stage("read"):
+        content = await file.read()
+    metrics.observe_upload(len(content))
+
     if len(content) > MAX_FILE_SIZE:
         raise HTTPException(
             status_code=413,
@@ -141,6 +255,14 @@ async def _save_upload_to_temp(file: UploadFile) -> str:
             detail=f"Unsupported audio format: {ext}. Supported formats: {', '.join(sorted(SUPPORTED_FORMATS))}"
         )
 
+    return content, ext
+
+
+def _save_upload_to_temp(content: bytes, ext: str) -> str:
+    """
+    Save uploaded content to a temp WAV file.
+    Converts non-WAV formats to WAV using ffmpeg.
+    """
     # If already WAV, save directly
     if ext == '.wav':
         with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
@@ -153,12 +275,15 @@ async def _save_upload_to_temp(file: UploadFile) -> str:
         src_tmp.write(content)
         src_path = src_tmp.name
 
+    wav_path = None
+    converted = False
     try:
         # Create output WAV file
         with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as wav_tmp:
             wav_path = wav_tmp.name
 
         _convert_to_wav_ffmpeg(src_path, wav_path)
+        converted = True
         return wav_path
 
     except HTTPException:
@@ -169,11 +294,13 @@ async def _save_upload_to_temp(file: UploadFile) -> str:
             detail=f"Failed to convert {ext} to WAV: {str(e)}"
         )
     finally:
-        # Clean up original temp file
-        try:
-            os.unlink(src_path)
-        except OSError:
-            pass
+        # Clean up original temp file, and the output if conversion failed
+        for path in (src_path,) if converted else (src_path, wav_path):
+            try:
+                if path is not None:
+                    os.unlink(path)
+            except OSError:
+                pass
 
 
 def _get_parselmouth():
@@ -188,137 +315,747 @@ def _get_parselmouth():
         )
 
 
-@router.post("/analyze/spectrogram", response_model=SpectrogramResponse)
+def _read_sound(parselmouth, path: str):
+    """Decode a WAV file into a Parselmouth Sound."""
+    with metrics.stage("decode"):
+        return parselmouth.Sound(path)
+
+
+def _decode_upload(parselmouth, content: bytes, ext: str):
+    """Write an upload to disk, transcoding if needed, and decode it."""
+    tmp_path = _save_upload_to_temp(content, ext)
+    try:
+        return _read_sound(parselmouth, tmp_path)
+    finally:
+        os.unlink(tmp_path)
+
+
+def _region_sound(parselmouth, values, sample_rate: float, start_time: float,
+                  start: float | None = None, end: float | None = None):
+    """Build a Sound from the samples between start and end, keeping the original timeline."""
+    n_samples = values.shape[1]
+    first = 0 if start is None else math.floor((start - start_time) * sample_rate)
+    last = n_samples if end is None else math.ceil((end - start_time) * sample_rate)
+    first = min(max(first, 0), n_samples)
+    last = min(max(last, first), n_samples)
+    return parselmouth.Sound(
+        values[:, first:last],
+        sampling_frequency=sample_rate,
+        start_time=start_time + first / sample_rate,
+    )
+
+
+async def _read_audio(file: UploadFile) -> http_cache.Upload:
+    """Read an uploaded audio file and hash its contents."""
+    content, ext = await _read_upload(file)
+    with metrics.stage("hash"):
+        key = audio_store.content_key(content)
+    return http_cache.Upload(content, ext, key)
+
+
+def _analysis_route(path: str, **route_options):
+    """
+    Register an analysis as POST path (audio uploaded with the request)
+    and GET path/{content_id} (audio uploaded before), with ETags.
+    """
+    return http_cache.content_addressed(router, path, "audio", _read_audio, **route_options)
+
+
+def _load_sound(parselmouth, audio: http_cache.Upload,
+                start: float | None = None, end: float | None = None):
+    """
+    Decode an uploaded file, optionally only the region between start
+    and end (seconds). Returns the content hash and the Sound.
+    """
+    return audio.key, _decode_cached(parselmouth, audio.content, audio.ext, audio.key, start, end)
+
+
+def _decode_cached(parselmouth, content: bytes, ext: str, key: str,
+                   start: float | None, end: float | None):
+    """
+    Decode an upload (or its start..end region). Decoded samples are looked
+    up by content hash in the shared-memory store, then in the disk PCM
+    cache, and stored in whichever caches are enabled after a fresh decode.
+    """
+    store = audio_store.get_store()
+    pcm_cache = audio_store.get_pcm_cache()
+    if store is None and pcm_cache is None:
+        sound = _decode_upload(parselmouth, content, ext)
+        if start is None and end is None:
+            return sound
+        return _region_sound(parselmouth, sound.values, sound.sampling_frequency, sound.xmin, start, end)
+
+    if store is not None:
+        with metrics.stage("decode"):
+            sound = store.get(key, lambda values, sample_rate, start_time: _region_sound(
+                parselmouth, values, sample_rate, start_time, start, end,
+            ))
+        metrics.observe_audio_cache("shared", sound is not None)
+        if sound is not None:
+            return sound
+
+    entry = None
+    if pcm_cache is not None:
+        entry = pcm_cache.get(key)
+        metrics.observe_audio_cache("disk", entry is not None)
+
+    if entry is None:
+        sound = _decode_upload(parselmouth, content, ext)
+        values, sample_rate, start_time = sound.values, sound.sampling_frequency, sound.xmin
+        if pcm_cache is not None:
+            with metrics.stage("store"):
+                pcm_cache.put_sound(key, sound)
+    elif store is not None:
+        # The shared store holds whole files, so read the full entry once
+        with metrics.stage("decode"):
+            values, sample_rate, start_time = entry.read(), entry.sample_rate, entry.start_time
+    else:
+        with metrics.stage("decode"):
+            return entry.to_sound(start, end)
+
+    if store is not None:
+        with metrics.stage("store"):
+            store.put(key, values, sample_rate, start_time)
+    if entry is None and start is None and end is None:
+        return sound
+    return _region_sound(parselmouth, values, sample_rate, start_time, start, end)
+
+
+def _check_range(start: float | None, end: float | None) -> None:
+    """Validate a start/end selection (seconds)."""
+    if start is not None and start < 0:
+        raise HTTPException(status_code=400, detail="start must not be negative")
+    if end is not None and end <= (start or 0.0):
+        raise HTTPException(status_code=400, detail="end must be greater than start")
+
+
+def _load_selection(parselmouth, audio: http_cache.Upload, start: float | None,
+                    end: float | None, padding: float = 0.0):
+    """
+    Load only the selected part of an upload, widened by padding on each
+    side so analysis windows centred near the edges see real signal. The
+    Sound keeps the file's timeline, so frame times come out absolute.
+    Returns the content hash and the Sound.
+    """
+    _check_range(start, end)
+    return audio.key, _decode_selection(parselmouth, audio.content, audio.ext, audio.key, start, end, padding)
+
+
+def _decode_selection(parselmouth, content: bytes, ext: str, key: str,
+                      start: float | None, end: float | None, padding: float = 0.0):
+    """Decode the padded start..end selection of an upload that has already been read."""
+    sound = _decode_cached(
+        parselmouth, content, ext, key,
+        None if start is None else start - padding,
+        None if end is None else end + padding,
+    )
+    if sound.n_samples == 0 or (start is not None and start >= sound.xmax):
+        raise HTTPException(status_code=400, detail="Selection is outside the audio")
+    return sound
+
+
+def _analysis_rate(sample_rate: float, required_rate: float, max_ratio: float | None = None) -> float | None:
+    """
+    Sample rate to analyze at, or None to keep the original. Analyses that
+    only look below some frequency need at most twice that frequency;
+    resampling is skipped unless that is below max_ratio of the sample rate
+    (MIN_RESAMPLE_RATIO: unless it saves at least 10% of the samples).
+    """
+    if required_rate >= (MIN_RESAMPLE_RATIO if max_ratio is None else max_ratio) * sample_rate:
+        return None
+    return required_rate
+
+
+def _resample_for_analysis(sound, key: str, required_rate: float, max_ratio: float | None = None):
+    """
+    Resample a Sound to the rate an analysis needs, once per content,
+    region and rate. The result keeps the original timeline.
+    """
+    rate = _analysis_rate(sound.sampling_frequency, required_rate, max_ratio)
+    return sound if rate is None else _resampled(sound, key, rate)
+
+
+def _resampled(sound, key: str, rate: float, cached_only: bool = False):
+    """
+    The Sound resampled to rate, once per content, region and rate; with
+    cached_only, None unless it has been already.
+    """
+    cache_key = (key, sound.xmin, sound.xmax, rate)
+    resampled = analysis_cache.RESAMPLED_SOUNDS.get(cache_key)
+    metrics.observe_audio_cache("resampled", resampled is not None)
+    if resampled is None and not cached_only:
+        with metrics.stage("resample"):
+            resampled = resample.resample_sound(sound, rate)
+        analysis_cache.RESAMPLED_SOUNDS.put(
+            cache_key, resampled, resampled.n_samples * resampled.n_channels * 8
+        )
+    return resampled
+
+
+def _resample_for_tracks(sound, key: str, rate: float | None, deadline: float | None):
+    """
+    A Sound for a frame-track analysis at rate (None: the Sound's own), as
+    (Sound, analysis rate for _analyze_tracks). With a deadline, resampling
+    counts against it: a Sound that hasn't been resampled yet, and whose
+    resampling would take more than RESAMPLE_DEADLINE_SHARE of the time
+    left, is left as it is and the analysis resamples block by block.
+    """
+    if rate is None or rate == sound.sampling_frequency:
+        return sound, None
+    blockwise = (
+        deadline is not None
+        and resample.supported(sound.sampling_frequency, rate)
+        and RESAMPLE_COST * sound.n_samples * sound.n_channels
+        > RESAMPLE_DEADLINE_SHARE * (deadline - time.monotonic())
+    )
+    resampled = _resampled(sound, key, rate, cached_only=blockwise)
+    return (sound, rate) if resampled is None else (resampled, None)
+
+
+def _selection_duration(sound, start: float | None, end: float | None) -> float:
+    """Duration of the selection, clipped to the audio."""
+    first = sound.xmin if start is None else max(start, sound.xmin)
+    last = sound.xmax if end is None else min(end, sound.xmax)
+    return max(last - first, 0.0)
+
+
+def _is_compact(response_format: str) -> bool:
+    """Whether the compact response schema was requested."""
+    if response_format not in serialization.RESPONSE_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported response_format: {response_format}. Use one of: {', '.join(sorted(serialization.RESPONSE_FORMATS))}"
+        )
+    return response_format == "compact"
+
+
+def _json_response(model: BaseModel) -> Response:
+    """Serialize a response model to JSON directly, skipping re-validation."""
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+def _channel_indices(channels: str, sound) -> list[int] | None:
+    """Validate a channels parameter. None means one analysis of all channels together (mix)."""
+    try:
+        return parse_channels(channels, sound.n_channels)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _analyze_channels(analysis, sound, indices: list[int] | None,
+                            max_cost: float | None = None, **kwargs) -> list:
+    """
+    Run one of the app.compute analyses on the whole Sound (indices None),
+    or on each selected channel in parallel worker processes. Returns one
+    result per channel, or a single result for the whole Sound. The work
+    is admitted, queued and run by the scheduler at its estimated cost,
+    at most max_cost; batch work runs in worker processes, away from this
+    process's GIL.
+    """
+    cost = scheduler.estimate_cost(
+        metrics.current_endpoint.get(), sound.xmax - sound.xmin, sound.sampling_frequency,
+        sound.n_channels if indices is None else len(indices), **kwargs,
+    )
+    if max_cost is not None:
+        cost = min(cost, max_cost)
+    isolate = scheduler.ISOLATE_BATCH and scheduler.SCHEDULER.priority(cost) == scheduler.BATCH
+    return await scheduler.SCHEDULER.run(cost, _compute_channels, analysis, sound, indices, isolate, kwargs)
+
+
+def _compute_channels(analysis, sound, indices: list[int] | None, isolate: bool, kwargs: dict) -> list:
+    """Worker-thread side of _analyze_channels."""
+    with metrics.stage("compute"):
+        try:
+            return analyze_channels(
+                analysis, sound, "mix" if indices is None else indices,
+                max_workers=CHANNEL_WORKERS or None, isolate=isolate,
+                cancelled=scheduler.cancelled, **kwargs,
+            )
+        except AnalysisCancelled:
+            raise HTTPException(status_code=499, detail="Client disconnected")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+
+def _channels_response(indices: list[int] | None, models: list[BaseModel]) -> Response:
+    """Serialize the result of a mixed analysis, or the per-channel results as a ChannelsResponse."""
+    if indices is None:
+        response = _json_response(models[0])
+    else:
+        response = _json_response(ChannelsResponse(channels=indices, results=models))
+    if any(getattr(model, "partial", False) for model in models):
+        # Another request may get further before its deadline, so don't let caches keep this
+        response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+def _deadline(deadline_ms: int | None) -> float | None:
+    """The time.monotonic() time a deadline_ms from now, None for no deadline."""
+    if deadline_ms is None:
+        return None
+    if deadline_ms <= 0:
+        raise HTTPException(status_code=400, detail="deadline_ms must be positive")
+    return time.monotonic() + deadline_ms / 1000.0
+
+
+async def _analyze_tracks(analysis, sound, indices: list[int] | None, deadline: float | None,
+                          window: float, context: float = 0.0, in_blocks: bool = True,
+                          analysis_rate: float | None = None, **kwargs) -> list:
+    """
+    Run a frame-track analysis like _analyze_channels, as (result,
+    computed_until) per channel. With a deadline, the analysis runs in
+    time order and stops at the deadline with the frames computed so far;
+    computed_until is None when it got through them all. window and
+    context are the analysis window and the time around a frame the
+    analysis looks at (seconds), in_blocks is False for the NumPy
+    engines, which stop at the deadline themselves, and analysis_rate is
+    the rate to resample each block to (from _resample_for_tracks); see
+    compute.within_deadline.
+    """
+    if deadline is None:
+        return [(result, None) for result in await _analyze_channels(analysis, sound, indices, **kwargs)]
+    # Each channel stops at the deadline, which bounds the cost
+    n_channels = sound.n_channels if indices is None else len(indices)
+    return await _analyze_channels(
+        compute.within_deadline, sound, indices,
+        max_cost=max(deadline - time.monotonic(), 0.0) * n_channels,
+        frame_analysis=analysis, deadline=deadline, window=window, context=context,
+        in_blocks=in_blocks, analysis_rate=analysis_rate, **kwargs,
+    )
+
+
+def _check_engine(engine: str) -> None:
+    """Validate a spectrogram engine name."""
+    if engine not in SPECTROGRAM_ENGINES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported engine: {engine}. Use one of: {', '.join(SPECTROGRAM_ENGINES)}"
+        )
+
+
+async def _compute_spectrograms(sound, key: str, time_step: float, max_frequency: float,
+                                start: float | None, end: float | None, engine: str = "praat",
+                                indices: list[int] | None = None) -> list:
+    """
+    Spectrograms of the start..end selection as (frame times, frequencies,
+    float32 dB matrix [time, frequency]): one of all channels together,
+    or one per channel in indices. Cached per content, channel and settings.
+    The numpy engine reproduces Praat's frames and power without Praat.
+    """
+    # Nothing above max_frequency is returned, so analyze at twice that rate
+    rate = (_analysis_rate(sound.sampling_frequency, 2 * max_frequency, SPECTROGRAM_RESAMPLE_RATIO)
+            or sound.sampling_frequency)
+    channels = [None] if indices is None else indices
+
+    def cache_key(channel):
+        return (key, sound.xmin, sound.xmax, rate, engine, channel, time_step, max_frequency)
+
+    analyses = {}
+    for channel in channels:
+        analysis = analysis_cache.SPECTROGRAMS.get(cache_key(channel))
+        derived = None
+        if analysis is None:
+            # A narrower request may be a slice of an analysis with other settings
+            analysis = derived = _derive_spectrogram(sound, key, rate, engine, channel, time_step, max_frequency)
+        metrics.observe_analysis_cache("spectrogram", analysis is not None, derived=derived is not None)
+        analyses[channel] = analysis
+
+    missing = [channel for channel in channels if analyses[channel] is None]
+    if missing:
+        analysis_sound = _resample_for_analysis(sound, key, 2 * max_frequency, SPECTROGRAM_RESAMPLE_RATIO)
+        computed = await _analyze_channels(
+            compute.spectrogram_matrix, analysis_sound, None if missing == [None] else missing,
+            window_length=SPECTROGRAM_WINDOW,
+            time_step=time_step,
+            max_frequency=max_frequency,
+            engine=engine,
+            # Praat's power scales with the sample rate, so rescale to what
+            # the original rate would give
+            rate_scale=sound.sampling_frequency / analysis_sound.sampling_frequency,
+        )
+        for channel, analysis in zip(missing, computed):
+            analysis_cache.SPECTROGRAMS.put(cache_key(channel), analysis, analysis.nbytes)
+            analyses[channel] = analysis
+
+    spectrograms = []
+    for channel in channels:
+        analysis = analyses[channel]
+        selected = compute.selection_mask(analysis.times, start, end)
+        spectrograms.append((analysis.times[selected], analysis.frequencies, analysis.values[selected]))
+    return spectrograms
+
+
+def _derive_spectrogram(sound, key: str, rate: float, engine: str, channel: int | None,
+                        time_step: float, max_frequency: float) -> analysis_cache.FrameMatrix | None:
+    """
+    Slice a spectrogram out of a cached one of the same content, channel,
+    engine and analysis rate whose frames and frequencies include the ones this
+    request's analysis would have; None if no cached analysis does.
+
+    Frames at the same time of the same samples are the same, so a cached
+    analysis serves coarser time steps whose frames fall on its grid, and
+    selections whose samples it analyzed: any part of it at the upload's
+    own rate, the same region after resampling (resampling depends on the
+    region). At the same rate the bands below a lower max_frequency are
+    the first bands of a higher one.
+    """
+    resampled = rate != sound.sampling_frequency
+    if resampled:
+        # Praat's resampled Sound is centred on the region it covers
+        n_samples = round((sound.xmax - sound.xmin) * rate)
+        x1 = 0.5 * (sound.xmin + sound.xmax - (n_samples - 1) / rate)
+    else:
+        n_samples, x1 = sound.n_samples, sound.x1
+    times, frequencies = stft.spectrogram_grid(
+        n_samples, rate, x1, SPECTROGRAM_WINDOW, time_step, max_frequency,
+    )
+
+    def rule(cache_key, analysis):
+        cached_key, xmin, xmax, cached_rate, cached_engine, cached_channel = cache_key[:6]
+        if (cached_key, cached_rate, cached_engine, cached_channel) != (key, rate, engine, channel):
+            return None
+        if resampled and (xmin, xmax) != (sound.xmin, sound.xmax):
+            return None
+        if xmin > sound.xmin or xmax < sound.xmax:
+            return None
+        return analysis.slice(times, frequencies)
+
+    return analysis_cache.SPECTROGRAMS.derive(rule)
+
+
+@_analysis_route(
+    "/analyze/spectrogram",
+    response_model=SpectrogramResponse | CompactSpectrogramResponse
+    | ChannelsResponse[SpectrogramResponse | CompactSpectrogramResponse],
+)
 async def analyze_spectrogram(
-    file: UploadFile = File(...),
+    audio: http_cache.Upload,
     time_step: float = 0.005,
     max_frequency: float = 5000.0,
+    start: float | None = None,
+    end: float | None = None,
+    precision: int | None = None,
+    response_format: str = "full",
+    engine: str = "praat",
+    channels: str = "mix",
 ):
     """
     Generate spectrogram data from an audio file.
-    Returns time-frequency intensity matrix.
+    Returns time-frequency intensity matrix, optionally for the start..end
+    selection only (seconds, frame times on the file's timeline).
+    engine=numpy computes the same spectrogram with a batched NumPy STFT.
+    channels=all (or a list such as 0,1) returns one spectrogram per channel.
     """
+    compact = _is_compact(response_format)
+    _check_engine(engine)
     parselmouth = _get_parselmouth()
-    import numpy as np
 
-    tmp_path = await _save_upload_to_temp(file)
+    # Gaussian window: the physical window is twice the 5 ms effective length
+    key, sound = _load_selection(parselmouth, audio, start, end, padding=2 * SPECTROGRAM_WINDOW)
+    indices = _channel_indices(channels, sound)
+    spectrograms = await _compute_spectrograms(
+        sound, key, time_step, max_frequency, start, end, engine, indices,
+    )
 
-    try:
-        sound = parselmouth.Sound(tmp_path)
-        spectrogram = sound.to_spectrogram(
-            time_step=time_step,
-            maximum_frequency=max_frequency,
+    with metrics.stage("serialize"):
+        digits = serialization.resolve_precision(precision)
+        duration = _selection_duration(sound, start, end)
+        models = [
+            _spectrogram_model(times, frequencies, intensities, digits, duration,
+                               int(sound.sampling_frequency), compact)
+            for times, frequencies, intensities in spectrograms
+        ]
+        return _channels_response(indices, models)
+
+
+def _spectrogram_model(times, frequencies, intensities_array, digits: int | None, duration: float,
+                       sample_rate: int, compact: bool) -> BaseModel:
+    """Response model of a spectrogram."""
+    intensities = serialization.float_list(
+        intensities_array, serialization.matrix_digits(intensities_array.dtype, digits),
+        nan_as_none=False,
+    )
+    if compact:
+        return CompactSpectrogramResponse(
+            time=serialization.uniform_axis(times),
+            frequency=serialization.uniform_axis(frequencies),
+            intensities=intensities,
+            duration=duration,
+            sample_rate=sample_rate,
         )
+    return SpectrogramResponse(
+        times=serialization.time_list(times, digits),
+        frequencies=serialization.float_list(frequencies, digits),
+        intensities=intensities,
+        duration=duration,
+        sample_rate=sample_rate,
+    )
 
-        times = list(spectrogram.xs())
-        frequencies = list(spectrogram.ys())
-
-        # Extract power values into numpy array
-        n_frames = spectrogram.n_frames
-        n_freqs = len(frequencies)
-        intensities_array = np.zeros((n_frames, n_freqs))
-        for t_idx in range(n_frames):
-            for f_idx in range(n_freqs):
-                intensities_array[t_idx, f_idx] = spectrogram.get_power_at(t_idx + 1, f_idx + 1)
-
-        # Convert to dB
-        intensities_array = np.where(
-            intensities_array > 0,
-            10 * np.log10(intensities_array + 1e-30),
-            -100
+
+@_analysis_route("/analyze/spectrogram/image")
+async def analyze_spectrogram_image(
+    audio: http_cache.Upload,
+    width: int = 1000,
+    height: int = 300,
+    time_step: float | None = None,
+    max_frequency: float = 5000.0,
+    dynamic_range: float = 70.0,
+    maximum: float | None = None,
+    pre_emphasis: float = 6.0,
+    colormap: str = "grayscale",
+    image_format: str = "png",
+    start: float | None = None,
+    end: float | None = None,
+    engine: str = "praat",
+):
+    """
+    Render a spectrogram as a PNG or WebP image of width x height pixels.
+    Painted like Praat: pre-emphasis in dB/octave, values more than
+    dynamic_range dB below the maximum (the image maximum unless given)
+    are blank. The default time step gives about one frame per pixel column,
+    but never more than the analysis window: on long selections the frames
+    of a column are max-pooled, so nothing between frames goes unseen.
+    They are pooled as they are computed, so memory doesn't grow with the
+    selection.
+    """
+    if not (1 <= width <= MAX_IMAGE_SIZE and 1 <= height <= MAX_IMAGE_SIZE):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Image width and height must be between 1 and {MAX_IMAGE_SIZE} pixels"
+        )
+    if colormap not in spectrogram_image.COLORMAPS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported colormap: {colormap}. Use one of: {', '.join(spectrogram_image.COLORMAPS)}"
+        )
+    if image_format not in spectrogram_image.IMAGE_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported image_format: {image_format}. Use one of: {', '.join(spectrogram_image.IMAGE_FORMATS)}"
         )
-        intensities = intensities_array.tolist()
+    if dynamic_range <= 0:
+        raise HTTPException(status_code=400, detail="dynamic_range must be positive")
+    _check_engine(engine)
+    parselmouth = _get_parselmouth()
+    media_type = spectrogram_image.IMAGE_FORMATS[image_format]
 
-        return SpectrogramResponse(
-            times=times,
-            frequencies=frequencies,
-            intensities=intensities,
-            duration=sound.duration,
-            sample_rate=int(sound.sampling_frequency),
+    _check_range(start, end)
+    image_key = (
+        audio.key, start, end, time_step, max_frequency, engine,
+        width, height, dynamic_range, maximum, pre_emphasis, colormap, image_format,
+    )
+    cached = analysis_cache.SPECTROGRAM_IMAGES.get(image_key)
+    metrics.observe_analysis_cache("image", cached is not None)
+    if cached is not None:
+        return Response(content=cached, media_type=media_type)
+
+    sound = _decode_selection(parselmouth, audio.content, audio.ext, audio.key, start, end,
+                              padding=2 * SPECTROGRAM_WINDOW)
+    duration = _selection_duration(sound, start, end)
+    if time_step is None:
+        time_step = min(max(duration / width, MIN_IMAGE_TIME_STEP), SPECTROGRAM_WINDOW)
+    if duration / time_step > width and duration > compute.IMAGE_BLOCK:
+        # Pool the frames into columns block by block rather than hold (and
+        # cache) every frame of a long selection
+        analysis_sound = _resample_for_analysis(sound, audio.key, 2 * max_frequency, SPECTROGRAM_RESAMPLE_RATIO)
+        (_, frequencies, intensities), = await _analyze_channels(
+            compute.spectrogram_columns, analysis_sound, None,
+            width=width, start=start, end=end,
+            window_length=SPECTROGRAM_WINDOW,
+            time_step=time_step,
+            max_frequency=max_frequency,
+            engine=engine,
+            rate_scale=sound.sampling_frequency / analysis_sound.sampling_frequency,
+        )
+    else:
+        _, frequencies, intensities = (await _compute_spectrograms(
+            sound, audio.key, time_step, max_frequency, start, end, engine,
+        ))[0]
+
+    with metrics.stage("serialize"):
+        image = spectrogram_image.render_spectrogram(
+            intensities, frequencies, width, height,
+            dynamic_range=dynamic_range, maximum=maximum,
+            pre_emphasis=pre_emphasis, colormap=colormap,
         )
+        try:
+            encoded = spectrogram_image.encode_image(image, image_format)
+        except ImportError as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
-    finally:
-        os.unlink(tmp_path)
+    analysis_cache.SPECTROGRAM_IMAGES.put(image_key, encoded, len(encoded))
+    return Response(content=encoded, media_type=media_type)
 
 
-@router.post("/analyze/formants", response_model=FormantResponse)
+@_analysis_route(
+    "/analyze/formants",
+    response_model=FormantResponse | CompactFormantResponse
+    | ChannelsResponse[FormantResponse | CompactFormantResponse],
+)
 async def analyze_formants(
-    file: UploadFile = File(...),
+    audio: http_cache.Upload,
     max_formant: float = 5500.0,
     time_step: float = 0.01,
+    start: float | None = None,
+    end: float | None = None,
+    precision: int | None = None,
+    response_format: str = "full",
+    engine: str = "praat",
+    channels: str = "mix",
+    deadline_ms: int | None = None,
 ):
     """
     Extract formant frequencies (F1-F4) from audio.
     Useful for vowel analysis.
+    engine=lpc runs the same Burg analysis batched over all frames and
+    also returns F5 and the bandwidths B1-B5.
+    channels=all (or a list such as 0,1) returns the tracks of each channel.
+    With deadline_ms, analysis stops once that many milliseconds have
+    passed and returns the frames up to computed_until, marked partial.
     """
-    parselmouth = _get_parselmouth()
-
-    tmp_path = await _save_upload_to_temp(file)
-
-    try:
-        sound = parselmouth.Sound(tmp_path)
-        formants = sound.to_formant_burg(
-            time_step=time_step,
-            max_number_of_formants=5,
-            maximum_formant=max_formant,
+    compact = _is_compact(response_format)
+    deadline = _deadline(deadline_ms)
+    if engine not in FORMANT_ENGINES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported engine: {engine}. Use one of: {', '.join(FORMANT_ENGINES)}"
         )
+    parselmouth = _get_parselmouth()
 
-        times = []
-        f1, f2, f3, f4 = [], [], [], []
-
-        for i in range(formants.n_frames):
-            t = formants.get_time_from_frame_number(i + 1)
-            times.append(t)
-
-            for formant_num, formant_list in [(1, f1), (2, f2), (3, f3), (4, f4)]:
-                try:
-                    val = formants.get_value_at_time(formant_num, t)
-                    formant_list.append(val if not math.isnan(val) else None)
-                except Exception:
-                    formant_list.append(None)
+    # Burg uses a Gaussian window twice the 25 ms effective length
+    key, sound = _load_selection(parselmouth, audio, start, end, padding=2 * FORMANT_WINDOW)
+    indices = _channel_indices(channels, sound)
+    # Burg resamples to twice the formant ceiling itself; do it once up front,
+    # and for the lpc engine, which needs that rate, even when it saves little
+    if engine == "lpc":
+        rate = 2 * max_formant
+    else:
+        rate = _analysis_rate(sound.sampling_frequency, 2 * max_formant)
+    sound, analysis_rate = _resample_for_tracks(sound, key, rate, deadline)
 
-        return FormantResponse(times=times, f1=f1, f2=f2, f3=f3, f4=f4)
+    results = await _analyze_tracks(
+        compute.formant_tracks, sound, indices, deadline,
+        window=2 * FORMANT_WINDOW, in_blocks=engine == "praat", analysis_rate=analysis_rate,
+        start=start, end=end, time_step=time_step, max_formant=max_formant, engine=engine,
+    )
 
-    finally:
-        os.unlink(tmp_path)
+    with metrics.stage("serialize"):
+        digits = serialization.resolve_precision(precision)
+        models = [
+            _formant_model(times, tracks, bandwidths, digits, compact, computed_until)
+            for (times, tracks, bandwidths), computed_until in results
+        ]
+        return _channels_response(indices, models)
+
+
+def _formant_model(times, tracks, bandwidths, digits: int | None, compact: bool,
+                   computed_until: float | None = None) -> BaseModel:
+    """Response model of formant tracks F1-F4 (or F1-F5) and optional bandwidths (None or NaN where undefined)."""
+    f5 = tracks[4] if len(tracks) > 4 else None
+    progress = _progress(computed_until)
+    if compact:
+        return CompactFormantResponse(
+            time=serialization.uniform_axis(times),
+            f1=serialization.segments(tracks[0], digits),
+            f2=serialization.segments(tracks[1], digits),
+            f3=serialization.segments(tracks[2], digits),
+            f4=serialization.segments(tracks[3], digits),
+            f5=None if f5 is None else serialization.segments(f5, digits),
+            bandwidths=None if bandwidths is None else [
+                serialization.segments(track, digits) for track in bandwidths
+            ],
+            **progress,
+        )
+    return FormantResponse(
+        times=serialization.time_list(times, digits),
+        f1=serialization.float_list(tracks[0], digits),
+        f2=serialization.float_list(tracks[1], digits),
+        f3=serialization.float_list(tracks[2], digits),
+        f4=serialization.float_list(tracks[3], digits),
+        f5=None if f5 is None else serialization.float_list(f5, digits),
+        bandwidths=None if bandwidths is None else serialization.float_list(bandwidths, digits),
+        **progress,
+    )
 
 
-@router.post("/analyze/pitch", response_model=PitchResponse)
+@_analysis_route(
+    "/analyze/pitch",
+    response_model=PitchResponse | CompactPitchResponse
+    | ChannelsResponse[PitchResponse | CompactPitchResponse],
+)
 async def analyze_pitch(
-    file: UploadFile = File(...),
+    audio: http_cache.Upload,
     time_step: float = 0.01,
     pitch_floor: float = 75.0,
     pitch_ceiling: float = 600.0,
+    start: float | None = None,
+    end: float | None = None,
+    precision: int | None = None,
+    response_format: str = "full",
+    mode: str = "praat",
+    channels: str = "mix",
+    deadline_ms: int | None = None,
 ):
     """
     Extract pitch (F0) contour from audio.
+    With response_format=compact, frame times are sent as a uniform axis
+    and only the voiced runs of the contour are included.
+    mode=fast uses a vectorized YIN tracker on the same frame times:
+    several times faster, with rougher voicing decisions than Praat's.
+    channels=all (or a list such as 0,1) tracks each channel separately,
+    e.g. one speaker per channel.
+    With deadline_ms, tracking stops once that many milliseconds have
+    passed and returns the frames up to computed_until, marked partial.
     """
-    parselmouth = _get_parselmouth()
-
-    tmp_path = await _save_upload_to_temp(file)
-
-    try:
-        sound = parselmouth.Sound(tmp_path)
-        pitch = sound.to_pitch(
-            time_step=time_step,
-            pitch_floor=pitch_floor,
-            pitch_ceiling=pitch_ceiling,
+    compact = _is_compact(response_format)
+    deadline = _deadline(deadline_ms)
+    if mode not in PITCH_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported mode: {mode}. Use one of: {', '.join(PITCH_MODES)}"
         )
+    parselmouth = _get_parselmouth()
 
-        times = []
-        frequencies = []
+    # The autocorrelation window spans three periods of the pitch floor
+    _, sound = _load_selection(parselmouth, audio, start, end, padding=3.0 / pitch_floor)
+    indices = _channel_indices(channels, sound)
 
-        for i in range(pitch.n_frames):
-            t = pitch.get_time_from_frame_number(i + 1)
-            times.append(t)
+    results = await _analyze_tracks(
+        compute.pitch_track, sound, indices, deadline,
+        window=fast_pitch.PERIODS_PER_WINDOW / pitch_floor,
+        context=PITCH_CONTEXT if mode == "praat" else 0.0, in_blocks=mode == "praat",
+        start=start, end=end, time_step=time_step,
+        pitch_floor=pitch_floor, pitch_ceiling=pitch_ceiling, mode=mode,
+    )
 
-            f0 = pitch.get_value_at_time(t)
-            frequencies.append(f0 if not math.isnan(f0) else None)
+    with metrics.stage("serialize"):
+        digits = serialization.resolve_precision(precision)
+        models = [
+            _pitch_model(times, frequencies, digits, compact, computed_until)
+            for (times, frequencies), computed_until in results
+        ]
+        return _channels_response(indices, models)
+
+
+def _pitch_model(times, frequencies, digits: int | None, compact: bool,
+                 computed_until: float | None = None) -> BaseModel:
+    """Response model of a pitch contour (None or NaN for unvoiced frames)."""
+    if compact:
+        return CompactPitchResponse(
+            time=serialization.uniform_axis(times),
+            frequencies=serialization.segments(frequencies, digits),
+            **_progress(computed_until),
+        )
+    return PitchResponse(
+        times=serialization.time_list(times, digits),
+        frequencies=serialization.float_list(frequencies, digits),
+        **_progress(computed_until),
+    )
 
-        return PitchResponse(times=times, frequencies=frequencies)
 
-    finally:
-        os.unlink(tmp_path)
+def _progress(computed_until: float | None) -> dict:
+    """The partial and computed_until fields of a frame-track response."""
+    return {"partial": computed_until is not None, "computed_until": computed_until}
 
 
 class WaveformResponse(BaseModel):
@@ -336,6 +1073,17 @@ class IntensityResponse(BaseModel):
     times: list[float]
     values: list[float]  # in dB
     unit: str = "dB"
+    partial: bool = False
+    computed_until: float | None = None
+
+
+class CompactIntensityResponse(BaseModel):
+    """Intensity contour response with an implicit time axis"""
+    time: Axis
+    values: list[float]  # in dB
+    unit: str = "dB"
+    partial: bool = False
+    computed_until: float | None = None
 
 
 class VoiceQualityResponse(BaseModel):
@@ -365,258 +1113,339 @@ class VoiceQualityResponse(BaseModel):
     degree_of_voice_breaks: float | None
 
 
-@router.post("/analyze/waveform", response_model=WaveformResponse)
+@_analysis_route("/analyze/waveform", response_model=WaveformResponse | ChannelsResponse[WaveformResponse])
 async def analyze_waveform(
-    file: UploadFile = File(...),
+    audio: http_cache.Upload,
     time_step: float = 0.001,
     max_points: int = 10000,
+    start: float | None = None,
+    end: float | None = None,
+    precision: int | None = None,
+    channels: str = "mix",
 ):
     """
     Extract waveform amplitude data for visualization.
     Downsamples if necessary to keep response size manageable.
+    Channels are averaged unless channels=all (or a list such as 0,1)
+    asks for each channel's waveform.
     """
     parselmouth = _get_parselmouth()
-    import numpy as np
-
-    tmp_path = await _save_upload_to_temp(file)
-
-    try:
-        sound = parselmouth.Sound(tmp_path)
-
-        # Get raw samples
-        samples = sound.values[0]  # First channel
-        sample_rate = int(sound.sampling_frequency)
-        duration = sound.duration
-
-        # Downsample if too many points
-        total_samples = len(samples)
-        if total_samples > max_points:
-            # Use peak envelope for better visualization
-            chunk_size = total_samples // max_points
-            downsampled = []
-            times = []
-
-            for i in range(0, total_samples - chunk_size, chunk_size):
-                chunk = samples[i:i + chunk_size]
-                # Take max absolute value to preserve peaks
-                max_val = np.max(np.abs(chunk))
-                # Preserve sign of the sample with max absolute value
-                idx = np.argmax(np.abs(chunk))
-                downsampled.append(float(chunk[idx]))
-                times.append(i / sample_rate)
-
-            amplitudes = downsampled
-        else:
-            amplitudes = [float(s) for s in samples]
-            times = [i / sample_rate for i in range(len(samples))]
-
-        return WaveformResponse(
-            times=times,
-            amplitudes=amplitudes,
-            duration=duration,
-            sample_rate=sample_rate,
-            min_amplitude=float(np.min(samples)),
-            max_amplitude=float(np.max(samples)),
-        )
-
-    finally:
-        os.unlink(tmp_path)
-
 
-@router.post("/analyze/intensity", response_model=IntensityResponse)
+    _, sound = _load_selection(parselmouth, audio, start, end)
+    indices = _channel_indices(channels, sound)
+
+    with metrics.stage("compute"):
+        # Peak picking is cheap; no worker processes needed
+        parts = [sound] if indices is None else [sound.extract_channel(i + 1) for i in indices]
+        results = [compute.waveform_envelope(part, max_points) for part in parts]
+
+    with metrics.stage("serialize"):
+        digits = serialization.resolve_precision(precision)
+        duration = _selection_duration(sound, start, end)
+        models = [
+            WaveformResponse(
+                times=serialization.time_list(times, digits),
+                amplitudes=serialization.float_list(amplitudes, digits),
+                duration=duration,
+                sample_rate=int(sound.sampling_frequency),
+                min_amplitude=minimum,
+                max_amplitude=maximum,
+            )
+            for times, amplitudes, minimum, maximum in results
+        ]
+        return _channels_response(indices, models)
+
+
+@_analysis_route(
+    "/analyze/intensity",
+    response_model=IntensityResponse | CompactIntensityResponse
+    | ChannelsResponse[IntensityResponse | CompactIntensityResponse],
+)
 async def analyze_intensity(
-    file: UploadFile = File(...),
+    audio: http_cache.Upload,
     time_step: float = 0.01,
     minimum_pitch: float = 75.0,
+    start: float | None = None,
+    end: float | None = None,
+    precision: int | None = None,
+    response_format: str = "full",
+    channels: str = "mix",
+    deadline_ms: int | None = None,
 ):
     """
     Extract intensity (loudness) contour from audio.
-    Returns values in dB.
+    Returns values in dB, per channel with channels=all (or a list such as 0,1).
+    With deadline_ms, analysis stops once that many milliseconds have
+    passed and returns the frames up to computed_until, marked partial.
     """
+    compact = _is_compact(response_format)
+    deadline = _deadline(deadline_ms)
     parselmouth = _get_parselmouth()
 
-    tmp_path = await _save_upload_to_temp(file)
-
-    try:
-        sound = parselmouth.Sound(tmp_path)
-        intensity = sound.to_intensity(
-            time_step=time_step,
-            minimum_pitch=minimum_pitch,
-        )
-
-        times = []
-        values = []
-
-        for i in range(intensity.n_frames):
-            t = intensity.get_time_from_frame_number(i + 1)
-            times.append(t)
-
-            val = intensity.get_value(t)
-            values.append(val if not math.isnan(val) else 0.0)
-
-        return IntensityResponse(times=times, values=values)
-
-    finally:
-        os.unlink(tmp_path)
+    # Praat's intensity window is 3.2 periods of the minimum pitch
+    _, sound = _load_selection(parselmouth, audio, start, end, padding=3.2 / minimum_pitch)
+    indices = _channel_indices(channels, sound)
 
+    results = await _analyze_tracks(
+        compute.intensity_track, sound, indices, deadline, window=6.4 / minimum_pitch,
+        start=start, end=end, time_step=time_step, minimum_pitch=minimum_pitch,
+    )
 
-@router.post("/analyze/voice-quality", response_model=VoiceQualityResponse)
+    with metrics.stage("serialize"):
+        digits = serialization.resolve_precision(precision)
+        models = [
+            CompactIntensityResponse(
+                time=serialization.uniform_axis(times),
+                values=serialization.float_list(values, digits),
+                **_progress(computed_until),
+            ) if compact else IntensityResponse(
+                times=serialization.time_list(times, digits),
+                values=serialization.float_list(values, digits),
+                **_progress(computed_until),
+            )
+            for (times, values), computed_until in results
+        ]
+        return _channels_response(indices, models)
+
+
+@_analysis_route("/analyze/voice-quality", response_model=VoiceQualityResponse | ChannelsResponse[VoiceQualityResponse])
 async def analyze_voice_quality(
-    file: UploadFile = File(...),
+    audio: http_cache.Upload,
     pitch_floor: float = 75.0,
     pitch_ceiling: float = 600.0,
     max_period_factor: float = 1.3,
     max_amplitude_factor: float = 1.6,
+    channels: str = "mix",
 ):
     """
     Extract voice quality measures including jitter, shimmer, and HNR.
     Critical for clinical voice assessment (SLP use case).
+    channels=all (or a list such as 0,1) measures each channel separately.
     """
     parselmouth = _get_parselmouth()
 
-    tmp_path = await _save_upload_to_temp(file)
-
-    try:
-        sound = parselmouth.Sound(tmp_path)
-
-        # Create pitch object for voiced frame detection
-        pitch = sound.to_pitch(
-            pitch_floor=pitch_floor,
-            pitch_ceiling=pitch_ceiling,
-        )
-
-        # Create PointProcess (glottal pulses)
-        point_process = parselmouth.praat.call(
-            [sound, pitch],
-            "To PointProcess (cc)"
-        )
+    _, sound = _load_sound(parselmouth, audio)
+    indices = _channel_indices(channels, sound)
 
-        # Helper function to safely call Praat commands
-        def safe_call(obj, command, *args):
-            try:
-                result = parselmouth.praat.call(obj, command, *args)
-                if math.isnan(result) if isinstance(result, float) else False:
-                    return None
-                return result
-            except Exception:
-                return None
-
-        # === JITTER MEASURES ===
-        jitter_local = safe_call(
-            point_process, "Get jitter (local)",
-            0, 0,  # time range (0 = all)
-            0.0001, 0.02,  # period floor/ceiling
-            max_period_factor
-        )
-
-        jitter_local_absolute = safe_call(
-            point_process, "Get jitter (local, absolute)",
-            0, 0, 0.0001, 0.02, max_period_factor
-        )
+    results = await _analyze_channels(
+        compute.voice_quality, sound, indices,
+        pitch_floor=pitch_floor,
+        pitch_ceiling=pitch_ceiling,
+        max_period_factor=max_period_factor,
+        max_amplitude_factor=max_amplitude_factor,
+    )
 
-        jitter_rap = safe_call(
-            point_process, "Get jitter (rap)",
-            0, 0, 0.0001, 0.02, max_period_factor
-        )
+    with metrics.stage("serialize"):
+        return _channels_response(indices, [VoiceQualityResponse(**measures) for measures in results])
 
-        jitter_ppq5 = safe_call(
-            point_process, "Get jitter (ppq5)",
-            0, 0, 0.0001, 0.02, max_period_factor
-        )
 
-        # === SHIMMER MEASURES ===
-        shimmer_local = safe_call(
-            [sound, point_process], "Get shimmer (local)",
-            0, 0, 0.0001, 0.02, max_period_factor, max_amplitude_factor
-        )
+class CPPSResponse(BaseModel):
+    """Cepstral peak prominence response"""
+    times: list[float]
+    cpp: list[float]  # per frame, unsmoothed cepstrum (dB)
+    cpps: list[float]  # per frame, smoothed cepstrum (dB)
+    cpp_mean: float
+    cpps_mean: float  # the CPPS summary measure
+    unit: str = "dB"
+    partial: bool = False
+    computed_until: float | None = None
 
-        shimmer_local_db = safe_call(
-            [sound, point_process], "Get shimmer (local, dB)",
-            0, 0, 0.0001, 0.02, max_period_factor, max_amplitude_factor
-        )
 
-        shimmer_apq3 = safe_call(
-            [sound, point_process], "Get shimmer (apq3)",
-            0, 0, 0.0001, 0.02, max_period_factor, max_amplitude_factor
-        )
+class CompactCPPSResponse(BaseModel):
+    """Cepstral peak prominence response with an implicit time axis"""
+    time: Axis
+    cpp: list[float]
+    cpps: list[float]
+    cpp_mean: float
+    cpps_mean: float
+    unit: str = "dB"
+    partial: bool = False
+    computed_until: float | None = None
+
+
+@_analysis_route(
+    "/analyze/cpps",
+    response_model=CPPSResponse | CompactCPPSResponse
+    | ChannelsResponse[CPPSResponse | CompactCPPSResponse],
+)
+async def analyze_cpps(
+    audio: http_cache.Upload,
+    pitch_floor: float = 60.0,
+    pitch_ceiling: float = 330.0,
+    time_step: float = 0.002,
+    max_frequency: float = 5000.0,
+    time_averaging: float = 0.01,
+    quefrency_averaging: float = 0.001,
+    start: float | None = None,
+    end: float | None = None,
+    precision: int | None = None,
+    response_format: str = "full",
+    channels: str = "mix",
+    deadline_ms: int | None = None,
+):
+    """
+    Cepstral peak prominence (CPP) and smoothed CPP (CPPS) of audio.
+    A clinical measure of dysphonia that works on connected speech.
+    Returns the per-frame tracks and their means over the selection;
+    cpps_mean matches Praat's Get CPPS with a least-squares tilt line.
+    channels=all (or a list such as 0,1) measures each channel separately.
+    With deadline_ms, analysis stops once that many milliseconds have
+    passed and returns the frames up to computed_until, marked partial,
+    with the means of those frames.
+    """
+    compact = _is_compact(response_format)
+    deadline = _deadline(deadline_ms)
+    if not 0 < pitch_floor < pitch_ceiling:
+        raise HTTPException(status_code=400, detail="pitch_ceiling must be greater than pitch_floor > 0")
+    if max_frequency <= pitch_ceiling or time_step <= 0:
+        raise HTTPException(status_code=400, detail="max_frequency and time_step must be positive, "
+                                                    "max_frequency above pitch_ceiling")
+    parselmouth = _get_parselmouth()
 
-        shimmer_apq5 = safe_call(
-            [sound, point_process], "Get shimmer (apq5)",
-            0, 0, 0.0001, 0.02, max_period_factor, max_amplitude_factor
-        )
+    # The Gaussian window spans six periods of the pitch floor, and CPPS
+    # averages over time_averaging around each frame
+    padding = cepstral.PERIODS_PER_WINDOW / pitch_floor + 0.5 * time_averaging
+    key, sound = _load_selection(parselmouth, audio, start, end, padding=padding)
+    indices = _channel_indices(channels, sound)
+    sound, analysis_rate = _resample_for_tracks(sound, key, 2 * max_frequency, deadline)
+
+    results = await _analyze_tracks(
+        compute.cpps_tracks, sound, indices, deadline,
+        # CPPS averages over time_averaging around each frame
+        window=2 * cepstral.PERIODS_PER_WINDOW / pitch_floor, context=0.5 * time_averaging,
+        in_blocks=False, analysis_rate=analysis_rate,
+        start=start, end=end,
+        pitch_floor=pitch_floor,
+        pitch_ceiling=pitch_ceiling,
+        time_step=time_step,
+        time_averaging=time_averaging,
+        quefrency_averaging=quefrency_averaging,
+    )
 
-        shimmer_apq11 = safe_call(
-            [sound, point_process], "Get shimmer (apq11)",
-            0, 0, 0.0001, 0.02, max_period_factor, max_amplitude_factor
-        )
+    with metrics.stage("serialize"):
+        digits = serialization.resolve_precision(precision)
+        models = []
+        for (times, cpp, cpps), computed_until in results:
+            summary = {
+                "cpp_mean": float(cpp.mean()), "cpps_mean": float(cpps.mean()),
+                **_progress(computed_until),
+            }
+            if compact:
+                models.append(CompactCPPSResponse(
+                    time=serialization.uniform_axis(times),
+                    cpp=serialization.float_list(cpp, digits),
+                    cpps=serialization.float_list(cpps, digits),
+                    **summary,
+                ))
+            else:
+                models.append(CPPSResponse(
+                    times=serialization.time_list(times, digits),
+                    cpp=serialization.float_list(cpp, digits),
+                    cpps=serialization.float_list(cpps, digits),
+                    **summary,
+                ))
+        return _channels_response(indices, models)
+
+
+class MeasurementsResponse(BaseModel):
+    """Per-interval measurements, as a table of rows"""
+    columns: list[str]
+    rows: list[list[str | float | None]]
+
+
+@router.post("/analyze/measurements", response_model=MeasurementsResponse)
+async def analyze_measurements(
+    file: UploadFile,
+    annotations: str = Form(...),
+    tier: str | None = None,
+    output_format: str = "json",
+    time_step: float = 0.01,
+    pitch_floor: float = 75.0,
+    pitch_ceiling: float = 600.0,
+    pitch_mode: str = "praat",
+    max_formant: float = 5500.0,
+    formant_engine: str = "praat",
+    minimum_pitch: float = 75.0,
+    precision: int | None = None,
+):
+    """
+    Measure every annotated interval of audio, as a Praat script looping
+    over a tier would: duration, and the mean, median, minimum, maximum
+    and midpoint value of F0, F1-F3 and intensity.
+    annotations is a JSON list in the format of /import/textgrid; tier
+    restricts the table to one tier. Each track is computed once for the
+    file. Statistics are over the frames centred in an interval, ignoring
+    unvoiced ones; the midpoint value is Praat's Get value at time.
+    Returns the table as JSON (columns and rows), CSV or Parquet.
+    """
+    import numpy as np
 
-        # === HARMONICITY (HNR) ===
-        harmonicity = sound.to_harmonicity(
-            time_step=0.01,
-            minimum_pitch=pitch_floor,
+    if output_format not in MEASUREMENT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported output_format: {output_format}. Use one of: {', '.join(MEASUREMENT_FORMATS)}"
         )
-
-        hnr = safe_call(harmonicity, "Get mean", 0, 0)
-        nhr = 1 / (10 ** (hnr / 10)) if hnr and hnr > 0 else None
-
-        # === PITCH STATISTICS ===
-        mean_pitch = safe_call(pitch, "Get mean", 0, 0, "Hertz")
-        pitch_stdev = safe_call(pitch, "Get standard deviation", 0, 0, "Hertz")
-
-        # Voiced fraction
-        voiced_frames = 0
-        total_frames = pitch.n_frames
-        for i in range(total_frames):
-            t = pitch.get_time_from_frame_number(i + 1)
-            if not math.isnan(pitch.get_value_at_time(t)):
-                voiced_frames += 1
-
-        voiced_fraction = voiced_frames / total_frames if total_frames > 0 else 0
-
-        # Voice breaks
-        num_voice_breaks = safe_call(
-            pitch, "Count voice breaks", 0, 0
+    if pitch_mode not in PITCH_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported pitch_mode: {pitch_mode}. Use one of: {', '.join(PITCH_MODES)}"
         )
-        degree_of_voice_breaks = safe_call(
-            pitch, "Get fraction of locally unvoiced frames", 0, 0
+    if formant_engine not in FORMANT_ENGINES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported formant_engine: {formant_engine}. Use one of: {', '.join(FORMANT_ENGINES)}"
         )
+    try:
+        selected = [
+            annotation for annotation in TypeAdapter(list[textgrid.Annotation]).validate_json(annotations)
+            if tier is None or annotation.tier == tier
+        ]
+        intervals = [Annotation(a.start, a.end, a.text, a.id) for a in selected]
+    except (ValidationError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid annotations: {e}")
+    if not intervals:
+        raise HTTPException(status_code=400, detail="No annotations to measure" + (f" in tier {tier}" if tier else ""))
+    parselmouth = _get_parselmouth()
 
-        # Convert jitter to percentage
-        if jitter_local is not None:
-            jitter_local = jitter_local * 100
-        if jitter_rap is not None:
-            jitter_rap = jitter_rap * 100
-        if jitter_ppq5 is not None:
-            jitter_ppq5 = jitter_ppq5 * 100
-
-        # Convert shimmer to percentage
-        if shimmer_local is not None:
-            shimmer_local = shimmer_local * 100
-        if shimmer_apq3 is not None:
-            shimmer_apq3 = shimmer_apq3 * 100
-        if shimmer_apq5 is not None:
-            shimmer_apq5 = shimmer_apq5 * 100
-        if shimmer_apq11 is not None:
-            shimmer_apq11 = shimmer_apq11 * 100
-
-        return VoiceQualityResponse(
-            jitter_local=jitter_local,
-            jitter_local_absolute=jitter_local_absolute,
-            jitter_rap=jitter_rap,
-            jitter_ppq5=jitter_ppq5,
-            shimmer_local=shimmer_local,
-            shimmer_local_db=shimmer_local_db,
-            shimmer_apq3=shimmer_apq3,
-            shimmer_apq5=shimmer_apq5,
-            shimmer_apq11=shimmer_apq11,
-            hnr=hnr,
-            nhr=nhr,
-            mean_pitch=mean_pitch,
-            pitch_stdev=pitch_stdev,
-            voiced_fraction=voiced_fraction,
-            num_voice_breaks=int(num_voice_breaks) if num_voice_breaks else None,
-            degree_of_voice_breaks=degree_of_voice_breaks,
+    audio = await _read_audio(file)
+    _, sound = _load_sound(parselmouth, audio)
+    table = (await _analyze_channels(
+        compute.interval_measurements, sound, None,
+        intervals=intervals,
+        time_step=time_step,
+        pitch_floor=pitch_floor,
+        pitch_ceiling=pitch_ceiling,
+        pitch_mode=pitch_mode,
+        max_formant=max_formant,
+        formant_engine=formant_engine,
+        minimum_pitch=minimum_pitch,
+    ))[0]
+
+    with metrics.stage("serialize"):
+        digits = serialization.resolve_precision(precision)
+        columns = {
+            "id": np.array([a.id for a in selected], dtype=object),
+            "tier": np.array([a.tier for a in selected], dtype=object),
+            **table.columns,
+        }
+        if digits is not None:
+            for name, values in columns.items():
+                if name in ("start", "end", "duration"):
+                    columns[name] = np.round(values, serialization.TIME_DECIMALS)
+                elif values.dtype.kind == "f":
+                    columns[name] = serialization.round_significant(values, digits)
+        table = IntervalMeasurements(columns)
+        if output_format == "json":
+            return _json_response(MeasurementsResponse(columns=list(columns), rows=table.rows()))
+        if output_format == "csv":
+            content = table.to_csv().encode()
+        else:
+            try:
+                content = table.to_parquet()
+            except ImportError as e:
+                raise HTTPException(status_code=500, detail=str(e))
+        return Response(
+            content=content,
+            media_type=MEASUREMENT_FORMATS[output_format],
+            headers={"Content-Disposition": f'attachment; filename="measurements.{output_format}"'},
         )
-
-    finally:
-        os.unlink(tmp_path)
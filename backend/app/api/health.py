@@ -1,6 +1,9 @@
 """Health check endpoints"""
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app import warmup
 
 router = APIRouter()
 
@@ -13,19 +16,9 @@ async def health_check():
 
 @router.get("/health/ready")
 async def readiness_check():
-    """Readiness check - verifies core dependencies are available"""
-    checks = {
-        "parselmouth": False,
-    }
-
-    try:
-        import parselmouth
-        checks["parselmouth"] = True
-    except ImportError:
-        pass
-
-    all_ready = all(checks.values())
-    return {
-        "status": "ready" if all_ready else "not_ready",
-        "checks": checks,
-    }
+    """Readiness check - ready once startup warmup has loaded and exercised dependencies"""
+    ready = warmup.is_ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", **warmup.status()},
+    )
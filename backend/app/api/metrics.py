@@ -0,0 +1,15 @@
+"""Prometheus metrics endpoint"""
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app import metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Expose analysis pipeline metrics in Prometheus text format"""
+    body, content_type = metrics.render_latest()
+    return Response(content=body, media_type=content_type)
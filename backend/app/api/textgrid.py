@@ -1,10 +1,13 @@
 """TextGrid import/export endpoints"""
 
 import re
+from pathlib import Path
 from typing import Optional
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, HTTPException
 from pydantic import BaseModel
 
+from app import audio_store, http_cache
+
 router = APIRouter()
 
 
@@ -284,15 +287,22 @@ def parse_textgrid_short(lines: list[str]) -> dict:
     return result
 
 
-@router.post("/import/textgrid", response_model=TextGridImportResponse)
-async def import_textgrid(
-    file: UploadFile = File(...),
-):
+async def _read_textgrid(file: UploadFile) -> http_cache.Upload:
+    """Read an uploaded TextGrid file and hash its contents."""
+    content = await file.read()
+    ext = Path(file.filename or "annotations.TextGrid").suffix.lower()
+    return http_cache.Upload(content, ext, audio_store.content_key(content))
+
+
+@http_cache.content_addressed(
+    router, "/import/textgrid", "textgrid", _read_textgrid, response_model=TextGridImportResponse,
+)
+async def import_textgrid(textgrid: http_cache.Upload):
     """
     Import a Praat TextGrid file.
     Supports both long and short formats.
     """
-    content = await file.read()
+    content = textgrid.content
 
     # Try to decode with different encodings
     text_content = None
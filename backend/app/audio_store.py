@@ -0,0 +1,291 @@
+"""
+Decoded-audio caches shared by all workers on a host.
+
+Shared memory:
+Decoded samples are kept in POSIX shared memory segments keyed by the
+SHA-256 of the uploaded bytes, so every worker on the host reuses one
+decoded copy instead of each decoding (and holding) its own. A small
+SQLite index next to the segments tracks sizes, leases and last use.
+Segments without leases are evicted least-recently-used first to stay
+within a global byte budget. A dead worker's leases are dropped the next
+time something needs evicting.
+
+The store is off by default. Set LINGUAI_SHARED_AUDIO_BYTES to the budget
+in bytes to enable it, and optionally LINGUAI_SHARED_AUDIO_DIR to the
+directory for the index (default /dev/shm, or the temp directory).
+
+Disk:
+A persistent linguai_core PCMCache of memory-mappable samples, used when
+LINGUAI_PCM_CACHE_DIR is set (LINGUAI_PCM_CACHE_DTYPE picks float32 or
+int16). It survives restarts and lets region requests read only the
+samples they need.
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, TypeVar
+
+import numpy as np
+from linguai_core import PCMCache
+
+T = TypeVar("T")
+
+# Samples are stored as Praat holds them: float64, [channels, samples]
+SAMPLE_DTYPE = np.float64
+
+# Longest shm name macOS accepts (PSHMNAMLEN), leading "/" included
+MAX_SEGMENT_NAME = 31
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    segment TEXT NOT NULL,
+    nbytes INTEGER NOT NULL,
+    sample_rate REAL NOT NULL,
+    n_channels INTEGER NOT NULL,
+    n_samples INTEGER NOT NULL,
+    start_time REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    key TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (key, pid)
+);
+"""
+
+
+def content_key(content: bytes) -> str:
+    """Key for an uploaded file: the SHA-256 of its bytes."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def _open_segment(name: str, create: bool = False, size: int = 0) -> shared_memory.SharedMemory:
+    """Open a segment without handing it to this process's resource tracker,
+    which would otherwise unlink it when the worker exits."""
+    try:
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+    except TypeError:  # Python < 3.13 has no track argument
+        segment = shared_memory.SharedMemory(name=name, create=create, size=size)
+        resource_tracker.unregister(segment._name, "shared_memory")
+        return segment
+
+
+def _unlink_segment(name: str) -> None:
+    try:
+        segment = _open_segment(name)
+    except FileNotFoundError:
+        return
+    segment.close()
+    if sys.version_info < (3, 13):
+        # unlink() also unregisters the name from the resource tracker
+        resource_tracker.register(segment._name, "shared_memory")
+    segment.unlink()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SharedAudioStore:
+    """Decoded audio shared between the worker processes of one host."""
+
+    def __init__(self, index_path: str, budget_bytes: int):
+        self.index_path = index_path
+        self.budget_bytes = budget_bytes
+        # Segment names are namespaced by index so separate deployments never collide
+        self._prefix = "lg" + hashlib.sha256(index_path.encode()).hexdigest()[:6] + "_"
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread, and never reused across a fork
+        conn, pid = getattr(self._local, "conn", (None, None))
+        if conn is None or pid != os.getpid():
+            conn = sqlite3.connect(self.index_path, timeout=30, isolation_level=None)
+            conn.executescript(_SCHEMA)
+            self._local.conn = (conn, os.getpid())
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _segment_name(self, key: str) -> str:
+        # macOS limits shm names, with their leading "/", to 31 characters
+        name = self._prefix + key[:16]
+        assert len(name) + 1 <= MAX_SEGMENT_NAME, name
+        return name
+
+    def get(self, key: str, build: Callable[[np.ndarray, float, float], T]) -> T | None:
+        """
+        Call build(values, sample_rate, start_time) on the stored samples for
+        key and return its result, or None if key isn't stored. values is a
+        read-only view of shared memory that is only valid during the call;
+        build must copy whatever it keeps.
+        """
+        pid = os.getpid()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT segment, sample_rate, n_channels, n_samples, start_time"
+                " FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+            conn.execute(
+                "INSERT INTO leases (key, pid, count) VALUES (?, ?, 1)"
+                " ON CONFLICT (key, pid) DO UPDATE SET count = count + 1",
+                (key, pid),
+            )
+
+        segment_name, sample_rate, n_channels, n_samples, start_time = row
+        try:
+            segment = _open_segment(segment_name)
+        except FileNotFoundError:
+            # The segment vanished underneath us (e.g. /dev/shm was cleared)
+            with self._transaction() as conn:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                conn.execute("DELETE FROM leases WHERE key = ?", (key,))
+            return None
+
+        try:
+            values = np.ndarray((n_channels, n_samples), dtype=SAMPLE_DTYPE, buffer=segment.buf)
+            values.flags.writeable = False
+            try:
+                return build(values, sample_rate, start_time)
+            finally:
+                del values
+        finally:
+            segment.close()
+            with self._transaction() as conn:
+                conn.execute(
+                    "UPDATE leases SET count = count - 1 WHERE key = ? AND pid = ?", (key, pid)
+                )
+                conn.execute("DELETE FROM leases WHERE count <= 0")
+
+    def put(self, key: str, values: np.ndarray, sample_rate: float, start_time: float = 0.0) -> bool:
+        """
+        Store decoded samples ([channels, samples]) under key, evicting idle
+        entries as needed. Returns False if they don't fit in the budget.
+        """
+        values = np.atleast_2d(np.asarray(values, dtype=SAMPLE_DTYPE))
+        nbytes = values.nbytes
+        if nbytes == 0 or nbytes > self.budget_bytes:
+            return False
+
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone():
+                return True
+            if not self._make_room(conn, nbytes):
+                return False
+
+            segment_name = self._segment_name(key)
+            _unlink_segment(segment_name)  # Left over from a crashed writer
+            segment = _open_segment(segment_name, create=True, size=nbytes)
+            try:
+                shared = np.ndarray(values.shape, dtype=SAMPLE_DTYPE, buffer=segment.buf)
+                shared[:] = values
+                del shared
+            finally:
+                segment.close()
+
+            conn.execute(
+                "INSERT INTO entries (key, segment, nbytes, sample_rate, n_channels, n_samples,"
+                " start_time, last_used) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, segment_name, nbytes, float(sample_rate), values.shape[0],
+                 values.shape[1], float(start_time), time.time()),
+            )
+        return True
+
+    def _make_room(self, conn: sqlite3.Connection, nbytes: int) -> bool:
+        """Evict unleased entries, oldest first, until nbytes more fit the budget."""
+        used = conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM entries").fetchone()[0]
+        if used + nbytes <= self.budget_bytes:
+            return True
+
+        for (pid,) in conn.execute("SELECT DISTINCT pid FROM leases").fetchall():
+            if not _pid_alive(pid):
+                conn.execute("DELETE FROM leases WHERE pid = ?", (pid,))
+
+        candidates = conn.execute(
+            "SELECT key, segment, nbytes FROM entries"
+            " WHERE key NOT IN (SELECT key FROM leases) ORDER BY last_used"
+        ).fetchall()
+        for key, segment_name, size in candidates:
+            if used + nbytes <= self.budget_bytes:
+                break
+            _unlink_segment(segment_name)
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            used -= size
+
+        return used + nbytes <= self.budget_bytes
+
+    def stats(self) -> dict:
+        conn = self._connection()
+        entries, used = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM entries"
+        ).fetchone()
+        leased = conn.execute("SELECT COUNT(DISTINCT key) FROM leases").fetchone()[0]
+        return {"entries": entries, "bytes": used, "leased": leased, "budget_bytes": self.budget_bytes}
+
+    def clear(self) -> None:
+        """Remove every entry and its segment (leased or not)."""
+        with self._transaction() as conn:
+            for (segment_name,) in conn.execute("SELECT segment FROM entries").fetchall():
+                _unlink_segment(segment_name)
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM leases")
+
+
+_store: SharedAudioStore | None = None
+
+
+def get_store() -> SharedAudioStore | None:
+    """The configured store, or None when LINGUAI_SHARED_AUDIO_BYTES is unset."""
+    global _store
+    budget = int(os.environ.get("LINGUAI_SHARED_AUDIO_BYTES", "0") or 0)
+    if budget <= 0:
+        return None
+    default_dir = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    directory = os.environ.get("LINGUAI_SHARED_AUDIO_DIR", default_dir)
+    index_path = os.path.join(directory, "linguai_audio_store.sqlite")
+    if _store is None or (_store.index_path, _store.budget_bytes) != (index_path, budget):
+        _store = SharedAudioStore(index_path, budget)
+    return _store
+
+
+_pcm_cache: PCMCache | None = None
+
+
+def get_pcm_cache() -> PCMCache | None:
+    """The configured disk cache, or None when LINGUAI_PCM_CACHE_DIR is unset."""
+    global _pcm_cache
+    directory = os.environ.get("LINGUAI_PCM_CACHE_DIR")
+    if not directory:
+        return None
+    dtype = os.environ.get("LINGUAI_PCM_CACHE_DTYPE", "float32")
+    if _pcm_cache is None or (str(_pcm_cache.directory), _pcm_cache.dtype) != (directory, dtype):
+        _pcm_cache = PCMCache(directory, dtype)
+    return _pcm_cache
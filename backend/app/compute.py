@@ -0,0 +1,578 @@
+"""
+The analyses behind the analyze endpoints, as plain functions of a Sound.
+
+They take a Sound that is already decoded, padded and resampled as the
+endpoint needs, and return arrays or lists ready for serialization. They
+raise ValueError for settings the audio can't satisfy and don't touch
+HTTP, metrics or the caches, so linguai_core.channels can run them on
+each channel of a recording in worker processes.
+"""
+
+import math
+import time
+
+import numpy as np
+
+from linguai_core import cepstral, fast_pitch, frames, lpc, measurements, resample, stft
+from linguai_core.tracks import FeatureSettings
+
+from app.analysis_cache import FrameMatrix
+
+
+# Audio analyzed per block when an analysis has a deadline (seconds)
+DEADLINE_BLOCK = 2.0
+
+# Audio whose spectrogram frames are computed at a time when they are
+# pooled into image columns (seconds)
+IMAGE_BLOCK = 10.0
+
+# Audio either side of a block resampled with it, so that the sinc at its
+# edges has all its samples (seconds)
+RESAMPLE_MARGIN = 0.05
+
+
+def in_selection(t: float, start: float | None, end: float | None) -> bool:
+    """Whether a frame time falls inside the selection."""
+    return (start is None or t >= start) and (end is None or t <= end)
+
+
+def selection_mask(times, start: float | None, end: float | None) -> np.ndarray:
+    """Which frame times fall inside the selection, as a boolean array."""
+    times = np.asarray(times, dtype=np.float64)
+    return (times >= (-np.inf if start is None else start)) & (times <= (np.inf if end is None else end))
+
+
+def within_deadline(sound, frame_analysis, deadline: float, window: float, context: float,
+                    in_blocks: bool, start: float | None, end: float | None, time_step: float,
+                    analysis_rate: float | None = None, **kwargs):
+    """
+    Run frame_analysis, a frame-track analysis such as pitch_track, over
+    the selection in time order, stopping once time.monotonic() passes
+    deadline. window is the analysis window and context the time around a
+    frame the analysis looks at beyond it (seconds).
+
+    The NumPy engines take the deadline themselves and stop between their
+    batches of frames (in_blocks False), with every frame they return
+    final. Praat's analyses are run on
+    blocks of about DEADLINE_BLOCK seconds (in_blocks True): each on the
+    samples whose own frame grid is the block's frames of the whole
+    Sound's grid, widened by context on each side. Either way the frames
+    and their values are those of one analysis of the whole Sound, except
+    that Praat's pitch path finder sees only a block and its context, so
+    voicing decisions near a block edge may differ.
+
+    With an analysis_rate, the Sound isn't at the rate the analysis needs
+    yet: every engine then runs in blocks, each resampled to that rate as
+    the analysis gets to it, so the deadline covers the resampling too.
+    The frames are those of the whole Sound resampled, but not all their
+    values: a block's low-pass leaves a different trace of the band just
+    below the new Nyquist frequency than the whole Sound's. Most frames
+    barely move; a few percent can pick another formant or cepstral peak
+    (on two minutes of speech, F1 moved by under 1 Hz in half the frames
+    and by up to 190 Hz in 1%; CPPS by up to 1.4 dB in 1%).
+
+    Returns (result, computed_until): the result of the frames computed,
+    and None if that is all of them, else the time halfway between the
+    last frame computed and the next.
+    """
+    if analysis_rate is None:
+        rate, n_samples, x1 = sound.sampling_frequency, sound.n_samples, sound.x1
+    else:
+        rate = analysis_rate
+        n_samples, x1 = resample.resampled_grid(sound.xmin, sound.xmax, rate)
+        in_blocks = True
+    dx = 1.0 / rate
+    times = frames.short_term_frame_times(n_samples, dx, x1, window, time_step) if time_step > 0 else []
+    selected = np.flatnonzero(selection_mask(times, start, end))
+    if len(selected) == 0:
+        # Praat picks the step itself when it isn't positive, so the frame
+        # grid isn't known up front
+        if analysis_rate is not None:
+            sound = resample.resample_sound(sound, analysis_rate)
+        return frame_analysis(sound, start, end, time_step=time_step, **kwargs), None
+
+    if not in_blocks:
+        result = frame_analysis(sound, start, end, time_step=time_step, deadline=deadline, **kwargs)
+        if len(result[0]) == len(selected):
+            return result, None
+        return result, float(times[selected[0] + len(result[0]) - 1] + 0.5 * time_step)
+
+    import parselmouth
+
+    values = sound.values
+    block_frames = max(round(DEADLINE_BLOCK / time_step), 1)
+    # At least a frame, so that a block's first frame doesn't see its edge
+    context_frames = max(math.ceil(context / time_step), 1)
+    parts = []
+    computed_until = None
+    for first in range(selected[0], selected[-1] + 1, block_frames):
+        last = min(first + block_frames - 1, selected[-1])
+        offset, length = frames.frame_block(
+            n_samples, dx, x1, window, time_step,
+            max(first - context_frames, 0), min(last + context_frames, len(times) - 1),
+        )
+        begin, end_sample = max(offset, 0), min(offset + length, n_samples)
+        if analysis_rate is None:
+            samples = values[:, begin:end_sample]
+        else:
+            samples = _resampled_block(sound, analysis_rate, x1 + begin * dx, end_sample - begin)
+        if offset < 0 or offset + length > n_samples:
+            samples = np.pad(samples, ((0, 0), (begin - offset, offset + length - end_sample)))
+        block = parselmouth.Sound(samples, sampling_frequency=rate, start_time=x1 + (offset - 0.5) * dx)
+        part = frame_analysis(block, times[first] - 0.5 * time_step, times[last] + 0.5 * time_step,
+                              time_step=time_step, **kwargs)
+        if len(part[0]) == last - first + 1:
+            # The block's grid may be off the whole Sound's by half a sample
+            part = (times[first:last + 1], *part[1:])
+        parts.append(part)
+        if last < selected[-1] and time.monotonic() >= deadline:
+            computed_until = float(times[last] + 0.5 * time_step)
+            break
+
+    result = tuple(_concatenate([part[i] for part in parts]) for i in range(len(parts[0])))
+    return result, computed_until
+
+
+def _resampled_block(sound, rate: float, x1: float, n_samples: int) -> np.ndarray:
+    """
+    The Sound resampled to rate on n_samples samples from time x1,
+    resampling only them and RESAMPLE_MARGIN either side. The rates must
+    be ones linguai_core.resample supports.
+    """
+    dx = 1.0 / sound.sampling_frequency
+    first = max(math.floor((x1 - RESAMPLE_MARGIN - sound.x1) / dx), 0)
+    last = min(math.ceil((x1 + n_samples / rate + RESAMPLE_MARGIN - sound.x1) / dx), sound.n_samples - 1)
+    xmin = x1 - 0.5 / rate
+    return resample.resample(sound.values[:, first:last + 1], sound.sampling_frequency,
+                             sound.x1 + first * dx, xmin, xmin + n_samples / rate, rate)
+
+
+def _concatenate(parts: list):
+    """Join the blocks of one element of an analysis result: frame values, or tracks of them."""
+    if parts[0] is None:
+        return None
+    if isinstance(parts[0], np.ndarray):
+        return np.concatenate(parts, axis=-1)
+    if parts[0] and isinstance(parts[0][0], (list, np.ndarray)):
+        return [_concatenate([part[i] for part in parts]) for i in range(len(parts[0]))]
+    return [value for part in parts for value in part]
+
+
+def spectrogram_matrix(sound, window_length: float, time_step: float, max_frequency: float,
+                       engine: str, rate_scale: float = 1.0) -> FrameMatrix:
+    """
+    Spectrogram of every frame of a Sound in dB (float32). rate_scale
+    rescales Praat's power, which scales with the sample rate, to the
+    rate the Sound was resampled from.
+    """
+    if engine == "numpy":
+        times, frequencies, power = stft.gaussian_spectrogram(
+            sound.values, sound.sampling_frequency, sound.x1,
+            window_length=window_length,
+            time_step=time_step,
+            max_frequency=max_frequency,
+        )
+    else:
+        spectrogram = sound.to_spectrogram(
+            window_length=window_length,
+            time_step=time_step,
+            maximum_frequency=max_frequency,
+        )
+        times = np.array(spectrogram.xs())
+        frequencies = np.array(spectrogram.ys())
+        # Praat stores power as [frequency, time]
+        power = spectrogram.values.T
+    return FrameMatrix(times, frequencies, _decibels(power, rate_scale))
+
+
+def _decibels(power: np.ndarray, rate_scale: float) -> np.ndarray:
+    """Spectrogram power in dB (float32), rescaled by rate_scale."""
+    # float32 is ample for dB values and halves the matrix
+    intensities = (power * rate_scale).astype(np.float32)
+    return np.where(
+        intensities > 0,
+        10 * np.log10(intensities + np.float32(1e-30)),
+        np.float32(-100),
+    )
+
+
+def spectrogram_columns(sound, width: int, start: float | None, end: float | None,
+                        window_length: float, time_step: float, max_frequency: float,
+                        engine: str, rate_scale: float = 1.0) -> tuple:
+    """
+    The spectrogram_matrix frames of the selection pooled into width
+    image columns as linguai_core.spectrogram_image does (each column the
+    maximum of its run of frames), or all of them if there are no more
+    than width. Computed IMAGE_BLOCK seconds of frames at a time, so that
+    only the columns are held however long the selection. Returns (time
+    of each column's first frame, frequencies, dB [column, frequency]).
+
+    The numpy engine computes the very frames of one analysis of the
+    whole Sound. Praat's are computed on a block of samples each, so a
+    frame whose window starts half-way between two samples may start a
+    sample off the whole Sound's, changing the quietest bins.
+    """
+    import parselmouth
+
+    rate, n_samples, x1 = sound.sampling_frequency, sound.n_samples, sound.x1
+    dx = 1.0 / rate
+    values = sound.values
+    # Praat's frame grid: whole physical windows (twice window_length),
+    # with the step no finer than its oversampling limit
+    window = 2.0 * window_length
+    time_step = max(time_step, window_length / math.sqrt(math.pi) / stft.MAX_TIME_OVERSAMPLING)
+    times, frequencies = stft.spectrogram_grid(n_samples, rate, x1, window_length, time_step, max_frequency)
+    selected = np.flatnonzero(selection_mask(times, start, end))
+    if len(selected) == 0:
+        return times[selected], frequencies, np.empty((0, len(frequencies)), dtype=np.float32)
+
+    n_columns = min(width, len(selected))
+    edges = np.linspace(0, len(selected), n_columns + 1).astype(np.intp)
+    columns_per_block = max(math.floor(n_columns * IMAGE_BLOCK / (len(selected) * time_step)), 1)
+    pooled = None
+    for first in range(0, n_columns, columns_per_block):
+        stop = min(first + columns_per_block, n_columns)
+        first_frame, last_frame = selected[edges[first]], selected[edges[stop] - 1]
+        if engine == "numpy":
+            _, _, power = stft.gaussian_spectrogram(
+                values, rate, x1,
+                window_length=window_length,
+                time_step=time_step,
+                max_frequency=max_frequency,
+                frames=slice(first_frame, last_frame + 1),
+            )
+            part = _decibels(power, rate_scale)
+        else:
+            offset, length = frames.frame_block(n_samples, dx, x1, window, time_step, first_frame, last_frame)
+            begin, end_sample = max(offset, 0), min(offset + length, n_samples)
+            samples = np.pad(values[:, begin:end_sample], ((0, 0), (begin - offset, offset + length - end_sample)))
+            block = parselmouth.Sound(samples, sampling_frequency=rate, start_time=x1 + (offset - 0.5) * dx)
+            part = spectrogram_matrix(block, window_length, time_step, max_frequency, engine, rate_scale).values
+        if pooled is None:
+            pooled = np.empty((n_columns, part.shape[1]), dtype=np.float32)
+        pooled[first:stop] = np.maximum.reduceat(part, edges[first:stop] - edges[first], axis=0)
+    return times[selected[edges[:-1]]], frequencies, pooled
+
+
+def formant_tracks(sound, start: float | None, end: float | None, time_step: float,
+                   max_formant: float, engine: str, deadline: float | None = None):
+    """
+    Formant tracks of the frames in the selection as (times, tracks,
+    bandwidths): F1-F4 and no bandwidths from Praat, F1-F5 and B1-B5 from
+    the lpc engine. The lpc engine needs the Sound at twice max_formant,
+    and stops at deadline (see within_deadline).
+    """
+    if engine == "lpc":
+        all_times, frequencies, bandwidths = lpc.lpc_formants(
+            sound.values, sound.sampling_frequency, sound.x1,
+            time_step=time_step,
+            num_formants=5,
+            deadline=deadline,
+        )
+        selected = selection_mask(all_times, start, end)
+        return all_times[selected], frequencies[selected].T, bandwidths[selected].T
+
+    formants = sound.to_formant_burg(
+        time_step=time_step,
+        max_number_of_formants=5,
+        maximum_formant=max_formant,
+    )
+
+    times = []
+    f1, f2, f3, f4 = [], [], [], []
+
+    for i in range(formants.n_frames):
+        t = formants.get_time_from_frame_number(i + 1)
+        if not in_selection(t, start, end):
+            continue
+        times.append(t)
+
+        for formant_num, formant_list in [(1, f1), (2, f2), (3, f3), (4, f4)]:
+            try:
+                val = formants.get_value_at_time(formant_num, t)
+                formant_list.append(val if not math.isnan(val) else None)
+            except Exception:
+                formant_list.append(None)
+
+    return times, [f1, f2, f3, f4], None
+
+
+def pitch_track(sound, start: float | None, end: float | None, time_step: float,
+                pitch_floor: float, pitch_ceiling: float, mode: str, deadline: float | None = None):
+    """
+    F0 of the frames in the selection as (times, frequencies), None or NaN
+    where unvoiced. The fast mode stops at deadline (see within_deadline).
+    """
+    if mode == "fast":
+        all_times, all_frequencies = fast_pitch.yin_pitch(
+            sound.values, sound.sampling_frequency, sound.x1,
+            time_step=time_step,
+            pitch_floor=pitch_floor,
+            pitch_ceiling=pitch_ceiling,
+            deadline=deadline,
+        )
+        selected = selection_mask(all_times, start, end)
+        return all_times[selected], all_frequencies[selected]
+
+    pitch = sound.to_pitch(
+        time_step=time_step,
+        pitch_floor=pitch_floor,
+        pitch_ceiling=pitch_ceiling,
+    )
+
+    times = []
+    frequencies = []
+
+    for i in range(pitch.n_frames):
+        t = pitch.get_time_from_frame_number(i + 1)
+        if not in_selection(t, start, end):
+            continue
+        times.append(t)
+
+        f0 = pitch.get_value_at_time(t)
+        frequencies.append(f0 if not math.isnan(f0) else None)
+
+    return times, frequencies
+
+
+def waveform_envelope(sound, max_points: int):
+    """
+    Samples for display as (times, amplitudes, minimum, maximum); above
+    max_points, the peak sample of each chunk. Channels are averaged.
+    """
+    samples = sound.values.mean(axis=0) if sound.n_channels > 1 else sound.values[0]
+    sample_rate = int(sound.sampling_frequency)
+    offset = sound.xmin  # Start of the selection on the file's timeline
+
+    # Downsample if too many points
+    total_samples = len(samples)
+    if total_samples > max_points:
+        # Use peak envelope for better visualization
+        chunk_size = total_samples // max_points
+        downsampled = []
+        times = []
+
+        for i in range(0, total_samples - chunk_size, chunk_size):
+            chunk = samples[i:i + chunk_size]
+            # Preserve sign of the sample with max absolute value
+            idx = np.argmax(np.abs(chunk))
+            downsampled.append(float(chunk[idx]))
+            times.append(offset + i / sample_rate)
+
+        amplitudes = downsampled
+    else:
+        amplitudes = [float(s) for s in samples]
+        times = [offset + i / sample_rate for i in range(len(samples))]
+
+    return times, amplitudes, float(np.min(samples)), float(np.max(samples))
+
+
+def intensity_track(sound, start: float | None, end: float | None, time_step: float,
+                    minimum_pitch: float):
+    """Intensity of the frames in the selection as (times, dB values), 0 where undefined."""
+    intensity = sound.to_intensity(
+        time_step=time_step,
+        minimum_pitch=minimum_pitch,
+    )
+
+    times = []
+    values = []
+
+    for i in range(intensity.n_frames):
+        t = intensity.get_time_from_frame_number(i + 1)
+        if not in_selection(t, start, end):
+            continue
+        times.append(t)
+
+        val = intensity.get_value(t)
+        values.append(val if not math.isnan(val) else 0.0)
+
+    return times, values
+
+
+def voice_quality(sound, pitch_floor: float, pitch_ceiling: float,
+                  max_period_factor: float, max_amplitude_factor: float) -> dict:
+    """Jitter, shimmer, HNR and pitch statistics of a Sound, None where Praat has no value."""
+    import parselmouth
+
+    # Create pitch object for voiced frame detection
+    pitch = sound.to_pitch(
+        pitch_floor=pitch_floor,
+        pitch_ceiling=pitch_ceiling,
+    )
+
+    # Create PointProcess (glottal pulses)
+    point_process = parselmouth.praat.call(
+        [sound, pitch],
+        "To PointProcess (cc)"
+    )
+
+    # Helper function to safely call Praat commands
+    def safe_call(obj, command, *args):
+        try:
+            result = parselmouth.praat.call(obj, command, *args)
+            if math.isnan(result) if isinstance(result, float) else False:
+                return None
+            return result
+        except Exception:
+            return None
+
+    # === JITTER MEASURES ===
+    jitter_local = safe_call(
+        point_process, "Get jitter (local)",
+        0, 0,  # time range (0 = all)
+        0.0001, 0.02,  # period floor/ceiling
+        max_period_factor
+    )
+
+    jitter_local_absolute = safe_call(
+        point_process, "Get jitter (local, absolute)",
+        0, 0, 0.0001, 0.02, max_period_factor
+    )
+
+    jitter_rap = safe_call(
+        point_process, "Get jitter (rap)",
+        0, 0, 0.0001, 0.02, max_period_factor
+    )
+
+    jitter_ppq5 = safe_call(
+        point_process, "Get jitter (ppq5)",
+        0, 0, 0.0001, 0.02, max_period_factor
+    )
+
+    # === SHIMMER MEASURES ===
+    shimmer_local = safe_call(
+        [sound, point_process], "Get shimmer (local)",
+        0, 0, 0.0001, 0.02, max_period_factor, max_amplitude_factor
+    )
+
+    shimmer_local_db = safe_call(
+        [sound, point_process], "Get shimmer (local, dB)",
+        0, 0, 0.0001, 0.02, max_period_factor, max_amplitude_factor
+    )
+
+    shimmer_apq3 = safe_call(
+        [sound, point_process], "Get shimmer (apq3)",
+        0, 0, 0.0001, 0.02, max_period_factor, max_amplitude_factor
+    )
+
+    shimmer_apq5 = safe_call(
+        [sound, point_process], "Get shimmer (apq5)",
+        0, 0, 0.0001, 0.02, max_period_factor, max_amplitude_factor
+    )
+
+    shimmer_apq11 = safe_call(
+        [sound, point_process], "Get shimmer (apq11)",
+        0, 0, 0.0001, 0.02, max_period_factor, max_amplitude_factor
+    )
+
+    # === HARMONICITY (HNR) ===
+    harmonicity = sound.to_harmonicity(
+        time_step=0.01,
+        minimum_pitch=pitch_floor,
+    )
+
+    hnr = safe_call(harmonicity, "Get mean", 0, 0)
+    nhr = 1 / (10 ** (hnr / 10)) if hnr and hnr > 0 else None
+
+    # === PITCH STATISTICS ===
+    mean_pitch = safe_call(pitch, "Get mean", 0, 0, "Hertz")
+    pitch_stdev = safe_call(pitch, "Get standard deviation", 0, 0, "Hertz")
+
+    # Voiced fraction
+    voiced_frames = 0
+    total_frames = pitch.n_frames
+    for i in range(total_frames):
+        t = pitch.get_time_from_frame_number(i + 1)
+        if not math.isnan(pitch.get_value_at_time(t)):
+            voiced_frames += 1
+
+    voiced_fraction = voiced_frames / total_frames if total_frames > 0 else 0
+
+    # Voice breaks
+    num_voice_breaks = safe_call(
+        pitch, "Count voice breaks", 0, 0
+    )
+    degree_of_voice_breaks = safe_call(
+        pitch, "Get fraction of locally unvoiced frames", 0, 0
+    )
+
+    # Convert jitter to percentage
+    if jitter_local is not None:
+        jitter_local = jitter_local * 100
+    if jitter_rap is not None:
+        jitter_rap = jitter_rap * 100
+    if jitter_ppq5 is not None:
+        jitter_ppq5 = jitter_ppq5 * 100
+
+    # Convert shimmer to percentage
+    if shimmer_local is not None:
+        shimmer_local = shimmer_local * 100
+    if shimmer_apq3 is not None:
+        shimmer_apq3 = shimmer_apq3 * 100
+    if shimmer_apq5 is not None:
+        shimmer_apq5 = shimmer_apq5 * 100
+    if shimmer_apq11 is not None:
+        shimmer_apq11 = shimmer_apq11 * 100
+
+    return dict(
+        jitter_local=jitter_local,
+        jitter_local_absolute=jitter_local_absolute,
+        jitter_rap=jitter_rap,
+        jitter_ppq5=jitter_ppq5,
+        shimmer_local=shimmer_local,
+        shimmer_local_db=shimmer_local_db,
+        shimmer_apq3=shimmer_apq3,
+        shimmer_apq5=shimmer_apq5,
+        shimmer_apq11=shimmer_apq11,
+        hnr=hnr,
+        nhr=nhr,
+        mean_pitch=mean_pitch,
+        pitch_stdev=pitch_stdev,
+        voiced_fraction=voiced_fraction,
+        num_voice_breaks=int(num_voice_breaks) if num_voice_breaks else None,
+        degree_of_voice_breaks=degree_of_voice_breaks,
+    )
+
+
+def cpps_tracks(sound, start: float | None, end: float | None, pitch_floor: float,
+                pitch_ceiling: float, time_step: float, time_averaging: float,
+                quefrency_averaging: float, deadline: float | None = None):
+    """
+    CPP and CPPS of the frames in the selection as (times, cpp, cpps) in
+    dB. The Sound must be at twice the maximum frequency. Stops at
+    deadline (see within_deadline).
+
+    Raises:
+        ValueError: If no frame falls in the selection, or the pitch range
+            covers no quefrency
+    """
+    times, cpp, cpps = cepstral.prominence_tracks(
+        sound.values, sound.sampling_frequency, sound.x1,
+        pitch_floor=pitch_floor,
+        pitch_ceiling=pitch_ceiling,
+        time_step=time_step,
+        time_averaging=time_averaging,
+        quefrency_averaging=quefrency_averaging,
+        start=start,
+        end=end,
+        deadline=deadline,
+    )
+    if len(times) == 0:
+        raise ValueError("Audio is shorter than the analysis window")
+    return times, cpp, cpps
+
+
+def interval_measurements(sound, intervals: list, time_step: float, pitch_floor: float,
+                          pitch_ceiling: float, pitch_mode: str, max_formant: float,
+                          formant_engine: str, minimum_pitch: float) -> measurements.IntervalMeasurements:
+    """Duration and F0, F1-F3 and intensity statistics of every interval (linguai_core Annotations)."""
+    return measurements.measure_intervals(sound, intervals, FeatureSettings(
+        time_step=time_step,
+        pitch_floor=pitch_floor,
+        pitch_ceiling=pitch_ceiling,
+        pitch_mode=pitch_mode,
+        max_formant=max_formant,
+        formant_engine=formant_engine,
+        intensity_minimum_pitch=minimum_pitch,
+    ))
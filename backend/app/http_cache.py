@@ -0,0 +1,180 @@
+"""
+HTTP caching of content-addressed results.
+
+An analysis result depends only on the uploaded bytes, the request's
+parameters and the server defaults standing in for parameters it leaves
+out (LINGUAI_RESPONSE_PRECISION), so it never changes while they don't.
+Responses carry a strong ETag computed from all three and are marked
+immutable. A request whose If-None-Match lists that ETag gets a 304
+before anything is decoded or analyzed.
+
+Endpoints served this way have two routes:
+
+    POST {path}               the file is uploaded in the request body
+    GET  {path}/{content_id}  a file uploaded before, by its SHA-256
+
+The POST response's Content-Location names the GET URL of the same
+result. Unlike POST responses, GET responses are stored and replayed by
+ordinary HTTP caches (browsers, proxies, the Electron app's cache), so
+repeats never reach Python. Uploads are kept for GET access in a
+per-process LRU cache of LINGUAI_UPLOAD_CACHE_BYTES. An unknown or
+evicted id gets a 404, and the client uploads the file again.
+
+An endpoint whose result is not final (an analysis stopped by its
+deadline) sets its own Cache-Control, and the response gets no ETag.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from fastapi import APIRouter, File, HTTPException, Request, UploadFile
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from linguai_core import __version__ as core_version
+
+from app import serialization
+from app.analysis_cache import LRUCache
+
+# Bump when a change alters the results for the same inputs, so that
+# responses cached by clients stop matching
+RESULTS_VERSION = 2
+
+# Results are immutable: a year is the longest max-age caches honour
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# Uploads by (kind, content hash), for the GET routes
+UPLOADS = LRUCache(int(os.environ.get("LINGUAI_UPLOAD_CACHE_BYTES", 512 * 1024 ** 2)))
+
+
+@dataclass(frozen=True)
+class Upload:
+    """An uploaded file, addressed by the SHA-256 of its bytes."""
+    content: bytes
+    ext: str  # lower-cased filename extension
+    key: str
+
+
+def entity_tag(path: str, key: str, params: dict) -> str:
+    """Strong ETag of the result of path for the content key, parameters and server settings."""
+    identity = json.dumps(
+        [RESULTS_VERSION, core_version, path, key, params, _effective_settings(params)],
+        sort_keys=True, default=str,
+    )
+    return '"' + hashlib.sha256(identity.encode()).hexdigest() + '"'
+
+
+def _effective_settings(params: dict) -> dict:
+    # Server defaults that shape the body when the request leaves them out,
+    # so that changing them changes the ETag
+    return {"precision": serialization.resolve_precision(params.get("precision"))}
+
+
+def matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header lists etag (weak comparison, as RFC 9110 asks)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def caching_headers(etag: str) -> dict[str, str]:
+    """Headers of a response (or 304) for an immutable result."""
+    return {"ETag": etag, "Cache-Control": IMMUTABLE}
+
+
+def content_addressed(
+    router: APIRouter,
+    path: str,
+    kind: str,
+    read_upload: Callable[[UploadFile], Awaitable[Upload]],
+    **route_options,
+):
+    """
+    Register endpoint(upload, **params) as POST path, taking the file
+    from the request, and GET path/{content_id}, taking an upload of the
+    same kind stored by an earlier POST. The remaining parameters of
+    endpoint become query parameters of both routes.
+
+    Args:
+        router: Router to add the routes to
+        path: Route path of the POST route
+        kind: Namespace of the stored uploads, e.g. "audio"; a GET only
+            finds uploads of its own kind
+        read_upload: Reads and validates the uploaded file
+        **route_options: Passed to add_api_route (response_model, ...)
+    """
+    def register(endpoint: Callable[..., Awaitable[Response | BaseModel]]):
+        params = [
+            param.replace(kind=inspect.Parameter.KEYWORD_ONLY)
+            for param in list(inspect.signature(endpoint).parameters.values())[1:]
+        ]
+        request_param = inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+
+        async def post(request: Request, file: UploadFile, **kwargs):
+            upload = await read_upload(file)
+            UPLOADS.put((kind, upload.key), upload, len(upload.content))
+            location = f"{request.url.path}/{upload.key}"
+            if request.url.query:
+                location += "?" + request.url.query
+            return await _respond(request, endpoint, path, upload.key, kwargs, lambda: upload, location)
+
+        async def get(request: Request, content_id: str, **kwargs):
+            # The ETag doesn't need the upload, so revalidation works after eviction
+            return await _respond(request, endpoint, path, content_id, kwargs,
+                                  lambda: UPLOADS.get((kind, content_id)))
+
+        post.__signature__ = inspect.Signature([
+            request_param,
+            inspect.Parameter("file", inspect.Parameter.KEYWORD_ONLY, default=File(...), annotation=UploadFile),
+            *params,
+        ])
+        get.__signature__ = inspect.Signature([
+            request_param,
+            inspect.Parameter("content_id", inspect.Parameter.KEYWORD_ONLY, annotation=str),
+            *params,
+        ])
+        post.__name__, get.__name__ = endpoint.__name__, endpoint.__name__ + "_by_id"
+        post.__doc__ = endpoint.__doc__
+        get.__doc__ = (endpoint.__doc__ or "") + (
+            f"\n\nGET variant: the file of an earlier POST {path}, by its SHA-256."
+        )
+
+        router.add_api_route(path, post, methods=["POST"], **route_options)
+        router.add_api_route(path + "/{content_id}", get, methods=["GET"], **route_options)
+        return endpoint
+
+    return register
+
+
+async def _respond(request: Request, endpoint, path: str, key: str, params: dict,
+                   load_upload: Callable[[], Upload | None],
+                   location: str | None = None) -> Response:
+    """Answer 304 if the client holds the result, else run endpoint and add the caching headers."""
+    etag = entity_tag(path, key, params)
+    headers = caching_headers(etag)
+    if location is not None:
+        headers["Content-Location"] = location
+    if matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    upload = load_upload()
+    if upload is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown content id: {key}. Upload the file with POST {request.url.path.rsplit('/', 1)[0]}",
+        )
+
+    result = await endpoint(upload, **params)
+    if isinstance(result, BaseModel):
+        result = Response(content=result.model_dump_json(), media_type="application/json")
+    if "cache-control" in result.headers:
+        # The endpoint's own policy, e.g. no-store for a result cut short by a deadline
+        headers = {k: v for k, v in headers.items() if k not in ("ETag", "Cache-Control")}
+    result.headers.update(headers)
+    return result
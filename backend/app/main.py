@@ -3,10 +3,26 @@ LinguAI Backend API
 FastAPI application for acoustic analysis powered by Parselmouth.
 """
 
-from fastapi import FastAPI
+import os
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api import health, analyze, textgrid
+from app import metrics, profiling, scheduler, warmup
+from app.api import health, analyze, textgrid, metrics as metrics_api
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up analysis dependencies before serving (skip with LINGUAI_WARMUP=0)."""
+    if os.environ.get("LINGUAI_WARMUP", "1") != "0":
+        warmup.run_warmup()
+    else:
+        warmup.skip_warmup()
+    yield
+
 
 app = FastAPI(
     title="LinguAI API",
@@ -14,6 +30,7 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS configuration
@@ -27,12 +44,68 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "ETag", "Content-Location"],
 )
 
+
+@app.middleware("http")
+async def observe_request(request: Request, call_next):
+    """
+    Time pipeline stages for Server-Timing and metrics, count analyze
+    outcomes, and profile the request when an operator asks for it.
+    """
+    profile_format = profiling.requested_format(request)
+    if profile_format is not None:
+        rejection = profiling.reject(request, profile_format)
+        if rejection is not None:
+            return rejection
+
+    endpoint = metrics.endpoint_label(request.url.path)
+    timings: dict[str, float] = {}
+    timings_token = metrics.request_timings.set(timings)
+    endpoint_token = metrics.current_endpoint.set(endpoint or "other")
+    client_token = scheduler.current_client.set(scheduler.client_id(request))
+    request_token = scheduler.current_request.set(request)
+
+    profiler = profiling.SamplingProfiler() if profile_format else None
+    profiler_token = profiling.current_profiler.set(profiler)
+    if profiler is not None:
+        profiler.start()
+
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    except Exception:
+        if endpoint is not None:
+            metrics.record_response(endpoint, 500)
+        raise
+    finally:
+        if profiler is not None:
+            profiler.stop()
+        profiling.current_profiler.reset(profiler_token)
+        scheduler.current_request.reset(request_token)
+        scheduler.current_client.reset(client_token)
+        metrics.current_endpoint.reset(endpoint_token)
+        metrics.request_timings.reset(timings_token)
+
+    total = time.perf_counter() - start
+    if endpoint is not None:
+        metrics.record_response(endpoint, response.status_code)
+    if profiler is not None:
+        response = profiling.profile_response(
+            profiler, profile_format, request, response.status_code
+        )
+
+    response.headers["Server-Timing"] = metrics.format_server_timing(timings, total)
+    return response
+
+
 # Include routers
 app.include_router(health.router, tags=["Health"])
+app.include_router(metrics_api.router, tags=["Metrics"])
 app.include_router(analyze.router, prefix="/api/v1", tags=["Analysis"])
 app.include_router(textgrid.router, prefix="/api/v1", tags=["TextGrid"])
+metrics.register_endpoints("/api/v1" + route.path for route in analyze.router.routes)
 
 
 @app.get("/")
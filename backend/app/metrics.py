@@ -0,0 +1,218 @@
+"""
+Prometheus metrics for the analysis pipeline.
+
+Every /api/v1/analyze/* request is broken into stages (read, transcode,
+decode, compute, serialize) so we can see where time goes per endpoint.
+Set PROMETHEUS_MULTIPROC_DIR when running several workers so /metrics
+aggregates across processes. The same stage timings are reported back
+to clients in a Server-Timing header on every response.
+"""
+
+import os
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+
+ANALYZE_PREFIX = "/api/v1/analyze/"
+
+# A content id (SHA-256 of an upload) at the end of a path
+CONTENT_ID = re.compile(r"[0-9a-f]{64}")
+
+# Labels of the analyze routes (see register_endpoints); requests for any
+# other path get no label, so a client can't mint label values
+ENDPOINTS: set[str] = set()
+
+REGISTRY = CollectorRegistry()
+
+# Endpoint label for the request being handled (set by the middleware)
+current_endpoint: ContextVar[str] = ContextVar("linguai_endpoint", default="other")
+
+# Stage durations (seconds) of the request being handled, for Server-Timing
+request_timings: ContextVar[dict[str, float] | None] = ContextVar(
+    "linguai_request_timings", default=None
+)
+
+UPLOAD_BYTES = Histogram(
+    "linguai_upload_bytes",
+    "Size of uploaded audio files in bytes",
+    ["endpoint"],
+    buckets=(
+        16 * 1024, 64 * 1024, 256 * 1024,
+        1024 ** 2, 4 * 1024 ** 2, 16 * 1024 ** 2, 64 * 1024 ** 2, 100 * 1024 ** 2,
+    ),
+    registry=REGISTRY,
+)
+
+STAGE_SECONDS = Histogram(
+    "linguai_stage_duration_seconds",
+    "Time spent in each analysis stage (read, transcode, decode, compute, serialize)",
+    ["endpoint", "stage"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+    registry=REGISTRY,
+)
+
+REQUESTS = Counter(
+    "linguai_analysis_requests_total",
+    "Analysis requests by endpoint and HTTP status",
+    ["endpoint", "status"],
+    registry=REGISTRY,
+)
+
+ERRORS = Counter(
+    "linguai_analysis_errors_total",
+    "Analysis requests that ended in a 4xx/5xx or an unhandled exception",
+    ["endpoint"],
+    registry=REGISTRY,
+)
+
+REJECTIONS = Counter(
+    "linguai_analysis_rejections_total",
+    "Analysis requests rejected as too large (413), timed out (408), "
+    "over a client's limits (429) or with the queue full (503)",
+    ["endpoint", "code"],
+    registry=REGISTRY,
+)
+
+REJECTION_CODES = {408, 413, 429, 503}
+
+ADMISSIONS = Counter(
+    "linguai_scheduler_admissions_total",
+    "Analyses by priority (interactive or batch) and admission outcome "
+    "(started, queued, rejected_client or rejected_busy)",
+    ["priority", "outcome"],
+    registry=REGISTRY,
+)
+
+CANCELLATIONS = Counter(
+    "linguai_analysis_cancellations_total",
+    "Analyses abandoned because the client disconnected, by the stage they "
+    "were in (queued, or running)",
+    ["endpoint", "stage"],
+    registry=REGISTRY,
+)
+
+QUEUE_SECONDS = Histogram(
+    "linguai_scheduler_queue_seconds",
+    "Time admitted analyses waited for an execution slot, by priority",
+    ["priority"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+    registry=REGISTRY,
+)
+
+AUDIO_CACHE_LOOKUPS = Counter(
+    "linguai_audio_cache_lookups_total",
+    "Decoded-audio lookups by cache (shared memory or disk) and result (hit or miss)",
+    ["cache", "result"],
+    registry=REGISTRY,
+)
+
+ANALYSIS_CACHE_LOOKUPS = Counter(
+    "linguai_analysis_cache_lookups_total",
+    "Analysis result lookups by cache (spectrogram, image) and result "
+    "(hit, derived from an entry with other settings, or miss)",
+    ["cache", "result"],
+    registry=REGISTRY,
+)
+
+
+def register_endpoints(route_paths) -> None:
+    """Allow the labels of these route templates, e.g. /api/v1/analyze/pitch/{content_id}."""
+    for route_path in route_paths:
+        if route_path.startswith(ANALYZE_PREFIX):
+            ENDPOINTS.add(route_path[len(ANALYZE_PREFIX):].removesuffix("/{content_id}").strip("/"))
+
+
+def endpoint_label(path: str) -> str | None:
+    """
+    Return the metrics label for an analyze path, or None for other
+    routes and paths no analyze route serves. GET routes by content id
+    share the label of their POST route.
+    """
+    if not path.startswith(ANALYZE_PREFIX):
+        return None
+    label = path[len(ANALYZE_PREFIX):].strip("/")
+    head, _, last = label.rpartition("/")
+    if head and CONTENT_ID.fullmatch(last):
+        label = head
+    return label if label in ENDPOINTS else None
+
+
+@contextmanager
+def stage(name: str):
+    """Time a pipeline stage for the current endpoint."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.labels(current_endpoint.get(), name).observe(elapsed)
+        timings = request_timings.get()
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + elapsed
+
+
+def observe_upload(size: int) -> None:
+    """Record the size of an uploaded file."""
+    UPLOAD_BYTES.labels(current_endpoint.get()).observe(size)
+
+
+def observe_audio_cache(cache: str, hit: bool) -> None:
+    """Count a lookup in a decoded-audio cache ("shared" or "disk")."""
+    AUDIO_CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def observe_analysis_cache(cache: str, hit: bool, derived: bool = False) -> None:
+    """Count a lookup in an analysis result cache (derived: served by slicing another entry)."""
+    result = "derived" if derived else "hit" if hit else "miss"
+    ANALYSIS_CACHE_LOOKUPS.labels(cache, result).inc()
+
+
+def observe_admission(priority: str, outcome: str) -> None:
+    """Count a scheduler decision for an analysis."""
+    ADMISSIONS.labels(priority, outcome).inc()
+
+
+def observe_cancellation(stage: str) -> None:
+    """Count an analysis abandoned by its client ("queued" or "running")."""
+    CANCELLATIONS.labels(current_endpoint.get(), stage).inc()
+
+
+def observe_queue_wait(priority: str, seconds: float) -> None:
+    """Record how long an admitted analysis waited for a slot."""
+    QUEUE_SECONDS.labels(priority).observe(seconds)
+
+
+def record_response(endpoint: str, status_code: int) -> None:
+    """Count a finished analysis request."""
+    REQUESTS.labels(endpoint, str(status_code)).inc()
+    if status_code >= 400:
+        ERRORS.labels(endpoint).inc()
+    if status_code in REJECTION_CODES:
+        REJECTIONS.labels(endpoint, str(status_code)).inc()
+
+
+def format_server_timing(timings: dict[str, float], total: float) -> str:
+    """Format stage durations as a Server-Timing header value (milliseconds)."""
+    entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in timings.items()]
+    entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
+
+
+def render_latest() -> tuple[bytes, str]:
+    """Render all metrics in the Prometheus text exposition format."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
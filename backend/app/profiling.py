@@ -0,0 +1,170 @@
+"""
+On-demand request profiling.
+
+An operator profiles a single request by sending the X-LinguAI-Profile
+header (or ?profile=) set to "collapsed" or "speedscope", together with
+an X-LinguAI-Profile-Token matching the LINGUAI_PROFILE_TOKEN environment
+variable. The response body is replaced by the captured profile.
+Profiling is disabled entirely when no token is configured.
+"""
+
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+PROFILE_HEADER = "X-LinguAI-Profile"
+TOKEN_HEADER = "X-LinguAI-Profile-Token"
+PROFILE_FORMATS = {"collapsed", "speedscope"}
+
+# Default sampling interval in seconds
+SAMPLE_INTERVAL = 0.001
+
+# Profiler attached to the request being handled, if any
+current_profiler: ContextVar["SamplingProfiler | None"] = ContextVar(
+    "linguai_profiler", default=None
+)
+
+
+def requested_format(request: Request) -> str | None:
+    """Return the requested profile format, or None if profiling wasn't asked for."""
+    fmt = request.headers.get(PROFILE_HEADER) or request.query_params.get("profile")
+    return fmt.lower() if fmt else None
+
+
+def is_authorized(request: Request) -> bool:
+    """Check the profile token against LINGUAI_PROFILE_TOKEN."""
+    expected = os.environ.get("LINGUAI_PROFILE_TOKEN")
+    if not expected:
+        return False
+    supplied = request.headers.get(TOKEN_HEADER, "")
+    return hmac.compare_digest(supplied.encode(), expected.encode())
+
+
+def reject(request: Request, fmt: str) -> JSONResponse | None:
+    """Return an error response if this profiling request can't be honored."""
+    if not is_authorized(request):
+        return JSONResponse(status_code=403, content={"detail": "Profiling not permitted"})
+    if fmt not in PROFILE_FORMATS:
+        return JSONResponse(
+            status_code=400,
+            content={"detail": f"Unknown profile format: {fmt}. Use one of: {', '.join(sorted(PROFILE_FORMATS))}"},
+        )
+    return None
+
+
+def add_current_thread() -> None:
+    """Include the calling thread in the active request profile, if any.
+
+    Call this from worker threads that execute part of a request.
+    """
+    profiler = current_profiler.get()
+    if profiler is not None:
+        profiler.add_thread(threading.get_ident())
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Samples the Python stacks of selected threads at a fixed interval.
+
+    Samples are weighted by the wall time since the previous sample, so a
+    long call into Praat that holds the GIL is still attributed correctly.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks: dict[tuple[str, ...], float] = defaultdict(float)
+        self._threads: set[int] = set()
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+        self._started = 0.0
+        self.duration = 0.0
+
+    def add_thread(self, thread_id: int) -> None:
+        self._threads.add(thread_id)
+
+    def start(self) -> None:
+        self.add_thread(threading.get_ident())
+        self._started = time.perf_counter()
+        self._sampler = threading.Thread(target=self._run, name="linguai-profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self.duration = time.perf_counter() - self._started
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            frames = sys._current_frames()
+            for thread_id in list(self._threads):
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                self.stacks[tuple(reversed(stack))] += elapsed
+
+    def collapsed(self) -> str:
+        """Render samples in collapsed-stack format (weights in microseconds)."""
+        lines = [
+            f"{';'.join(stack)} {max(1, round(weight * 1e6))}"
+            for stack, weight in self.stacks.items()
+        ]
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name: str) -> dict:
+        """Render samples as a speedscope sampled profile (weights in seconds)."""
+        frame_index: dict[str, int] = {}
+        samples, weights = [], []
+        for stack, weight in self.stacks.items():
+            samples.append([frame_index.setdefault(label, len(frame_index)) for label in stack])
+            weights.append(weight)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": label} for label in frame_index]},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self.duration,
+                "samples": samples,
+                "weights": weights,
+            }],
+            "name": name,
+            "exporter": "linguai",
+        }
+
+
+def profile_response(profiler: SamplingProfiler, fmt: str, request: Request,
+                     status_code: int) -> Response:
+    """Build the response that replaces a profiled request's body."""
+    headers = {"X-LinguAI-Profiled-Status": str(status_code)}
+    if fmt == "speedscope":
+        name = f"{request.method} {request.url.path}"
+        return Response(
+            content=json.dumps(profiler.speedscope(name)),
+            media_type="application/json",
+            headers=headers,
+        )
+    return Response(content=profiler.collapsed(), media_type="text/plain", headers=headers)
@@ -0,0 +1,335 @@
+"""
+Cost-aware admission control and priority scheduling of analyses.
+
+Every analysis is given an estimated cost in seconds of compute, worked
+out from its endpoint, parameters, duration and sample rate. It then
+waits for one of a fixed number of execution slots, and runs in a
+worker thread so the event loop stays free to admit, reject and
+reorder requests:
+
+- Analyses estimated at up to LINGUAI_INTERACTIVE_COST seconds are
+  interactive. They go ahead of every waiting batch analysis.
+- Batch analyses hold at most LINGUAI_BATCH_SLOTS of the
+  LINGUAI_ANALYSIS_SLOTS slots. With more than one slot, at least one is
+  left for interactive work.
+- A client (its peer address) may have at most
+  LINGUAI_CLIENT_CONCURRENCY analyses running or waiting. Behind a proxy
+  listed in LINGUAI_TRUSTED_PROXIES, the client is instead the one the
+  proxy names in the X-LinguAI-Client header; from anyone else the
+  header is ignored, so a client can't escape its limits by varying it.
+- A client's analyses in progress may add up to at most
+  LINGUAI_CLIENT_BUDGET estimated seconds. A single analysis above the
+  budget is admitted only when the client has nothing else in progress.
+
+Work beyond a client's limits is rejected with 429, and work beyond
+LINGUAI_MAX_QUEUE waiting analyses with 503, both with Retry-After.
+Admitted work waits its turn. The wait is reported as the "queue" stage
+of Server-Timing.
+
+While an analysis waits or runs, the scheduler watches for its client
+to disconnect. An analysis whose client has gone leaves the queue. If it
+is running, it is told to stop: work in a worker process is killed, and
+work in a thread skips the channels it hasn't started. The request ends
+with 499 and counts as a cancellation in the metrics. Work that has
+started keeps its slot, and counts against its client's limits, until
+its thread is done.
+
+Praat holds the GIL while it computes, so a long Praat analysis in the
+server process would stall every other request there, interactive ones
+included. Batch analyses therefore run in the worker processes of
+linguai_core.channels (turn this off with LINGUAI_ISOLATE_BATCH=0),
+at the price of copying their samples there. Interactive analyses run
+in a thread of the server process. The default of two slots runs one
+batch analysis at a time next to interactive work.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException, Request
+
+from app import metrics, profiling
+
+T = TypeVar("T")
+
+CLIENT_HEADER = "X-LinguAI-Client"
+
+# Peer addresses whose CLIENT_HEADER is believed (comma-separated)
+TRUSTED_PROXIES = frozenset(
+    address.strip() for address in os.environ.get("LINGUAI_TRUSTED_PROXIES", "").split(",") if address.strip()
+)
+
+INTERACTIVE, BATCH = "interactive", "batch"
+
+# Estimated compute seconds per second of audio per kHz of sample rate:
+# (per second of audio, per analysis frame). Measured on one core with a
+# synthetic voice at the rates the endpoints analyze at; only the ratios
+# to the budgets below matter.
+COST_MODELS = {
+    "pitch": (0.0, 2.6e-6),
+    "pitch/fast": (0.0, 4e-7),
+    "formants": (0.0, 4.1e-6),
+    "spectrogram": (0.0, 5.5e-7),
+    "spectrogram/image": (0.0, 5.5e-7),
+    "intensity": (0.0, 2.7e-7),
+    "cpps": (0.0, 9e-6),
+    # Pitch, formants and intensity, once each
+    "measurements": (0.0, 7e-6),
+    "voice-quality": (2.4e-3, 0.0),
+    "waveform": (1e-6, 0.0),
+}
+DEFAULT_COST_MODEL = (1e-3, 0.0)
+
+# Run batch analyses in worker processes rather than server threads
+ISOLATE_BATCH = os.environ.get("LINGUAI_ISOLATE_BATCH", "1") != "0"
+
+# Frame step assumed when an analysis doesn't say (seconds)
+DEFAULT_TIME_STEP = 0.01
+
+# How often a waiting or running analysis checks for a client disconnect (seconds)
+DISCONNECT_POLL_INTERVAL = 0.1
+
+# Client the request being handled is accounted to (set by the middleware)
+current_client: ContextVar[str] = ContextVar("linguai_client", default="unknown")
+
+# Request being handled, watched for disconnects (set by the middleware)
+current_request: ContextVar[Request | None] = ContextVar("linguai_request", default=None)
+
+# Set, in the worker thread of an analysis, once its client has gone
+_cancel_event: ContextVar[threading.Event | None] = ContextVar("linguai_cancel", default=None)
+
+
+def cancelled() -> bool:
+    """Whether the client of the analysis running in this worker thread has disconnected."""
+    event = _cancel_event.get()
+    return event is not None and event.is_set()
+
+
+def client_id(request: Request) -> str:
+    """The client a request is accounted to: its peer, or the client a trusted proxy names."""
+    peer = request.client.host if request.client else "unknown"
+    supplied = request.headers.get(CLIENT_HEADER)
+    if supplied and peer in TRUSTED_PROXIES:
+        return supplied[:128]
+    return peer
+
+
+def estimate_cost(endpoint: str, duration: float, sample_rate: float,
+                  n_channels: int = 1, **params) -> float:
+    """
+    Estimated compute seconds of an analysis of duration seconds of
+    n_channels channels at sample_rate. A variant of an endpoint picked by
+    its mode or engine parameter (e.g. pitch/fast) has a model of its own.
+    """
+    variant = params.get("mode") or params.get("engine")
+    per_second, per_frame = COST_MODELS.get(
+        f"{endpoint}/{variant}", COST_MODELS.get(endpoint, DEFAULT_COST_MODEL),
+    )
+    time_step = params.get("time_step") or DEFAULT_TIME_STEP
+    return duration * sample_rate / 1000.0 * n_channels * (per_second + per_frame / time_step)
+
+
+@dataclass(order=True)
+class _Waiter:
+    rank: int
+    sequence: int
+    priority: str = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    granted: bool = field(default=False, compare=False)
+
+
+class Scheduler:
+    """Execution slots handed out by priority, with per-client admission limits."""
+
+    def __init__(self, slots: int, batch_slots: int, interactive_cost: float,
+                 client_concurrency: int, client_budget: float, max_queue: int):
+        self.slots = max(slots, 1)
+        self.batch_slots = min(max(batch_slots, 1), self.slots)
+        self.interactive_cost = interactive_cost
+        self.client_concurrency = client_concurrency
+        self.client_budget = client_budget
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(self.slots, thread_name_prefix="linguai-analysis")
+        self._lock = threading.Lock()
+        self._running = {INTERACTIVE: 0, BATCH: 0}
+        self._waiting: list[_Waiter] = []
+        self._sequence = itertools.count()
+        # Analyses running or waiting, and their total cost, per client
+        self._clients: dict[str, tuple[int, float]] = {}
+
+    def priority(self, cost: float) -> str:
+        return INTERACTIVE if cost <= self.interactive_cost else BATCH
+
+    async def run(self, cost: float, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run func(*args, **kwargs) in a worker thread once admitted and
+        given a slot. Raises HTTPException 429 or 503 if not admitted, and
+        499 if the client disconnects first; func can poll cancelled().
+        """
+        client = current_client.get()
+        request = current_request.get()
+        priority = self.priority(cost)
+        self._enter(client, cost, priority)
+        submitted = False
+        try:
+            waited = time.perf_counter()
+            with metrics.stage("queue"):
+                # A slot granted as the client goes away is passed on
+                await _unless_disconnected(self._acquire(priority), request, "queued",
+                                           abandoned=lambda: self._release(priority))
+            metrics.observe_queue_wait(priority, time.perf_counter() - waited)
+
+            cancel = threading.Event()
+            context = contextvars.copy_context()
+            context.run(_cancel_event.set, cancel)
+            work = self._executor.submit(context.run, _in_worker, func, args, kwargs)
+            submitted = True
+            # The slot, and the client's share of its limits, are held until
+            # the thread is done, even if the request goes away
+            work.add_done_callback(lambda _: (self._release(priority), self._leave(client, cost)))
+            try:
+                return await _unless_disconnected(asyncio.wrap_future(work), request, "running")
+            except BaseException:
+                cancel.set()
+                raise
+        finally:
+            if not submitted:
+                self._leave(client, cost)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "slots": self.slots,
+                "running": dict(self._running),
+                "waiting": len(self._waiting),
+                "clients": len(self._clients),
+            }
+
+    def _enter(self, client: str, cost: float, priority: str) -> None:
+        """Account an analysis to its client, or reject it."""
+        with self._lock:
+            count, in_progress = self._clients.get(client, (0, 0.0))
+            if count >= self.client_concurrency:
+                self._reject(429, priority, "client",
+                             f"Too many analyses in progress for this client ({count}); "
+                             f"at most {self.client_concurrency} at a time")
+            if count and in_progress + cost > self.client_budget:
+                self._reject(429, priority, "client",
+                             f"Estimated cost {cost:.1f}s would exceed this client's budget of "
+                             f"{self.client_budget:.0f}s of analysis in progress ({in_progress:.1f}s)")
+            if len(self._waiting) >= self.max_queue and not self._can_start(priority):
+                self._reject(503, priority, "busy",
+                             f"Analysis queue is full ({self.max_queue} waiting); try again later")
+            self._clients[client] = (count + 1, in_progress + cost)
+
+    def _reject(self, status_code: int, priority: str, reason: str, detail: str) -> None:
+        metrics.observe_admission(priority, "rejected_" + reason)
+        raise HTTPException(status_code=status_code, detail=detail, headers={"Retry-After": "1"})
+
+    def _leave(self, client: str, cost: float) -> None:
+        with self._lock:
+            count, in_progress = self._clients.pop(client, (1, cost))
+            if count > 1:
+                self._clients[client] = (count - 1, max(in_progress - cost, 0.0))
+
+    def _can_start(self, priority: str) -> bool:
+        if sum(self._running.values()) >= self.slots:
+            return False
+        return priority == INTERACTIVE or self._running[BATCH] < self.batch_slots
+
+    async def _acquire(self, priority: str) -> None:
+        """Wait for a slot; interactive waiters are served before batch ones, each in arrival order."""
+        with self._lock:
+            if self._can_start(priority):
+                self._running[priority] += 1
+                metrics.observe_admission(priority, "started")
+                return
+            waiter = _Waiter(
+                0 if priority == INTERACTIVE else 1, next(self._sequence),
+                priority, asyncio.get_running_loop().create_future(),
+            )
+            heapq.heappush(self._waiting, waiter)
+            metrics.observe_admission(priority, "queued")
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if not waiter.granted:
+                    self._waiting.remove(waiter)
+                    heapq.heapify(self._waiting)
+                    raise
+            # Granted just as the request went away: pass the slot on
+            self._release(priority)
+            raise
+
+    def _release(self, priority: str) -> None:
+        """Free a slot and hand it to the first waiter allowed to start."""
+        with self._lock:
+            self._running[priority] -= 1
+            # Waiters are ordered interactive first, so once the head can't
+            # start (a batch analysis over the batch limit) nobody can
+            while self._waiting and self._can_start(self._waiting[0].priority):
+                waiter = heapq.heappop(self._waiting)
+                waiter.granted = True
+                self._running[waiter.priority] += 1
+                waiter.future.get_loop().call_soon_threadsafe(_wake, waiter.future)
+
+
+async def _unless_disconnected(awaitable, request: Request | None, stage: str,
+                               abandoned: Callable[[], None] | None = None):
+    """
+    Await awaitable, giving up with 499 if the client disconnects meanwhile.
+    abandoned is called if awaitable completed but its result was given up
+    (it finished while the disconnect was being checked), to undo its work.
+    """
+    task = asyncio.ensure_future(awaitable)
+    if request is None:
+        return await task
+    delivered = False
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                delivered = True
+                return task.result()
+            if await request.is_disconnected():
+                metrics.observe_cancellation(stage)
+                raise HTTPException(status_code=499, detail="Client disconnected")
+    finally:
+        task.cancel()
+        if (not delivered and abandoned is not None and task.done()
+                and not task.cancelled() and task.exception() is None):
+            abandoned()
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def _in_worker(func: Callable[..., T], args: tuple, kwargs: dict) -> T:
+    """Worker-thread side: join the request's profile, then run func."""
+    profiling.add_current_thread()
+    return func(*args, **kwargs)
+
+
+_slots = int(os.environ.get("LINGUAI_ANALYSIS_SLOTS", 2))
+
+SCHEDULER = Scheduler(
+    slots=_slots,
+    batch_slots=int(os.environ.get("LINGUAI_BATCH_SLOTS", max(_slots - 1, 1))),
+    interactive_cost=float(os.environ.get("LINGUAI_INTERACTIVE_COST", 1.0)),
+    client_concurrency=int(os.environ.get("LINGUAI_CLIENT_CONCURRENCY", 4)),
+    client_budget=float(os.environ.get("LINGUAI_CLIENT_BUDGET", 120.0)),
+    max_queue=int(os.environ.get("LINGUAI_MAX_QUEUE", 64)),
+)
@@ -0,0 +1,112 @@
+"""
+Numeric precision policy for API responses.
+
+Analysis values are rounded to a number of significant digits before
+they are serialized, so JSON carries only the precision that is actually
+meaningful. The per-request `precision` parameter overrides the
+LINGUAI_RESPONSE_PRECISION default; without either, values are sent at
+full precision (float32 matrices at most 7 digits).
+"""
+
+import os
+
+import numpy as np
+
+# Frame times are rounded to microseconds whenever values are rounded
+TIME_DECIMALS = 6
+
+# Significant digits a float32 value actually carries
+FLOAT32_DIGITS = 7
+
+MAX_PRECISION = 15
+
+
+def resolve_precision(precision: int | None) -> int | None:
+    """Significant digits for this request, or None for full precision."""
+    if precision is None:
+        default = os.environ.get("LINGUAI_RESPONSE_PRECISION")
+        precision = int(default) if default else None
+    if precision is None:
+        return None
+    return min(max(precision, 1), MAX_PRECISION)
+
+
+def round_significant(values, digits: int) -> np.ndarray:
+    """Round to `digits` significant digits (NaN and zero pass through)."""
+    values = np.asarray(values, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        magnitude = np.floor(np.log10(np.abs(values)))
+    magnitude = np.where(np.isfinite(magnitude), magnitude, 0)
+    decimals = (digits - 1 - magnitude).astype(np.int64)
+
+    # Divide by (or multiply with) an exact power of ten so the result is the
+    # double closest to the rounded decimal, which then prints short
+    scale = 10.0 ** np.abs(decimals)
+    return np.where(
+        decimals >= 0,
+        np.round(values * scale) / scale,
+        np.round(values / scale) * scale,
+    )
+
+
+def float_list(values, digits: int | None, nan_as_none: bool = True) -> list:
+    """A JSON-ready list of floats (any shape), rounded when digits is set."""
+    array = np.asarray(values, dtype=np.float64)
+    if digits is not None:
+        array = round_significant(array, digits)
+    result = array.tolist()
+    if nan_as_none and np.isnan(array).any():
+        result = _nan_to_none(result)
+    return result
+
+
+def time_list(times, digits: int | None) -> list:
+    """Frame times, rounded to TIME_DECIMALS when values are being rounded."""
+    array = np.asarray(times, dtype=np.float64)
+    if digits is not None:
+        array = np.round(array, TIME_DECIMALS)
+    return array.tolist()
+
+
+def matrix_digits(dtype, digits: int | None) -> int | None:
+    """Digits to serialize a matrix of the given dtype with."""
+    if np.dtype(dtype) == np.float32:
+        return FLOAT32_DIGITS if digits is None else min(digits, FLOAT32_DIGITS)
+    return digits
+
+
+def _nan_to_none(values):
+    if isinstance(values, list):
+        return [_nan_to_none(v) for v in values]
+    return None if values != values else values
+
+
+# Response formats: "full" lists every frame time; "compact" replaces the
+# times with a uniform axis and sends only the voiced (non-NaN) runs of tracks
+RESPONSE_FORMATS = {"full", "compact"}
+
+
+def uniform_axis(points) -> dict:
+    """Describe uniformly spaced points (frame times, frequency bins) as first/step/count."""
+    points = np.asarray(points, dtype=np.float64)
+    n = len(points)
+    step = float(points[1] - points[0]) if n > 1 else 0.0
+    return {"start": float(points[0]) if n else 0.0, "step": step, "n": n}
+
+
+def segments(values, digits: int | None) -> list[dict]:
+    """
+    Run-length encode a track with NaN (or None) gaps as its defined runs:
+    [{"start": first frame index, "values": [...]}, ...].
+    """
+    array = np.asarray(values, dtype=np.float64)
+    if digits is not None:
+        array = round_significant(array, digits)
+
+    defined = ~np.isnan(array)
+    # Indices where a run of defined values starts or stops
+    edges = np.flatnonzero(np.diff(np.concatenate([[False], defined, [False]]).astype(np.int8)))
+    return [
+        {"start": int(first), "values": array[first:last].tolist()}
+        for first, last in zip(edges[::2], edges[1::2])
+    ]
@@ -0,0 +1,123 @@
+"""
+Startup warmup.
+
+Imports Parselmouth and NumPy and runs one tiny synthetic analysis of
+each kind, so the first real request on a fresh worker doesn't pay for
+imports and Praat initialization. /health/ready reports not_ready until
+this has finished. With warmup turned off (LINGUAI_WARMUP=0), the first
+readiness probe only checks that the dependencies import.
+
+Under gunicorn with preload_app (see gunicorn.conf.py) the warmup runs
+once in the master before forking, and workers share the warmed pages
+copy-on-write.
+"""
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Sample rate and duration of the synthetic warmup signal
+WARMUP_SAMPLE_RATE = 16000
+WARMUP_DURATION = 0.5
+
+_state = {
+    "ready": False,
+    "skipped": False,
+    "checks": {},
+    "duration_ms": None,
+}
+
+
+def _synthetic_voice():
+    """A short harmonic signal with a 150 Hz fundamental."""
+    import numpy as np
+    import parselmouth
+
+    t = np.arange(int(WARMUP_SAMPLE_RATE * WARMUP_DURATION)) / WARMUP_SAMPLE_RATE
+    values = sum(np.sin(2 * np.pi * 150 * h * t) / h for h in range(1, 10))
+    return parselmouth.Sound(0.3 * values, sampling_frequency=WARMUP_SAMPLE_RATE)
+
+
+def _warm_voice_quality(parselmouth, sound):
+    pitch = sound.to_pitch()
+    point_process = parselmouth.praat.call([sound, pitch], "To PointProcess (cc)")
+    parselmouth.praat.call(point_process, "Get jitter (local)", 0, 0, 0.0001, 0.02, 1.3)
+    parselmouth.praat.call(
+        [sound, point_process], "Get shimmer (local)", 0, 0, 0.0001, 0.02, 1.3, 1.6
+    )
+    sound.to_harmonicity()
+
+
+def _import_checks() -> dict:
+    """Whether each analysis dependency imports."""
+    checks = {"numpy": False, "parselmouth": False}
+    try:
+        import numpy  # noqa: F401
+        checks["numpy"] = True
+        import parselmouth  # noqa: F401
+        checks["parselmouth"] = True
+    except ImportError as e:
+        logger.error("Could not import analysis dependencies: %s", e)
+    return checks
+
+
+def skip_warmup() -> None:
+    """Record that warmup is turned off, so readiness only needs the dependencies to import."""
+    _state["skipped"] = True
+
+
+def run_warmup() -> dict:
+    """
+    Preload dependencies and exercise each analysis once.
+    Safe to call repeatedly; only the first call in a process does the work.
+    """
+    if _state["ready"]:
+        return _state
+
+    start = time.perf_counter()
+    checks = _import_checks()
+    if not all(checks.values()):
+        _state["checks"] = checks
+        return _state
+
+    import parselmouth
+    sound = _synthetic_voice()
+    analyses = {
+        "spectrogram": lambda: sound.to_spectrogram(time_step=0.005, maximum_frequency=5000.0),
+        "formants": lambda: sound.to_formant_burg(max_number_of_formants=5, maximum_formant=5500.0),
+        "pitch": lambda: sound.to_pitch(time_step=0.01, pitch_floor=75.0, pitch_ceiling=600.0),
+        "intensity": lambda: sound.to_intensity(time_step=0.01, minimum_pitch=75.0),
+        "voice_quality": lambda: _warm_voice_quality(parselmouth, sound),
+    }
+
+    for name, analysis in analyses.items():
+        try:
+            analysis()
+            checks[name] = True
+        except Exception as e:
+            logger.error("Warmup %s analysis failed: %s", name, e)
+            checks[name] = False
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    _state["checks"] = checks
+    _state["duration_ms"] = round(elapsed_ms, 2)
+    _state["ready"] = all(checks.values())
+    logger.info("Warmup finished in %.0f ms (ready=%s)", elapsed_ms, _state["ready"])
+    return _state
+
+
+def is_ready() -> bool:
+    if _state["skipped"] and not _state["ready"] and not _state["checks"]:
+        # Checked lazily, on the first probe
+        _state["checks"] = _import_checks()
+        _state["ready"] = all(_state["checks"].values())
+    return _state["ready"]
+
+
+def status() -> dict:
+    """Readiness details for the health endpoint."""
+    return {
+        "checks": dict(_state["checks"]),
+        "warmup_ms": _state["duration_ms"],
+    }
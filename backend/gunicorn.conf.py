@@ -0,0 +1,40 @@
+"""
+Gunicorn configuration for multi-worker deployments.
+
+    cd backend && gunicorn app.main:app
+
+The app is imported and warmed up once in the master process, then
+forked, so every worker starts with Parselmouth, NumPy and Praat already
+initialized and shares those pages copy-on-write instead of loading its
+own copy. Tune with WEB_CONCURRENCY, PORT and GUNICORN_TIMEOUT.
+"""
+
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+worker_class = "uvicorn_worker.UvicornWorker"
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "180"))
+
+# Import the app in the master so workers inherit it on fork
+preload_app = True
+
+
+def when_ready(server):
+    """Warm up in the master, after preloading and before any worker is forked."""
+    from app import warmup
+
+    state = warmup.run_warmup()
+    server.log.info("Warmup finished in %s ms (ready=%s)", state["duration_ms"], state["ready"])
+    # Move everything allocated so far out of the collector's reach, so GC
+    # passes in workers don't touch (and copy) the shared pages
+    gc.freeze()
+
+
+def child_exit(server, worker):
+    """Drop a dead worker's metrics files when aggregating across processes."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,114 @@
+"""Tests for serving spectrograms by slicing cached analyses with other settings"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app import analysis_cache, metrics
+from app.main import app
+
+client = TestClient(app)
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+LOW_RATE_FILE = DATA_DIR / "stress_test_batches" / "batch_2" / "sample_rate_8000hz.wav"
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    analysis_cache.SPECTROGRAMS.clear()
+    yield
+    analysis_cache.SPECTROGRAMS.clear()
+
+
+def _spectrogram(path: Path = DATA_DIR / "speech_like.wav", **params) -> dict:
+    with open(path, "rb") as f:
+        response = client.post(
+            "/api/v1/analyze/spectrogram",
+            params=params,
+            files={"file": (path.name, f, "audio/wav")},
+        )
+    assert response.status_code == 200
+    return response.json()
+
+
+def _derived_count() -> float:
+    return metrics.REGISTRY.get_sample_value(
+        "linguai_analysis_cache_lookups_total", {"cache": "spectrogram", "result": "derived"},
+    ) or 0.0
+
+
+def _derived_and_direct(path: Path, cached: dict, **params) -> tuple[dict, dict, bool]:
+    """The response with the cache holding one analysis, and without any cached analysis."""
+    analysis_cache.SPECTROGRAMS.clear()
+    _spectrogram(path, **cached)
+    before = _derived_count()
+    derived = _spectrogram(path, **params)
+    was_derived = _derived_count() > before
+    analysis_cache.SPECTROGRAMS.clear()
+    return derived, _spectrogram(path, **params), was_derived
+
+
+def _assert_same(derived: dict, direct: dict):
+    np.testing.assert_allclose(derived["times"], direct["times"], rtol=0, atol=1e-12)
+    assert derived["frequencies"] == direct["frequencies"]
+    assert derived["intensities"] == direct["intensities"]
+
+
+@pytest.mark.parametrize("engine", ["praat", "numpy"])
+def test_coarser_time_step_is_derived(engine):
+    """Test a coarser time step served from a finer analysis equals a direct computation"""
+    derived_any = False
+    for time_step in (0.004, 0.006, 0.01):
+        derived, direct, was_derived = _derived_and_direct(
+            DATA_DIR / "speech_like.wav", {"time_step": 0.002, "engine": engine},
+            time_step=time_step, engine=engine,
+        )
+        _assert_same(derived, direct)
+        derived_any |= was_derived
+    # Only frames on the finer grid can be derived; a step of 0.01 s is
+    assert derived_any
+
+
+def test_lower_max_frequency_is_derived_at_the_same_rate():
+    """Test bands below a lower max_frequency are cropped when the analysis rate is unchanged"""
+    derived, direct, was_derived = _derived_and_direct(
+        LOW_RATE_FILE, {"max_frequency": 4000.0}, max_frequency=3700.0,
+    )
+    assert was_derived
+    _assert_same(derived, direct)
+    assert len(direct["frequencies"]) < len(_spectrogram(LOW_RATE_FILE, max_frequency=4000.0)["frequencies"])
+
+
+def test_lower_max_frequency_at_a_lower_rate_is_computed():
+    """Test a request that resamples differently isn't sliced from another rate's bands"""
+    derived, direct, was_derived = _derived_and_direct(
+        DATA_DIR / "speech_like.wav", {"max_frequency": 5000.0}, max_frequency=4000.0,
+    )
+    assert not was_derived
+    _assert_same(derived, direct)
+
+
+def test_selection_is_derived_from_the_whole_file():
+    """Test selections whose frames fall on a cached grid equal a direct computation"""
+    derived_any = False
+    # Selections shifted by half a sample at a time; only some line up with the grid
+    for shift in range(8):
+        start = 0.5 + shift / 16000
+        derived, direct, was_derived = _derived_and_direct(
+            LOW_RATE_FILE, {"time_step": 0.001, "max_frequency": 4000.0},
+            time_step=0.001, max_frequency=4000.0, start=start, end=start + 0.25,
+        )
+        _assert_same(derived, direct)
+        derived_any |= was_derived
+    assert derived_any
+
+
+def test_frames_on_grid():
+    """Test frames are found only when every time is on the grid"""
+    grid = 0.01 + np.arange(100) * 0.002
+    np.testing.assert_array_equal(analysis_cache.frames_on_grid(grid, grid[3::5]), np.arange(3, 100, 5))
+    assert analysis_cache.frames_on_grid(grid, grid[:10] + 0.001) is None
+    assert analysis_cache.frames_on_grid(grid, np.array([grid[-1] + 0.002])) is None
+    assert len(analysis_cache.frames_on_grid(grid, np.empty(0))) == 0
@@ -0,0 +1,74 @@
+"""Tests for resampling to the analysis rate"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app import analysis_cache
+from app.api import analyze
+from app.main import app
+
+client = TestClient(app)
+
+HIGH_RATE_FILE = Path(__file__).parents[2] / "tests" / "data" / "stress_test_batches" / "batch_2" / "sample_rate_96000hz.wav"
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    analysis_cache.RESAMPLED_SOUNDS.clear()
+    analysis_cache.SPECTROGRAMS.clear()
+    yield
+    analysis_cache.RESAMPLED_SOUNDS.clear()
+    analysis_cache.SPECTROGRAMS.clear()
+
+
+def _analyze(endpoint: str, **params):
+    with open(HIGH_RATE_FILE, "rb") as f:
+        return client.post(
+            f"/api/v1/analyze/{endpoint}",
+            params=params,
+            files={"file": (HIGH_RATE_FILE.name, f, "audio/wav")},
+        )
+
+
+def test_analysis_rate_policy():
+    """Test resampling only happens when it saves a meaningful share of samples"""
+    assert analyze._analysis_rate(96000, 10000) == 10000
+    assert analyze._analysis_rate(11025, 10000) is None
+    assert analyze._analysis_rate(8000, 10000) is None
+    # Spectrograms only resample where it beats analyzing the original
+    assert analyze._analysis_rate(96000, 10000, analyze.SPECTROGRAM_RESAMPLE_RATIO) == 10000
+    assert analyze._analysis_rate(44100, 10000, analyze.SPECTROGRAM_RESAMPLE_RATIO) is None
+
+
+def test_resampled_spectrogram_matches_full_rate(monkeypatch):
+    """Test a spectrogram at twice max_frequency matches one at the upload's rate"""
+    resampled = _analyze("spectrogram").json()
+    monkeypatch.setattr(analyze, "SPECTROGRAM_RESAMPLE_RATIO", 0.0)
+    analysis_cache.SPECTROGRAMS.clear()
+    full_rate = _analyze("spectrogram").json()
+
+    assert resampled["sample_rate"] == full_rate["sample_rate"] == 96000
+    np.testing.assert_allclose(resampled["times"], full_rate["times"], atol=1e-9)
+
+    # FFT sizes differ, so compare on the resampled frequency grid
+    actual = np.array(resampled["intensities"])
+    expected = np.array([
+        np.interp(resampled["frequencies"], full_rate["frequencies"], row)
+        for row in full_rate["intensities"]
+    ])
+    strong = actual > actual.max() - 40
+    np.testing.assert_allclose(actual[strong], expected[strong], atol=0.5)
+
+
+def test_resampled_sound_is_reused():
+    """Test repeated formant requests resample once"""
+    assert _analyze("formants").status_code == 200
+    assert analysis_cache.RESAMPLED_SOUNDS.stats()["entries"] == 1
+
+    response = _analyze("formants", time_step=0.005)
+    assert response.status_code == 200
+    assert "resample" not in response.headers["Server-Timing"]
+    assert 'linguai_audio_cache_lookups_total{cache="resampled",result="hit"}' in client.get("/metrics").text
@@ -0,0 +1,130 @@
+"""Tests for the shared-memory decoded-audio store"""
+
+import multiprocessing
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app import audio_store
+from app.main import app
+
+client = TestClient(app)
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = audio_store.SharedAudioStore(str(tmp_path / "index.sqlite"), budget_bytes=3 * 8000)
+    yield store
+    store.clear()
+
+
+def _samples(n: int = 1000, value: float = 0.5) -> np.ndarray:
+    return np.full((1, n), value)
+
+
+def _read_in_child(index_path: str, budget: int, key: str, queue):
+    store = audio_store.SharedAudioStore(index_path, budget)
+    queue.put(store.get(key, lambda values, sample_rate, start: (values.sum(), sample_rate)))
+
+
+def test_put_and_get_round_trip(store):
+    """Test stored samples come back with their sample rate and start time"""
+    values = np.vstack([np.linspace(-1, 1, 500), np.linspace(1, -1, 500)])
+    assert store.put("abc", values, 16000, 0.25)
+
+    result = store.get("abc", lambda v, sr, start: (v.copy(), sr, start))
+    np.testing.assert_array_equal(result[0], values)
+    assert result[1:] == (16000, 0.25)
+    assert store.get("missing", lambda *args: args) is None
+
+
+def test_segment_names_fit_macos_limit(store):
+    """Test a full-length content key still gives a name macOS accepts"""
+    key = "f" * 64
+    assert len("/" + store._segment_name(key)) <= audio_store.MAX_SEGMENT_NAME
+    assert store.put(key, _samples(), 16000)
+    assert store.get(key, lambda v, sr, start: sr) == 16000
+
+
+def test_lru_eviction_respects_budget(store):
+    """Test the least recently used entry is evicted to make room"""
+    for key in ("a", "b", "c"):
+        assert store.put(key, _samples(), 16000)
+    store.get("a", lambda *args: None)  # "b" is now the oldest
+
+    assert store.put("d", _samples(), 16000)
+    assert store.get("b", lambda *args: True) is None
+    assert store.get("a", lambda *args: True)
+    assert store.stats()["bytes"] <= store.budget_bytes
+
+
+def test_leased_entries_are_not_evicted(store):
+    """Test an entry in use by a reader survives eviction pressure"""
+    for key in ("a", "b", "c"):
+        store.put(key, _samples(), 16000)
+
+    def build(values, sample_rate, start):
+        # "a" is the oldest entry, but while leased the idle ones make room instead
+        for key in ("d", "e", "f"):
+            assert store.put(key, _samples(), 16000)
+        return values.sum()
+
+    assert store.get("a", build) == 500.0
+    assert store.stats()["leased"] == 0
+    assert store.get("a", lambda *args: True)
+
+
+def test_dead_process_leases_are_dropped(store):
+    """Test leases held by a process that no longer exists don't pin entries"""
+    for key in ("a", "b", "c"):
+        store.put(key, _samples(), 16000)
+    conn = store._connection()
+    conn.execute("INSERT INTO leases (key, pid, count) VALUES ('a', ?, 1)", (2 ** 22 + 12345,))
+
+    for key in ("d", "e", "f"):
+        assert store.put(key, _samples(), 16000)
+    assert store.get("a", lambda *args: True) is None
+
+
+def test_other_processes_read_the_same_segment(store):
+    """Test a separate process reads samples stored by this one"""
+    store.put("shared", _samples(1000, 0.25), 22050)
+
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    child = ctx.Process(
+        target=_read_in_child, args=(store.index_path, store.budget_bytes, "shared", queue)
+    )
+    child.start()
+    child.join(timeout=30)
+
+    assert queue.get(timeout=5) == (250.0, 22050)
+    # The child exiting must not unlink the segment
+    assert store.get("shared", lambda values, *args: values.sum()) == 250.0
+
+
+def test_analyze_reuses_shared_audio(monkeypatch, tmp_path):
+    """Test a repeated upload is served from the shared store with identical results"""
+    monkeypatch.setenv("LINGUAI_SHARED_AUDIO_BYTES", str(64 * 1024 ** 2))
+    monkeypatch.setenv("LINGUAI_SHARED_AUDIO_DIR", str(tmp_path))
+
+    def upload():
+        with open(DATA_DIR / "sine_440hz.wav", "rb") as f:
+            return client.post(
+                "/api/v1/analyze/pitch",
+                files={"file": ("sine_440hz.wav", f, "audio/wav")},
+            )
+
+    try:
+        first = upload()
+        second = upload()
+        assert first.status_code == second.status_code == 200
+        assert first.json() == second.json()
+        assert audio_store.get_store().stats()["entries"] == 1
+        assert 'linguai_audio_cache_lookups_total{cache="shared",result="hit"}' in client.get("/metrics").text
+    finally:
+        audio_store.get_store().clear()
@@ -0,0 +1,85 @@
+"""Tests for per-channel analysis on the analyze endpoints"""
+
+import io
+from pathlib import Path
+
+import numpy as np
+import parselmouth
+import pytest
+from fastapi.testclient import TestClient
+
+from app import analysis_cache
+from app.api import analyze
+from app.main import app
+
+client = TestClient(app)
+
+STEREO = Path(__file__).parents[2] / "tests" / "data" / "stress_test_batches" / "batch_2" / "channels_stereo.wav"
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    analysis_cache.SPECTROGRAMS.clear()
+    yield
+    analysis_cache.SPECTROGRAMS.clear()
+
+
+def _analyze(endpoint: str, content: bytes, **params):
+    response = client.post(
+        f"/api/v1/analyze/{endpoint}",
+        params=params,
+        files={"file": ("audio.wav", io.BytesIO(content), "audio/wav")},
+    )
+    return response
+
+
+def _channel_wav(channel: int, tmp_path: Path) -> bytes:
+    path = tmp_path / f"channel_{channel}.wav"
+    parselmouth.Sound(str(STEREO)).extract_channel(channel + 1).save(str(path), "WAV")
+    return path.read_bytes()
+
+
+@pytest.mark.parametrize("endpoint, params", [
+    ("pitch", {}),
+    ("pitch", {"mode": "fast", "response_format": "compact"}),
+    ("formants", {"engine": "lpc"}),
+    ("intensity", {}),
+    ("cpps", {"start": 0.5, "end": 1.5}),
+    ("spectrogram", {"start": 1.0, "end": 1.2}),
+    ("waveform", {"max_points": 500}),
+])
+def test_channels_match_mono_uploads(endpoint, params, tmp_path):
+    """Test each channel's result equals the result for that channel uploaded alone"""
+    stereo = STEREO.read_bytes()
+    response = _analyze(endpoint, stereo, channels="all", **params)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["channels"] == [0, 1]
+    for channel, result in zip(data["channels"], data["results"]):
+        assert result == _analyze(endpoint, _channel_wav(channel, tmp_path), **params).json()
+
+
+def test_channels_run_in_worker_processes(monkeypatch):
+    """Test a channel list is analyzed in worker processes, in the order given"""
+    monkeypatch.setattr(analyze, "CHANNEL_WORKERS", 2)
+    data = _analyze("pitch", STEREO.read_bytes(), channels="1,0").json()
+    assert data["channels"] == [1, 0]
+    medians = [np.nanmedian(np.array(result["frequencies"], dtype=float)) for result in data["results"]]
+    assert medians == [pytest.approx(550, rel=0.01), pytest.approx(440, rel=0.01)]
+
+
+def test_mix_is_the_default():
+    """Test without channels one result covers all channels; the waveform is their average"""
+    stereo = STEREO.read_bytes()
+    assert "channels" not in _analyze("pitch", stereo).json()
+    waveform = _analyze("waveform", stereo, start=1.0, end=1.01).json()
+    sound = parselmouth.Sound(str(STEREO))
+    first = round(1.0 * sound.sampling_frequency)
+    expected = sound.values[:, first:first + 5].mean(axis=0)
+    np.testing.assert_allclose(waveform["amplitudes"][:5], expected, atol=1e-6)
+
+
+@pytest.mark.parametrize("channels", ["2", "left", "0,x", ""])
+def test_invalid_channels(channels):
+    """Test unknown modes and missing channels are rejected"""
+    assert _analyze("pitch", STEREO.read_bytes(), channels=channels).status_code == 400
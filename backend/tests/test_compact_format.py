@@ -0,0 +1,85 @@
+"""Tests for the compact contour response format"""
+
+from pathlib import Path
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app import serialization
+from app.main import app
+
+client = TestClient(app)
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+
+
+def _analyze(endpoint: str, filename: str = "speech_like.wav", **params):
+    with open(DATA_DIR / filename, "rb") as f:
+        return client.post(
+            f"/api/v1/analyze/{endpoint}",
+            params=params,
+            files={"file": (filename, f, "audio/wav")},
+        )
+
+
+def _expand_axis(axis: dict) -> np.ndarray:
+    return axis["start"] + np.arange(axis["n"]) * axis["step"]
+
+
+def _expand_segments(segments: list[dict], n: int) -> list:
+    track = [None] * n
+    for segment in segments:
+        track[segment["start"]:segment["start"] + len(segment["values"])] = segment["values"]
+    return track
+
+
+def test_segments_round_trip():
+    """Test defined runs are encoded with their first frame index"""
+    track = [None, 1.0, 2.0, None, None, 3.0, 4.0]
+    segments = serialization.segments(track, None)
+    assert segments == [{"start": 1, "values": [1.0, 2.0]}, {"start": 5, "values": [3.0, 4.0]}]
+    assert _expand_segments(segments, len(track)) == track
+    assert serialization.segments([None, None], None) == []
+
+
+def test_compact_pitch_matches_full():
+    """Test the compact pitch contour expands to the full response"""
+    full = _analyze("pitch", filename="long_10s.wav").json()
+    response = _analyze("pitch", filename="long_10s.wav", response_format="compact")
+    assert response.status_code == 200
+    compact = response.json()
+
+    assert compact["time"]["n"] == len(full["times"])
+    np.testing.assert_allclose(_expand_axis(compact["time"]), full["times"], atol=1e-9)
+    assert _expand_segments(compact["frequencies"], compact["time"]["n"]) == full["frequencies"]
+    assert compact["unit"] == "Hz"
+
+
+def test_compact_formants_and_intensity_match_full():
+    """Test compact formant tracks and intensity expand to the full response"""
+    full = _analyze("formants", start=0.5, end=1.5).json()
+    compact = _analyze("formants", start=0.5, end=1.5, response_format="compact").json()
+    np.testing.assert_allclose(_expand_axis(compact["time"]), full["times"], atol=1e-9)
+    for name in ("f1", "f2", "f3", "f4"):
+        assert _expand_segments(compact[name], compact["time"]["n"]) == full[name]
+
+    full = _analyze("intensity").json()
+    compact = _analyze("intensity", response_format="compact").json()
+    np.testing.assert_allclose(_expand_axis(compact["time"]), full["times"], atol=1e-9)
+    assert compact["values"] == full["values"]
+
+
+def test_compact_spectrogram_axes():
+    """Test the spectrogram time and frequency axes are implicit"""
+    full = _analyze("spectrogram", end=1.0).json()
+    compact = _analyze("spectrogram", end=1.0, response_format="compact").json()
+    np.testing.assert_allclose(_expand_axis(compact["time"]), full["times"], atol=1e-9)
+    np.testing.assert_allclose(_expand_axis(compact["frequency"]), full["frequencies"])
+    assert compact["intensities"] == full["intensities"]
+
+
+def test_unknown_response_format_is_rejected():
+    """Test an unknown response_format is a 400"""
+    response = _analyze("pitch", response_format="tiny")
+    assert response.status_code == 400
+    assert "response_format" in response.json()["detail"]
@@ -0,0 +1,58 @@
+"""Tests for the cepstral peak prominence endpoint"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from linguai_core import get_cpps, load_sound
+
+client = TestClient(app)
+
+VOICE_FILE = Path(__file__).parents[2] / "tests" / "data" / "stress_test_batches" / "batch_5" / "sustained_a_clinical.wav"
+
+
+def _analyze(**params):
+    with open(VOICE_FILE, "rb") as f:
+        return client.post(
+            "/api/v1/analyze/cpps",
+            params=params,
+            files={"file": (VOICE_FILE.name, f, "audio/wav")},
+        )
+
+
+def test_cpps_matches_core():
+    """Test the endpoint returns the core tracks and summary"""
+    response = _analyze()
+    assert response.status_code == 200
+    data = response.json()
+    expected = get_cpps(load_sound(VOICE_FILE))
+    np.testing.assert_allclose(data["times"], expected.times)
+    # The endpoint resamples with linguai_core.resample, whose samples are
+    # Praat's to 1e-9 of the peak: per-frame prominences move by under 1e-3 dB
+    np.testing.assert_allclose(data["cpps"], expected.cpps, atol=1e-3)
+    np.testing.assert_allclose(data["cpp"], expected.cpp, atol=1e-3)
+    assert data["cpps_mean"] == pytest.approx(expected.cpps_mean)
+
+
+def test_cpps_selection_and_compact():
+    """Test a selection keeps full-file values and the compact format carries the track"""
+    full = _analyze().json()
+    selection = _analyze(start=1.0, end=2.0, response_format="compact").json()
+    axis = selection["time"]
+    times = axis["start"] + np.arange(axis["n"]) * axis["step"]
+    assert times[0] >= 1.0 and times[-1] <= 2.0 and times[-1] > 1.99
+    assert len(selection["cpps"]) == len(times)
+
+    # Frame grids differ between the two analyses and CPPS moves by a dB
+    # or more from frame to frame, so compare the summaries
+    inside = (np.array(full["times"]) >= 1.0) & (np.array(full["times"]) <= 2.0)
+    assert selection["cpps_mean"] == pytest.approx(np.mean(np.array(full["cpps"])[inside]), abs=0.1)
+
+
+def test_cpps_invalid_parameters():
+    """Test inconsistent pitch and frequency settings are rejected"""
+    assert _analyze(pitch_floor=300, pitch_ceiling=200).status_code == 400
+    assert _analyze(max_frequency=200).status_code == 400
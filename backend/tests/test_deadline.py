@@ -0,0 +1,132 @@
+"""Tests for deadline-bound analyses (deadline_ms)"""
+
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app import analysis_cache
+from app.main import app
+
+client = TestClient(app)
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+
+TRACKS = {
+    "pitch": ["frequencies"],
+    "formants": ["f1", "f2", "f3", "f4"],
+    "intensity": ["values"],
+    "cpps": ["cpp", "cpps"],
+}
+
+
+def _analyze(endpoint: str, name: str = "long_10s.wav", **params):
+    with open(DATA_DIR / name, "rb") as f:
+        return client.post(
+            f"/api/v1/analyze/{endpoint}",
+            params=params,
+            files={"file": (name, f, "audio/wav")},
+        )
+
+
+def _assert_same_frames(data, expected, keys, n_frames):
+    np.testing.assert_allclose(data["times"], expected["times"][:n_frames], rtol=0, atol=1e-9)
+    for key in keys:
+        np.testing.assert_allclose(
+            np.array(data[key], dtype=float), np.array(expected[key][:n_frames], dtype=float),
+            rtol=1e-9, atol=1e-9,
+        )
+
+
+@pytest.mark.parametrize("endpoint, params", [
+    ("pitch", {}),
+    ("pitch", {"mode": "fast"}),
+    ("formants", {}),
+    ("formants", {"engine": "lpc"}),
+    ("intensity", {}),
+    ("cpps", {}),
+])
+@pytest.mark.parametrize("name", ["long_10s.wav", "speech_like.wav"])
+def test_deadline_met_matches_analysis(endpoint, params, name):
+    """Test an analysis that beats its deadline returns the frames of one analysis of the whole file"""
+    expected = _analyze(endpoint, name, **params).json()
+    data = _analyze(endpoint, name, deadline_ms=60000, **params).json()
+    assert data["partial"] is False and data["computed_until"] is None
+    assert expected["partial"] is False
+    _assert_same_frames(data, expected, TRACKS[endpoint], len(expected["times"]))
+
+
+@pytest.mark.parametrize("endpoint, params", [
+    ("pitch", {}),
+    ("formants", {"engine": "lpc"}),
+    ("intensity", {}),
+    ("cpps", {}),
+])
+def test_expired_deadline_returns_frames_so_far(endpoint, params):
+    """Test an analysis out of time returns its first frames, marked partial and not cacheable"""
+    expected = _analyze(endpoint, **params).json()
+    response = _analyze(endpoint, deadline_ms=1, **params)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["partial"] is True
+    assert 0 < len(data["times"]) < len(expected["times"])
+    assert data["times"][-1] < data["computed_until"] < expected["times"][len(data["times"])]
+    _assert_same_frames(data, expected, TRACKS[endpoint], len(data["times"]))
+    assert response.headers["cache-control"] == "no-store"
+    assert "etag" not in response.headers
+
+
+@pytest.mark.parametrize("endpoint, key, tolerance", [
+    ("formants", "f1", 2.0),
+    ("cpps", "cpps", 0.2),
+])
+def test_deadline_covers_resampling(tmp_path, endpoint, key, tolerance):
+    """Test a deadline holds for a long upload not yet resampled to the analysis rate"""
+    import parselmouth
+
+    sound = parselmouth.Sound(str(DATA_DIR / "long_10s.wav"))
+    path = tmp_path / "long_2min.wav"
+    parselmouth.Sound(np.tile(sound.values, 12), sampling_frequency=sound.sampling_frequency).save(str(path), "WAV")
+    content = path.read_bytes()
+
+    def analyze(**params):
+        return client.post(f"/api/v1/analyze/{endpoint}", params=params,
+                           files={"file": (path.name, content, "audio/wav")})
+
+    analysis_cache.RESAMPLED_SOUNDS.clear()
+    begin = time.perf_counter()
+    response = analyze(deadline_ms=200)
+    elapsed = time.perf_counter() - begin
+    data = response.json()
+    # Resampling the whole upload first took about 1.8 s
+    assert elapsed < 1.0
+    assert data["partial"] is True
+    assert "resample" not in response.headers["server-timing"]
+    assert analysis_cache.RESAMPLED_SOUNDS.stats()["entries"] == 0
+
+    # The frames of the whole upload resampled, most values close to theirs
+    expected = analyze().json()
+    n_frames = len(data["times"])
+    np.testing.assert_allclose(data["times"], expected["times"][:n_frames], rtol=0, atol=1e-9)
+    difference = np.abs(np.array(data[key], dtype=float) - np.array(expected[key][:n_frames], dtype=float))
+    assert np.nanmedian(difference) < tolerance
+    analysis_cache.RESAMPLED_SOUNDS.clear()
+
+
+def test_partial_compact_and_channels():
+    """Test partial results in the compact format and per channel"""
+    data = _analyze("pitch", deadline_ms=1, response_format="compact").json()
+    assert data["partial"] is True
+    assert data["time"]["start"] + data["time"]["n"] * data["time"]["step"] == pytest.approx(
+        data["computed_until"] + 0.5 * data["time"]["step"])
+
+    data = _analyze("intensity", deadline_ms=1, channels="0").json()
+    assert data["channels"] == [0]
+    assert data["results"][0]["partial"] is True
+
+
+def test_invalid_deadline():
+    """Test a deadline must be positive"""
+    assert _analyze("pitch", deadline_ms=0).status_code == 400
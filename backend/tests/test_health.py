@@ -3,6 +3,7 @@
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from app import warmup
 
 client = TestClient(app)
 
@@ -27,9 +28,33 @@ def test_root_endpoint():
 
 def test_readiness_check():
     """Test readiness check endpoint"""
-    response = client.get("/health/ready")
+    with TestClient(app) as started:  # runs the lifespan warmup
+        response = started.get("/health/ready")
     assert response.status_code == 200
     data = response.json()
-    assert "status" in data
+    assert data["status"] == "ready"
     assert "checks" in data
     assert "parselmouth" in data["checks"]
+    assert data["checks"]["pitch"] is True
+    assert data["warmup_ms"] is not None
+
+
+def test_readiness_before_warmup(monkeypatch):
+    """Test readiness reports 503 until warmup has run"""
+    monkeypatch.setitem(warmup._state, "ready", False)
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "not_ready"
+
+
+def test_readiness_without_warmup(monkeypatch):
+    """Test an instance started with LINGUAI_WARMUP=0 becomes ready once its dependencies import"""
+    monkeypatch.setenv("LINGUAI_WARMUP", "0")
+    monkeypatch.setattr(warmup, "_state", {"ready": False, "skipped": False, "checks": {}, "duration_ms": None})
+    with TestClient(app) as started:
+        response = started.get("/health/ready")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ready"
+    assert data["checks"] == {"numpy": True, "parselmouth": True}
+    assert data["warmup_ms"] is None
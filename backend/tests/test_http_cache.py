@@ -0,0 +1,116 @@
+"""Tests for ETags, conditional requests and the GET routes by content id"""
+
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import http_cache, metrics
+from app.main import app
+
+client = TestClient(app)
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+
+
+@pytest.fixture(autouse=True)
+def empty_uploads():
+    http_cache.UPLOADS.clear()
+    yield
+    http_cache.UPLOADS.clear()
+
+
+def _post(path: str, name: str, headers: dict | None = None, **params):
+    with open(DATA_DIR / name, "rb") as f:
+        return client.post(f"/api/v1{path}", params=params, headers=headers,
+                           files={"file": (name, f, "application/octet-stream")})
+
+
+def test_post_is_tagged_and_revalidated():
+    """Test results carry an immutable ETag and a matching If-None-Match gets a 304"""
+    response = _post("/analyze/pitch", "sine_440hz.wav", time_step=0.02)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == http_cache.IMMUTABLE
+
+    repeat = _post("/analyze/pitch", "sine_440hz.wav", headers={"If-None-Match": f'W/"x", {etag}'}, time_step=0.02)
+    assert repeat.status_code == 304
+    assert repeat.content == b""
+    assert repeat.headers["etag"] == etag
+
+    other = _post("/analyze/pitch", "sine_440hz.wav", headers={"If-None-Match": etag}, time_step=0.01)
+    assert other.status_code == 200
+    assert other.headers["etag"] != etag
+
+
+def test_server_precision_default_changes_the_etag(monkeypatch):
+    """Test a new LINGUAI_RESPONSE_PRECISION stops earlier results from revalidating"""
+    etag = _post("/analyze/pitch", "sine_440hz.wav", time_step=0.02).headers["etag"]
+
+    monkeypatch.setenv("LINGUAI_RESPONSE_PRECISION", "3")
+    rounded = _post("/analyze/pitch", "sine_440hz.wav", headers={"If-None-Match": etag}, time_step=0.02)
+    assert rounded.status_code == 200
+    assert rounded.headers["etag"] != etag
+    # The same digits asked for explicitly are the same result
+    explicit = _post("/analyze/pitch", "sine_440hz.wav", time_step=0.02, precision=3)
+    assert explicit.content == rounded.content
+
+
+def test_get_by_content_id_serves_the_same_result():
+    """Test the Content-Location of a POST answers GETs with the same body and ETag"""
+    response = _post("/analyze/intensity", "sine_440hz.wav", time_step=0.02, response_format="compact")
+    location = response.headers["content-location"]
+    assert location.startswith("/api/v1/analyze/intensity/")
+    assert location.endswith("?time_step=0.02&response_format=compact")
+
+    by_id = client.get(location)
+    assert by_id.status_code == 200
+    assert by_id.content == response.content
+    assert by_id.headers["etag"] == response.headers["etag"]
+
+    # Another analysis of the same upload, without uploading it again
+    content_id = location.split("/")[-1].split("?")[0]
+    formants = client.get(f"/api/v1/analyze/formants/{content_id}", params={"max_formant": 5000})
+    assert formants.status_code == 200
+    assert formants.json()["f1"]
+
+
+def test_get_revalidates_without_the_upload():
+    """Test unknown ids get a 404, but a held ETag still revalidates after eviction"""
+    response = _post("/analyze/waveform", "sine_440hz.wav", max_points=500)
+    location = response.headers["content-location"]
+    http_cache.UPLOADS.clear()
+
+    assert client.get(location).status_code == 404
+    assert client.get(location, headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+
+
+def test_textgrid_import_by_content_id():
+    """Test TextGrid imports are tagged and can be fetched again by id"""
+    response = _post("/import/textgrid", "test.TextGrid")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == http_cache.IMMUTABLE
+
+    by_id = client.get(response.headers["content-location"])
+    assert by_id.json() == response.json()
+    # Uploads of one kind aren't found by the routes of another
+    content_id = response.headers["content-location"].split("/")[-1]
+    assert client.get(f"/api/v1/analyze/pitch/{content_id}").status_code == 404
+
+
+def test_content_id_routes_share_the_metrics_label():
+    """Test GET routes by id are labelled like their POST route"""
+    content_id = "0" * 64
+    assert metrics.endpoint_label(f"/api/v1/analyze/pitch/{content_id}") == "pitch"
+    assert metrics.endpoint_label(f"/api/v1/analyze/spectrogram/image/{content_id}") == "spectrogram/image"
+    assert metrics.endpoint_label("/api/v1/analyze/spectrogram/image") == "spectrogram/image"
+    assert metrics.endpoint_label("/api/v1/analyze/pitch/not-a-content-id") is None
+
+
+def test_openapi_lists_both_routes():
+    """Test the schema documents the POST and GET variants"""
+    paths = client.get("/openapi.json").json()["paths"]
+    assert "post" in paths["/api/v1/analyze/pitch"]
+    assert "get" in paths["/api/v1/analyze/pitch/{content_id}"]
+    parameters = {p["name"] for p in paths["/api/v1/analyze/pitch/{content_id}"]["get"]["parameters"]}
+    assert {"content_id", "time_step", "channels"} <= parameters
@@ -0,0 +1,39 @@
+"""Tests for the lpc formant engine of /analyze/formants"""
+
+from pathlib import Path
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+
+
+def _analyze(name: str, **params):
+    with open(DATA_DIR / name, "rb") as f:
+        return client.post(
+            "/api/v1/analyze/formants",
+            params=params,
+            files={"file": (name, f, "audio/wav")},
+        )
+
+
+def test_lpc_formants_match_praat_on_selection():
+    """Test the lpc engine reproduces the Burg tracks of a selection and adds F5 and bandwidths"""
+    praat = _analyze("speech_like.wav", start=0.5, end=2.0).json()
+    lpc = _analyze("speech_like.wav", start=0.5, end=2.0, engine="lpc").json()
+    assert praat["f5"] is None and praat["bandwidths"] is None
+    np.testing.assert_allclose(lpc["times"], praat["times"], atol=1e-9)
+    for k in ("f1", "f2", "f3", "f4"):
+        expected = np.array(praat[k], dtype=float)
+        np.testing.assert_allclose(np.array(lpc[k], dtype=float), expected, rtol=1e-5)
+    assert len(lpc["f5"]) == len(lpc["times"])
+    assert np.array(lpc["bandwidths"], dtype=float).shape == (5, len(lpc["times"]))
+
+    compact = _analyze("speech_like.wav", start=0.5, end=2.0, engine="lpc",
+                       response_format="compact").json()
+    assert len(compact["bandwidths"]) == 5
+    assert _analyze("speech_like.wav", engine="fft").status_code == 400
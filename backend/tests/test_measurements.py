@@ -0,0 +1,90 @@
+"""Tests for the per-interval measurements endpoint"""
+
+import csv
+import io
+import json
+from pathlib import Path
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+
+
+def _import_annotations() -> list[dict]:
+    with open(DATA_DIR / "test.TextGrid", "rb") as f:
+        response = client.post("/api/v1/import/textgrid", files={"file": ("test.TextGrid", f, "text/plain")})
+    assert response.status_code == 200
+    return response.json()["annotations"]
+
+
+def _measure(annotations, **params):
+    with open(DATA_DIR / "speech_like.wav", "rb") as f:
+        return client.post(
+            "/api/v1/analyze/measurements",
+            params=params,
+            data={"annotations": json.dumps(annotations)},
+            files={"file": ("speech_like.wav", f, "audio/wav")},
+        )
+
+
+def test_json_table_per_interval():
+    """Test one row per annotation, with duration and the track statistics"""
+    annotations = _import_annotations()
+    response = _measure(annotations)
+    assert response.status_code == 200
+    data = response.json()
+
+    columns = data["columns"]
+    assert columns[:6] == ["id", "tier", "label", "start", "end", "duration"]
+    assert {"f0_mean", "f1_median", "f2_min", "f3_max", "intensity_midpoint"} <= set(columns)
+    assert len(data["rows"]) == len(annotations)
+    for row, annotation in zip(data["rows"], annotations):
+        record = dict(zip(columns, row))
+        assert (record["id"], record["tier"], record["label"]) == (annotation["id"], annotation["tier"], annotation["text"])
+        assert record["duration"] == annotation["end"] - annotation["start"]
+        if record["intensity_mean"] is not None:
+            assert record["intensity_min"] <= record["intensity_mean"] <= record["intensity_max"]
+
+
+def test_tier_and_csv_output():
+    """Test a tier selects its intervals, and CSV carries the same table"""
+    annotations = _import_annotations()
+    tier = annotations[-1]["tier"]
+    expected = _measure(annotations, tier=tier).json()
+    response = _measure(annotations, tier=tier, output_format="csv")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == expected["columns"]
+    assert len(rows) - 1 == len(expected["rows"]) == sum(a["tier"] == tier for a in annotations)
+    f1 = expected["columns"].index("f1_mean")
+    for row, expected_row in zip(rows[1:], expected["rows"]):
+        assert row[1] == tier
+        assert (row[f1] == "" if expected_row[f1] is None else float(row[f1]) == expected_row[f1])
+
+
+def test_precision_rounds_measurements():
+    """Test precision rounds the measurements but not the interval times"""
+    annotations = _import_annotations()
+    data = _measure(annotations, precision=3).json()
+    f1 = data["columns"].index("f1_mean")
+    values = np.array([row[f1] for row in data["rows"] if row[f1] is not None])
+    assert len(values)
+    np.testing.assert_array_equal(values, np.array([float(f"{v:.3g}") for v in values]))
+
+
+def test_invalid_requests():
+    """Test bad annotations, an empty tier and unknown formats, modes and engines are rejected"""
+    annotations = _import_annotations()
+    assert _measure(annotations, output_format="xlsx").status_code == 400
+    assert _measure(annotations, pitch_mode="no such mode").status_code == 400
+    assert _measure(annotations, formant_engine="no such engine").status_code == 400
+    assert _measure(annotations, tier="no such tier").status_code == 400
+    assert _measure([{"id": "1", "tier": "t", "start": 0.5, "end": 0.2, "text": "a"}]).status_code == 400
+    assert _measure("not a list").status_code == 400
@@ -0,0 +1,57 @@
+"""Tests for the Prometheus metrics endpoint"""
+
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api import analyze
+
+client = TestClient(app)
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+
+
+def _upload(endpoint: str, name: str = "sine_440hz.wav"):
+    with open(DATA_DIR / name, "rb") as f:
+        return client.post(
+            f"/api/v1/analyze/{endpoint}",
+            files={"file": (name, f, "audio/wav")},
+        )
+
+
+def test_metrics_endpoint_exposes_text_format():
+    """Test /metrics returns Prometheus exposition text"""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "linguai_stage_duration_seconds" in response.text
+
+
+def test_analysis_stages_are_recorded_per_endpoint():
+    """Test each pipeline stage is timed under the endpoint label"""
+    assert _upload("pitch").status_code == 200
+
+    text = client.get("/metrics").text
+    for stage in ("read", "decode", "compute", "serialize"):
+        assert f'linguai_stage_duration_seconds_count{{endpoint="pitch",stage="{stage}"}}' in text
+    assert 'linguai_upload_bytes_count{endpoint="pitch"}' in text
+    assert 'linguai_analysis_requests_total{endpoint="pitch",status="200"}' in text
+
+
+def test_oversized_upload_counts_as_rejection(monkeypatch):
+    """Test 413 responses increment the rejection and error counters"""
+    monkeypatch.setattr(analyze, "MAX_FILE_SIZE", 10)
+    assert _upload("intensity").status_code == 413
+
+    text = client.get("/metrics").text
+    assert 'linguai_analysis_rejections_total{code="413",endpoint="intensity"}' in text
+    assert 'linguai_analysis_errors_total{endpoint="intensity"}' in text
+
+
+def test_unmatched_paths_add_no_labels():
+    """Test requests for paths no route serves are not counted under their path"""
+    for i in range(3):
+        assert client.post(f"/api/v1/analyze/no-such-endpoint-{i}").status_code == 404
+
+    text = client.get("/metrics").text
+    assert "no-such-endpoint" not in text
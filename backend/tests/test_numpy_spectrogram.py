@@ -0,0 +1,42 @@
+"""Tests for the NumPy engine of the spectrogram endpoints"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app import analysis_cache
+from app.main import app
+
+client = TestClient(app)
+
+HIGH_RATE_FILE = Path(__file__).parents[2] / "tests" / "data" / "stress_test_batches" / "batch_2" / "sample_rate_96000hz.wav"
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    analysis_cache.SPECTROGRAMS.clear()
+    yield
+    analysis_cache.SPECTROGRAMS.clear()
+
+
+def _analyze(endpoint: str, **params):
+    with open(HIGH_RATE_FILE, "rb") as f:
+        return client.post(
+            f"/api/v1/analyze/{endpoint}",
+            params=params,
+            files={"file": (HIGH_RATE_FILE.name, f, "audio/wav")},
+        )
+
+
+def test_numpy_engine_matches_praat():
+    """Test engine=numpy returns Praat's spectrogram, resampled and for a selection"""
+    for params in ({}, {"start": 0.3, "end": 0.7}):
+        praat = _analyze("spectrogram", **params).json()
+        fast = _analyze("spectrogram", engine="numpy", **params).json()
+        assert fast["times"] == praat["times"]
+        assert fast["frequencies"] == praat["frequencies"]
+        np.testing.assert_allclose(fast["intensities"], praat["intensities"], atol=1e-3)
+
+    assert _analyze("spectrogram", engine="fft").status_code == 400
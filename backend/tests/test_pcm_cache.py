@@ -0,0 +1,81 @@
+"""Tests for the memory-mapped PCM cache"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from linguai_core import PCMCache, load_sound
+
+client = TestClient(app)
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+SINE = DATA_DIR / "sine_440hz.wav"
+
+
+@pytest.mark.parametrize("dtype, tolerance", [("float32", 1e-7), ("int16", 1 / 32767)])
+def test_round_trip_and_region_reads(tmp_path, dtype, tolerance):
+    """Test cached samples and regions match the original within dtype precision"""
+    cache = PCMCache(tmp_path, dtype)
+    values = np.vstack([np.sin(np.linspace(0, 100, 8000)), np.cos(np.linspace(0, 100, 8000))])
+    entry = cache.put("key", values, 8000, 0.5)
+
+    assert (entry.n_channels, entry.n_samples, entry.sample_rate, entry.start_time) == (2, 8000, 8000, 0.5)
+    np.testing.assert_allclose(entry.read(), values, atol=tolerance)
+    # 0.25 s into the file (0.75 s on its timeline) to the end of the first half
+    np.testing.assert_allclose(entry.read(0.75, 1.0), values[:, 2000:4000], atol=tolerance)
+    assert cache.get("missing") is None
+
+
+def test_int16_entry_of_16_bit_file_is_exact(tmp_path):
+    """Test an int16 entry holds a 16-bit file's samples bit for bit"""
+    sound = load_sound(DATA_DIR / "speech_like.wav")
+    entry = PCMCache(tmp_path, "int16").put_sound("key", sound)
+    np.testing.assert_array_equal(entry.read(), sound.values)
+
+
+def test_load_sound_region_from_cache(tmp_path):
+    """Test a cached region matches the same region of the decoded file"""
+    full = load_sound(SINE)
+    region = load_sound(SINE, start=0.5, end=1.25, cache_dir=tmp_path)
+    cached = load_sound(SINE, start=0.5, end=1.25, cache_dir=tmp_path)
+
+    assert region.xmin == pytest.approx(0.5)
+    assert region.xmax == pytest.approx(1.25)
+    first = round(0.5 * full.sampling_frequency)
+    np.testing.assert_array_equal(cached.values, full.values[:, first:first + cached.n_samples])
+    assert len(list(tmp_path.glob("*.pcm"))) == 1
+
+
+def test_key_for_file_tracks_changes(tmp_path):
+    """Test file keys are reused for unchanged files and recomputed after edits"""
+    cache = PCMCache(tmp_path / "cache")
+    audio = tmp_path / "audio.wav"
+    audio.write_bytes(SINE.read_bytes())
+
+    key = cache.key_for_file(audio)
+    assert cache.key_for_file(audio) == key
+
+    audio.write_bytes(SINE.read_bytes() + b"\0\0")
+    assert cache.key_for_file(audio) != key
+
+
+def test_analyze_uses_disk_cache(monkeypatch, tmp_path):
+    """Test a repeated upload is served from the disk cache with identical results"""
+    monkeypatch.setenv("LINGUAI_PCM_CACHE_DIR", str(tmp_path))
+
+    def upload():
+        with open(SINE, "rb") as f:
+            return client.post(
+                "/api/v1/analyze/intensity",
+                files={"file": ("sine_440hz.wav", f, "audio/wav")},
+            )
+
+    first = upload()
+    second = upload()
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert len(list(tmp_path.glob("*.pcm"))) == 1
+    assert 'linguai_audio_cache_lookups_total{cache="disk",result="hit"}' in client.get("/metrics").text
@@ -0,0 +1,78 @@
+"""Tests for Server-Timing headers and on-demand profiling"""
+
+import json
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+
+
+def _upload(endpoint: str, headers: dict | None = None):
+    with open(DATA_DIR / "sine_440hz.wav", "rb") as f:
+        return client.post(
+            f"/api/v1/analyze/{endpoint}",
+            files={"file": ("sine_440hz.wav", f, "audio/wav")},
+            headers=headers or {},
+        )
+
+
+def test_server_timing_header_lists_stages():
+    """Test analysis responses carry a Server-Timing stage breakdown"""
+    response = _upload("pitch")
+    assert response.status_code == 200
+    header = response.headers["server-timing"]
+    for stage in ("read", "decode", "compute", "serialize", "total"):
+        assert f"{stage};dur=" in header
+
+
+def test_server_timing_on_non_analysis_routes():
+    """Test every response carries at least the total duration"""
+    response = client.get("/health")
+    assert "total;dur=" in response.headers["server-timing"]
+
+
+def test_profiling_requires_token(monkeypatch):
+    """Test profiling is refused when no or a wrong token is given"""
+    monkeypatch.delenv("LINGUAI_PROFILE_TOKEN", raising=False)
+    assert _upload("pitch", {"X-LinguAI-Profile": "collapsed"}).status_code == 403
+
+    monkeypatch.setenv("LINGUAI_PROFILE_TOKEN", "secret")
+    response = _upload("pitch", {
+        "X-LinguAI-Profile": "collapsed",
+        "X-LinguAI-Profile-Token": "wrong",
+    })
+    assert response.status_code == 403
+
+
+def test_collapsed_profile(monkeypatch):
+    """Test a profiled request returns collapsed stacks instead of the body"""
+    monkeypatch.setenv("LINGUAI_PROFILE_TOKEN", "secret")
+    response = _upload("spectrogram", {
+        "X-LinguAI-Profile": "collapsed",
+        "X-LinguAI-Profile-Token": "secret",
+    })
+    assert response.status_code == 200
+    assert response.headers["x-linguai-profiled-status"] == "200"
+    assert response.headers["content-type"].startswith("text/plain")
+    lines = response.text.strip().splitlines()
+    assert lines
+    stack, weight = lines[0].rsplit(" ", 1)
+    assert int(weight) > 0
+
+
+def test_speedscope_profile(monkeypatch):
+    """Test speedscope output is a valid sampled profile"""
+    monkeypatch.setenv("LINGUAI_PROFILE_TOKEN", "secret")
+    response = _upload("pitch", {
+        "X-LinguAI-Profile": "speedscope",
+        "X-LinguAI-Profile-Token": "secret",
+    })
+    data = json.loads(response.content)
+    profile = data["profiles"][0]
+    assert profile["type"] == "sampled"
+    assert len(profile["samples"]) == len(profile["weights"])
+    assert all(i < len(data["shared"]["frames"]) for s in profile["samples"] for i in s)
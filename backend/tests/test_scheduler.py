@@ -0,0 +1,298 @@
+"""Tests for cost estimates, admission control and priority scheduling"""
+
+import asyncio
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException, Request
+from fastapi.testclient import TestClient
+
+from app import metrics, scheduler
+from app.main import app
+
+client = TestClient(app)
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+
+
+def _scheduler(**options) -> scheduler.Scheduler:
+    settings = dict(slots=1, batch_slots=1, interactive_cost=1.0,
+                    client_concurrency=4, client_budget=100.0, max_queue=8)
+    settings.update(options)
+    return scheduler.Scheduler(**settings)
+
+
+def test_cost_estimates():
+    """Test costs grow with duration, rate, channels and frame rate, and rank endpoints sensibly"""
+    pitch = scheduler.estimate_cost("pitch", 1.0, 44100, time_step=0.01)
+    assert pitch < 1.0
+    assert scheduler.estimate_cost("pitch", 2.0, 44100, 2, time_step=0.005) == pytest.approx(8 * pitch)
+    assert scheduler.estimate_cost("pitch", 1.0, 44100, time_step=0.01, mode="fast") < pitch
+    # Twenty minutes of voice quality is batch work; a second of pitch is interactive
+    heavy = scheduler.estimate_cost("voice-quality", 1200.0, 44100)
+    assert heavy > 100.0
+    assert _scheduler().priority(heavy) == scheduler.BATCH
+    assert _scheduler().priority(pitch) == scheduler.INTERACTIVE
+
+
+def test_interactive_work_goes_first():
+    """Test waiting interactive analyses start before batch analyses that arrived earlier"""
+    runner = _scheduler()
+    started = threading.Event()
+    release = threading.Event()
+    order = []
+
+    def blocking():
+        started.set()
+        release.wait(5)
+
+    async def main():
+        first = asyncio.create_task(runner.run(50.0, blocking))
+        await asyncio.to_thread(started.wait, 5)
+        batch = asyncio.create_task(runner.run(20.0, order.append, "batch"))
+        await asyncio.sleep(0.01)
+        interactive = asyncio.create_task(runner.run(0.1, order.append, "interactive"))
+        await asyncio.sleep(0.01)
+        assert runner.stats()["waiting"] == 2
+        release.set()
+        await asyncio.gather(first, batch, interactive)
+
+    asyncio.run(main())
+    assert order == ["interactive", "batch"]
+    assert runner.stats()["running"] == {"interactive": 0, "batch": 0}
+
+
+def test_batch_work_leaves_a_slot_for_interactive():
+    """Test batch analyses hold at most batch_slots slots"""
+    runner = _scheduler(slots=2, batch_slots=1)
+    release = threading.Event()
+
+    async def main():
+        batch = [asyncio.create_task(runner.run(20.0, release.wait, 5)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        assert runner.stats()["running"]["batch"] == 1
+        # The second batch analysis waits, but interactive work still runs
+        assert await runner.run(0.1, lambda: "done") == "done"
+        release.set()
+        await asyncio.gather(*batch)
+
+    asyncio.run(main())
+
+
+def test_client_limits():
+    """Test per-client concurrency and cost budgets reject with 429, other clients unaffected"""
+    runner = _scheduler(client_concurrency=2, client_budget=30.0)
+    release = threading.Event()
+
+    async def main():
+        token = scheduler.current_client.set("batch-user")
+        # Alone, an analysis above the budget is still admitted
+        big = asyncio.create_task(runner.run(50.0, release.wait, 5))
+        await asyncio.sleep(0.01)
+        with pytest.raises(HTTPException) as over_budget:
+            await runner.run(0.5, lambda: None)
+        assert over_budget.value.status_code == 429
+        assert "budget" in over_budget.value.detail
+        scheduler.current_client.reset(token)
+
+        waiting = asyncio.create_task(runner.run(0.5, lambda: None))  # another client, queued
+        await asyncio.sleep(0.01)
+        release.set()
+        await asyncio.gather(big, waiting)
+
+    asyncio.run(main())
+
+    async def concurrency():
+        release.clear()
+        tasks = [asyncio.create_task(runner.run(1.0, release.wait, 5)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        with pytest.raises(HTTPException) as too_many:
+            await runner.run(1.0, lambda: None)
+        assert too_many.value.status_code == 429
+        assert too_many.value.headers["Retry-After"] == "1"
+        release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(concurrency())
+
+
+def test_full_queue_and_cancelled_waiters():
+    """Test a full queue answers 503 and a cancelled waiter gives up its place"""
+    runner = _scheduler(max_queue=1, client_concurrency=10)
+    release = threading.Event()
+
+    async def main():
+        running = asyncio.create_task(runner.run(0.1, release.wait, 5))
+        await asyncio.sleep(0.01)
+        queued = asyncio.create_task(runner.run(0.1, lambda: None))
+        await asyncio.sleep(0.01)
+        with pytest.raises(HTTPException) as busy:
+            await runner.run(0.1, lambda: None)
+        assert busy.value.status_code == 503
+
+        queued.cancel()
+        await asyncio.sleep(0.01)
+        assert runner.stats()["waiting"] == 0
+        release.set()
+        await running
+        assert await runner.run(0.1, lambda: "next") == "next"
+
+    asyncio.run(main())
+
+
+def test_endpoint_reports_queue_and_rejections(monkeypatch):
+    """Test analyses pass through the scheduler, and rejections reach the client as 429"""
+    with open(DATA_DIR / "sine_440hz.wav", "rb") as f:
+        content = f.read()
+
+    response = client.post("/api/v1/analyze/pitch", files={"file": ("a.wav", content, "audio/wav")})
+    assert response.status_code == 200
+    assert "queue;dur=" in response.headers["server-timing"]
+
+    monkeypatch.setattr(scheduler, "SCHEDULER", _scheduler(client_concurrency=0))
+    rejected = client.post(
+        "/api/v1/analyze/intensity", params={"time_step": 0.02},
+        headers={scheduler.CLIENT_HEADER: "annotator-1"},
+        files={"file": ("a.wav", content, "audio/wav")},
+    )
+    assert rejected.status_code == 429
+    assert rejected.headers["retry-after"] == "1"
+
+
+def test_client_header_only_believed_from_trusted_proxy(monkeypatch):
+    """Test a client can't pick its own identity, but a trusted proxy can name one"""
+    def request(peer: str, header: str | None = None) -> Request:
+        headers = [(scheduler.CLIENT_HEADER.lower().encode(), header.encode())] if header else []
+        return Request({"type": "http", "headers": headers, "client": (peer, 5000)})
+
+    assert scheduler.client_id(request("10.0.0.5", "annotator-1")) == "10.0.0.5"
+    assert scheduler.client_id(request("10.0.0.5", "annotator-2")) == "10.0.0.5"
+
+    monkeypatch.setattr(scheduler, "TRUSTED_PROXIES", frozenset({"10.0.0.1"}))
+    assert scheduler.client_id(request("10.0.0.1", "annotator-1")) == "annotator-1"
+    assert scheduler.client_id(request("10.0.0.1")) == "10.0.0.1"
+    assert scheduler.client_id(request("10.0.0.5", "annotator-1")) == "10.0.0.5"
+
+
+class _Client:
+    """Stands in for a Request whose client disconnects after a while."""
+
+    def __init__(self, after: float):
+        self.gone_at = time.perf_counter() + after
+
+    async def is_disconnected(self) -> bool:
+        return time.perf_counter() >= self.gone_at
+
+
+def test_disconnect_cancels_running_and_queued_work():
+    """Test a disconnect ends the request with 499, signals the worker and frees the queue"""
+    runner = _scheduler()
+    observed = []
+
+    def until_cancelled():
+        deadline = time.perf_counter() + 5
+        while not scheduler.cancelled() and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        observed.append(scheduler.cancelled())
+
+    def cancellations(stage):
+        return metrics.REGISTRY.get_sample_value(
+            "linguai_analysis_cancellations_total", {"endpoint": "other", "stage": stage},
+        ) or 0.0
+
+    running_before, queued_before = cancellations("running"), cancellations("queued")
+
+    async def main():
+        token = scheduler.current_request.set(_Client(after=0.3))
+        running = asyncio.create_task(runner.run(0.1, until_cancelled))
+        scheduler.current_request.set(_Client(after=0.1))
+        await asyncio.sleep(0.05)
+        queued = asyncio.create_task(runner.run(0.1, lambda: None))
+        scheduler.current_request.reset(token)
+        for task in (running, queued):
+            with pytest.raises(HTTPException) as gone:
+                await task
+            assert gone.value.status_code == 499
+        await asyncio.sleep(0.1)
+
+    begin = time.perf_counter()
+    asyncio.run(main())
+    assert time.perf_counter() - begin < 2
+    assert observed == [True]
+    assert runner.stats()["waiting"] == 0
+    assert runner.stats()["running"] == {"interactive": 0, "batch": 0}
+    assert cancellations("running") == running_before + 1
+    assert cancellations("queued") == queued_before + 1
+
+
+def test_failed_transcode_leaves_no_temp_files(monkeypatch, tmp_path):
+    """Test the temp input and output of a failed conversion are removed"""
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    response = client.post(
+        "/api/v1/analyze/pitch", files={"file": ("broken.mp3", b"not audio", "audio/mpeg")},
+    )
+    assert response.status_code in (400, 500)
+    assert list(tmp_path.iterdir()) == []
+
+
+class _SlowCheckClient:
+    """A Request whose disconnect check takes a while, and then reports a disconnect."""
+
+    async def is_disconnected(self) -> bool:
+        await asyncio.sleep(0.2)
+        return True
+
+
+def test_slot_granted_during_disconnect_check_is_released():
+    """Test a slot granted while the disconnect is being checked goes back to the scheduler"""
+    runner = _scheduler()
+    release = threading.Event()
+
+    async def main():
+        running = asyncio.create_task(runner.run(0.1, release.wait, 5))
+        await asyncio.sleep(0.05)
+        token = scheduler.current_request.set(_SlowCheckClient())
+        queued = asyncio.create_task(runner.run(0.1, lambda: None))
+        scheduler.current_request.reset(token)
+        # Free the slot while the queued request's disconnect check is under way
+        await asyncio.sleep(scheduler.DISCONNECT_POLL_INTERVAL + 0.05)
+        release.set()
+        await running
+        with pytest.raises(HTTPException) as gone:
+            await queued
+        assert gone.value.status_code == 499
+        # A leaked slot would leave this waiting forever
+        assert await asyncio.wait_for(runner.run(0.1, lambda: "next"), 5) == "next"
+
+    asyncio.run(main())
+    assert runner.stats()["running"] == {"interactive": 0, "batch": 0}
+    assert runner.stats()["waiting"] == 0
+
+
+def test_disconnected_work_counts_against_its_client_until_done():
+    """Test a client can't get past its limits by disconnecting from work still running"""
+    runner = _scheduler(slots=2, batch_slots=2, client_concurrency=1)
+    release = threading.Event()
+
+    async def main():
+        token = scheduler.current_request.set(_Client(after=0.05))
+        # Ignores cancelled(), as an uninterruptible Praat call does
+        abandoned = asyncio.create_task(runner.run(0.1, release.wait, 5))
+        scheduler.current_request.reset(token)
+        with pytest.raises(HTTPException) as gone:
+            await abandoned
+        assert gone.value.status_code == 499
+
+        with pytest.raises(HTTPException) as too_many:
+            await runner.run(0.1, lambda: None)
+        assert too_many.value.status_code == 429
+
+        release.set()
+        await asyncio.sleep(0.05)
+        assert await runner.run(0.1, lambda: "next") == "next"
+
+    asyncio.run(main())
+    assert runner.stats()["clients"] == 0
@@ -0,0 +1,67 @@
+"""Tests for start/end selection on the analyze endpoints"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+
+
+def _analyze(endpoint: str, name: str = "long_10s.wav", **params):
+    with open(DATA_DIR / name, "rb") as f:
+        return client.post(
+            f"/api/v1/analyze/{endpoint}",
+            params=params,
+            files={"file": (name, f, "audio/wav")},
+        )
+
+
+@pytest.mark.parametrize("endpoint", ["spectrogram", "formants", "pitch", "intensity", "waveform"])
+def test_selection_times_are_absolute(endpoint):
+    """Test frames of a selection lie inside it, on the file's timeline"""
+    response = _analyze(endpoint, start=4.0, end=5.5)
+    assert response.status_code == 200
+    times = response.json()["times"]
+    assert times
+    assert min(times) >= 4.0
+    assert max(times) <= 5.5
+    assert max(times) > 5.4
+
+
+def test_selection_matches_full_file_analysis():
+    """Test padding keeps values at the selection edges equal to full-file values"""
+    full = _analyze("intensity").json()
+    selection = _analyze("intensity", start=4.0, end=5.5).json()
+
+    # Frame grids differ between the two analyses, so compare on the full-file contour
+    expected = np.interp(selection["times"], full["times"], full["values"])
+    np.testing.assert_allclose(selection["values"], expected, atol=0.5)
+
+
+def test_fast_pitch_selection_uses_praat_frames():
+    """Test mode=fast returns the same selection frames as Praat's tracker"""
+    praat = _analyze("pitch", start=4.0, end=5.5).json()
+    fast = _analyze("pitch", start=4.0, end=5.5, mode="fast").json()
+    np.testing.assert_allclose(fast["times"], praat["times"], atol=1e-9)
+    assert sum(f is not None for f in fast["frequencies"]) > 0
+    assert _analyze("pitch", mode="yin").status_code == 400
+
+
+def test_spectrogram_selection_duration():
+    """Test the spectrogram reports the selection's duration"""
+    data = _analyze("spectrogram", start=1.0, end=3.0).json()
+    assert data["duration"] == pytest.approx(2.0, abs=1e-3)
+    assert len(data["intensities"]) == len(data["times"])
+
+
+@pytest.mark.parametrize("params", [{"start": -1.0}, {"start": 2.0, "end": 1.0}, {"start": 60.0}])
+def test_invalid_selection(params):
+    """Test negative, reversed and out-of-range selections are rejected"""
+    assert _analyze("pitch", **params).status_code == 400
+
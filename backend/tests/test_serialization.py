@@ -0,0 +1,65 @@
+"""Tests for response precision"""
+
+from pathlib import Path
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app import serialization
+from app.main import app
+
+client = TestClient(app)
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+
+
+def _analyze(endpoint: str, **params):
+    with open(DATA_DIR / "speech_like.wav", "rb") as f:
+        return client.post(
+            f"/api/v1/analyze/{endpoint}",
+            params=params,
+            files={"file": ("speech_like.wav", f, "audio/wav")},
+        )
+
+
+def _significant_digits(value: float) -> int:
+    return len(repr(abs(value)).replace(".", "").lstrip("0").rstrip("0").split("e")[0])
+
+
+def test_round_significant():
+    """Test rounding keeps magnitude and prints short"""
+    values = serialization.round_significant([123456.789, 0.000123456, -2.5e-9, 0.0, np.nan], 3)
+    assert repr(values[0]) == repr(np.float64(123000.0))
+    assert values.tolist()[:4] == [123000.0, 0.000123, -2.5e-09, 0.0]
+    assert np.isnan(values[4])
+
+
+def test_float_list_maps_nan_to_none():
+    """Test NaN and None both serialize as null"""
+    assert serialization.float_list([1.23456, None, float("nan")], 2) == [1.2, None, None]
+
+
+def test_precision_parameter_rounds_values():
+    """Test precision limits significant digits and shrinks the payload"""
+    full = _analyze("pitch")
+    rounded = _analyze("pitch", precision=4)
+    assert rounded.status_code == 200
+    assert len(rounded.content) < len(full.content)
+
+    frequencies = [f for f in rounded.json()["frequencies"] if f is not None]
+    assert frequencies
+    assert all(_significant_digits(f) <= 4 for f in frequencies)
+    assert rounded.json()["frequencies"].count(None) == full.json()["frequencies"].count(None)
+
+
+def test_precision_default_from_environment(monkeypatch):
+    """Test LINGUAI_RESPONSE_PRECISION sets the default"""
+    monkeypatch.setenv("LINGUAI_RESPONSE_PRECISION", "3")
+    values = _analyze("intensity").json()["values"]
+    assert all(_significant_digits(v) <= 3 for v in values)
+
+
+def test_spectrogram_matrix_is_float32_precision():
+    """Test spectrogram intensities carry at most float32's 7 digits"""
+    intensities = _analyze("spectrogram").json()["intensities"]
+    assert all(_significant_digits(v) <= 7 for row in intensities[:20] for v in row)
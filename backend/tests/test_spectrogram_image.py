@@ -0,0 +1,105 @@
+"""Tests for the spectrogram image endpoint"""
+
+import struct
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app import analysis_cache, compute
+from app.main import app
+
+client = TestClient(app)
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    analysis_cache.SPECTROGRAMS.clear()
+    analysis_cache.SPECTROGRAM_IMAGES.clear()
+    yield
+    analysis_cache.SPECTROGRAMS.clear()
+    analysis_cache.SPECTROGRAM_IMAGES.clear()
+
+
+def _render(**params):
+    with open(DATA_DIR / "speech_like.wav", "rb") as f:
+        return client.post(
+            "/api/v1/analyze/spectrogram/image",
+            params=params,
+            files={"file": ("speech_like.wav", f, "audio/wav")},
+        )
+
+
+def test_renders_png_at_requested_size():
+    """Test the image has the requested pixel size and is far smaller than JSON"""
+    response = _render(width=640, height=200, colormap="viridis")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    width, height, depth, color_type = struct.unpack(">IIBB", response.content[16:26])
+    assert (width, height, depth, color_type) == (640, 200, 8, 2)
+
+    with open(DATA_DIR / "speech_like.wav", "rb") as f:
+        json_response = client.post(
+            "/api/v1/analyze/spectrogram", files={"file": ("speech_like.wav", f, "audio/wav")},
+        )
+    assert len(response.content) * 4 < len(json_response.content)
+
+
+def test_images_and_spectrograms_are_cached():
+    """Test a repeated render is served from the image cache, and restyling reuses the analysis"""
+    first = _render(width=300, height=100)
+    assert analysis_cache.SPECTROGRAM_IMAGES.stats()["entries"] == 1
+    assert _render(width=300, height=100).content == first.content
+    assert analysis_cache.SPECTROGRAM_IMAGES.stats()["entries"] == 1
+
+    restyled = _render(width=300, height=100, dynamic_range=40)
+    assert restyled.content != first.content
+    assert analysis_cache.SPECTROGRAMS.stats()["entries"] == 1
+    assert 'linguai_analysis_cache_lookups_total{cache="spectrogram",result="hit"}' in client.get("/metrics").text
+
+
+def test_long_overview_is_pooled_as_computed(tmp_path, monkeypatch):
+    """Test a long overview pools its frames block by block: the same image, without every frame in memory"""
+    import parselmouth
+
+    sound = parselmouth.Sound(str(DATA_DIR / "long_10s.wav"))
+    path = tmp_path / "long_1min.wav"
+    parselmouth.Sound(np.tile(sound.values, 6), sampling_frequency=sound.sampling_frequency).save(str(path), "WAV")
+    content = path.read_bytes()
+
+    def render():
+        analysis_cache.SPECTROGRAM_IMAGES.clear()
+        tracemalloc.start()
+        response = client.post(
+            "/api/v1/analyze/spectrogram/image", params={"width": 200, "engine": "numpy"},
+            files={"file": (path.name, content, "audio/wav")},
+        )
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert response.status_code == 200
+        return response.content, peak
+
+    pooled, pooled_peak = render()
+    assert analysis_cache.SPECTROGRAMS.stats()["entries"] == 0
+
+    # One block: every frame analyzed, cached and pooled at once
+    monkeypatch.setattr(compute, "IMAGE_BLOCK", 1e9)
+    whole, whole_peak = render()
+    assert pooled == whole
+    assert pooled_peak + analysis_cache.SPECTROGRAMS.stats()["bytes"] < whole_peak
+
+
+@pytest.mark.parametrize("params", [
+    {"width": 0},
+    {"height": 10000},
+    {"colormap": "rainbow"},
+    {"image_format": "gif"},
+    {"dynamic_range": 0},
+])
+def test_invalid_render_parameters(params):
+    """Test invalid sizes, colormaps and formats are rejected"""
+    assert _render(**params).status_code == 400
@@ -14,15 +14,36 @@ from .acoustic import (
     get_spectrogram,
     get_formants,
     get_pitch,
+    get_intensity,
+    get_cpps,
 )
 from .annotation import Annotation, Tier, TextGrid
+from .channels import AnalysisCancelled, analyze_channels
+from .feature_store import FeatureStore, FrameSelection
+from .measurements import IntervalMeasurements, measure_intervals
+from .pcm_cache import PCMCache, CachedPCM
+from .spectrogram_image import render_spectrogram, encode_image
+from .tracks import FeatureSettings
 
 __all__ = [
     "load_sound",
     "get_spectrogram",
     "get_formants",
     "get_pitch",
+    "get_intensity",
+    "get_cpps",
+    "analyze_channels",
+    "AnalysisCancelled",
     "Annotation",
     "Tier",
     "TextGrid",
+    "FeatureStore",
+    "FeatureSettings",
+    "FrameSelection",
+    "measure_intervals",
+    "IntervalMeasurements",
+    "PCMCache",
+    "CachedPCM",
+    "render_spectrogram",
+    "encode_image",
 ]
@@ -5,11 +5,17 @@ This module wraps Praat's acoustic analysis capabilities
 with a modern, Pythonic interface.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 import numpy as np
 
+from .pcm_cache import PCMCache
+from .cepstral import prominence_tracks
+from .fast_pitch import yin_pitch
+from .lpc import lpc_formants
+from .stft import gaussian_spectrogram
+
 try:
     import parselmouth
     from parselmouth.praat import call
@@ -19,6 +25,11 @@ except ImportError:
     parselmouth = None
 
 
+SPECTROGRAM_ENGINES = ("praat", "numpy")
+PITCH_MODES = ("praat", "fast")
+FORMANT_ENGINES = ("praat", "lpc")
+
+
 @dataclass
 class SpectrogramData:
     """Container for spectrogram analysis results."""
@@ -28,6 +39,10 @@ class SpectrogramData:
     duration: float
     sample_rate: int
 
+    def astype(self, dtype) -> "SpectrogramData":
+        """Copy with the intensity matrix converted to dtype (e.g. np.float32)."""
+        return replace(self, intensities=self.intensities.astype(dtype, copy=False))
+
 
 @dataclass
 class FormantData:
@@ -37,6 +52,20 @@ class FormantData:
     f2: np.ndarray
     f3: np.ndarray
     f4: np.ndarray
+    f5: Optional[np.ndarray] = None  # Filled by the "lpc" engine
+    bandwidths: Optional[np.ndarray] = None  # 2D array [time, formant], B1, B2, ... ("lpc" engine)
+
+    def astype(self, dtype) -> "FormantData":
+        """Copy with the formant tracks converted to dtype (e.g. np.float32)."""
+        return replace(
+            self,
+            f1=self.f1.astype(dtype, copy=False),
+            f2=self.f2.astype(dtype, copy=False),
+            f3=self.f3.astype(dtype, copy=False),
+            f4=self.f4.astype(dtype, copy=False),
+            f5=None if self.f5 is None else self.f5.astype(dtype, copy=False),
+            bandwidths=None if self.bandwidths is None else self.bandwidths.astype(dtype, copy=False),
+        )
 
 
 @dataclass
@@ -46,6 +75,35 @@ class PitchData:
     frequencies: np.ndarray  # NaN for unvoiced segments
     unit: str = "Hz"
 
+    def astype(self, dtype) -> "PitchData":
+        """Copy with the frequency track converted to dtype (e.g. np.float32)."""
+        return replace(self, frequencies=self.frequencies.astype(dtype, copy=False))
+
+
+@dataclass
+class IntensityData:
+    """Container for intensity analysis results."""
+    times: np.ndarray
+    values: np.ndarray  # dB
+
+    def astype(self, dtype) -> "IntensityData":
+        """Copy with the intensity track converted to dtype (e.g. np.float32)."""
+        return replace(self, values=self.values.astype(dtype, copy=False))
+
+
+@dataclass
+class CPPData:
+    """Container for cepstral peak prominence results."""
+    times: np.ndarray
+    cpp: np.ndarray  # Per frame, from the unsmoothed cepstrogram (dB)
+    cpps: np.ndarray  # Per frame, from the smoothed cepstrogram (dB)
+    cpp_mean: float
+    cpps_mean: float  # The CPPS summary, as Praat's Get CPPS
+
+    def astype(self, dtype) -> "CPPData":
+        """Copy with the prominence tracks converted to dtype (e.g. np.float32)."""
+        return replace(self, cpp=self.cpp.astype(dtype, copy=False), cpps=self.cpps.astype(dtype, copy=False))
+
 
 def _check_parselmouth():
     """Raise error if Parselmouth is not installed."""
@@ -56,15 +114,26 @@ def _check_parselmouth():
         )
 
 
-def load_sound(path: Union[str, Path]) -> "parselmouth.Sound":
+def load_sound(
+    path: Union[str, Path],
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    cache_dir: Optional[Union[str, Path]] = None,
+) -> "parselmouth.Sound":
     """
     Load an audio file as a Parselmouth Sound object.
 
     Args:
         path: Path to audio file (WAV, MP3, FLAC, etc.)
+        start: Start of the region to load (seconds), default the beginning
+        end: End of the region to load (seconds), default the end
+        cache_dir: Directory for a PCMCache. The file is decoded into it
+            once; later loads memory-map the cached samples and read only
+            the requested region.
 
     Returns:
-        Parselmouth Sound object
+        Parselmouth Sound object, keeping the file's timeline when a
+        region is requested
 
     Raises:
         ImportError: If Parselmouth is not installed
@@ -74,7 +143,21 @@ def load_sound(path: Union[str, Path]) -> "parselmouth.Sound":
     path = Path(path)
     if not path.exists():
         raise FileNotFoundError(f"Audio file not found: {path}")
-    return parselmouth.Sound(str(path))
+
+    if cache_dir is not None:
+        cache = PCMCache(cache_dir)
+        key = cache.key_for_file(path)
+        entry = cache.get(key) or cache.put_sound(key, parselmouth.Sound(str(path)))
+        return entry.to_sound(start, end)
+
+    sound = parselmouth.Sound(str(path))
+    if start is None and end is None:
+        return sound
+    return sound.extract_part(
+        from_time=sound.xmin if start is None else start,
+        to_time=sound.xmax if end is None else end,
+        preserve_times=True,
+    )
 
 
 def get_spectrogram(
@@ -82,6 +165,8 @@ def get_spectrogram(
     time_step: float = 0.005,
     max_frequency: float = 5000.0,
     window_length: float = 0.025,
+    dtype=np.float64,
+    engine: str = "praat",
 ) -> SpectrogramData:
     """
     Generate spectrogram from a sound.
@@ -91,28 +176,39 @@ def get_spectrogram(
         time_step: Time step between frames (seconds)
         max_frequency: Maximum frequency to analyze (Hz)
         window_length: Analysis window length (seconds)
+        dtype: Intensity matrix dtype; np.float32 halves its memory
+        engine: "praat", or "numpy" for the batched STFT in linguai_core.stft
+            (same frames, bins and power as Praat, to floating-point rounding)
 
     Returns:
         SpectrogramData with time, frequency, and intensity arrays
     """
     _check_parselmouth()
 
-    spectrogram = sound.to_spectrogram(
-        time_step=time_step,
-        maximum_frequency=max_frequency,
-        window_length=window_length,
-    )
+    if engine == "numpy":
+        times, frequencies, power = gaussian_spectrogram(
+            sound.values, sound.sampling_frequency, sound.x1,
+            window_length=window_length,
+            time_step=time_step,
+            max_frequency=max_frequency,
+            dtype=dtype,
+        )
+    elif engine == "praat":
+        spectrogram = sound.to_spectrogram(
+            time_step=time_step,
+            maximum_frequency=max_frequency,
+            window_length=window_length,
+        )
 
-    times = np.array(spectrogram.xs())
-    frequencies = np.array(spectrogram.ys())
+        times = np.array(spectrogram.xs())
+        frequencies = np.array(spectrogram.ys())
 
-    # Extract intensity matrix
-    intensities = np.zeros((len(times), len(frequencies)))
-    for t_idx in range(spectrogram.n_frames):
-        for f_idx in range(spectrogram.n_bins):
-            value = spectrogram.get_power_at(t_idx + 1, f_idx + 1)
-            # Convert to dB
-            intensities[t_idx, f_idx] = 10 * np.log10(value + 1e-30)
+        # Extract intensity matrix (Praat stores power as [frequency, time])
+        power = spectrogram.values.T.astype(dtype)
+    else:
+        raise ValueError(f"Unknown spectrogram engine: {engine}. Use one of: {', '.join(SPECTROGRAM_ENGINES)}")
+
+    intensities = 10 * np.log10(power + power.dtype.type(1e-30))  # Convert to dB
 
     return SpectrogramData(
         times=times,
@@ -128,6 +224,8 @@ def get_formants(
     time_step: float = 0.01,
     max_formant: float = 5500.0,
     num_formants: int = 5,
+    dtype=np.float64,
+    engine: str = "praat",
 ) -> FormantData:
     """
     Extract formant frequencies (F1-F4) from a sound.
@@ -137,12 +235,40 @@ def get_formants(
         time_step: Time step between measurements (seconds)
         max_formant: Maximum formant frequency (Hz)
         num_formants: Number of formants to track
+        dtype: Formant track dtype (times stay float64)
+        engine: "praat" (To Formant (burg)), or "lpc" for the batched Burg
+            analysis in linguai_core.lpc: same frames and values as Praat,
+            read out as arrays, with F5 and the bandwidths B1-B5 as well
 
     Returns:
         FormantData with time and formant frequency arrays
     """
     _check_parselmouth()
 
+    if engine == "lpc":
+        # As To Formant (burg), analyze at twice the formant ceiling
+        if sound.sampling_frequency != 2 * max_formant:
+            sound = sound.resample(2 * max_formant)
+        times, frequencies, bandwidths = lpc_formants(
+            sound.values, sound.sampling_frequency, sound.x1,
+            time_step=time_step,
+            num_formants=num_formants,
+        )
+        # Fewer than five formants are looked for with a lower LPC order
+        frequencies = np.pad(frequencies, ((0, 0), (0, max(5 - frequencies.shape[1], 0))),
+                             constant_values=np.nan)
+        return FormantData(
+            times=times,
+            f1=frequencies[:, 0],
+            f2=frequencies[:, 1],
+            f3=frequencies[:, 2],
+            f4=frequencies[:, 3],
+            f5=frequencies[:, 4],
+            bandwidths=bandwidths,
+        ).astype(dtype)
+    if engine != "praat":
+        raise ValueError(f"Unknown formant engine: {engine}. Use one of: {', '.join(FORMANT_ENGINES)}")
+
     formants = sound.to_formant_burg(
         time_step=time_step,
         max_number_of_formants=num_formants,
@@ -168,7 +294,7 @@ def get_formants(
         f2=get_formant_track(2),
         f3=get_formant_track(3),
         f4=get_formant_track(4),
-    )
+    ).astype(dtype)
 
 
 def get_pitch(
@@ -176,6 +302,8 @@ def get_pitch(
     time_step: float = 0.01,
     pitch_floor: float = 75.0,
     pitch_ceiling: float = 600.0,
+    dtype=np.float64,
+    mode: str = "praat",
 ) -> PitchData:
     """
     Extract pitch (F0) contour from a sound.
@@ -185,12 +313,27 @@ def get_pitch(
         time_step: Time step between measurements (seconds)
         pitch_floor: Minimum pitch to detect (Hz)
         pitch_ceiling: Maximum pitch to detect (Hz)
+        dtype: Frequency track dtype (times stay float64)
+        mode: "praat" (autocorrelation method), or "fast" for the
+            frame-batched YIN tracker in linguai_core.fast_pitch: same
+            frame times, several times faster, rougher voicing decisions
 
     Returns:
         PitchData with time and frequency arrays
     """
     _check_parselmouth()
 
+    if mode == "fast":
+        times, frequencies = yin_pitch(
+            sound.values, sound.sampling_frequency, sound.x1,
+            time_step=time_step,
+            pitch_floor=pitch_floor,
+            pitch_ceiling=pitch_ceiling,
+        )
+        return PitchData(times=times, frequencies=frequencies).astype(dtype)
+    if mode != "praat":
+        raise ValueError(f"Unknown pitch mode: {mode}. Use one of: {', '.join(PITCH_MODES)}")
+
     pitch = sound.to_pitch(
         time_step=time_step,
         pitch_floor=pitch_floor,
@@ -205,4 +348,89 @@ def get_pitch(
         f0 = pitch.get_value_at_time(times[i])
         frequencies[i] = f0 if not np.isnan(f0) else np.nan
 
-    return PitchData(times=times, frequencies=frequencies)
+    return PitchData(times=times, frequencies=frequencies).astype(dtype)
+
+
+def get_intensity(
+    sound: "parselmouth.Sound",
+    time_step: float = 0.01,
+    minimum_pitch: float = 100.0,
+    dtype=np.float64,
+) -> IntensityData:
+    """
+    Extract the intensity contour of a sound (To Intensity).
+
+    Args:
+        sound: Parselmouth Sound object
+        time_step: Time step between measurements (seconds)
+        minimum_pitch: Lowest pitch to smooth out; sets the window length (Hz)
+        dtype: Intensity track dtype (times stay float64)
+
+    Returns:
+        IntensityData with time and dB arrays
+    """
+    _check_parselmouth()
+
+    intensity = sound.to_intensity(time_step=time_step, minimum_pitch=minimum_pitch)
+    return IntensityData(
+        times=np.array(intensity.xs()),
+        values=np.array(intensity.values[0]),
+    ).astype(dtype)
+
+
+def get_cpps(
+    sound: "parselmouth.Sound",
+    pitch_floor: float = 60.0,
+    pitch_ceiling: float = 330.0,
+    time_step: float = 0.002,
+    max_frequency: float = 5000.0,
+    pre_emphasis: float = 50.0,
+    time_averaging: float = 0.01,
+    quefrency_averaging: float = 0.001,
+    dtype=np.float64,
+) -> CPPData:
+    """
+    Cepstral peak prominence (CPP) and smoothed CPP (CPPS) of a sound.
+
+    Computed with linguai_core.cepstral, which reproduces Praat's
+    To PowerCepstrogram and Get CPPS with a least-squares tilt line fitted
+    from 1 ms to the highest quefrency (pass that quefrency explicitly to
+    Praat to compare: Praat 6.1 fits from 0 s when the end is left at 0).
+
+    Args:
+        sound: Parselmouth Sound object
+        pitch_floor: Lowest pitch searched for; also sets the window length (Hz)
+        pitch_ceiling: Highest pitch searched for (Hz)
+        time_step: Time step between frames (seconds)
+        max_frequency: The sound is analyzed at twice this rate (Hz)
+        pre_emphasis: Pre-emphasis from this frequency upwards (Hz)
+        time_averaging: Smoothing window over time for CPPS (seconds)
+        quefrency_averaging: Smoothing window over quefrency for CPPS (seconds)
+        dtype: Prominence track dtype (times stay float64)
+
+    Returns:
+        CPPData with per-frame CPP and CPPS tracks and their means
+    """
+    _check_parselmouth()
+
+    if sound.sampling_frequency != 2 * max_frequency:
+        sound = sound.resample(2 * max_frequency)
+    times, cpp, cpps = prominence_tracks(
+        sound.values, sound.sampling_frequency, sound.x1,
+        pitch_floor=pitch_floor,
+        pitch_ceiling=pitch_ceiling,
+        time_step=time_step,
+        pre_emphasis=pre_emphasis,
+        time_averaging=time_averaging,
+        quefrency_averaging=quefrency_averaging,
+    )
+    if len(times) == 0:
+        raise ValueError("Sound is shorter than the analysis window")
+
+    return CPPData(
+        times=times,
+        cpp=cpp,
+        cpps=cpps,
+        cpp_mean=float(cpp.mean()),
+        cpps_mean=float(cpps.mean()),
+    ).astype(dtype)
@@ -0,0 +1,321 @@
+"""
+Cepstral peak prominence (CPP and smoothed CPPS) in NumPy.
+
+Reproduces Praat's Sound: To PowerCepstrogram and PowerCepstrogram:
+Get CPPS (with the "Least squares" tilt line) for long recordings without
+per-frame calls into Praat. The power cepstra of all frames of a block
+come from one batched pair of real FFTs; smoothing over time and
+quefrency, the tilt-line regression and the peak search are array
+operations over the block. prominence_tracks streams these blocks, so
+only the prominences of a long recording are held, not its cepstrogram.
+
+The sound must already be at the analysis rate (twice the maximum
+frequency); get_cpps resamples it with Praat first, as Praat does.
+
+Parity with Praat (tested): the cepstrogram and its smoothed version
+match to 1e-12 relative, and per-frame prominences to 1e-9 dB.
+"""
+
+import math
+import time
+from typing import Optional
+
+import numpy as np
+
+from .frames import short_term_frame_times
+from .lpc import formant_window, pre_emphasize
+
+# The analysis window spans this many periods of the pitch floor
+# (the physical Gaussian window is twice as long)
+PERIODS_PER_WINDOW = 3.0
+
+# Frames transformed per batch, bounding the temporary frame matrices
+FRAMES_PER_BLOCK = 256
+
+
+def power_cepstrogram(
+    values: np.ndarray,
+    sample_rate: float,
+    x1: float,
+    pitch_floor: float = 60.0,
+    time_step: float = 0.002,
+    pre_emphasis: float = 50.0,
+    deadline: Optional[float] = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Power cepstrogram of samples, as Praat's To PowerCepstrogram.
+
+    Args:
+        values: Samples at the analysis rate, [samples] or [channels, samples];
+            channels are averaged
+        sample_rate: Sampling frequency (Hz), normally twice the maximum frequency
+        x1: Time of the first sample (seconds)
+        pitch_floor: Lowest pitch the window must fit three periods of (Hz)
+        time_step: Time step between frames (seconds)
+        pre_emphasis: Pre-emphasis from this frequency upwards (Hz)
+        deadline: time.monotonic() time after which to stop between
+            blocks of frames, returning the frames computed so far
+
+    Returns:
+        (frame times, quefrencies in seconds, power [time, quefrency])
+    """
+    times, quefrencies, cepstra = _cepstra(values, sample_rate, x1, pitch_floor, time_step, pre_emphasis)
+    power = np.empty((len(times), len(quefrencies)))
+    for block in range(0, len(times), FRAMES_PER_BLOCK):
+        done = min(block + FRAMES_PER_BLOCK, len(times))
+        power[block:done] = cepstra(block, done)
+        if deadline is not None and done < len(times) and time.monotonic() >= deadline:
+            return times[:done], quefrencies, power[:done]
+
+    return times, quefrencies, power
+
+
+def _cepstra(values: np.ndarray, sample_rate: float, x1: float, pitch_floor: float,
+             time_step: float, pre_emphasis: float):
+    """
+    Frame times and quefrencies of a power cepstrogram, and a function
+    giving the power cepstra [time, quefrency] of frames first to stop.
+    """
+    samples = np.asarray(values, dtype=np.float64)
+    if samples.ndim == 2:
+        samples = samples.mean(axis=0)
+    n_samples = len(samples)
+    dx = 1.0 / sample_rate
+
+    window_duration = 2.0 * PERIODS_PER_WINDOW / pitch_floor
+    n_window = int(round(window_duration * sample_rate))
+    n_fft = 2
+    while n_fft < n_window:
+        n_fft *= 2
+    n_quefrencies = n_fft // 2 + 1
+    quefrencies = np.arange(n_quefrencies) * dx
+
+    times = short_term_frame_times(n_samples, dx, x1, window_duration, time_step)
+    if len(times) == 0:
+        return times, quefrencies, None
+
+    samples = pre_emphasize(samples, sample_rate, pre_emphasis)
+    window = formant_window(n_window)
+
+    # Each frame starts at the sample nearest to half a window before its
+    # centre, halves rounded up as Praat does; samples outside the signal
+    # are zeros
+    starts = np.floor((times - 0.5 * window_duration - x1) / dx + 0.5).astype(np.intp)
+    padding = max(int(-starts.min()), 0)
+    padded = np.concatenate([np.zeros(padding), samples, np.zeros(n_window)])
+    frames_view = np.lib.stride_tricks.sliding_window_view(padded, n_window)
+
+    def cepstra(first: int, stop: int) -> np.ndarray:
+        frames = frames_view[starts[first:stop] + padding]
+        frames = (frames - frames.mean(axis=1, keepdims=True)) * window
+        spectrum = np.fft.rfft(frames, n_fft) * dx
+        log_power = np.log(spectrum.real ** 2 + spectrum.imag ** 2 + 1e-300)
+        cepstrum = np.fft.irfft(log_power, n_fft)[:, :n_quefrencies] * sample_rate
+        return cepstrum * cepstrum
+
+    return times, quefrencies, cepstra
+
+
+def _box_mean(values: np.ndarray, width: float, lower: float, upper: float, axis: int) -> np.ndarray:
+    """
+    Running mean along an axis over a box `width` samples wide of the
+    linearly interpolated values (constant beyond the end samples), with
+    the box clipped to [lower, upper] in sample-index units.
+    """
+    # Work along the first axis so that every gather below copies whole rows
+    moved = np.ascontiguousarray(np.moveaxis(values, axis, 0))
+    n = len(moved)
+    if n < 2:
+        return values.copy()
+    # Integral of the interpolated values from sample 0 to each sample
+    integral = np.empty_like(moved)
+    integral[0] = 0.0
+    np.cumsum(0.5 * (moved[1:] + moved[:-1]), axis=0, out=integral[1:])
+    step = moved[1:] - moved[:-1]
+
+    def integral_to(x: np.ndarray) -> np.ndarray:
+        inside = np.clip(x, 0, n - 1)
+        k = np.minimum(np.floor(inside).astype(np.intp), n - 2)
+        fraction = (inside - k)[:, np.newaxis]
+        value = integral[k] + fraction * (moved[k] + 0.5 * fraction * step[k])
+        # Constant continuation before the first and after the last sample
+        value += np.minimum(x, 0)[:, np.newaxis] * moved[0]
+        value += np.maximum(x - (n - 1), 0)[:, np.newaxis] * moved[-1]
+        return value
+
+    def shifted_integral(rows: slice, offset: float) -> np.ndarray:
+        # integral_to(rows + offset) where no clipping applies, by slicing
+        k = math.floor(offset)
+        fraction = offset - k
+        shifted = slice(rows.start + k, rows.stop + k)
+        return integral[shifted] + fraction * (moved[shifted] + 0.5 * fraction * step[shifted])
+
+    half = 0.5 * width
+    mean = np.empty_like(moved)
+    # Away from the ends every box spans whole interpolated samples at the
+    # same offsets; only the rows near the ends need clipping
+    interior = slice(-math.floor(-half), max(n - 1 - math.floor(half), -math.floor(-half)))
+    mean[interior] = (shifted_integral(interior, half) - shifted_integral(interior, -half)) / width
+    edges = np.r_[0:interior.start, interior.stop:n]
+    edges = edges[edges < n]
+    low = np.maximum(edges - half, lower)
+    high = np.minimum(edges + half, upper)
+    mean[edges] = (integral_to(high) - integral_to(low)) / (high - low)[:, np.newaxis]
+    return np.moveaxis(mean, 0, axis)
+
+
+def smooth_cepstrogram(power: np.ndarray, time_step: float, quefrency_step: float,
+                       time_window: float = 0.01, quefrency_window: float = 0.001,
+                       first_frame: int = 0, n_frames: Optional[int] = None) -> np.ndarray:
+    """
+    Smooth a power cepstrogram [time, quefrency] by running means over
+    time_window seconds and quefrency_window seconds of quefrency, as
+    Praat's PowerCepstrogram: Smooth.
+
+    power may be frames first_frame on of a cepstrogram of n_frames
+    frames (default: all of them); only frames at least
+    smoothing_context(time_step, time_window) from its ends are then
+    smoothed as in the whole cepstrogram.
+    """
+    n_quefrencies = power.shape[1]
+    n_frames = power.shape[0] if n_frames is None else n_frames
+    smoothed = power
+    if time_window / time_step > 1.0:
+        smoothed = _box_mean(smoothed, time_window / time_step,
+                             -0.5 - first_frame, n_frames - 0.5 - first_frame, axis=0)
+    if quefrency_window / quefrency_step > 1.0:
+        smoothed = _box_mean(smoothed, quefrency_window / quefrency_step, 0, n_quefrencies - 1, axis=1)
+    return smoothed
+
+
+def smoothing_context(time_step: float, time_window: float = 0.01) -> int:
+    """Frames either side of a frame that smoothing over time_window reads."""
+    return math.ceil(0.5 * time_window / time_step) if time_window / time_step > 1.0 else 0
+
+
+def prominence_tracks(
+    values: np.ndarray,
+    sample_rate: float,
+    x1: float,
+    pitch_floor: float = 60.0,
+    pitch_ceiling: float = 330.0,
+    time_step: float = 0.002,
+    pre_emphasis: float = 50.0,
+    time_averaging: float = 0.01,
+    quefrency_averaging: float = 0.001,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    deadline: Optional[float] = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    CPP and CPPS of the frames from start to end (seconds, default all),
+    as power_cepstrogram, smooth_cepstrogram and peak_prominence of the
+    whole cepstrogram would give them.
+
+    Works through FRAMES_PER_BLOCK frames at a time, each with the frames
+    either side its smoothing reads, keeping only the prominences, so
+    memory doesn't grow with the length of the sound.
+
+    Args:
+        values, sample_rate, x1, pitch_floor, time_step, pre_emphasis:
+            As for power_cepstrogram
+        pitch_ceiling: Highest pitch searched for (Hz)
+        time_averaging, quefrency_averaging: Smoothing windows for CPPS
+            (seconds), as for smooth_cepstrogram
+        start, end: Times of the first and last frames wanted (seconds)
+        deadline: time.monotonic() time after which to stop between
+            blocks of frames, returning the frames computed so far
+
+    Returns:
+        (frame times, CPP in dB, CPPS in dB)
+    """
+    times, quefrencies, cepstra = _cepstra(values, sample_rate, x1, pitch_floor, time_step, pre_emphasis)
+    selected = np.flatnonzero((times >= (-np.inf if start is None else start))
+                              & (times <= (np.inf if end is None else end)))
+    cpp = np.empty(len(selected))
+    cpps = np.empty(len(selected))
+    if len(selected) == 0:
+        return times[selected], cpp, cpps
+
+    context = smoothing_context(time_step, time_averaging)
+    n_frames = len(times)
+    for block in range(0, len(selected), FRAMES_PER_BLOCK):
+        done = min(block + FRAMES_PER_BLOCK, len(selected))
+        first, stop = selected[block], selected[done - 1] + 1
+        around = max(first - context, 0)
+        power = cepstra(around, min(stop + context, n_frames))
+        smoothed = smooth_cepstrogram(
+            power, time_step, quefrencies[1] - quefrencies[0],
+            time_window=time_averaging, quefrency_window=quefrency_averaging,
+            first_frame=around, n_frames=n_frames,
+        )
+        kept = slice(first - around, stop - around)
+        cpp[block:done], _ = peak_prominence(power[kept], quefrencies, pitch_floor, pitch_ceiling)
+        cpps[block:done], _ = peak_prominence(smoothed[kept], quefrencies, pitch_floor, pitch_ceiling)
+        if deadline is not None and done < len(selected) and time.monotonic() >= deadline:
+            return times[selected[:done]], cpp[:done], cpps[:done]
+
+    return times[selected], cpp, cpps
+
+
+def peak_prominence(
+    power: np.ndarray,
+    quefrencies: np.ndarray,
+    pitch_floor: float = 60.0,
+    pitch_ceiling: float = 330.0,
+    fit_start: float = 0.001,
+    fit_end: Optional[float] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Cepstral peak prominence of every frame of a power cepstrogram [time, quefrency].
+
+    The cepstrum is taken in dB; a least-squares line is fitted over the
+    quefrencies from fit_start to fit_end (default the highest), and the
+    prominence is the height of the cepstral peak above that line. The
+    peak is the highest parabolically interpolated local maximum between
+    the quefrencies of pitch_ceiling and pitch_floor, as in Praat.
+
+    Returns:
+        (prominence in dB, quefrency of the peak in seconds) per frame
+    """
+    decibels = 10.0 * np.log10(power + 1e-30)
+    n_frames, n_quefrencies = decibels.shape
+    quefrency_step = quefrencies[1] - quefrencies[0]
+    frames = np.arange(n_frames)
+
+    # Tilt line by least squares, for all frames at once
+    fit_end = quefrencies[-1] if fit_end is None else fit_end
+    fitted = (quefrencies >= fit_start) & (quefrencies <= fit_end)
+    q = quefrencies[fitted]
+    q_centred = q - q.mean()
+    y = decibels[:, fitted]
+    y_mean = y.mean(axis=1)
+    slope = (y - y_mean[:, np.newaxis]) @ q_centred / (q_centred @ q_centred)
+    intercept = y_mean - slope * q.mean()
+
+    # Peak search: the raw end values of the range, then every local
+    # maximum inside it, refined by a parabola through its neighbours
+    first = max(math.ceil((1.0 / pitch_ceiling - quefrencies[0]) / quefrency_step), 1)
+    last = min(math.floor((1.0 / pitch_floor - quefrencies[0]) / quefrency_step), n_quefrencies - 2)
+    if last < first:
+        raise ValueError("Pitch range does not cover any quefrency of the cepstrum")
+    centre = decibels[:, first:last + 1]
+    left = decibels[:, first - 1:last]
+    right = decibels[:, first + 1:last + 2]
+    is_peak = (centre > left) & (centre >= right)
+    slope_mid = 0.5 * (right - left)
+    curvature = 2.0 * centre - left - right
+    with np.errstate(divide="ignore", invalid="ignore"):
+        refined = np.where(is_peak, centre + 0.5 * slope_mid ** 2 / curvature, -np.inf)
+        offsets = np.where(is_peak, slope_mid / curvature, 0.0)
+    candidates = np.concatenate([centre[:, :1], centre[:, -1:], refined], axis=1)
+    positions = np.concatenate([
+        np.zeros((n_frames, 1)),
+        np.full((n_frames, 1), last - first),
+        np.arange(last - first + 1) + offsets,
+    ], axis=1)
+    best = np.argmax(candidates, axis=1)
+    peak = candidates[frames, best]
+    peak_quefrency = quefrencies[0] + (first + positions[frames, best]) * quefrency_step
+
+    return peak - (slope * peak_quefrency + intercept), peak_quefrency
@@ -0,0 +1,248 @@
+"""
+Per-channel analysis of multichannel recordings.
+
+Praat analyzes a multichannel Sound as one signal: To Pitch sums the
+channels' autocorrelations, To Intensity averages their energies. For
+recordings with one speaker per channel each channel needs an analysis
+of its own. analyze_channels runs an analysis on every selected channel
+in a pool of worker processes, so two channels take about the wall time
+of one on two cores; Praat holds the GIL while it computes, so threads
+would run one channel at a time. For the same reason a server can
+isolate a long analysis in a worker process, even of a single channel
+or of all channels mixed, to keep its own GIL free for other requests.
+
+Worker processes are started on demand and kept for reuse. Each runs
+one analysis at a time, so an analysis whose caller gives up is stopped
+by killing the worker running it, without disturbing the others.
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Optional, Sequence, Union
+
+import numpy as np
+
+# Channel selections besides an explicit list of channel indices
+CHANNEL_MODES = ("mix", "all")
+
+# How often a running analysis checks whether it was cancelled (seconds)
+CANCEL_POLL_INTERVAL = 0.05
+
+# Idle worker processes kept for reuse
+MAX_IDLE_WORKERS = os.cpu_count() or 1
+
+_idle_workers: list["_Worker"] = []
+_workers_lock = threading.Lock()
+
+
+class AnalysisCancelled(Exception):
+    """The caller cancelled an analysis before it finished."""
+
+
+def parse_channels(channels: Union[str, Sequence[int]], n_channels: int) -> Optional[list[int]]:
+    """
+    Channel indices (0-based) to analyze separately, or None to analyze
+    the channels together as one signal.
+
+    Args:
+        channels: "mix", "all", a comma-separated list such as "0,1", or
+            a sequence of indices
+        n_channels: Number of channels of the sound
+
+    Raises:
+        ValueError: For an unknown mode or an index outside the sound
+    """
+    if isinstance(channels, str):
+        spec = channels.strip().lower()
+        if spec == "mix":
+            return None
+        if spec == "all":
+            return list(range(n_channels))
+        try:
+            channels = [int(part) for part in spec.split(",")]
+        except ValueError:
+            raise ValueError(
+                f"Invalid channels: {channels}. Use {' or '.join(CHANNEL_MODES)}, "
+                "or comma-separated channel indices"
+            )
+    indices = list(channels)
+    if not indices:
+        raise ValueError("No channels selected")
+    for index in indices:
+        if not 0 <= index < n_channels:
+            raise ValueError(f"Channel {index} does not exist; the sound has {n_channels} channel(s)")
+    return indices
+
+
+def _channel_sound(values: np.ndarray, sample_rate: float, x1: float):
+    """A Sound of one channel (or of [channels, samples]) whose first sample is at x1 (the frame grids depend on it)."""
+    import parselmouth
+    return parselmouth.Sound(values, sampling_frequency=sample_rate, start_time=x1 - 0.5 / sample_rate)
+
+
+def _analyze_channel(analysis: Callable, values: np.ndarray, sample_rate: float,
+                     x1: float, kwargs: dict) -> Any:
+    """Worker side: rebuild one channel as a Sound and analyze it."""
+    return analysis(_channel_sound(values, sample_rate, x1), **kwargs)
+
+
+def _serve(connection: Connection) -> None:
+    """Worker process: analyze the jobs sent over connection until it is closed."""
+    while True:
+        try:
+            job = connection.recv()
+        except EOFError:
+            return
+        try:
+            reply = (True, _analyze_channel(*job))
+        except Exception as e:
+            reply = (False, e)
+        try:
+            connection.send(reply)
+        except Exception as e:
+            # The result or exception doesn't pickle
+            connection.send((False, RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+class _Worker:
+    """A worker process and the parent's end of its job pipe."""
+
+    def __init__(self):
+        # Spawned workers don't inherit the parent's threads or locks
+        context = multiprocessing.get_context("spawn")
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def stop(self, kill: bool = False) -> None:
+        """Let the worker finish (closing its pipe), or kill it mid-analysis."""
+        if kill:
+            self.process.kill()
+        self.connection.close()
+        self.process.join(timeout=5)
+
+
+def _checkout(n_workers: int) -> list[_Worker]:
+    """n_workers worker processes for the caller's exclusive use, reusing idle ones."""
+    with _workers_lock:
+        workers = []
+        while _idle_workers and len(workers) < n_workers:
+            worker = _idle_workers.pop()
+            if worker.process.is_alive():
+                workers.append(worker)
+    return workers + [_Worker() for _ in range(n_workers - len(workers))]
+
+
+def _checkin(workers: list[_Worker]) -> None:
+    """Return workers for reuse, stopping those beyond MAX_IDLE_WORKERS."""
+    with _workers_lock:
+        for worker in workers:
+            if worker.process.is_alive() and len(_idle_workers) < MAX_IDLE_WORKERS:
+                _idle_workers.append(worker)
+            else:
+                worker.stop()
+
+
+@atexit.register
+def shutdown_pool() -> None:
+    """Stop the idle worker processes (they are started again when needed)."""
+    with _workers_lock:
+        workers = _idle_workers[:]
+        _idle_workers.clear()
+    for worker in workers:
+        worker.stop()
+
+
+def _run_in_workers(analysis: Callable, parts: list[np.ndarray], sample_rate: float, x1: float,
+                    kwargs: dict, n_workers: int, cancelled: Optional[Callable[[], bool]]) -> list:
+    """Analyze each part in a worker process, killing the busy workers if cancelled."""
+    workers = _checkout(n_workers)
+    idle = list(workers)
+    busy: dict[Connection, tuple[int, _Worker]] = {}
+    jobs = list(enumerate(parts))
+    results: list = [None] * len(parts)
+    try:
+        while jobs or busy:
+            while jobs and idle:
+                worker = idle.pop()
+                index, part = jobs.pop(0)
+                worker.connection.send((analysis, part, sample_rate, x1, kwargs))
+                busy[worker.connection] = (index, worker)
+            for connection in wait(list(busy), timeout=CANCEL_POLL_INTERVAL):
+                index, worker = busy.pop(connection)
+                try:
+                    succeeded, value = connection.recv()
+                except EOFError:
+                    worker.stop(kill=True)
+                    raise BrokenProcessPool("A worker process died during an analysis")
+                # The worker is free again whether the analysis succeeded or raised
+                idle.append(worker)
+                if not succeeded:
+                    raise value
+                results[index] = value
+            if cancelled is not None and cancelled():
+                raise AnalysisCancelled()
+        return results
+    finally:
+        # Workers still busy (cancelled, or another part failed) are killed
+        for _, worker in busy.values():
+            worker.stop(kill=True)
+        _checkin(idle)
+
+
+def analyze_channels(
+    analysis: Callable,
+    sound: "parselmouth.Sound",
+    channels: Union[str, Sequence[int]] = "all",
+    max_workers: Optional[int] = None,
+    isolate: bool = False,
+    cancelled: Optional[Callable[[], bool]] = None,
+    **kwargs,
+) -> list:
+    """
+    Run analysis(sound, **kwargs) on each selected channel of a Sound.
+
+    Args:
+        analysis: A module-level function taking a Sound (such as
+            get_pitch), so that worker processes can import it; its
+            arguments and result must be picklable
+        sound: Parselmouth Sound
+        channels: "all", a list of channel indices, or "mix" for one
+            analysis of the whole Sound (see parse_channels)
+        max_workers: Worker processes to use; default one per channel,
+            at most the number of CPUs. With one worker, or one channel,
+            the analysis runs in the calling process.
+        isolate: Run in worker processes even then (and for "mix"), so
+            that a long analysis doesn't hold the calling process's GIL
+        cancelled: Polled while the analysis runs; once it returns True,
+            worker processes still analyzing are killed (and channels
+            not yet started in the calling process are skipped)
+        **kwargs: Passed to analysis
+
+    Returns:
+        One result per selected channel, in order (one result for "mix")
+
+    Raises:
+        AnalysisCancelled: If cancelled() returned True before the end
+    """
+    indices = parse_channels(channels, sound.n_channels)
+    if indices is None and not isolate:
+        return [analysis(sound, **kwargs)]
+
+    values = sound.values
+    parts = [values] if indices is None else [values[i] for i in indices]
+    workers = min(len(parts), max_workers or os.cpu_count() or 1)
+    if workers <= 1 and not isolate:
+        results = []
+        for part in parts:
+            if cancelled is not None and cancelled():
+                raise AnalysisCancelled()
+            results.append(analysis(_channel_sound(part, sound.sampling_frequency, sound.x1), **kwargs))
+        return results
+
+    return _run_in_workers(analysis, parts, sound.sampling_frequency, sound.x1, kwargs, max(workers, 1), cancelled)
@@ -0,0 +1,445 @@
+"""
+On-disk store of per-frame acoustic tracks for corpus queries.
+
+A corpus study measures F0, F1-F4 and intensity of thousands of
+recordings once, then asks many questions of the frames: "frames with
+F1 > 700 Hz inside intervals labelled a". FeatureStore keeps the tracks
+of each recording in a partition of its own, one .npy file per column,
+so a query memory-maps only the columns it reads and copies only the
+frames it selects. All tracks of a recording share one frame grid, the
+formant analysis's: pitch and intensity are read at its frame times
+as Praat's Get value at time does.
+
+Metadata lives in SQLite (features.sqlite in the store's directory):
+the recordings, keyed by the SHA-256 of their bytes, and the intervals
+of their annotation tiers with the frame range each covers. Recordings
+and intervals also carry the minimum and maximum of every track, so a
+predicate such as F1 > 700 skips, through the database, recordings and
+intervals that have no frame above 700 Hz before any frame is read.
+
+Ingesting a recording whose bytes are in the store already skips the
+analysis. Files are found again by path, size and modification time
+without being re-hashed, so re-running the ingestion of a corpus after
+adding a few recordings analyzes only those.
+
+The analysis settings are fixed when a store is created: every
+recording has the same frame step, so that frames of different
+recordings can be compared.
+"""
+
+import itertools
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence, Union
+
+import numpy as np
+
+from .annotation import TextGrid
+from .pcm_cache import file_key
+from .tracks import (
+    TRACKS, FeatureSettings, analyze_tracks, interval_frames, range_extrema, range_indices, values_at_times,
+)
+
+# Per-frame tracks, in the order they are stored
+COLUMNS = TRACKS
+
+# Comparison operators of query predicates
+OPERATORS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+# Bump when the layout on disk changes
+FORMAT_VERSION = 1
+
+DATABASE = "features.sqlite"
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (
+    key TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    duration REAL NOT NULL,
+    sample_rate REAL NOT NULL,
+    n_frames INTEGER NOT NULL,
+    ingested_at REAL NOT NULL,
+    {", ".join(f"{c}_min REAL, {c}_max REAL" for c in COLUMNS)}
+);
+CREATE TABLE IF NOT EXISTS paths (
+    path TEXT PRIMARY KEY,
+    signature TEXT NOT NULL,
+    key TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS intervals (
+    id INTEGER PRIMARY KEY,
+    file_key TEXT NOT NULL REFERENCES files(key) ON DELETE CASCADE,
+    tier TEXT NOT NULL,
+    label TEXT NOT NULL,
+    start_time REAL NOT NULL,
+    end_time REAL NOT NULL,
+    first_frame INTEGER NOT NULL,
+    last_frame INTEGER NOT NULL,
+    {", ".join(f"{c}_min REAL, {c}_max REAL" for c in COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS intervals_by_label ON intervals (tier, label);
+CREATE INDEX IF NOT EXISTS intervals_by_file ON intervals (file_key);
+"""
+
+
+@dataclass
+class StoredFile:
+    """A recording in the store."""
+    key: str
+    path: str  # Where it was ingested from
+    duration: float
+    sample_rate: float
+    n_frames: int
+    ingested_at: float
+
+
+@dataclass
+class FrameSelection:
+    """Frames matched by a query, with the values of the columns asked for."""
+    files: list[str]  # Content keys of the recordings the frames are from
+    file_index: np.ndarray  # Per frame, index into files
+    frames: np.ndarray  # Per frame, index within its recording
+    times: np.ndarray
+    columns: dict[str, np.ndarray] = field(default_factory=dict)
+    labels: Optional[np.ndarray] = None  # Per frame, its interval's label (interval queries)
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+
+def _predicates(where) -> list[tuple[str, str, float]]:
+    """Validate predicates given as (column, operator, value) tuples."""
+    if where is None:
+        return []
+    if isinstance(where, tuple) and where and isinstance(where[0], str):
+        where = [where]
+    predicates = []
+    for column, operator, value in where:
+        if column not in COLUMNS:
+            raise ValueError(f"Unknown column: {column}. Use one of: {', '.join(COLUMNS)}")
+        if operator not in OPERATORS:
+            raise ValueError(f"Unknown operator: {operator}. Use one of: {' '.join(OPERATORS)}")
+        predicates.append((column, operator, float(value)))
+    return predicates
+
+
+def _pruning_sql(predicates: list[tuple[str, str, float]]) -> tuple[list[str], list[float]]:
+    """
+    Conditions on the stored extrema of a recording or interval that hold
+    whenever one of its frames can satisfy all predicates.
+    """
+    conditions, params = [], []
+    for column, operator, value in predicates:
+        if operator in (">", ">="):
+            conditions.append(f"{column}_max {operator} ?")
+            params.append(value)
+        elif operator in ("<", "<="):
+            conditions.append(f"{column}_min {operator} ?")
+            params.append(value)
+        elif operator == "==":
+            conditions.append(f"{column}_min <= ? AND {column}_max >= ?")
+            params += [value, value]
+        else:
+            conditions.append(f"{column}_min IS NOT NULL")
+    return conditions, params
+
+
+def _stats(columns: dict[str, np.ndarray], first, last) -> list[tuple]:
+    """Per range, the (min, max) of every column, None where undefined, in COLUMNS order."""
+    extrema = [range_extrema(columns[c], first, last) for c in COLUMNS]
+    rows = []
+    for i in range(len(first)):
+        row = []
+        for minima, maxima in extrema:
+            row += [None if np.isnan(minima[i]) else float(minima[i]),
+                    None if np.isnan(maxima[i]) else float(maxima[i])]
+        rows.append(tuple(row))
+    return rows
+
+
+class FeatureStore:
+    """
+    Directory of per-frame acoustic tracks with SQLite metadata.
+
+    Args:
+        directory: Store directory, created if needed
+        settings: Analysis settings of a new store; an existing store
+            keeps its own, and refuses different ones (ValueError)
+    """
+
+    def __init__(self, directory: Union[str, Path], settings: Optional[FeatureSettings] = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+            stored = dict(db.execute("SELECT name, value FROM meta"))
+            if not stored:
+                self.settings = settings or FeatureSettings()
+                db.executemany("INSERT INTO meta VALUES (?, ?)", [
+                    ("format_version", str(FORMAT_VERSION)),
+                    ("settings", json.dumps(asdict(self.settings))),
+                ])
+            else:
+                if int(stored["format_version"]) != FORMAT_VERSION:
+                    raise ValueError(f"Unsupported feature store format: {stored['format_version']}")
+                self.settings = FeatureSettings(**json.loads(stored["settings"]))
+                if settings is not None and settings != self.settings:
+                    raise ValueError(
+                        f"The store at {self.directory} was created with other settings: {self.settings}"
+                    )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """A connection whose work is committed if the block succeeds."""
+        db = sqlite3.connect(self.directory / DATABASE, timeout=30)
+        try:
+            db.execute("PRAGMA foreign_keys = ON")
+            yield db
+            db.commit()
+        finally:
+            db.close()
+
+    def _partition(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    # Ingestion
+
+    def key_for_file(self, path: Union[str, Path]) -> str:
+        """Content key of a file, reusing the key recorded for an unchanged path."""
+        path = Path(path).resolve()
+        stat = path.stat()
+        signature = f"{stat.st_size} {stat.st_mtime_ns}"
+        with self._connect() as db:
+            row = db.execute("SELECT signature, key FROM paths WHERE path = ?", (str(path),)).fetchone()
+        if row is not None and row[0] == signature:
+            return row[1]
+        key = file_key(path)
+        with self._connect() as db:
+            db.execute("INSERT OR REPLACE INTO paths VALUES (?, ?, ?)", (str(path), signature, key))
+        return key
+
+    def __contains__(self, key: str) -> bool:
+        with self._connect() as db:
+            return db.execute("SELECT 1 FROM files WHERE key = ?", (key,)).fetchone() is not None
+
+    def ingest(self, path: Union[str, Path], textgrid: Optional[TextGrid] = None) -> bool:
+        """
+        Analyze a recording into the store, unless its bytes are there already.
+
+        Args:
+            path: Audio file
+            textgrid: Annotation tiers of the recording; they replace the
+                recording's intervals in the store, even when the
+                analysis is skipped
+
+        Returns:
+            True if the recording was analyzed, False if it was skipped
+        """
+        from .acoustic import load_sound
+
+        key = self.key_for_file(path)
+        analyzed = key not in self
+        if analyzed:
+            sound = load_sound(path)
+            tracks = analyze_tracks(sound, self.settings)
+            # The formant frames are the store's grid; the other tracks are read at their times
+            times = np.asarray(tracks["f1"][0], dtype=np.float64)
+            columns = {
+                name: values if track_times is tracks["f1"][0]
+                else values_at_times(track_times, values, times, self.settings.time_step)
+                for name, (track_times, values) in tracks.items()
+            }
+            columns = {name: np.asarray(values, dtype=np.float32) for name, values in columns.items()}
+            self._write_partition(key, times, columns)
+            (stats,) = _stats(columns, [0], [len(times)])
+            with self._connect() as db:
+                db.execute(
+                    f"INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, {', '.join('?' * 2 * len(COLUMNS))})",
+                    (key, str(Path(path).resolve()), sound.duration, sound.sampling_frequency,
+                     len(times), time.time(), *stats),
+                )
+        if textgrid is not None:
+            self.set_intervals(key, textgrid)
+        return analyzed
+
+    def ingest_many(self, paths: Iterable[Union[str, Path]],
+                    textgrids: Optional[Sequence[Optional[TextGrid]]] = None) -> list[str]:
+        """Ingest recordings (with their TextGrids, if given); returns the keys of those analyzed."""
+        paths = list(paths)
+        textgrids = list(textgrids) if textgrids is not None else [None] * len(paths)
+        if len(textgrids) != len(paths):
+            raise ValueError("Give one TextGrid (or None) per recording")
+        analyzed = []
+        for path, textgrid in zip(paths, textgrids):
+            if self.ingest(path, textgrid):
+                analyzed.append(self.key_for_file(path))
+        return analyzed
+
+    def _write_partition(self, key: str, times: np.ndarray, columns: dict[str, np.ndarray]) -> None:
+        """Write a recording's columns, replacing a partition left by an interrupted ingestion."""
+        partition = self._partition(key)
+        partition.parent.mkdir(exist_ok=True)
+        # Write to a temp directory and rename, so readers never see a partial partition
+        tmp = Path(tempfile.mkdtemp(dir=partition.parent, suffix=".tmp"))
+        try:
+            np.save(tmp / "times.npy", times)
+            for name, values in columns.items():
+                np.save(tmp / f"{name}.npy", values)
+            if partition.exists():
+                shutil.rmtree(partition)
+            os.replace(tmp, partition)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    def set_intervals(self, key: str, textgrid: TextGrid) -> None:
+        """Replace the intervals of a stored recording with the tiers of textgrid."""
+        columns = self.read(key)
+        times = columns["times"]
+        rows = []
+        for tier in textgrid.tiers:
+            if not tier.annotations:
+                continue
+            starts = np.array([a.start for a in tier.annotations])
+            ends = np.array([a.end for a in tier.annotations])
+            first, last = interval_frames(times, starts, ends)
+            for annotation, f, l, stats in zip(tier.annotations, first, last, _stats(columns, first, last)):
+                rows.append((key, tier.name, annotation.text, annotation.start, annotation.end,
+                             int(f), int(l), *stats))
+        with self._connect() as db:
+            db.execute("DELETE FROM intervals WHERE file_key = ?", (key,))
+            db.executemany(
+                "INSERT INTO intervals (file_key, tier, label, start_time, end_time, first_frame, last_frame, "
+                f"{', '.join(f'{c}_min, {c}_max' for c in COLUMNS)}) "
+                f"VALUES ({', '.join('?' * (7 + 2 * len(COLUMNS)))})",
+                rows,
+            )
+
+    # Reading
+
+    def files(self) -> list[StoredFile]:
+        """The recordings in the store, in ingestion order."""
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT key, path, duration, sample_rate, n_frames, ingested_at FROM files ORDER BY ingested_at"
+            ).fetchall()
+        return [StoredFile(*row) for row in rows]
+
+    def read(self, key: str, columns: Optional[Sequence[str]] = None) -> dict[str, np.ndarray]:
+        """Memory-mapped times and columns (default all) of a stored recording."""
+        partition = self._partition(key)
+        if not partition.exists():
+            raise KeyError(f"Recording not in the store: {key}")
+        names = COLUMNS if columns is None else columns
+        return {
+            name: np.load(partition / f"{name}.npy", mmap_mode="r")
+            for name in ("times", *names)
+        }
+
+    def query(
+        self,
+        where=None,
+        tier: Optional[str] = None,
+        label: Union[str, Sequence[str], None] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> FrameSelection:
+        """
+        Frames satisfying every predicate, optionally only those inside
+        intervals of a tier (with one of the given labels).
+
+        Args:
+            where: Predicates as (column, operator, value) tuples, such
+                as [("f1", ">", 700)]; a frame where a column is
+                undefined (NaN) satisfies no predicate on it
+            tier: Only frames inside intervals of this tier
+            label: Only intervals with this label (or one of these labels);
+                needs tier
+            columns: Columns to return (default all)
+
+        Returns:
+            FrameSelection, frames ordered by recording and time (and
+            repeated if inside several matching intervals)
+        """
+        predicates = _predicates(where)
+        names = list(COLUMNS if columns is None else columns)
+        for name in names:
+            if name not in COLUMNS:
+                raise ValueError(f"Unknown column: {name}. Use one of: {', '.join(COLUMNS)}")
+        if label is not None and tier is None:
+            raise ValueError("Selecting intervals by label needs a tier")
+
+        conditions, params = _pruning_sql(predicates)
+        if tier is None:
+            sql = "SELECT key, 0, n_frames, NULL FROM files"
+        else:
+            sql = "SELECT file_key, first_frame, last_frame, label FROM intervals"
+            conditions.insert(0, "tier = ?")
+            params.insert(0, tier)
+            if label is not None:
+                labels = [label] if isinstance(label, str) else list(label)
+                conditions.insert(1, f"label IN ({', '.join('?' * len(labels))})")
+                params[1:1] = labels
+            conditions.append("last_frame > first_frame")
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY 1, 2"
+        with self._connect() as db:
+            ranges = db.execute(sql, params).fetchall()
+
+        files: list[str] = []
+        parts = []
+        needed = list(dict.fromkeys(names + [c for c, _, _ in predicates]))
+        for key, group in itertools.groupby(ranges, key=lambda r: r[0]):
+            group = list(group)
+            first = np.array([r[1] for r in group], dtype=np.intp)
+            last = np.array([r[2] for r in group], dtype=np.intp)
+            lengths = last - first
+            frames = range_indices(first, last)
+
+            data = self.read(key, needed)
+            selected = np.ones(len(frames), dtype=bool)
+            values = {name: np.asarray(data[name][frames]) for name in needed}
+            for column, operator, value in predicates:
+                column_values = values[column]
+                selected &= OPERATORS[operator](column_values, value) & ~np.isnan(column_values)
+            if not selected.any():
+                continue
+            part = {
+                "file_index": np.full(int(selected.sum()), len(files), dtype=np.int32),
+                "frames": frames[selected],
+                "times": np.asarray(data["times"][frames[selected]]),
+            }
+            part.update({name: values[name][selected] for name in names})
+            if tier is not None:
+                range_labels = np.array([r[3] for r in group], dtype=object)
+                part["labels"] = np.repeat(range_labels, lengths)[selected]
+            files.append(key)
+            parts.append(part)
+
+        def joined(name, dtype):
+            return np.concatenate([p[name] for p in parts]) if parts else np.empty(0, dtype=dtype)
+
+        return FrameSelection(
+            files=files,
+            file_index=joined("file_index", np.int32),
+            frames=joined("frames", np.intp),
+            times=joined("times", np.float64),
+            columns={name: joined(name, np.float32) for name in names},
+            labels=joined("labels", object) if tier is not None else None,
+        )
+
@@ -0,0 +1,55 @@
+"""
+Analysis frame grids shared by the NumPy analysis engines.
+"""
+
+import math
+
+import numpy as np
+
+
+def short_term_frame_times(n_samples: int, dx: float, x1: float, window: float,
+                           time_step: float) -> np.ndarray:
+    """
+    Centres of the frames Praat fits into a signal for a short-term
+    analysis (Sampled_shortTermAnalysis, used by To Pitch and To Formant):
+    as many whole windows as fit, centred on the signal.
+    """
+    duration = n_samples * dx
+    n_frames = math.floor((duration - window) / time_step) + 1
+    if n_frames < 1:
+        return np.empty(0)
+    mid = x1 - 0.5 * dx + 0.5 * duration
+    first = mid - 0.5 * (n_frames * time_step) + 0.5 * time_step
+    return first + np.arange(n_frames) * time_step
+
+
+def frame_block(n_samples: int, dx: float, x1: float, window: float, time_step: float,
+                first: int, last: int) -> tuple[int, int]:
+    """
+    The samples [offset, offset + length) of a signal whose own frame grid
+    is frames first..last of the signal's grid, so that an analysis of
+    just those samples computes the same frames. The block's grid is
+    centred on its samples; when the frames' centre falls between two
+    sample positions, it is off by half a sample. Near the signal's ends
+    the block may reach past them by a sample or so, into zeros that no
+    frame's window covers.
+    """
+    times = short_term_frame_times(n_samples, dx, x1, window, time_step)
+    n_frames = last - first + 1
+    centre = (0.5 * (times[first] + times[last]) - x1) / dx
+
+    def frames_in(length: int) -> int:
+        return math.floor((length * dx - window) / time_step) + 1
+
+    # The shortest block that fits n_frames windows, one sample longer if
+    # that centres it on the frames and still fits no more
+    length = math.ceil((window + (n_frames - 1) * time_step) / dx)
+    while frames_in(length) < n_frames:
+        length += 1
+    while length > 1 and frames_in(length - 1) >= n_frames:
+        length -= 1
+    offset = centre - 0.5 * (length - 1)
+    if abs(offset - round(offset)) > 0.25 and frames_in(length + 1) == n_frames:
+        length += 1
+        offset -= 0.5
+    return round(offset), length
@@ -0,0 +1,186 @@
+"""
+Persistent, memory-mapped cache of decoded audio.
+
+Each decoded file is written once as a raw PCM array (float32 or int16,
+interleaved [sample, channel]) behind a small fixed-size header, keyed by
+the SHA-256 of the original file's bytes. Reading a region maps the file
+and copies only the samples inside it, so analysing a few seconds of a
+two-hour recording touches only the pages that hold those seconds.
+"""
+
+import hashlib
+import os
+import struct
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+# Version 2: int16 entries scaled by 32768 (older entries are decoded again)
+MAGIC = b"LGAIPCM2"
+# magic, dtype code, channels, samples, sample rate, start time
+HEADER = struct.Struct("<8s4sIQdd")
+# Samples start on a page boundary so mapped reads stay page-aligned
+DATA_OFFSET = 4096
+
+DTYPES = {
+    "float32": (b"f4\0\0", np.dtype("<f4")),
+    "int16": (b"i2\0\0", np.dtype("<i2")),
+}
+_DTYPE_CODES = {code: name for name, (code, _) in DTYPES.items()}
+
+# 16-bit PCM is read as sample / 32768, as Praat does, so int16 entries of
+# 16-bit files hold the original samples exactly
+INT16_SCALE = 32768.0
+
+
+def content_key(data: bytes) -> str:
+    """Cache key for in-memory file contents."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_key(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    """Cache key for a file on disk (SHA-256 of its bytes)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class CachedPCM:
+    """A memory-mapped cache entry."""
+    path: Path
+    dtype: str
+    n_channels: int
+    n_samples: int
+    sample_rate: float
+    start_time: float
+
+    @property
+    def duration(self) -> float:
+        return self.n_samples / self.sample_rate
+
+    @property
+    def end_time(self) -> float:
+        return self.start_time + self.duration
+
+    def _samples(self) -> np.ndarray:
+        return np.memmap(
+            self.path, dtype=DTYPES[self.dtype][1], mode="r", offset=DATA_OFFSET,
+            shape=(self.n_samples, self.n_channels),
+        )
+
+    def sample_range(self, start: Optional[float] = None,
+                     end: Optional[float] = None) -> tuple[int, int]:
+        """Sample indices [first, last) covering the time range start..end (seconds)."""
+        first = 0 if start is None else int(np.floor((start - self.start_time) * self.sample_rate))
+        last = self.n_samples if end is None else int(np.ceil((end - self.start_time) * self.sample_rate))
+        first = min(max(first, 0), self.n_samples)
+        last = min(max(last, first), self.n_samples)
+        return first, last
+
+    def read(self, start: Optional[float] = None, end: Optional[float] = None) -> np.ndarray:
+        """Samples between start and end (seconds) as float64 [channels, samples]."""
+        first, last = self.sample_range(start, end)
+        region = np.asarray(self._samples()[first:last], dtype=np.float64).T
+        if self.dtype == "int16":
+            region /= INT16_SCALE
+        return np.ascontiguousarray(region)
+
+    def to_sound(self, start: Optional[float] = None, end: Optional[float] = None):
+        """A Parselmouth Sound of the region, positioned on the original timeline."""
+        import parselmouth
+
+        first, _ = self.sample_range(start, end)
+        return parselmouth.Sound(
+            self.read(start, end),
+            sampling_frequency=self.sample_rate,
+            start_time=self.start_time + first / self.sample_rate,
+        )
+
+
+class PCMCache:
+    """Directory of memory-mappable decoded audio, keyed by content hash."""
+
+    def __init__(self, directory: Union[str, Path], dtype: str = "float32"):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported PCM cache dtype: {dtype}. Use one of: {', '.join(DTYPES)}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dtype = dtype
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}.pcm"
+
+    def get(self, key: str) -> Optional[CachedPCM]:
+        """Open the entry for key, or return None if it isn't cached."""
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                header = f.read(HEADER.size)
+        except FileNotFoundError:
+            return None
+        if len(header) < HEADER.size:
+            return None
+
+        magic, code, n_channels, n_samples, sample_rate, start_time = HEADER.unpack(header)
+        if magic != MAGIC or code not in _DTYPE_CODES:
+            return None
+        return CachedPCM(path, _DTYPE_CODES[code], n_channels, n_samples, sample_rate, start_time)
+
+    def put(self, key: str, values: np.ndarray, sample_rate: float,
+            start_time: float = 0.0) -> CachedPCM:
+        """Write decoded samples ([channels, samples], floats in -1..1) under key."""
+        values = np.atleast_2d(np.asarray(values))
+        n_channels, n_samples = values.shape
+        code, dtype = DTYPES[self.dtype]
+
+        interleaved = values.T
+        if self.dtype == "int16":
+            interleaved = np.clip(np.round(interleaved * INT16_SCALE), -INT16_SCALE, INT16_SCALE - 1)
+        data = np.ascontiguousarray(interleaved, dtype=dtype)
+
+        header = HEADER.pack(MAGIC, code, n_channels, n_samples, float(sample_rate), float(start_time))
+        # Write to a temp file and rename, so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header.ljust(DATA_OFFSET, b"\0"))
+                f.write(data.tobytes())
+            os.replace(tmp_path, self._entry_path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        return self.get(key)
+
+    def put_sound(self, key: str, sound) -> CachedPCM:
+        """Write a Parselmouth Sound under key."""
+        return self.put(key, sound.values, sound.sampling_frequency, sound.xmin)
+
+    # Files on disk are looked up by path, size and modification time, so a
+    # cached file isn't re-hashed on every load
+    def _ref_path(self, path: Path) -> Path:
+        return self.directory / f"{hashlib.sha256(str(path).encode()).hexdigest()}.ref"
+
+    def key_for_file(self, path: Union[str, Path]) -> str:
+        """Content key for a file, reusing the key recorded for an unchanged file."""
+        path = Path(path).resolve()
+        stat = path.stat()
+        signature = f"{stat.st_size} {stat.st_mtime_ns}"
+        ref_path = self._ref_path(path)
+
+        try:
+            recorded_signature, key = ref_path.read_text().rsplit(" ", 1)
+            if recorded_signature == signature:
+                return key
+        except (FileNotFoundError, ValueError):
+            pass
+
+        key = file_key(path)
+        ref_path.write_text(f"{signature} {key}")
+        return key
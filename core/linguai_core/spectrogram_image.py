@@ -0,0 +1,180 @@
+"""
+Spectrogram rendering to raster images.
+
+Paints a dB intensity matrix the way Praat's "Paint..." does: a
+pre-emphasis in dB per octave is added, everything more than the dynamic
+range below the maximum is floored, and the remaining range is mapped
+through a colour lookup table. Images are encoded as PNG with the
+standard library, or as WebP when Pillow is installed.
+"""
+
+import struct
+import zlib
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+# Grayscale follows Praat (white is silence, black is the maximum);
+# viridis is perceptually uniform (dark is silence)
+COLORMAPS = ("grayscale", "viridis")
+
+IMAGE_FORMATS = {"png": "image/png", "webp": "image/webp"}
+
+LUT_SIZE = 256
+
+# Polynomial fit of matplotlib's viridis, lowest power first (r, g, b)
+_VIRIDIS_COEFFICIENTS = np.array([
+    [0.2777273272234177, 0.005407344544966578, 0.3340998053353061],
+    [0.1050930431085774, 1.404613529898575, 1.384590162594685],
+    [-0.3308618287255563, 0.214847559468213, 0.09509516302823659],
+    [-4.634230498983486, -5.799100973351585, -19.33244095627987],
+    [6.228269936347081, 14.17993336680509, 56.69055260068105],
+    [4.776384997670288, -13.74514537774601, -65.35303263337234],
+    [-5.435455855934631, 4.645852612178535, 26.3124352495832],
+])
+
+
+@lru_cache(maxsize=None)
+def colormap_lut(name: str) -> np.ndarray:
+    """
+    Lookup table for a colormap: LUT_SIZE entries from silence to maximum,
+    uint8 gray levels for grayscale and uint8 RGB triples otherwise.
+    """
+    levels = np.linspace(0.0, 1.0, LUT_SIZE)
+    if name == "grayscale":
+        lut = np.round(255 * (1.0 - levels))
+    elif name == "viridis":
+        powers = levels[:, np.newaxis] ** np.arange(len(_VIRIDIS_COEFFICIENTS))
+        lut = np.round(255 * np.clip(powers @ _VIRIDIS_COEFFICIENTS, 0.0, 1.0))
+    else:
+        raise ValueError(f"Unknown colormap: {name}. Use one of: {', '.join(COLORMAPS)}")
+    lut = lut.astype(np.uint8)
+    lut.flags.writeable = False
+    return lut
+
+
+def _resample_axis(matrix: np.ndarray, size: int, axis: int) -> np.ndarray:
+    """Linearly interpolate matrix to `size` evenly spaced points along axis."""
+    n = matrix.shape[axis]
+    if n == size:
+        return matrix
+    positions = np.linspace(0.0, n - 1, size)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, n - 1)
+    weight = (positions - lower).astype(matrix.dtype)
+    shape = [1] * matrix.ndim
+    shape[axis] = size
+    weight = weight.reshape(shape)
+    return np.take(matrix, lower, axis=axis) * (1 - weight) + np.take(matrix, upper, axis=axis) * weight
+
+
+def _pool_axis(matrix: np.ndarray, size: int, axis: int) -> np.ndarray:
+    """Reduce matrix to `size` points along axis, each the maximum of its run of neighbours."""
+    edges = np.linspace(0, matrix.shape[axis], size + 1).astype(np.intp)[:-1]
+    return np.maximum.reduceat(matrix, edges, axis=axis)
+
+
+def render_spectrogram(
+    intensities: np.ndarray,
+    frequencies: np.ndarray,
+    width: int,
+    height: int,
+    dynamic_range: float = 70.0,
+    maximum: Optional[float] = None,
+    pre_emphasis: float = 6.0,
+    colormap: str = "grayscale",
+) -> np.ndarray:
+    """
+    Paint a spectrogram into an image.
+
+    With more frames than pixel columns, each column shows the loudest
+    of its frames, so short events stay visible however long the file;
+    with fewer, frames are interpolated.
+
+    Args:
+        intensities: dB matrix [time, frequency]
+        frequencies: Frequency of each matrix column (Hz)
+        width: Image width in pixels (time)
+        height: Image height in pixels (frequency, lowest at the bottom)
+        dynamic_range: dB below the maximum that are still painted
+        maximum: dB painted at full strength; None uses the image maximum
+        pre_emphasis: dB per octave added above 1 kHz (subtracted below)
+        colormap: One of COLORMAPS
+
+    Returns:
+        uint8 image, [height, width] for grayscale, [height, width, 3] otherwise
+    """
+    if width < 1 or height < 1:
+        raise ValueError("Image width and height must be at least 1 pixel")
+    lut = colormap_lut(colormap)
+
+    values = np.asarray(intensities, dtype=np.float32)
+    if values.size == 0:
+        return np.broadcast_to(lut[0], (height, width) + lut.shape[1:]).copy()
+
+    if pre_emphasis:
+        frequencies = np.asarray(frequencies, dtype=np.float64)
+        # The lowest bin may sit at 0 Hz; give it the next bin's emphasis
+        positive = np.maximum(frequencies, frequencies[frequencies > 0].min(initial=1000.0))
+        values = values + (pre_emphasis * np.log2(positive / 1000.0)).astype(np.float32)
+
+    if values.shape[0] > width:
+        values = _pool_axis(values, width, 0)
+    values = _resample_axis(_resample_axis(values, width, 0), height, 1)
+
+    top = float(values.max()) if maximum is None else maximum
+    scaled = (values - (top - dynamic_range)) * ((LUT_SIZE - 1) / max(dynamic_range, 1e-6))
+    indices = np.clip(np.round(scaled), 0, LUT_SIZE - 1).astype(np.uint8)
+
+    # [time, frequency] -> [row, column] with high frequencies on top
+    return lut[indices.T[::-1]]
+
+
+def encode_png(image: np.ndarray) -> bytes:
+    """Encode a uint8 [height, width] (gray) or [height, width, 3] (RGB) image as PNG."""
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    height, width = image.shape[:2]
+    color_type = 0 if image.ndim == 2 else 2
+
+    # "Up" filter on every row: spectrogram rows change slowly, so the
+    # differences compress far better than the raw pixels
+    rows = image.reshape(height, -1)
+    filtered = rows.copy()
+    filtered[1:] -= rows[:-1]
+    scanlines = np.hstack([np.full((height, 1), 2, dtype=np.uint8), filtered])
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)),
+        chunk(b"IDAT", zlib.compress(scanlines.tobytes(), 9)),
+        chunk(b"IEND", b""),
+    ])
+
+
+def encode_webp(image: np.ndarray, quality: int = 90) -> bytes:
+    """Encode a uint8 image as WebP (requires Pillow)."""
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ImportError(
+            "Pillow is required for WebP output. "
+            "Install it with: pip install pillow"
+        )
+    import io
+
+    buffer = io.BytesIO()
+    Image.fromarray(np.ascontiguousarray(image, dtype=np.uint8)).save(buffer, format="WEBP", quality=quality)
+    return buffer.getvalue()
+
+
+def encode_image(image: np.ndarray, image_format: str = "png") -> bytes:
+    """Encode a rendered image in one of IMAGE_FORMATS."""
+    if image_format == "png":
+        return encode_png(image)
+    if image_format == "webp":
+        return encode_webp(image)
+    raise ValueError(f"Unknown image format: {image_format}. Use one of: {', '.join(IMAGE_FORMATS)}")
@@ -0,0 +1,157 @@
+"""
+The frame tracks of a recording, and vectorized lookups on them.
+
+analyze_tracks computes F0, F1-F4 and intensity of a Sound once. The
+functions below then answer questions about many time ranges or time
+points at once, without a Python loop over them: the frames of a range
+are found with searchsorted, and ranges are reduced with ufunc.reduceat
+over their frame indices.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# Per-frame tracks of analyze_tracks
+TRACKS = ("f0", "f1", "f2", "f3", "f4", "intensity")
+
+
+@dataclass(frozen=True)
+class FeatureSettings:
+    """Analysis settings of the frame tracks."""
+    time_step: float = 0.01
+    pitch_floor: float = 75.0
+    pitch_ceiling: float = 600.0
+    pitch_mode: str = "praat"
+    max_formant: float = 5500.0
+    num_formants: int = 5
+    formant_engine: str = "praat"
+    intensity_minimum_pitch: float = 100.0
+
+
+def analyze_tracks(sound, settings: FeatureSettings = FeatureSettings()) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    """
+    Pitch, formant and intensity tracks of a Sound, each on its own frame
+    grid, as {track: (times, values)} for every name in TRACKS.
+    """
+    from .acoustic import get_formants, get_intensity, get_pitch
+
+    pitch = get_pitch(
+        sound, time_step=settings.time_step, pitch_floor=settings.pitch_floor,
+        pitch_ceiling=settings.pitch_ceiling, mode=settings.pitch_mode,
+    )
+    formants = get_formants(
+        sound, time_step=settings.time_step, max_formant=settings.max_formant,
+        num_formants=settings.num_formants, engine=settings.formant_engine,
+    )
+    intensity = get_intensity(
+        sound, time_step=settings.time_step, minimum_pitch=settings.intensity_minimum_pitch,
+    )
+    return {
+        "f0": (pitch.times, pitch.frequencies),
+        "f1": (formants.times, formants.f1),
+        "f2": (formants.times, formants.f2),
+        "f3": (formants.times, formants.f3),
+        "f4": (formants.times, formants.f4),
+        "intensity": (intensity.times, intensity.values),
+    }
+
+
+def values_at_times(times: np.ndarray, values: np.ndarray, points, time_step: float) -> np.ndarray:
+    """
+    A track (frames every time_step from times[0]) at many time points,
+    as Praat's linear Get value at time: undefined where the nearest frame
+    is, else interpolated towards the other neighbour if that is defined,
+    with half a frame's extrapolation at either end.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    result = np.full(len(points), np.nan)
+    if len(times) == 0:
+        return result
+    index = (points - times[0]) / time_step
+    left = np.floor(index).astype(np.intp)
+    phase = index - left
+    near = np.where(phase < 0.5, left, left + 1)
+    far = np.where(phase < 0.5, left + 1, left)
+    phase = np.where(phase < 0.5, phase, 1.0 - phase)
+
+    inside = (near >= 0) & (near < len(times))
+    near_value = values[np.clip(near, 0, len(times) - 1)]
+    far_value = np.where((far >= 0) & (far < len(times)), values[np.clip(far, 0, len(times) - 1)], np.nan)
+    interpolated = np.where(np.isnan(far_value), near_value, near_value + phase * (far_value - near_value))
+    result[inside] = interpolated[inside]
+    return result
+
+
+def interval_frames(times: np.ndarray, starts, ends) -> tuple[np.ndarray, np.ndarray]:
+    """Frame ranges [first, last) of the intervals starts..ends: the frames centred inside each."""
+    return (np.searchsorted(times, starts, side="left"),
+            np.searchsorted(times, ends, side="left"))
+
+
+def range_indices(first: np.ndarray, last: np.ndarray) -> np.ndarray:
+    """The frame indices of all ranges [first[i], last[i]), one range after the other."""
+    lengths = np.asarray(last, dtype=np.intp) - np.asarray(first, dtype=np.intp)
+    return np.repeat(first - (np.cumsum(lengths) - lengths), lengths) + np.arange(lengths.sum())
+
+
+def _reduce_ranges(ufunc: np.ufunc, values: np.ndarray, first: np.ndarray, last: np.ndarray,
+                   fill: float) -> np.ndarray:
+    """ufunc reduced over each range values[first[i]:last[i]] (first <= len(values)); fill for empty ones."""
+    # reduceat over [first0, last0, first1, last1, ...] reduces each range
+    # at the even positions; a sentinel lets first and last reach the end
+    padded = np.append(values, fill)
+    bounds = np.column_stack([first, last]).ravel()
+    result = ufunc.reduceat(padded, bounds)[::2]
+    result[last <= first] = fill
+    return result
+
+
+def range_extrema(values: np.ndarray, first, last) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Minimum and maximum of values[first[i]:last[i]] for every range,
+    ignoring NaN; NaN for empty ranges and ranges without a defined value.
+    """
+    first = np.asarray(first, dtype=np.intp)
+    last = np.asarray(last, dtype=np.intp)
+    if len(first) == 0:
+        return np.empty(0), np.empty(0)
+    values = np.asarray(values, dtype=np.float64)
+    return (_reduce_ranges(np.fmin, values, first, last, np.nan),
+            _reduce_ranges(np.fmax, values, first, last, np.nan))
+
+
+def range_means(values: np.ndarray, first, last) -> np.ndarray:
+    """Mean of the defined values of every range; NaN where there are none."""
+    first = np.asarray(first, dtype=np.intp)
+    last = np.asarray(last, dtype=np.intp)
+    if len(first) == 0:
+        return np.empty(0)
+    values = np.asarray(values, dtype=np.float64)
+    defined = ~np.isnan(values)
+    sums = _reduce_ranges(np.add, np.where(defined, values, 0.0), first, last, 0.0)
+    counts = _reduce_ranges(np.add, defined.astype(np.float64), first, last, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def range_medians(values: np.ndarray, first, last) -> np.ndarray:
+    """Median of the defined values of every range; NaN where there are none."""
+    first = np.asarray(first, dtype=np.intp)
+    last = np.asarray(last, dtype=np.intp)
+    lengths = last - first
+    result = np.full(len(first), np.nan)
+    if lengths.sum() == 0:
+        return result
+    values = np.asarray(values, dtype=np.float64)
+    ranges = np.repeat(np.arange(len(first)), lengths)
+    selected = values[range_indices(first, last)]
+    # Sorted by range, then value; NaN sorts after the values of its range
+    ordered = selected[np.lexsort((selected, ranges))]
+    counts = np.bincount(ranges, weights=~np.isnan(selected), minlength=len(first)).astype(np.intp)
+    offsets = np.cumsum(lengths) - lengths
+    has_values = counts > 0
+    lower = ordered[(offsets + (counts - 1) // 2)[has_values]]
+    upper = ordered[(offsets + counts // 2)[has_values]]
+    result[has_values] = (lower + upper) / 2
+    return result
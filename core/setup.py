@@ -16,6 +16,12 @@ setup(
         "parselmouth>=0.4.4",
     ],
     extras_require={
+        "image": [
+            "pillow>=10.0.0",
+        ],
+        "parquet": [
+            "pyarrow>=14.0.0",
+        ],
         "dev": [
             "pytest>=8.0.0",
             "pytest-cov>=4.0.0",
@@ -0,0 +1,44 @@
+"""Tests for linguai_core acoustic analysis"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from linguai_core import get_formants, get_pitch, get_spectrogram, load_sound
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+
+
+@pytest.fixture(scope="module")
+def sound():
+    return load_sound(DATA_DIR / "speech_like.wav")
+
+
+def test_float32_spectrogram_matches_float64(sound):
+    """Test a float32 spectrogram agrees with float64 and uses half the memory"""
+    full = get_spectrogram(sound)
+    compact = get_spectrogram(sound, dtype=np.float32)
+
+    assert compact.intensities.dtype == np.float32
+    assert compact.times.dtype == np.float64
+    assert compact.intensities.nbytes * 2 == full.intensities.nbytes
+    np.testing.assert_allclose(compact.intensities, full.intensities, atol=1e-3)
+
+
+def test_float32_tracks(sound):
+    """Test the dtype option applies to formant and pitch tracks"""
+    formants = get_formants(sound, dtype=np.float32)
+    pitch = get_pitch(sound, dtype=np.float32)
+
+    assert formants.f1.dtype == formants.f4.dtype == np.float32
+    assert pitch.frequencies.dtype == np.float32
+    np.testing.assert_allclose(pitch.frequencies, get_pitch(sound).frequencies, rtol=1e-6)
+
+
+def test_astype_round_trip(sound):
+    """Test astype converts values and leaves times untouched"""
+    pitch = get_pitch(sound)
+    converted = pitch.astype(np.float32)
+    assert converted.times is pitch.times
+    assert converted.frequencies.dtype == np.float32
@@ -0,0 +1,108 @@
+"""Tests for cepstral peak prominence"""
+
+from pathlib import Path
+
+import numpy as np
+import parselmouth
+import pytest
+from parselmouth.praat import call
+
+from linguai_core import get_cpps, load_sound
+from linguai_core.cepstral import peak_prominence, power_cepstrogram, prominence_tracks, smooth_cepstrogram
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+CLINICAL_DIR = DATA_DIR / "stress_test_batches" / "batch_5"
+
+
+@pytest.mark.parametrize("path", [
+    CLINICAL_DIR / "sustained_a_clinical.wav",
+    CLINICAL_DIR / "breathy_voice.wav",
+    DATA_DIR / "speech_like.wav",
+])
+def test_matches_praat(path):
+    """Test the cepstrogram, its smoothing and CPPS reproduce Praat's"""
+    sound = load_sound(path)
+    praat = call(sound, "To PowerCepstrogram", 60, 0.002, 5000, 50)
+    praat_smoothed = call(praat, "Smooth", 0.01, 0.001)
+
+    analysis_sound = sound.resample(10000)
+    times, quefrencies, power = power_cepstrogram(analysis_sound.values, 10000, analysis_sound.x1)
+    expected = call(praat, "To Matrix").values.T
+    np.testing.assert_allclose(power, expected, rtol=0, atol=1e-12 * expected.max())
+
+    smoothed = smooth_cepstrogram(power, 0.002, quefrencies[1] - quefrencies[0])
+    expected = call(praat_smoothed, "To Matrix").values.T
+    np.testing.assert_allclose(smoothed, expected, rtol=0, atol=1e-12 * expected.max())
+
+    cpps = get_cpps(sound)
+    np.testing.assert_allclose(cpps.times, times)
+    expected_mean = call(
+        praat, "Get CPPS", False, 0.01, 0.001, 60, 330, 0.05,
+        "Parabolic", 0.001, quefrencies[-1], "Straight", "Least squares",
+    )
+    assert cpps.cpps_mean == pytest.approx(expected_mean, abs=1e-9)
+    for frame in (0, len(times) // 2, len(times) - 1):
+        cepstrum = call(praat_smoothed, "To PowerCepstrum (slice)", times[frame])
+        expected = call(
+            cepstrum, "Get peak prominence", 60, 330,
+            "Parabolic", 0.001, quefrencies[-1], "Straight", "Least squares",
+        )
+        assert cpps.cpps[frame] == pytest.approx(expected, abs=1e-9)
+
+
+def test_periodic_voice_is_more_prominent_than_noise():
+    """Test a harmonic signal has a clear cepstral peak and noise does not"""
+    import parselmouth
+
+    rate = 16000
+    t = np.arange(rate) / rate
+    voice = sum(np.sin(2 * np.pi * 150 * h * t) / h for h in range(1, 20))
+    noise = np.random.default_rng(0).normal(0, 0.3, rate)
+    voiced = get_cpps(parselmouth.Sound(voice, sampling_frequency=rate))
+    unvoiced = get_cpps(parselmouth.Sound(noise, sampling_frequency=rate))
+    assert voiced.cpps_mean > unvoiced.cpps_mean + 10
+    assert voiced.cpp_mean > voiced.cpps_mean
+    assert len(voiced.cpp) == len(voiced.cpps) == len(voiced.times)
+
+
+def test_sound_shorter_than_window():
+    """Test a sound shorter than the analysis window is rejected"""
+    import parselmouth
+
+    with pytest.raises(ValueError):
+        get_cpps(parselmouth.Sound(np.zeros(500), sampling_frequency=10000))
+
+
+def test_half_sample_frame_starts_match_praat():
+    """Test frames starting half-way between samples take the later sample, as in Praat"""
+    sound = load_sound(DATA_DIR / "long_10s.wav").resample(10000)
+    # Two samples more than 5 s put every frame start on a half sample
+    part = parselmouth.Sound(sound.values[:, :50002], sampling_frequency=10000)
+    praat = call(part, "To PowerCepstrogram", 60, 0.002, 5000, 50)
+    expected = call(praat, "To Matrix").values.T
+    _, _, power = power_cepstrogram(part.values, 10000, part.x1)
+    np.testing.assert_allclose(power, expected, rtol=0, atol=1e-12 * expected.max())
+
+
+def test_prominence_tracks_stream_the_cepstrogram():
+    """Test CPP and CPPS come out as from the whole cepstrogram, in memory that doesn't grow with it"""
+    import tracemalloc
+
+    noise = np.random.default_rng(0).normal(0, 0.1, 600000)
+    times, quefrencies, power = power_cepstrogram(noise[:100000], 10000, 0.5e-4)
+    smoothed = smooth_cepstrogram(power, 0.002, quefrencies[1] - quefrencies[0])
+    selected = (times >= 3.3) & (times <= 7.1)
+    streamed = prominence_tracks(noise[:100000], 10000, 0.5e-4, start=3.3, end=7.1)
+    np.testing.assert_array_equal(streamed[0], times[selected])
+    np.testing.assert_allclose(streamed[1], peak_prominence(power, quefrencies)[0][selected], rtol=0, atol=1e-9)
+    np.testing.assert_allclose(streamed[2], peak_prominence(smoothed, quefrencies)[0][selected], rtol=0, atol=1e-9)
+
+    peaks = []
+    for n_samples in (100000, 600000):
+        tracemalloc.start()
+        prominence_tracks(noise[:n_samples], 10000, 0.5e-4)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    # Only copies of the samples grow: the cepstrogram of the 50 s added
+    # would take 128 MB
+    assert peaks[1] - peaks[0] < 3 * noise[100000:].nbytes
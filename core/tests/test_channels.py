@@ -0,0 +1,88 @@
+"""Tests for per-channel analysis"""
+
+import time
+from pathlib import Path
+
+import numpy as np
+import parselmouth
+import pytest
+
+from linguai_core import AnalysisCancelled, analyze_channels, get_cpps, get_formants, get_pitch, load_sound
+from linguai_core import channels
+from linguai_core.channels import parse_channels
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+STEREO = DATA_DIR / "stress_test_batches" / "batch_2" / "channels_stereo.wav"
+
+
+def test_parse_channels():
+    """Test channel selections are parsed and checked against the sound"""
+    assert parse_channels("mix", 2) is None
+    assert parse_channels("all", 2) == [0, 1]
+    assert parse_channels("1, 0", 2) == [1, 0]
+    assert parse_channels([1], 2) == [1]
+    for invalid in ("2", "left", "", []):
+        with pytest.raises(ValueError):
+            parse_channels(invalid, 2)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_channels_match_separate_analyses(max_workers):
+    """Test each channel's result equals the analysis of that channel alone, in or out of process"""
+    sound = load_sound(STEREO)
+    results = analyze_channels(get_pitch, sound, "all", max_workers=max_workers, time_step=0.01)
+    assert len(results) == 2
+    for channel, result in enumerate(results):
+        expected = get_pitch(sound.extract_channel(channel + 1), time_step=0.01)
+        np.testing.assert_array_equal(result.times, expected.times)
+        np.testing.assert_array_equal(result.frequencies, expected.frequencies)
+
+    # The channels of this recording carry different tones
+    medians = [np.nanmedian(result.frequencies) for result in results]
+    assert medians[0] == pytest.approx(440, rel=0.01)
+    assert medians[1] == pytest.approx(550, rel=0.01)
+
+
+def test_mix_analyzes_the_sound_once():
+    """Test channels="mix" runs one analysis of the whole sound"""
+    sound = load_sound(STEREO)
+    (mixed,) = analyze_channels(get_formants, sound, "mix")
+    expected = get_formants(sound)
+    np.testing.assert_array_equal(mixed.f1, expected.f1)
+
+
+def test_isolated_mix_matches_in_process():
+    """Test isolate=True runs the mixed analysis in a worker process with the same result"""
+    sound = load_sound(STEREO)
+    (isolated,) = analyze_channels(get_pitch, sound, "mix", isolate=True, time_step=0.01)
+    expected = get_pitch(sound, time_step=0.01)
+    np.testing.assert_array_equal(isolated.times, expected.times)
+    np.testing.assert_array_equal(isolated.frequencies, expected.frequencies)
+
+
+def test_cancelled_analysis_kills_its_worker():
+    """Test cancelling stops a running worker process promptly and later analyses still work"""
+    noise = parselmouth.Sound(np.random.default_rng(0).standard_normal(44100 * 60), 44100)
+    begin = time.perf_counter()
+    with pytest.raises(AnalysisCancelled):
+        analyze_channels(get_pitch, noise, "mix", isolate=True, time_step=0.0005,
+                         cancelled=lambda: time.perf_counter() - begin > 0.5)
+    assert time.perf_counter() - begin < 3.0
+    assert all(worker.process.is_alive() for worker in channels._idle_workers)
+
+    sound = load_sound(STEREO)
+    (result,) = analyze_channels(get_pitch, sound, [1], isolate=True, time_step=0.01)
+    assert np.nanmedian(result.frequencies) == pytest.approx(550, rel=0.01)
+
+
+def test_failed_analysis_returns_its_worker():
+    """Test an analysis that raises in a worker leaves no extra worker process behind"""
+    import multiprocessing
+
+    short = parselmouth.Sound(np.zeros((2, 300)), 10000)
+    analyze_channels(get_pitch, load_sound(STEREO), "all", max_workers=2, time_step=0.01)
+    children = len(multiprocessing.active_children())
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            analyze_channels(get_cpps, short, "all", max_workers=2)
+    assert len(multiprocessing.active_children()) == children
@@ -0,0 +1,57 @@
+"""Tests for the fast (YIN) pitch tracker"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from linguai_core import get_pitch, load_sound
+from linguai_core.fast_pitch import yin_pitch
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+
+
+def test_sine_pitch():
+    """Test a pure tone is tracked at its frequency on every frame"""
+    sound = load_sound(DATA_DIR / "sine_440hz.wav")
+    pitch = get_pitch(sound, mode="fast")
+    assert not np.isnan(pitch.frequencies).any()
+    np.testing.assert_allclose(pitch.frequencies, 440.0, rtol=0.005)
+
+
+def test_same_frames_as_praat_and_close_values():
+    """Test fast mode shares Praat's frame times and mostly agrees with it"""
+    sound = load_sound(DATA_DIR / "speech_like.wav")
+    praat = get_pitch(sound)
+    fast = get_pitch(sound, mode="fast")
+    np.testing.assert_array_equal(fast.times, praat.times)
+
+    praat_voiced = ~np.isnan(praat.frequencies)
+    fast_voiced = ~np.isnan(fast.frequencies)
+    assert (praat_voiced != fast_voiced).mean() < 0.15
+
+    both = praat_voiced & fast_voiced
+    ratio = fast.frequencies[both] / praat.frequencies[both]
+    assert (np.abs(np.log2(ratio)) > np.log2(1.2)).mean() < 0.05
+    assert np.median(np.abs(ratio - 1)) < 0.03
+
+
+def test_silence_and_noise_are_unvoiced():
+    """Test frames without periodic signal come out unvoiced"""
+    rng = np.random.default_rng(0)
+    silence = np.zeros(16000)
+    noise = rng.normal(0, 0.1, 16000)
+    for values in (silence, noise):
+        _, frequencies = yin_pitch(values, 16000, 0.5 / 16000)
+        assert np.isnan(frequencies).mean() > 0.95
+
+
+def test_channels_are_combined():
+    """Test a stereo tone is tracked like the same tone in mono"""
+    t = np.arange(16000) / 16000
+    tone = 0.5 * np.sin(2 * np.pi * 220 * t)
+    _, mono = yin_pitch(tone, 16000, 0.5 / 16000)
+    _, stereo = yin_pitch(np.vstack([tone, 0.5 * tone]), 16000, 0.5 / 16000)
+    np.testing.assert_allclose(stereo, mono, rtol=1e-6)
+    with pytest.raises(ValueError):
+        get_pitch(load_sound(DATA_DIR / "sine_440hz.wav"), mode="yin")
@@ -0,0 +1,96 @@
+"""Tests for the corpus feature store"""
+
+import shutil
+from pathlib import Path
+
+import numpy as np
+import parselmouth
+import pytest
+
+from linguai_core import Annotation, FeatureSettings, FeatureStore, TextGrid, Tier
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+
+
+def _textgrid(duration: float) -> TextGrid:
+    bounds = np.linspace(0.0, duration, 13)
+    labels = ["a", "i", "u"] * 4
+    return TextGrid(
+        tiers=[Tier(name="phones", annotations=[
+            Annotation(float(start), float(end), label)
+            for start, end, label in zip(bounds[:-1], bounds[1:], labels)
+        ])],
+        duration=duration,
+    )
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    store = FeatureStore(tmp_path_factory.mktemp("features"))
+    for name, duration in [("speech_like.wav", 3.0), ("long_10s.wav", 10.0)]:
+        store.ingest(DATA_DIR / name, _textgrid(duration))
+    return store
+
+
+def test_ingestion_skips_known_content(store, tmp_path):
+    """Test a file already in the store, under any name, is not analyzed again"""
+    copy = tmp_path / "copy.wav"
+    shutil.copy(DATA_DIR / "speech_like.wav", copy)
+    assert store.ingest(DATA_DIR / "speech_like.wav") is False
+    assert store.ingest_many([copy, DATA_DIR / "long_10s.wav"]) == []
+    assert len(store.files()) == 2
+
+
+def test_tracks_match_praat(store):
+    """Test the stored F0 and intensity are Praat's values at the formant frames"""
+    sound = parselmouth.Sound(str(DATA_DIR / "speech_like.wav"))
+    data = store.read(store.key_for_file(DATA_DIR / "speech_like.wav"))
+    pitch = sound.to_pitch(time_step=0.01, pitch_floor=75, pitch_ceiling=600)
+    intensity = sound.to_intensity(time_step=0.01, minimum_pitch=100)
+
+    expected_f0 = [pitch.get_value_at_time(t) for t in data["times"]]
+    expected_intensity = [intensity.get_value(t, parselmouth.ValueInterpolation.LINEAR) for t in data["times"]]
+    np.testing.assert_allclose(data["f0"], expected_f0, rtol=1e-6)
+    np.testing.assert_allclose(data["intensity"], expected_intensity, rtol=1e-6)
+
+
+def test_interval_query_matches_scan(store):
+    """Test an indexed query returns the frames a full scan of the tracks finds"""
+    selection = store.query([("f1", ">", 700)], tier="phones", label="a", columns=["f1"])
+
+    expected = []
+    for stored in sorted(store.files(), key=lambda f: f.key):
+        data = store.read(stored.key)
+        for annotation in _textgrid(stored.duration).tiers[0].annotations:
+            if annotation.text != "a":
+                continue
+            inside = (data["times"] >= annotation.start) & (data["times"] < annotation.end)
+            expected += [(stored.key, t) for t in data["times"][inside & (data["f1"] > 700)]]
+
+    found = [(selection.files[i], t) for i, t in zip(selection.file_index, selection.times)]
+    assert len(selection) > 0
+    assert found == expected
+    assert (selection.columns["f1"] > 700).all()
+    assert set(selection.labels) == {"a"}
+
+
+def test_query_without_tier(store):
+    """Test predicates over every frame, undefined values never matching"""
+    selection = store.query([("f0", ">", 0), ("intensity", ">=", 60)])
+    total = sum(f.n_frames for f in store.files())
+    assert 0 < len(selection) < total
+    assert not np.isnan(selection.columns["f0"]).any()
+    assert (selection.columns["intensity"] >= 60).all()
+    assert selection.labels is None
+    assert len(store.query()) == total
+    assert len(store.query(("f1", ">", 1e6))) == 0
+
+
+def test_store_keeps_its_settings(store):
+    """Test a store refuses other analysis settings"""
+    assert FeatureStore(store.directory).settings == store.settings
+    with pytest.raises(ValueError):
+        FeatureStore(store.directory, FeatureSettings(time_step=0.005))
+    with pytest.raises(ValueError):
+        store.query([("f9", ">", 1)])
+
@@ -0,0 +1,39 @@
+"""Tests for the shared analysis frame grids"""
+
+import time
+
+import numpy as np
+import pytest
+
+from linguai_core.cepstral import power_cepstrogram
+from linguai_core.frames import frame_block, short_term_frame_times
+
+
+@pytest.mark.parametrize("sample_rate, window, time_step", [
+    (44100, 0.04, 0.01),
+    (22050, 0.0853, 0.01),
+    (11000, 0.05, 0.01),
+    (10000, 0.1, 0.002),
+])
+def test_frame_block_reproduces_grid(sample_rate, window, time_step):
+    """Test a block's own frames are the chosen frames of the whole signal, to half a sample"""
+    dx = 1.0 / sample_rate
+    n_samples = int(7.3 * sample_rate) + 17
+    x1 = 0.25 + 0.5 * dx
+    times = short_term_frame_times(n_samples, dx, x1, window, time_step)
+    for first, last in [(0, 99), (150, 420), (300, len(times) - 1), (0, len(times) - 1)]:
+        offset, length = frame_block(n_samples, dx, x1, window, time_step, first, last)
+        block_times = short_term_frame_times(length, dx, x1 + offset * dx, window, time_step)
+        assert len(block_times) == last - first + 1
+        np.testing.assert_allclose(block_times, times[first:last + 1], rtol=0, atol=0.5 * dx + 1e-12)
+
+
+def test_expired_deadline_keeps_first_block():
+    """Test an engine past its deadline returns the frames of its first block, unchanged"""
+    rng = np.random.default_rng(0)
+    samples = rng.standard_normal(10000 * 8)
+    times, _, power = power_cepstrogram(samples, 10000, 0.5e-4)
+    partial_times, _, partial_power = power_cepstrogram(samples, 10000, 0.5e-4, deadline=time.monotonic())
+    assert 0 < len(partial_times) < len(times)
+    np.testing.assert_array_equal(partial_times, times[:len(partial_times)])
+    np.testing.assert_array_equal(partial_power, power[:len(partial_times)])
@@ -0,0 +1,106 @@
+"""Tests for the batched LPC formant engine"""
+
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from linguai_core import get_formants, load_sound
+from linguai_core.lpc import burg, lpc_formants
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+VOWEL_DIR = DATA_DIR / "stress_test_batches" / "batch_3"
+
+
+def _praat_tracks(sound, time_step=0.01, max_formant=5500.0):
+    """Praat's formant frequencies and bandwidths [time, formant] at its frame times."""
+    formants = sound.to_formant_burg(
+        time_step=time_step, max_number_of_formants=5, maximum_formant=max_formant,
+    )
+    times = np.array(formants.xs())
+    frequencies = np.array([[formants.get_value_at_time(k, t) for k in range(1, 6)] for t in times])
+    bandwidths = np.array([[formants.get_bandwidth_at_time(k, t) for k in range(1, 6)] for t in times])
+    return times, frequencies, bandwidths
+
+
+@pytest.mark.parametrize("name", [
+    "vowel_inventory.wav",
+    "vowel_ah_sustained.wav",
+    "vowel_i_sustained.wav",
+    "vowel_u_sustained.wav",
+    "diphthong_ai.wav",
+])
+def test_matches_praat_burg(name):
+    """Test the lpc engine reproduces To Formant (burg) frame for frame"""
+    sound = load_sound(VOWEL_DIR / name)
+    times, frequencies, bandwidths = _praat_tracks(sound)
+    lpc = get_formants(sound, engine="lpc")
+
+    np.testing.assert_allclose(lpc.times, times, rtol=0, atol=1e-12)
+    tracks = np.column_stack([lpc.f1, lpc.f2, lpc.f3, lpc.f4, lpc.f5])
+    np.testing.assert_array_equal(np.isnan(tracks), np.isnan(frequencies))
+    np.testing.assert_allclose(tracks, frequencies, rtol=1e-6)
+    np.testing.assert_allclose(lpc.bandwidths, bandwidths, rtol=1e-4)
+
+
+def test_same_tracks_as_praat_engine():
+    """Test F1-F4 agree with the default engine, and only lpc adds F5 and bandwidths"""
+    sound = load_sound(DATA_DIR / "speech_like.wav")
+    praat = get_formants(sound)
+    lpc = get_formants(sound, engine="lpc", dtype=np.float32)
+    assert praat.f5 is None and praat.bandwidths is None
+    assert lpc.f1.dtype == np.float32 and lpc.bandwidths.shape == (len(lpc.times), 5)
+    for k in ("f1", "f2", "f3", "f4"):
+        np.testing.assert_allclose(getattr(lpc, k), getattr(praat, k), rtol=1e-5)
+
+
+def test_burg_recovers_ar_process():
+    """Test batched Burg finds the coefficients of a known autoregressive process"""
+    rng = np.random.default_rng(0)
+    true = np.array([1.3, -0.8, 0.2])
+    signal = np.zeros(4096)
+    noise = rng.normal(size=4096)
+    for n in range(3, 4096):
+        signal[n] = true @ signal[n - 3:n][::-1] + noise[n]
+    frames = np.stack([signal[:2048], signal[2048:]])
+    np.testing.assert_allclose(burg(frames, 3), np.tile(true, (2, 1)), atol=0.05)
+
+
+def test_other_threads_run_during_analysis():
+    """Test the analysis releases the GIL instead of stalling the process as Praat does"""
+    sound = load_sound(DATA_DIR / "long_10s.wav").resample(11000)
+    values = np.tile(sound.values, (1, 3))
+    gaps, stop = [], threading.Event()
+
+    def ticker():
+        last = time.perf_counter()
+        while not stop.is_set():
+            time.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    thread = threading.Thread(target=ticker)
+    thread.start()
+    begin = time.perf_counter()
+    lpc_formants(values, 11000, sound.x1)
+    elapsed = time.perf_counter() - begin
+    stop.set()
+    thread.join()
+    assert max(gaps) < elapsed / 2
+
+
+def test_silence_has_no_formants():
+    """Test silent frames come out undefined instead of failing"""
+    times, frequencies, bandwidths = lpc_formants(np.zeros(11000), 11000, 0.5 / 11000)
+    assert len(times) > 0
+    assert np.isnan(frequencies).all() and np.isnan(bandwidths).all()
+
+
+def test_unknown_engine():
+    """Test an unknown engine name is rejected"""
+    sound = load_sound(DATA_DIR / "sine_440hz.wav")
+    with pytest.raises(ValueError):
+        get_formants(sound, engine="fft")
@@ -0,0 +1,99 @@
+"""Tests for per-interval measurements and the track lookups behind them"""
+
+from pathlib import Path
+
+import numpy as np
+import parselmouth
+import pytest
+
+from linguai_core import Annotation, get_formants, get_pitch, load_sound, measure_intervals
+from linguai_core.measurements import MEASURED_TRACKS, STATISTICS
+from linguai_core.tracks import range_extrema, range_means, range_medians
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+
+
+@pytest.fixture(scope="module")
+def sound():
+    return load_sound(DATA_DIR / "speech_like.wav")
+
+
+@pytest.fixture(scope="module")
+def intervals():
+    rng = np.random.default_rng(1)
+    starts = np.sort(rng.uniform(0.0, 2.9, 40))
+    return [
+        Annotation(float(start), float(min(start + length, 3.0)), f"v{i % 3}")
+        for i, (start, length) in enumerate(zip(starts, rng.uniform(0.0, 0.3, 40)))
+    ] + [Annotation(1.234, 1.234, "point")]
+
+
+def test_range_reductions_match_loops():
+    """Test the reduceat range statistics against a loop over the ranges"""
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=200)
+    values[rng.random(200) < 0.3] = np.nan
+    first = rng.integers(0, 201, 300)
+    last = np.minimum(first + rng.integers(0, 12, 300), 200)
+
+    minima, maxima = range_extrema(values, first, last)
+    means = range_means(values, first, last)
+    medians = range_medians(values, first, last)
+    for i, (f, l) in enumerate(zip(first, last)):
+        part = values[f:l][~np.isnan(values[f:l])]
+        if len(part) == 0:
+            assert np.isnan([minima[i], maxima[i], means[i], medians[i]]).all()
+            continue
+        assert (minima[i], maxima[i]) == (part.min(), part.max())
+        assert means[i] == pytest.approx(part.mean())
+        assert medians[i] == np.median(part)
+
+
+def test_measurements_match_per_interval_queries(sound, intervals):
+    """Test the one-pass table against measuring each interval on its own"""
+    table = measure_intervals(sound, intervals)
+    assert len(table) == len(intervals)
+    assert list(table.columns)[:4] == ["label", "start", "end", "duration"]
+    assert len(table.columns) == 4 + len(MEASURED_TRACKS) * len(STATISTICS)
+
+    pitch = get_pitch(sound)
+    formants = get_formants(sound)
+    for i, interval in enumerate(intervals):
+        inside = (formants.times >= interval.start) & (formants.times < interval.end)
+        f2 = formants.f2[inside]
+        f2 = f2[~np.isnan(f2)]
+        if len(f2):
+            assert table.columns["f2_max"][i] == f2.max()
+            assert table.columns["f2_median"][i] == np.median(f2)
+        else:
+            assert np.isnan(table.columns["f2_mean"][i])
+        voiced = pitch.frequencies[(pitch.times >= interval.start) & (pitch.times < interval.end)]
+        voiced = voiced[~np.isnan(voiced)]
+        if len(voiced):
+            assert table.columns["f0_mean"][i] == pytest.approx(voiced.mean())
+
+
+def test_midpoints_match_praat(sound, intervals):
+    """Test midpoint values are Praat's Get value at time"""
+    table = measure_intervals(sound, intervals)
+    pitch = sound.to_pitch(time_step=0.01, pitch_floor=75, pitch_ceiling=600)
+    intensity = sound.to_intensity(time_step=0.01, minimum_pitch=100)
+    midpoints = [(interval.start + interval.end) / 2 for interval in intervals]
+
+    np.testing.assert_allclose(table.columns["f0_midpoint"],
+                               [pitch.get_value_at_time(t) for t in midpoints], rtol=1e-9)
+    np.testing.assert_allclose(table.columns["intensity_midpoint"],
+                               [intensity.get_value(t, parselmouth.ValueInterpolation.LINEAR) for t in midpoints],
+                               rtol=1e-9)
+
+
+def test_table_output(sound, intervals):
+    """Test CSV output has a header, one line per interval, and blanks for NaN"""
+    table = measure_intervals(sound, intervals[-3:])
+    lines = table.to_csv().splitlines()
+    assert lines[0].split(",") == list(table.columns)
+    assert len(lines) == 4
+    point = lines[-1].split(",")
+    assert point[:4] == ["point", "1.234", "1.234", "0.0"]
+    assert point[4] == ""
+    assert table.rows()[-1][4] is None
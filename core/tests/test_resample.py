@@ -0,0 +1,42 @@
+"""Tests for the NumPy resampler"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from linguai_core import load_sound
+from linguai_core.resample import resample, resample_sound
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+
+# Documented parity with Praat (see linguai_core.resample)
+PEAK_TOLERANCE = 1e-9
+
+
+@pytest.mark.parametrize("filename, rate", [
+    ("speech_like.wav", 10000.0),
+    ("long_10s.wav", 11000.0),
+    ("stress_test_batches/batch_2/channels_stereo.wav", 8000.0),
+    ("stress_test_batches/batch_2/sample_rate_8000hz.wav", 6000.0),
+])
+def test_resample_matches_praat(filename, rate):
+    """Test the resampled Sound has Praat's grid and samples"""
+    sound = load_sound(DATA_DIR / filename)
+    reference = sound.resample(rate)
+    resampled = resample_sound(sound, rate)
+
+    assert resampled.values.shape == reference.values.shape
+    assert (resampled.xmin, resampled.xmax) == (reference.xmin, reference.xmax)
+    assert resampled.x1 == pytest.approx(reference.x1, abs=1e-12)
+    error = np.abs(resampled.values - reference.values).max()
+    assert error <= PEAK_TOLERANCE * np.abs(reference.values).max()
+
+
+@pytest.mark.parametrize("factor", [0.9 + 1e-7, 1.5])
+def test_upsampling_and_irregular_rates_are_left_to_praat(factor):
+    """Test upsampling, or a rate ratio with a large denominator, isn't resampled here"""
+    sound = load_sound(DATA_DIR / "speech_like.wav")
+    rate = sound.sampling_frequency * factor
+    assert resample(sound.values, sound.sampling_frequency, sound.x1, sound.xmin, sound.xmax, rate) is None
+    np.testing.assert_array_equal(resample_sound(sound, rate).values, sound.resample(rate).values)
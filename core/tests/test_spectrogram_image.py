@@ -0,0 +1,87 @@
+"""Tests for spectrogram image rendering"""
+
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from linguai_core import encode_image, render_spectrogram
+from linguai_core.spectrogram_image import LUT_SIZE, colormap_lut
+
+
+def _decode_png(data: bytes) -> np.ndarray:
+    """Decode the PNGs encode_png writes (8-bit, every row Up-filtered)."""
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    chunks, offset = {}, 8
+    while offset < len(data):
+        (length,) = struct.unpack(">I", data[offset:offset + 4])
+        kind = data[offset + 4:offset + 8]
+        chunks[kind] = chunks.get(kind, b"") + data[offset + 8:offset + 8 + length]
+        offset += 12 + length
+    width, height, _, color_type = struct.unpack(">IIBB", chunks[b"IHDR"][:10])
+    channels = 1 if color_type == 0 else 3
+    rows = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8).reshape(height, -1)
+    assert (rows[:, 0] == 2).all()
+    image = np.cumsum(rows[:, 1:], axis=0, dtype=np.uint8)
+    return image.reshape(height, width, channels).squeeze(axis=2) if channels == 1 else image.reshape(height, width, 3)
+
+
+def test_colormap_luts():
+    """Test grayscale runs white to black and viridis dark to bright"""
+    gray = colormap_lut("grayscale")
+    assert gray.shape == (LUT_SIZE,) and gray[0] == 255 and gray[-1] == 0
+    viridis = colormap_lut("viridis")
+    assert viridis.shape == (LUT_SIZE, 3) and viridis.dtype == np.uint8
+    assert viridis[0].sum() < viridis[-1].sum()
+    with pytest.raises(ValueError):
+        colormap_lut("rainbow")
+
+
+def test_dynamic_range_and_orientation():
+    """Test values below the dynamic range are blank and high frequencies are on top"""
+    intensities = np.full((50, 20), -200.0, dtype=np.float32)
+    intensities[:, -1] = 60.0  # loud top band
+    intensities[:, 0] = 0.0  # 60 dB down: still painted with a 70 dB range
+    frequencies = np.linspace(100, 5000, 20)
+
+    image = render_spectrogram(intensities, frequencies, 50, 20, pre_emphasis=0.0)
+    assert image.shape == (20, 50)
+    assert (image[0] == 0).all()  # maximum is black
+    assert (image[10] == 255).all()  # floored is white
+    assert 0 < image[-1, 0] < 255
+
+    floored = render_spectrogram(intensities, frequencies, 50, 20, dynamic_range=50.0, pre_emphasis=0.0)
+    assert (floored[-1] == 255).all()
+
+
+def test_frames_beyond_width_are_max_pooled():
+    """Test a single loud frame among many per column still shows"""
+    intensities = np.zeros((1000, 4), dtype=np.float32)
+    intensities[503] = 60.0  # shorter than a column
+    frequencies = np.linspace(100, 5000, 4)
+
+    image = render_spectrogram(intensities, frequencies, 10, 4, pre_emphasis=0.0)
+    assert (image[:, 5] == 0).all()
+    assert (np.delete(image, 5, axis=1) > 0).all()
+
+
+def test_pre_emphasis_raises_high_frequencies():
+    """Test pre-emphasis adds dB per octave above 1 kHz"""
+    intensities = np.zeros((10, 2), dtype=np.float32)
+    frequencies = np.array([1000.0, 4000.0])
+    flat = render_spectrogram(intensities, frequencies, 10, 2, maximum=20.0, dynamic_range=40.0, pre_emphasis=0.0)
+    emphasized = render_spectrogram(intensities, frequencies, 10, 2, maximum=20.0, dynamic_range=40.0)
+    assert flat[0, 0] == flat[1, 0] == emphasized[1, 0]
+    # Two octaves at 6 dB/octave: 12 of the 40 dB range darker
+    assert int(flat[0, 0]) - int(emphasized[0, 0]) == pytest.approx(255 * 12 / 40, abs=1)
+
+
+def test_png_round_trip():
+    """Test encoded PNGs decode back to the rendered pixels"""
+    rng = np.random.default_rng(0)
+    intensities = rng.uniform(-20, 60, (300, 64)).astype(np.float32)
+    frequencies = np.linspace(0, 5000, 64)
+    for colormap in ("grayscale", "viridis"):
+        image = render_spectrogram(intensities, frequencies, 120, 40, colormap=colormap)
+        np.testing.assert_array_equal(_decode_png(encode_image(image, "png")), image)
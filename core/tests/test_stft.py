@@ -0,0 +1,93 @@
+"""Tests for the NumPy spectrogram engine"""
+
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from linguai_core import get_spectrogram, load_sound
+from linguai_core.stft import gaussian_spectrogram
+
+DATA_DIR = Path(__file__).parents[2] / "tests" / "data"
+
+# Documented parity with Praat (see linguai_core.stft)
+POWER_TOLERANCE = 1e-12
+DB_TOLERANCE = 1e-6
+DB_RANGE = 100.0
+
+
+@pytest.mark.parametrize("filename, settings", [
+    ("speech_like.wav", dict(window_length=0.005, time_step=0.002, max_frequency=5000.0)),
+    ("chord.wav", dict(window_length=0.025, time_step=0.01, max_frequency=8000.0)),
+    # Frame centres off the sample grid, analysis up to the Nyquist frequency
+    ("long_10s.wav", dict(window_length=0.005, time_step=0.0013, max_frequency=30000.0)),
+    ("stress_test_batches/batch_2/channels_stereo.wav", dict(window_length=0.005, time_step=0.002)),
+    ("stress_test_batches/batch_2/sample_rate_8000hz.wav", dict(window_length=0.005, time_step=0.002)),
+])
+def test_numpy_engine_matches_praat(filename, settings):
+    """Test the NumPy engine reproduces Praat's frames, bins and power"""
+    sound = load_sound(DATA_DIR / filename)
+    reference = sound.to_spectrogram(
+        window_length=settings["window_length"],
+        time_step=settings["time_step"],
+        maximum_frequency=settings.get("max_frequency", 5000.0),
+    )
+    times, frequencies, power = gaussian_spectrogram(
+        sound.values, sound.sampling_frequency, sound.x1, **settings,
+    )
+
+    expected = reference.values.T
+    assert power.shape == expected.shape
+    np.testing.assert_allclose(times, reference.xs(), rtol=0, atol=1e-12)
+    np.testing.assert_allclose(frequencies, reference.ys())
+    assert np.abs(power - expected).max() <= POWER_TOLERANCE * expected.max()
+
+    # A range of frames is computed as in the whole analysis
+    part_times, _, part = gaussian_spectrogram(
+        sound.values, sound.sampling_frequency, sound.x1, frames=slice(3, 40), **settings,
+    )
+    np.testing.assert_array_equal(part_times, times[3:40])
+    np.testing.assert_array_equal(part, power[3:40])
+
+
+def test_get_spectrogram_engines_agree():
+    """Test get_spectrogram gives the same dB matrix with either engine"""
+    sound = load_sound(DATA_DIR / "speech_like.wav")
+    praat = get_spectrogram(sound)
+    fast = get_spectrogram(sound, engine="numpy", dtype=np.float32)
+
+    assert fast.intensities.dtype == np.float32
+    np.testing.assert_array_equal(fast.times, praat.times)
+    audible = praat.intensities > praat.intensities.max() - DB_RANGE
+    np.testing.assert_allclose(fast.intensities[audible], praat.intensities[audible], atol=1e-3)
+    exact = get_spectrogram(sound, engine="numpy")
+    assert np.abs(exact.intensities - praat.intensities)[audible].max() < DB_TOLERANCE
+
+    with pytest.raises(ValueError):
+        get_spectrogram(sound, engine="fft")
+
+
+def test_other_threads_run_during_analysis():
+    """Test the analysis releases the GIL instead of stalling the process as Praat does"""
+    sound = load_sound(DATA_DIR / "long_10s.wav")
+    values = np.tile(sound.values, (1, 3))
+    gaps, stop = [], threading.Event()
+
+    def ticker():
+        last = time.perf_counter()
+        while not stop.is_set():
+            time.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    thread = threading.Thread(target=ticker)
+    thread.start()
+    begin = time.perf_counter()
+    gaussian_spectrogram(values, sound.sampling_frequency, sound.x1)
+    elapsed = time.perf_counter() - begin
+    stop.set()
+    thread.join()
+    assert max(gaps) < elapsed / 2
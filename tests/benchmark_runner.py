@@ -0,0 +1,338 @@
+"""
+LinguAI Benchmark Runner
+Micro-benchmarks for linguai_core acoustic functions and the TextGrid parsers.
+
+Runs each function over synthetic inputs of increasing duration and sample
+rate, stores the timings as JSON together with machine metadata, and can
+compare a run against a stored baseline to flag regressions.
+
+Usage:
+    python tests/benchmark_runner.py
+    python tests/benchmark_runner.py --durations 1 5 --sample-rates 16000 44100
+    python tests/benchmark_runner.py --save-baseline tests/logs/benchmark_baseline.json
+    python tests/benchmark_runner.py --compare tests/logs/benchmark_baseline.json --threshold 0.15
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Configuration
+TEST_DIR = Path(__file__).parent
+REPO_ROOT = TEST_DIR.parent
+LOGS_DIR = TEST_DIR / "logs"
+
+sys.path.insert(0, str(REPO_ROOT / "core"))
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+from comprehensive_test_generator import (  # noqa: E402
+    write_wav,
+    generate_sine,
+    generate_noise,
+    mix_samples,
+    apply_envelope,
+)
+
+LOGS_DIR.mkdir(exist_ok=True)
+
+DEFAULT_DURATIONS = [1.0, 5.0, 30.0]
+DEFAULT_SAMPLE_RATES = [16000, 44100, 96000]
+DEFAULT_INTERVAL_COUNTS = [100, 1000, 10000]
+DEFAULT_REPEATS = 5
+DEFAULT_THRESHOLD = 0.10  # 10% slower than baseline counts as a regression
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing statistics for one function on one input"""
+    name: str  # Unique key, e.g. "get_pitch[5s@44100Hz]"
+    function: str
+    params: dict
+    repeats: int
+    min_ms: float
+    median_ms: float
+    mean_ms: float
+    stdev_ms: float
+
+
+@dataclass
+class BenchmarkReport:
+    """Full benchmark report"""
+    timestamp: str
+    machine: dict
+    total_duration_ms: float = 0
+    results: List[Dict] = field(default_factory=list)
+
+    def add_result(self, result: BenchmarkResult):
+        self.results.append(asdict(result))
+
+    def save(self, filepath: Path) -> Path:
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        with open(filepath, "w") as f:
+            json.dump(asdict(self), f, indent=2)
+        return filepath
+
+
+def collect_machine_metadata() -> dict:
+    """Describe the machine and software versions the benchmark ran on."""
+    metadata = {
+        "hostname": platform.node(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+    }
+
+    try:
+        import numpy
+        metadata["numpy"] = numpy.__version__
+    except ImportError:
+        metadata["numpy"] = None
+
+    try:
+        import parselmouth
+        metadata["parselmouth"] = parselmouth.VERSION
+        metadata["praat"] = parselmouth.PRAAT_VERSION
+    except (ImportError, AttributeError):
+        metadata["parselmouth"] = None
+
+    try:
+        metadata["git_commit"] = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.TimeoutExpired):
+        metadata["git_commit"] = None
+
+    return metadata
+
+
+def time_function(fn: Callable[[], object], repeats: int, warmup: int = 1) -> List[float]:
+    """Call fn repeatedly and return wall times in milliseconds."""
+    for _ in range(warmup):
+        fn()
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def make_result(name: str, function: str, params: dict, timings: List[float]) -> BenchmarkResult:
+    return BenchmarkResult(
+        name=name,
+        function=function,
+        params=params,
+        repeats=len(timings),
+        min_ms=round(min(timings), 3),
+        median_ms=round(statistics.median(timings), 3),
+        mean_ms=round(statistics.mean(timings), 3),
+        stdev_ms=round(statistics.stdev(timings), 3) if len(timings) > 1 else 0.0,
+    )
+
+
+# ============================================================
+# SYNTHETIC INPUTS
+# ============================================================
+
+def generate_voiced_input(filepath: Path, duration: float, sample_rate: int) -> Path:
+    """Write a harmonic, lightly noisy signal suitable for pitch and formant analysis."""
+    samples = mix_samples(
+        generate_sine(125, duration, sample_rate, 0.4),
+        generate_sine(250, duration, sample_rate, 0.2),
+        generate_sine(500, duration, sample_rate, 0.15),
+        generate_sine(1500, duration, sample_rate, 0.05),
+        generate_noise(duration, sample_rate, 0.02),
+    )
+    return write_wav(filepath, apply_envelope(samples, 0.02, 0.02, sample_rate), sample_rate)
+
+
+def generate_textgrid_content(num_intervals: int, fmt: str) -> str:
+    """Build a TextGrid with one interval tier of num_intervals segments."""
+    from app.api.textgrid import (
+        Annotation,
+        ExportTextGridRequest,
+        generate_textgrid_long,
+        generate_textgrid_short,
+    )
+
+    interval = 0.05
+    annotations = [
+        Annotation(
+            id=str(i + 1),
+            tier="phones",
+            start=round(i * interval, 6),
+            end=round((i + 1) * interval, 6),
+            text=f"p{i % 40}",
+        )
+        for i in range(num_intervals)
+    ]
+    request = ExportTextGridRequest(
+        duration=num_intervals * interval,
+        tiers=["phones"],
+        annotations=annotations,
+        format=fmt,
+    )
+    if fmt == "short":
+        return generate_textgrid_short(request)
+    return generate_textgrid_long(request)
+
+
+# ============================================================
+# BENCHMARKS
+# ============================================================
+
+def benchmark_acoustic(report: BenchmarkReport, workdir: Path, durations: List[float],
+                       sample_rates: List[int], repeats: int):
+    """Benchmark load_sound and the analysis functions of linguai_core."""
+    from linguai_core import load_sound, get_spectrogram, get_formants, get_pitch
+
+    for sample_rate in sample_rates:
+        for duration in durations:
+            filepath = workdir / f"bench_{duration:g}s_{sample_rate}hz.wav"
+            if not filepath.exists():
+                generate_voiced_input(filepath, duration, sample_rate)
+
+            sound = load_sound(filepath)
+            params = {"duration_s": duration, "sample_rate": sample_rate}
+            suffix = f"[{duration:g}s@{sample_rate}Hz]"
+
+            cases = [
+                ("load_sound", lambda: load_sound(filepath)),
+                ("get_spectrogram", lambda: get_spectrogram(sound)),
+                ("get_formants", lambda: get_formants(sound)),
+                ("get_pitch", lambda: get_pitch(sound)),
+            ]
+
+            for function, fn in cases:
+                timings = time_function(fn, repeats)
+                result = make_result(function + suffix, function, params, timings)
+                report.add_result(result)
+                print(f"  {result.name:<40} median {result.median_ms:>10.2f} ms")
+
+
+def benchmark_textgrid(report: BenchmarkReport, interval_counts: List[int], repeats: int):
+    """Benchmark the backend TextGrid parsers on long- and short-format files."""
+    from app.api.textgrid import parse_textgrid
+
+    for fmt in ("long", "short"):
+        for num_intervals in interval_counts:
+            content = generate_textgrid_content(num_intervals, fmt)
+            function = f"parse_textgrid_{fmt}"
+            params = {"intervals": num_intervals, "format": fmt}
+
+            timings = time_function(lambda: parse_textgrid(content), repeats)
+            result = make_result(f"{function}[{num_intervals}]", function, params, timings)
+            report.add_result(result)
+            print(f"  {result.name:<40} median {result.median_ms:>10.2f} ms")
+
+
+# ============================================================
+# BASELINE COMPARISON
+# ============================================================
+
+def compare_with_baseline(current: dict, baseline: dict, threshold: float) -> List[dict]:
+    """
+    Compare median timings with a baseline report.
+    Returns one entry per benchmark present in both, flagged when slower
+    than the baseline by more than threshold (a fraction, e.g. 0.1 = 10%).
+    """
+    baseline_by_name = {r["name"]: r for r in baseline.get("results", [])}
+    comparisons = []
+
+    for result in current.get("results", []):
+        base = baseline_by_name.get(result["name"])
+        if base is None or base["median_ms"] <= 0:
+            continue
+
+        change = (result["median_ms"] - base["median_ms"]) / base["median_ms"]
+        comparisons.append({
+            "name": result["name"],
+            "baseline_ms": base["median_ms"],
+            "current_ms": result["median_ms"],
+            "change": round(change, 4),
+            "regression": change > threshold,
+        })
+
+    return comparisons
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description="LinguAI micro-benchmarks")
+    parser.add_argument("--durations", type=float, nargs="+", default=DEFAULT_DURATIONS,
+                        help="Input durations in seconds")
+    parser.add_argument("--sample-rates", type=int, nargs="+", default=DEFAULT_SAMPLE_RATES,
+                        help="Input sample rates in Hz")
+    parser.add_argument("--intervals", type=int, nargs="+", default=DEFAULT_INTERVAL_COUNTS,
+                        help="TextGrid interval counts")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--output", type=Path, help="Where to write the JSON report")
+    parser.add_argument("--save-baseline", type=Path, help="Also store this run as a baseline")
+    parser.add_argument("--compare", type=Path, help="Baseline report to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report = BenchmarkReport(timestamp=timestamp, machine=collect_machine_metadata())
+
+    print("=" * 60)
+    print("LinguAI Benchmark Runner")
+    print("=" * 60)
+
+    overall_start = time.time()
+
+    with tempfile.TemporaryDirectory(prefix="linguai_bench_") as workdir:
+        print("\n=== Acoustic analysis ===")
+        benchmark_acoustic(report, Path(workdir), args.durations, args.sample_rates, args.repeats)
+
+    print("\n=== TextGrid parsing ===")
+    benchmark_textgrid(report, args.intervals, args.repeats)
+
+    report.total_duration_ms = (time.time() - overall_start) * 1000
+
+    output = args.output or LOGS_DIR / f"benchmark_{timestamp}.json"
+    print(f"\nReport saved to: {report.save(output)}")
+    if args.save_baseline:
+        print(f"Baseline saved to: {report.save(args.save_baseline)}")
+
+    if not args.compare:
+        return 0
+
+    with open(args.compare) as f:
+        baseline = json.load(f)
+
+    comparisons = compare_with_baseline(asdict(report), baseline, args.threshold)
+    regressions = [c for c in comparisons if c["regression"]]
+
+    print(f"\n=== Comparison with {args.compare} (threshold {args.threshold:.0%}) ===")
+    if baseline.get("machine", {}).get("hostname") != report.machine["hostname"]:
+        print("  Note: baseline was recorded on a different machine")
+    for c in comparisons:
+        marker = "REGRESSION" if c["regression"] else "ok"
+        print(f"  {c['name']:<40} {c['baseline_ms']:>10.2f} -> {c['current_ms']:>10.2f} ms "
+              f"({c['change']:+.1%}) {marker}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed beyond {args.threshold:.0%}")
+        return 1
+
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,126 +7,195 @@ Batch 2: Format Variety (sample rates, bit depths, channels)
 Batch 3: Real Phonetic Patterns (vowels, consonants, tones)
 Batch 4: Edge Cases (noise, clipping, silence gaps)
 Batch 5: Clinical/Research Scenarios (dysphonia, child speech patterns)
+
+It can also emit large synthetic corpora for load testing: hours of
+speech-like audio per file and thousands of files, each with a matching
+TextGrid of configurable interval density, generated in parallel.
+
+Usage:
+    python tests/comprehensive_test_generator.py [--seed 42]
+    python tests/comprehensive_test_generator.py --corpus /tmp/corpus \\
+        --files 100 --duration 3600 --sample-rate 16000 --intervals-per-second 28 --workers 8
 """
 
+import argparse
 import os
 import sys
 import wave
-import struct
-import math
-import random
 import json
+from multiprocessing import Pool
 from pathlib import Path
 from datetime import datetime
-from dataclasses import dataclass
-from typing import List, Tuple, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
 
 # Configuration
 TEST_DIR = Path(__file__).parent
 DATA_DIR = TEST_DIR / "data"
 BATCH_DIR = DATA_DIR / "stress_test_batches"
 
-# Ensure directories exist
-BATCH_DIR.mkdir(parents=True, exist_ok=True)
-for i in range(1, 6):
-    (BATCH_DIR / f"batch_{i}").mkdir(exist_ok=True)
+# Samples are int32 arrays in 16-bit range; mixing may exceed it before clipping
+SAMPLE_DTYPE = np.int32
+
+# Seconds of audio synthesized per chunk when streaming long files
+CHUNK_SECONDS = 10.0
+
+# Shared generator for the batch files; reseed with set_seed() for reproducible output
+_rng = np.random.default_rng()
+
+
+def set_seed(seed: Optional[int]) -> None:
+    """Reseed the generator used by the batch files."""
+    global _rng
+    _rng = np.random.default_rng(seed)
+
+
+def _time_axis(duration: float, sample_rate: int) -> np.ndarray:
+    return np.arange(int(duration * sample_rate)) / sample_rate
+
+
+def _to_samples(values: np.ndarray, scale: float) -> np.ndarray:
+    """Scale a float signal to integer samples, truncating like int()."""
+    return np.trunc(32767 * scale * values).astype(SAMPLE_DTYPE)
 
 
 # =============================================================================
 # CORE AUDIO GENERATION UTILITIES
 # =============================================================================
 
-def write_wav(filepath: Path, samples: List[int], sample_rate: int = 44100,
-              num_channels: int = 1, sample_width: int = 2) -> Path:
-    """Write samples to a WAV file."""
+def _to_pcm_bytes(samples, sample_width: int) -> bytes:
+    """Clip samples to the sample width and encode them as little-endian PCM."""
+    data = np.asarray(samples)
+    if data.dtype.kind == "f":
+        data = np.trunc(data)
+    data = data.astype(np.int64)
+
+    if sample_width == 2:
+        return np.clip(data, -32767, 32767).astype("<i2").tobytes()
+    if sample_width == 1:
+        return np.clip(data, 0, 255).astype(np.uint8).tobytes()
+    # 3 bytes (24-bit): keep the low three bytes of each little-endian int32
+    packed = np.clip(data, -8388607, 8388607).astype("<i4").reshape(-1, 1).view(np.uint8)
+    return packed[:, :3].tobytes()
+
+
+def write_wav_stream(filepath: Path, chunks: Iterable[np.ndarray], sample_rate: int = 44100,
+                     num_channels: int = 1, sample_width: int = 2) -> Path:
+    """Write successive sample chunks to a WAV file without holding it all in memory.
+
+    Multichannel chunks are 2D arrays shaped [samples, channels].
+    """
     with wave.open(str(filepath), 'w') as wav_file:
         wav_file.setnchannels(num_channels)
         wav_file.setsampwidth(sample_width)
         wav_file.setframerate(sample_rate)
-
-        if sample_width == 2:
-            fmt = '<h'
-            max_val = 32767
-        elif sample_width == 1:
-            fmt = '<B'
-            max_val = 255
-        else:  # 3 bytes (24-bit)
-            fmt = None
-            max_val = 8388607
-
-        for sample in samples:
-            sample = max(-max_val, min(max_val, int(sample)))
-            if fmt:
-                wav_file.writeframes(struct.pack(fmt, sample))
-            else:
-                # 24-bit handling
-                b = sample.to_bytes(3, byteorder='little', signed=True)
-                wav_file.writeframes(b)
+        for chunk in chunks:
+            wav_file.writeframes(_to_pcm_bytes(chunk, sample_width))
 
     return filepath
 
 
+def write_wav(filepath: Path, samples, sample_rate: int = 44100,
+              num_channels: int = 1, sample_width: int = 2) -> Path:
+    """Write samples to a WAV file."""
+    return write_wav_stream(filepath, [np.asarray(samples)], sample_rate,
+                            num_channels, sample_width)
+
+
 def generate_sine(frequency: float, duration: float, sample_rate: int = 44100,
-                  amplitude: float = 0.5) -> List[int]:
+                  amplitude: float = 0.5) -> np.ndarray:
     """Generate sine wave samples."""
-    n_samples = int(duration * sample_rate)
-    samples = []
-    for i in range(n_samples):
-        t = i / sample_rate
-        value = int(32767 * amplitude * math.sin(2 * math.pi * frequency * t))
-        samples.append(value)
-    return samples
+    t = _time_axis(duration, sample_rate)
+    return _to_samples(np.sin(2 * np.pi * frequency * t), amplitude)
 
 
 def generate_noise(duration: float, sample_rate: int = 44100,
-                   amplitude: float = 0.3) -> List[int]:
+                   amplitude: float = 0.3, rng: Optional[np.random.Generator] = None) -> np.ndarray:
     """Generate white noise samples."""
+    rng = rng or _rng
     n_samples = int(duration * sample_rate)
-    return [int(32767 * amplitude * (random.random() * 2 - 1)) for _ in range(n_samples)]
+    return _to_samples(rng.random(n_samples) * 2 - 1, amplitude)
 
 
-def generate_silence(duration: float, sample_rate: int = 44100) -> List[int]:
+def generate_silence(duration: float, sample_rate: int = 44100) -> np.ndarray:
     """Generate silence."""
-    return [0] * int(duration * sample_rate)
+    return np.zeros(int(duration * sample_rate), dtype=SAMPLE_DTYPE)
 
 
-def mix_samples(*sample_lists: List[int]) -> List[int]:
-    """Mix multiple sample lists together."""
+def mix_samples(*sample_lists) -> np.ndarray:
+    """Mix multiple sample arrays together."""
     max_len = max(len(s) for s in sample_lists)
-    result = [0] * max_len
+    result = np.zeros(max_len, dtype=np.int64)
     for samples in sample_lists:
-        for i, s in enumerate(samples):
-            if i < max_len:
-                result[i] += s
+        result[:len(samples)] += np.asarray(samples, dtype=np.int64)
     # Normalize to prevent clipping
-    max_val = max(abs(s) for s in result) if result else 1
+    max_val = int(np.max(np.abs(result))) if max_len else 1
     if max_val > 32767:
-        result = [int(s * 32767 / max_val) for s in result]
-    return result
+        result = np.trunc(result * 32767 / max_val)
+    return result.astype(SAMPLE_DTYPE)
 
 
-def apply_envelope(samples: List[int], attack: float = 0.01, release: float = 0.01,
-                   sample_rate: int = 44100) -> List[int]:
+def apply_envelope(samples, attack: float = 0.01, release: float = 0.01,
+                   sample_rate: int = 44100) -> np.ndarray:
     """Apply attack/release envelope to samples."""
     attack_samples = int(attack * sample_rate)
     release_samples = int(release * sample_rate)
-    result = samples.copy()
+    result = np.asarray(samples, dtype=np.float64).copy()
+    n = len(result)
+
+    if attack_samples > 0:
+        k = min(attack_samples, n)
+        result[:k] = np.trunc(result[:k] * (np.arange(k) / attack_samples))
+
+    if release_samples > 0:
+        k = min(release_samples, n)
+        ramp = np.arange(k) / release_samples  # ramp[i] applies to index n - 1 - i
+        result[n - k:] = np.trunc(result[n - k:] * ramp[::-1])
 
-    for i in range(min(attack_samples, len(result))):
-        result[i] = int(result[i] * (i / attack_samples))
+    return result.astype(SAMPLE_DTYPE)
 
-    for i in range(min(release_samples, len(result))):
-        idx = len(result) - 1 - i
-        if idx >= 0:
-            result[idx] = int(result[idx] * (i / release_samples))
 
-    return result
+def harmonic_series(f0: np.ndarray, t: np.ndarray, num_harmonics: int,
+                    amplitude_fn) -> np.ndarray:
+    """Sum sin(2*pi*h*f0*t) for h = 1..num_harmonics - 1, weighted by amplitude_fn(h, h*f0)."""
+    value = np.zeros_like(t)
+    for harmonic in range(1, num_harmonics):
+        h_freq = f0 * harmonic
+        value += amplitude_fn(harmonic, h_freq) * np.sin(2 * np.pi * h_freq * t)
+    return value
 
 
 # =============================================================================
 # BATCH 1: EXTENDED DURATION FILES
 # =============================================================================
 
+def _extended_speech_chunk(t: np.ndarray) -> np.ndarray:
+    """Speech-like signal with slowly varying F0 and crude formant boosts."""
+    # Varying fundamental frequency (simulating natural speech prosody)
+    f0 = 120 + 30 * np.sin(2 * np.pi * 0.3 * t)  # Slow variation
+    f0 += 10 * np.sin(2 * np.pi * 2 * t)  # Faster variation
+
+    # Generate harmonics
+    value = harmonic_series(f0, t, 15, lambda h, _: 1.0 / (h ** 1.2))
+
+    # Add formant-like filtering (simplified)
+    formant_boost = np.zeros_like(t)
+    for f in [500, 1500, 2500]:  # F1, F2, F3
+        formant_boost += 0.3 * (np.abs(f0 * np.round(f / f0) - f) < 100)
+
+    return _to_samples(value * (1 + formant_boost), 0.3)
+
+
+def _chunked(duration: float, sample_rate: int, synth) -> Iterable[np.ndarray]:
+    """Yield synth(t) over consecutive CHUNK_SECONDS slices of the time axis."""
+    n_samples = int(duration * sample_rate)
+    step = int(CHUNK_SECONDS * sample_rate)
+    for start in range(0, n_samples, step):
+        t = np.arange(start, min(start + step, n_samples)) / sample_rate
+        yield synth(t)
+
+
 def generate_batch_1():
     """Generate extended duration test files."""
     print("\n=== BATCH 1: Extended Duration Files ===")
@@ -142,36 +211,11 @@ def generate_batch_1():
 
     for duration_sec, name in durations:
         print(f"  Generating {name} file ({duration_sec}s)...")
-
-        # Complex speech-like pattern with varying F0
-        samples = []
         sample_rate = 44100
 
-        for i in range(int(duration_sec * sample_rate)):
-            t = i / sample_rate
-
-            # Varying fundamental frequency (simulating natural speech prosody)
-            f0 = 120 + 30 * math.sin(2 * math.pi * 0.3 * t)  # Slow variation
-            f0 += 10 * math.sin(2 * math.pi * 2 * t)  # Faster variation
-
-            # Generate harmonics
-            value = 0
-            for harmonic in range(1, 15):
-                h_freq = f0 * harmonic
-                amp = 1.0 / (harmonic ** 1.2)
-                value += amp * math.sin(2 * math.pi * h_freq * t)
-
-            # Add formant-like filtering (simplified)
-            formant_boost = 0
-            for f in [500, 1500, 2500]:  # F1, F2, F3
-                if abs(f0 * round(f / f0) - f) < 100:
-                    formant_boost += 0.3
-
-            value *= (1 + formant_boost)
-            samples.append(int(32767 * 0.3 * value))
-
         filepath = batch_dir / f"extended_{name}.wav"
-        write_wav(filepath, samples, sample_rate)
+        write_wav_stream(filepath, _chunked(duration_sec, sample_rate, _extended_speech_chunk),
+                         sample_rate)
         files.append(filepath)
         print(f"    Created: {filepath.name} ({filepath.stat().st_size / 1024 / 1024:.2f} MB)")
 
@@ -196,18 +240,12 @@ def generate_batch_2():
 
     for sr in sample_rates:
         print(f"  Generating {sr}Hz sample rate...")
-        samples = []
         f0 = 150  # Female-like pitch
-
-        for i in range(int(base_duration * sr)):
-            t = i / sr
-            value = 0
-            for h in range(1, 10):
-                value += (1/h) * math.sin(2 * math.pi * f0 * h * t)
-            samples.append(int(32767 * 0.4 * value))
+        t = _time_axis(base_duration, sr)
+        value = harmonic_series(np.full_like(t, f0), t, 10, lambda h, _: 1 / h)
 
         filepath = batch_dir / f"sample_rate_{sr}hz.wav"
-        write_wav(filepath, samples, sr)
+        write_wav(filepath, _to_samples(value, 0.4), sr)
         files.append(filepath)
 
     # Different channel configurations (using 44100 Hz)
@@ -218,33 +256,19 @@ def generate_batch_2():
     files.append(filepath)
 
     print("  Generating stereo file...")
-    # Stereo: interleave left and right channels
+    # Stereo: [samples, channels] is written interleaved
     left = generate_sine(440, 3.0, 44100, 0.5)
     right = generate_sine(550, 3.0, 44100, 0.5)  # Different frequency
-    stereo_samples = []
-    for l, r in zip(left, right):
-        stereo_samples.append(l)
-        stereo_samples.append(r)
     filepath = batch_dir / "channels_stereo.wav"
-    with wave.open(str(filepath), 'w') as wav_file:
-        wav_file.setnchannels(2)
-        wav_file.setsampwidth(2)
-        wav_file.setframerate(44100)
-        for s in stereo_samples:
-            wav_file.writeframes(struct.pack('<h', s))
+    write_wav(filepath, np.column_stack([left, right]), 44100, num_channels=2)
     files.append(filepath)
 
     # 8-bit audio
     print("  Generating 8-bit file...")
     samples_8bit = generate_sine(440, 3.0, 44100, 0.5)
-    samples_8bit = [(s // 256) + 128 for s in samples_8bit]  # Convert to unsigned 8-bit
+    samples_8bit = (samples_8bit // 256) + 128  # Convert to unsigned 8-bit
     filepath = batch_dir / "bit_depth_8bit.wav"
-    with wave.open(str(filepath), 'w') as wav_file:
-        wav_file.setnchannels(1)
-        wav_file.setsampwidth(1)
-        wav_file.setframerate(44100)
-        for s in samples_8bit:
-            wav_file.writeframes(struct.pack('<B', max(0, min(255, s))))
+    write_wav(filepath, samples_8bit, 44100, sample_width=1)
     files.append(filepath)
 
     print(f"  Created {len(files)} format variety files")
@@ -255,99 +279,87 @@ def generate_batch_2():
 # BATCH 3: REAL PHONETIC PATTERNS
 # =============================================================================
 
+# Formant frequencies for different vowels (approximate male values)
+VOWEL_FORMANTS = {
+    'i': [270, 2290, 3010],   # /i/ as in "beat"
+    'ɪ': [390, 1990, 2550],   # /ɪ/ as in "bit"
+    'e': [530, 1840, 2480],   # /e/ as in "bait"
+    'ɛ': [660, 1720, 2410],   # /ɛ/ as in "bet"
+    'æ': [730, 1090, 2440],   # /æ/ as in "bat"
+    'ɑ': [730, 1090, 2440],   # /ɑ/ as in "bot"
+    'ɔ': [570, 840, 2410],    # /ɔ/ as in "bought"
+    'o': [490, 830, 2480],    # /o/ as in "boat"
+    'ʊ': [440, 1020, 2240],   # /ʊ/ as in "book"
+    'u': [300, 870, 2240],    # /u/ as in "boot"
+    'ʌ': [640, 1190, 2390],   # /ʌ/ as in "but"
+    'ə': [500, 1500, 2500],   # /ə/ schwa
+}
+VOWEL_BANDWIDTHS = [60, 100, 150]
+
+# Frequency ranges for different fricatives: (low, high, amplitude)
+FRICATIVE_PARAMS = {
+    's': (4000, 8000, 0.4),    # High frequency, strong
+    'ʃ': (2500, 6000, 0.35),   # Mid-high, moderate
+    'f': (1500, 8000, 0.2),    # Broad, weak
+    'θ': (1500, 8000, 0.15),   # Broad, very weak
+    'h': (500, 4000, 0.1),     # Low, very weak
+    'z': (4000, 8000, 0.3),    # Like /s/ but with voicing
+    'ʒ': (2500, 6000, 0.25),   # Like /ʃ/ but with voicing
+    'v': (1500, 6000, 0.15),   # Like /f/ but with voicing
+}
+VOICED_FRICATIVES = {'z', 'ʒ', 'v'}
+
+
+def formant_amplitude(formants, bandwidths, gain: float = 3.0):
+    """Harmonic weighting 1/h boosted near each formant (for harmonic_series)."""
+    def amplitude(harmonic, h_freq):
+        amp = 1.0 / harmonic
+        for f, bw in zip(formants, bandwidths):
+            # Resonance boost near formant frequencies
+            distance = (h_freq - f) / bw
+            amp = amp * (1 + gain / (1.0 + distance ** 2))
+        return amp
+    return amplitude
+
+
 def generate_vowel(vowel_type: str, duration: float = 0.3,
-                   sample_rate: int = 44100) -> List[int]:
+                   sample_rate: int = 44100) -> np.ndarray:
     """Generate synthetic vowel with appropriate formants."""
-    # Formant frequencies for different vowels (approximate male values)
-    vowel_formants = {
-        'i': [270, 2290, 3010],   # /i/ as in "beat"
-        'ɪ': [390, 1990, 2550],   # /ɪ/ as in "bit"
-        'e': [530, 1840, 2480],   # /e/ as in "bait"
-        'ɛ': [660, 1720, 2410],   # /ɛ/ as in "bet"
-        'æ': [730, 1090, 2440],   # /æ/ as in "bat"
-        'ɑ': [730, 1090, 2440],   # /ɑ/ as in "bot"
-        'ɔ': [570, 840, 2410],    # /ɔ/ as in "bought"
-        'o': [490, 830, 2480],    # /o/ as in "boat"
-        'ʊ': [440, 1020, 2240],   # /ʊ/ as in "book"
-        'u': [300, 870, 2240],    # /u/ as in "boot"
-        'ʌ': [640, 1190, 2390],   # /ʌ/ as in "but"
-        'ə': [500, 1500, 2500],   # /ə/ schwa
-    }
-
-    formants = vowel_formants.get(vowel_type, [500, 1500, 2500])
-    bandwidths = [60, 100, 150]
+    formants = VOWEL_FORMANTS.get(vowel_type, [500, 1500, 2500])
 
-    samples = []
+    t = _time_axis(duration, sample_rate)
     f0 = 125  # Fundamental frequency
+    # Add slight F0 variation (natural speech)
+    current_f0 = f0 + 5 * np.sin(2 * np.pi * 5 * t)
 
-    for i in range(int(duration * sample_rate)):
-        t = i / sample_rate
-
-        # Add slight F0 variation (natural speech)
-        current_f0 = f0 + 5 * math.sin(2 * math.pi * 5 * t)
-
-        value = 0
-        for harmonic in range(1, 30):
-            h_freq = current_f0 * harmonic
-            amplitude = 1.0 / harmonic
-
-            # Apply formant filtering
-            for f, bw in zip(formants, bandwidths):
-                # Resonance boost near formant frequencies
-                distance = abs(h_freq - f) / bw
-                resonance = 1.0 / (1.0 + distance ** 2)
-                amplitude *= (1 + 3 * resonance)
-
-            value += amplitude * math.sin(2 * math.pi * h_freq * t)
-
-        samples.append(int(32767 * 0.15 * value))
-
-    return apply_envelope(samples, 0.02, 0.02, sample_rate)
+    value = harmonic_series(current_f0, t, 30, formant_amplitude(formants, VOWEL_BANDWIDTHS))
+    return apply_envelope(_to_samples(value, 0.15), 0.02, 0.02, sample_rate)
 
 
 def generate_fricative(fricative_type: str, duration: float = 0.2,
-                       sample_rate: int = 44100) -> List[int]:
+                       sample_rate: int = 44100) -> np.ndarray:
     """Generate synthetic fricative consonant."""
-    # Frequency ranges for different fricatives
-    fricative_params = {
-        's': (4000, 8000, 0.4),    # High frequency, strong
-        'ʃ': (2500, 6000, 0.35),   # Mid-high, moderate
-        'f': (1500, 8000, 0.2),    # Broad, weak
-        'θ': (1500, 8000, 0.15),   # Broad, very weak
-        'h': (500, 4000, 0.1),     # Low, very weak
-        'z': (4000, 8000, 0.3),    # Like /s/ but with voicing
-        'ʒ': (2500, 6000, 0.25),   # Like /ʃ/ but with voicing
-        'v': (1500, 6000, 0.15),   # Like /f/ but with voicing
-    }
-
-    low_freq, high_freq, amplitude = fricative_params.get(fricative_type, (2000, 6000, 0.2))
-    voiced = fricative_type in ['z', 'ʒ', 'v']
+    low_freq, high_freq, amplitude = FRICATIVE_PARAMS.get(fricative_type, (2000, 6000, 0.2))
 
-    samples = []
-    for i in range(int(duration * sample_rate)):
-        t = i / sample_rate
+    t = _time_axis(duration, sample_rate)
 
-        # Filtered noise
-        noise_val = random.random() * 2 - 1
+    # Filtered noise: simple bandpass simulation
+    noise_val = _rng.random(len(t)) * 2 - 1
+    freq = _rng.uniform(low_freq, high_freq, len(t))
+    noise_val *= np.sin(2 * np.pi * freq * t)
 
-        # Simple bandpass simulation
-        freq = random.uniform(low_freq, high_freq)
-        noise_val *= math.sin(2 * math.pi * freq * t)
-
-        if voiced:
-            # Add voicing (fundamental + harmonics)
-            f0 = 125
-            voice = 0.3 * math.sin(2 * math.pi * f0 * t)
-            voice += 0.15 * math.sin(2 * math.pi * f0 * 2 * t)
-            noise_val = 0.7 * noise_val + 0.3 * voice
-
-        samples.append(int(32767 * amplitude * noise_val))
+    if fricative_type in VOICED_FRICATIVES:
+        # Add voicing (fundamental + harmonics)
+        f0 = 125
+        voice = 0.3 * np.sin(2 * np.pi * f0 * t)
+        voice += 0.15 * np.sin(2 * np.pi * f0 * 2 * t)
+        noise_val = 0.7 * noise_val + 0.3 * voice
 
-    return apply_envelope(samples, 0.01, 0.01, sample_rate)
+    return apply_envelope(_to_samples(noise_val, amplitude), 0.01, 0.01, sample_rate)
 
 
 def generate_stop_consonant(stop_type: str, duration: float = 0.15,
-                            sample_rate: int = 44100) -> List[int]:
+                            sample_rate: int = 44100) -> np.ndarray:
     """Generate synthetic stop consonant (plosive)."""
     # Stop consonant parameters
     stop_params = {
@@ -361,71 +373,62 @@ def generate_stop_consonant(stop_type: str, duration: float = 0.15,
 
     voiced, burst_freq, vot = stop_params.get(stop_type, (False, 2000, 0.02))
 
-    samples = []
-
     # Closure (silence or voicing bar)
-    closure_duration = duration * 0.5
-    for i in range(int(closure_duration * sample_rate)):
-        t = i / sample_rate
-        if voiced:
-            # Low frequency voicing bar
-            samples.append(int(32767 * 0.1 * math.sin(2 * math.pi * 125 * t)))
-        else:
-            samples.append(0)
+    t = _time_axis(duration * 0.5, sample_rate)
+    if voiced:
+        # Low frequency voicing bar
+        closure = _to_samples(np.sin(2 * np.pi * 125 * t), 0.1)
+    else:
+        closure = np.zeros(len(t), dtype=SAMPLE_DTYPE)
 
     # Burst
     burst_duration = 0.01
-    for i in range(int(burst_duration * sample_rate)):
-        noise = random.random() * 2 - 1
-        # Envelope the burst
-        env = 1.0 - (i / (burst_duration * sample_rate))
-        samples.append(int(32767 * 0.5 * noise * env))
+    n_burst = int(burst_duration * sample_rate)
+    env = 1.0 - np.arange(n_burst) / (burst_duration * sample_rate)
+    burst = _to_samples((_rng.random(n_burst) * 2 - 1) * env, 0.5)
 
     # VOT (aspiration for voiceless, transition for voiced)
     vot_samples = int(vot * sample_rate)
-    for i in range(vot_samples):
-        t = i / sample_rate
-        if not voiced:
-            # Aspiration noise
-            noise = random.random() * 2 - 1
-            env = 1.0 - (i / vot_samples)
-            samples.append(int(32767 * 0.2 * noise * env))
-        else:
-            # Quick transition to vowel
-            f0 = 125
-            samples.append(int(32767 * 0.3 * math.sin(2 * math.pi * f0 * t)))
+    i = np.arange(vot_samples)
+    if not voiced:
+        # Aspiration noise
+        env = 1.0 - i / vot_samples
+        transition = _to_samples((_rng.random(vot_samples) * 2 - 1) * env, 0.2)
+    else:
+        # Quick transition to vowel
+        f0 = 125
+        transition = _to_samples(np.sin(2 * np.pi * f0 * i / sample_rate), 0.3)
 
-    return samples
+    return np.concatenate([closure, burst, transition])
 
 
 def generate_tone_contour(tone_type: str, duration: float = 0.4,
-                          sample_rate: int = 44100) -> List[int]:
+                          sample_rate: int = 44100) -> np.ndarray:
     """Generate tonal patterns (for tonal languages like Mandarin)."""
     # Mandarin tone contours (pitch patterns)
     tone_contours = {
-        'tone1': lambda t, d: 200,                                    # High level
+        'tone1': lambda t, d: np.full_like(t, 200),                  # High level
         'tone2': lambda t, d: 150 + 80 * (t / d),                     # Rising
-        'tone3': lambda t, d: 180 - 60 * math.sin(math.pi * t / d),   # Dipping
+        'tone3': lambda t, d: 180 - 60 * np.sin(np.pi * t / d),       # Dipping
         'tone4': lambda t, d: 220 - 100 * (t / d),                    # Falling
-        'tone5': lambda t, d: 140,                                    # Neutral (shorter)
+        'tone5': lambda t, d: np.full_like(t, 140),                   # Neutral (shorter)
     }
 
     pitch_func = tone_contours.get(tone_type, tone_contours['tone1'])
 
-    samples = []
-    for i in range(int(duration * sample_rate)):
-        t = i / sample_rate
-        f0 = pitch_func(t, duration)
+    t = _time_axis(duration, sample_rate)
+    f0 = pitch_func(t, duration)
+    value = harmonic_series(f0, t, 15, lambda h, _: 1.0 / (h ** 1.1))
 
-        value = 0
-        for harmonic in range(1, 15):
-            h_freq = f0 * harmonic
-            amp = 1.0 / (harmonic ** 1.1)
-            value += amp * math.sin(2 * math.pi * h_freq * t)
+    return apply_envelope(_to_samples(value, 0.25), 0.02, 0.03, sample_rate)
 
-        samples.append(int(32767 * 0.25 * value))
 
-    return apply_envelope(samples, 0.02, 0.03, sample_rate)
+def generate_glide(f0_func, duration: float, sample_rate: int = 44100,
+                   num_harmonics: int = 10, scale: float = 0.3) -> np.ndarray:
+    """Harmonic signal with 1/h weights following the F0 contour f0_func(t)."""
+    t = _time_axis(duration, sample_rate)
+    value = harmonic_series(f0_func(t), t, num_harmonics, lambda h, _: 1 / h)
+    return _to_samples(value, scale)
 
 
 def generate_batch_3():
@@ -439,11 +442,11 @@ def generate_batch_3():
     vowels = ['i', 'ɪ', 'e', 'ɛ', 'æ', 'ɑ', 'ɔ', 'o', 'ʊ', 'u', 'ʌ', 'ə']
     all_vowel_samples = []
     for v in vowels:
-        all_vowel_samples.extend(generate_vowel(v, 0.4))
-        all_vowel_samples.extend(generate_silence(0.1))
+        all_vowel_samples.append(generate_vowel(v, 0.4))
+        all_vowel_samples.append(generate_silence(0.1))
 
     filepath = batch_dir / "vowel_inventory.wav"
-    write_wav(filepath, all_vowel_samples)
+    write_wav(filepath, np.concatenate(all_vowel_samples))
     files.append(filepath)
 
     # Individual vowels for detailed analysis
@@ -458,11 +461,11 @@ def generate_batch_3():
     fricatives = ['s', 'ʃ', 'f', 'θ', 'z', 'ʒ', 'v']
     all_fricative_samples = []
     for f in fricatives:
-        all_fricative_samples.extend(generate_fricative(f, 0.3))
-        all_fricative_samples.extend(generate_silence(0.1))
+        all_fricative_samples.append(generate_fricative(f, 0.3))
+        all_fricative_samples.append(generate_silence(0.1))
 
     filepath = batch_dir / "fricative_inventory.wav"
-    write_wav(filepath, all_fricative_samples)
+    write_wav(filepath, np.concatenate(all_fricative_samples))
     files.append(filepath)
 
     # Stop consonants (plosives)
@@ -470,12 +473,12 @@ def generate_batch_3():
     stops = ['p', 'b', 't', 'd', 'k', 'g']
     all_stop_samples = []
     for s in stops:
-        all_stop_samples.extend(generate_stop_consonant(s, 0.2))
-        all_stop_samples.extend(generate_vowel('ɑ', 0.2))  # Add vowel context
-        all_stop_samples.extend(generate_silence(0.1))
+        all_stop_samples.append(generate_stop_consonant(s, 0.2))
+        all_stop_samples.append(generate_vowel('ɑ', 0.2))  # Add vowel context
+        all_stop_samples.append(generate_silence(0.1))
 
     filepath = batch_dir / "stop_consonant_inventory.wav"
-    write_wav(filepath, all_stop_samples)
+    write_wav(filepath, np.concatenate(all_stop_samples))
     files.append(filepath)
 
     # Mandarin tones
@@ -483,62 +486,40 @@ def generate_batch_3():
     tones = ['tone1', 'tone2', 'tone3', 'tone4']
     all_tone_samples = []
     for tone in tones:
-        all_tone_samples.extend(generate_tone_contour(tone, 0.5))
-        all_tone_samples.extend(generate_silence(0.2))
+        all_tone_samples.append(generate_tone_contour(tone, 0.5))
+        all_tone_samples.append(generate_silence(0.2))
 
     filepath = batch_dir / "mandarin_tones.wav"
-    write_wav(filepath, all_tone_samples)
+    write_wav(filepath, np.concatenate(all_tone_samples))
     files.append(filepath)
 
     # Diphthongs (vowel transitions)
     print("  Generating diphthongs...")
-    diphthong_samples = []
-    # /aɪ/ as in "buy"
-    for i in range(int(0.4 * 44100)):
-        t = i / 44100
-        progress = t / 0.4
-        # Interpolate formants from /ɑ/ to /ɪ/
-        f1 = 730 - progress * 340  # 730 -> 390
-        f2 = 1090 + progress * 900  # 1090 -> 1990
-
-        f0 = 125
-        value = 0
-        for h in range(1, 20):
-            h_freq = f0 * h
-            amp = 1.0 / h
-            for f in [f1, f2, 2500]:
-                resonance = 1.0 / (1 + ((h_freq - f) / 80) ** 2)
-                amp *= (1 + 2 * resonance)
-            value += amp * math.sin(2 * math.pi * h_freq * t)
-        diphthong_samples.append(int(32767 * 0.15 * value))
-
-    diphthong_samples = apply_envelope(diphthong_samples, 0.02, 0.02)
+    # /aɪ/ as in "buy": interpolate formants from /ɑ/ to /ɪ/
+    t = _time_axis(0.4, 44100)
+    progress = t / 0.4
+    f1 = 730 - progress * 340  # 730 -> 390
+    f2 = 1090 + progress * 900  # 1090 -> 1990
+    value = harmonic_series(
+        np.full_like(t, 125), t, 20,
+        formant_amplitude([f1, f2, 2500], [80, 80, 80], gain=2.0),
+    )
+
+    diphthong_samples = apply_envelope(_to_samples(value, 0.15), 0.02, 0.02)
     filepath = batch_dir / "diphthong_ai.wav"
     write_wav(filepath, diphthong_samples)
     files.append(filepath)
 
     # Pitch variation patterns (intonation)
     print("  Generating intonation patterns...")
-    # Question intonation (rising)
-    question_samples = []
-    for i in range(int(1.0 * 44100)):
-        t = i / 44100
-        f0 = 120 + 80 * (t / 1.0)  # Rising from 120 to 200 Hz
-        value = sum((1/h) * math.sin(2 * math.pi * f0 * h * t) for h in range(1, 10))
-        question_samples.append(int(32767 * 0.3 * value))
-
+    # Question intonation (rising from 120 to 200 Hz)
+    question_samples = generate_glide(lambda t: 120 + 80 * (t / 1.0), 1.0)
     filepath = batch_dir / "intonation_question_rising.wav"
     write_wav(filepath, apply_envelope(question_samples, 0.02, 0.05))
     files.append(filepath)
 
-    # Statement intonation (falling)
-    statement_samples = []
-    for i in range(int(1.0 * 44100)):
-        t = i / 44100
-        f0 = 180 - 60 * (t / 1.0)  # Falling from 180 to 120 Hz
-        value = sum((1/h) * math.sin(2 * math.pi * f0 * h * t) for h in range(1, 10))
-        statement_samples.append(int(32767 * 0.3 * value))
-
+    # Statement intonation (falling from 180 to 120 Hz)
+    statement_samples = generate_glide(lambda t: 180 - 60 * (t / 1.0), 1.0)
     filepath = batch_dir / "intonation_statement_falling.wav"
     write_wav(filepath, apply_envelope(statement_samples, 0.02, 0.05))
     files.append(filepath)
@@ -570,7 +551,7 @@ def generate_batch_4():
     # 2. Clipped audio (distortion)
     print("  Generating clipped/distorted audio...")
     loud_samples = generate_sine(440, 3.0, sample_rate, 1.5)  # Over 100%
-    clipped = [max(-32767, min(32767, int(s * 1.5))) for s in loud_samples]
+    clipped = np.clip(np.trunc(loud_samples * 1.5), -32767, 32767)
     filepath = batch_dir / "clipped_distorted.wav"
     write_wav(filepath, clipped)
     files.append(filepath)
@@ -579,28 +560,25 @@ def generate_batch_4():
     print("  Generating audio with silence gaps...")
     gap_samples = []
     for i in range(5):
-        gap_samples.extend(generate_sine(440 + i * 50, 0.5, sample_rate, 0.5))
-        gap_samples.extend(generate_silence(0.3, sample_rate))
+        gap_samples.append(generate_sine(440 + i * 50, 0.5, sample_rate, 0.5))
+        gap_samples.append(generate_silence(0.3, sample_rate))
     filepath = batch_dir / "silence_gaps.wav"
-    write_wav(filepath, gap_samples)
+    write_wav(filepath, np.concatenate(gap_samples))
     files.append(filepath)
 
     # 4. Background noise (babble/crowd)
     print("  Generating background noise...")
-    babble = []
-    for i in range(int(5.0 * sample_rate)):
-        t = i / sample_rate
-        # Multiple overlapping "voices" at different pitches
-        value = 0
-        for f0 in [100, 150, 180, 220, 130]:
-            f0_var = f0 + random.uniform(-10, 10)
-            value += 0.1 * math.sin(2 * math.pi * f0_var * t)
-        # Add noise
-        value += 0.3 * (random.random() * 2 - 1)
-        babble.append(int(32767 * 0.3 * value))
+    t = _time_axis(5.0, sample_rate)
+    # Multiple overlapping "voices" at different pitches
+    value = np.zeros_like(t)
+    for f0 in [100, 150, 180, 220, 130]:
+        f0_var = f0 + _rng.uniform(-10, 10, len(t))
+        value += 0.1 * np.sin(2 * np.pi * f0_var * t)
+    # Add noise
+    value += 0.3 * (_rng.random(len(t)) * 2 - 1)
 
     filepath = batch_dir / "background_babble.wav"
-    write_wav(filepath, babble)
+    write_wav(filepath, _to_samples(value, 0.3))
     files.append(filepath)
 
     # 5. Signal + noise (various SNR levels)
@@ -617,7 +595,7 @@ def generate_batch_4():
     # 6. DC offset
     print("  Generating audio with DC offset...")
     dc_samples = generate_sine(440, 3.0, sample_rate, 0.3)
-    dc_offset = [s + 10000 for s in dc_samples]  # Add DC bias
+    dc_offset = dc_samples + 10000  # Add DC bias
     filepath = batch_dir / "dc_offset.wav"
     write_wav(filepath, dc_offset)
     files.append(filepath)
@@ -631,18 +609,15 @@ def generate_batch_4():
 
     # 8. Frequency sweep (chirp)
     print("  Generating frequency sweep...")
-    sweep_samples = []
-    for i in range(int(3.0 * sample_rate)):
-        t = i / sample_rate
-        freq = 100 + (8000 - 100) * (t / 3.0)  # 100Hz to 8kHz
-        sweep_samples.append(int(32767 * 0.5 * math.sin(2 * math.pi * freq * t)))
+    t = _time_axis(3.0, sample_rate)
+    freq = 100 + (8000 - 100) * (t / 3.0)  # 100Hz to 8kHz
     filepath = batch_dir / "frequency_sweep.wav"
-    write_wav(filepath, sweep_samples)
+    write_wav(filepath, _to_samples(np.sin(2 * np.pi * freq * t), 0.5))
     files.append(filepath)
 
     # 9. Impulse train (clicks)
     print("  Generating impulse train...")
-    impulse_samples = [0] * int(2.0 * sample_rate)
+    impulse_samples = np.zeros(int(2.0 * sample_rate), dtype=SAMPLE_DTYPE)
     for i in range(20):
         idx = int(i * 0.1 * sample_rate)
         if idx < len(impulse_samples):
@@ -655,16 +630,13 @@ def generate_batch_4():
 
     # 10. Amplitude modulated signal
     print("  Generating amplitude modulated signal...")
-    am_samples = []
     carrier_freq = 1000
     mod_freq = 5
-    for i in range(int(3.0 * sample_rate)):
-        t = i / sample_rate
-        modulator = 0.5 + 0.5 * math.sin(2 * math.pi * mod_freq * t)
-        carrier = math.sin(2 * math.pi * carrier_freq * t)
-        am_samples.append(int(32767 * 0.5 * modulator * carrier))
+    t = _time_axis(3.0, sample_rate)
+    modulator = 0.5 + 0.5 * np.sin(2 * np.pi * mod_freq * t)
+    carrier = np.sin(2 * np.pi * carrier_freq * t)
     filepath = batch_dir / "amplitude_modulated.wav"
-    write_wav(filepath, am_samples)
+    write_wav(filepath, _to_samples(modulator * carrier, 0.5))
     files.append(filepath)
 
     print(f"  Created {len(files)} edge case files")
@@ -681,106 +653,75 @@ def generate_batch_5():
     batch_dir = BATCH_DIR / "batch_5"
     files = []
     sample_rate = 44100
+    t = _time_axis(3.0, sample_rate)
+    n = len(t)
 
     # 1. Breathy voice (common in voice disorders)
     print("  Generating breathy voice...")
-    breathy_samples = []
-    for i in range(int(3.0 * sample_rate)):
-        t = i / sample_rate
-        f0 = 180  # Higher pitch
-        # Less harmonics, more noise
-        voice = 0.3 * math.sin(2 * math.pi * f0 * t)
-        voice += 0.1 * math.sin(2 * math.pi * f0 * 2 * t)
-        noise = 0.4 * (random.random() * 2 - 1)  # Significant aspiration noise
-        breathy_samples.append(int(32767 * 0.4 * (voice + noise)))
+    f0 = 180  # Higher pitch
+    # Less harmonics, more noise
+    voice = 0.3 * np.sin(2 * np.pi * f0 * t)
+    voice += 0.1 * np.sin(2 * np.pi * f0 * 2 * t)
+    noise = 0.4 * (_rng.random(n) * 2 - 1)  # Significant aspiration noise
     filepath = batch_dir / "breathy_voice.wav"
-    write_wav(filepath, breathy_samples)
+    write_wav(filepath, _to_samples(voice + noise, 0.4))
     files.append(filepath)
 
     # 2. Creaky voice (vocal fry)
     print("  Generating creaky voice (vocal fry)...")
-    creaky_samples = []
-    for i in range(int(3.0 * sample_rate)):
-        t = i / sample_rate
-        f0 = 50 + 20 * random.random()  # Very low, irregular F0
-        # Irregular glottal pulses
-        phase = (t * f0) % 1
-        if phase < 0.1:
-            value = 1.0
-        elif phase < 0.2:
-            value = -0.5
-        else:
-            value = 0.05 * (random.random() * 2 - 1)
-        creaky_samples.append(int(32767 * 0.4 * value))
+    f0 = 50 + 20 * _rng.random(n)  # Very low, irregular F0
+    # Irregular glottal pulses
+    phase = (t * f0) % 1
+    value = np.where(
+        phase < 0.1, 1.0,
+        np.where(phase < 0.2, -0.5, 0.05 * (_rng.random(n) * 2 - 1)),
+    )
     filepath = batch_dir / "creaky_voice_vocal_fry.wav"
-    write_wav(filepath, creaky_samples)
+    write_wav(filepath, _to_samples(value, 0.4))
     files.append(filepath)
 
     # 3. Jitter simulation (pitch perturbation)
     print("  Generating voice with jitter...")
-    jitter_samples = []
     base_f0 = 120
     jitter_percent = 3.0  # 3% jitter
-    for i in range(int(3.0 * sample_rate)):
-        t = i / sample_rate
-        # Add random pitch perturbation
-        f0 = base_f0 * (1 + jitter_percent/100 * (random.random() * 2 - 1))
-        value = sum((1/h) * math.sin(2 * math.pi * f0 * h * t) for h in range(1, 10))
-        jitter_samples.append(int(32767 * 0.4 * value))
+    # Add random pitch perturbation
+    f0 = base_f0 * (1 + jitter_percent / 100 * (_rng.random(n) * 2 - 1))
+    value = harmonic_series(f0, t, 10, lambda h, _: 1 / h)
     filepath = batch_dir / "voice_with_jitter.wav"
-    write_wav(filepath, jitter_samples)
+    write_wav(filepath, _to_samples(value, 0.4))
     files.append(filepath)
 
     # 4. Shimmer simulation (amplitude perturbation)
     print("  Generating voice with shimmer...")
-    shimmer_samples = []
-    for i in range(int(3.0 * sample_rate)):
-        t = i / sample_rate
-        f0 = 120
-        # Add random amplitude perturbation per cycle
-        shimmer = 1 + 0.1 * math.sin(2 * math.pi * f0 * 0.7 * t)  # Slow amplitude variation
-        value = shimmer * sum((1/h) * math.sin(2 * math.pi * f0 * h * t) for h in range(1, 10))
-        shimmer_samples.append(int(32767 * 0.4 * value))
+    f0 = 120
+    # Slow amplitude variation per cycle
+    shimmer = 1 + 0.1 * np.sin(2 * np.pi * f0 * 0.7 * t)
+    value = shimmer * harmonic_series(np.full_like(t, f0), t, 10, lambda h, _: 1 / h)
     filepath = batch_dir / "voice_with_shimmer.wav"
-    write_wav(filepath, shimmer_samples)
+    write_wav(filepath, _to_samples(value, 0.4))
     files.append(filepath)
 
     # 5. Child-like speech (higher pitch, different formants)
     print("  Generating child-like speech pattern...")
-    child_samples = []
     child_f0 = 300  # Much higher fundamental
     # Scaled formants for smaller vocal tract
     child_formants = [800, 2400, 3600]
-    for i in range(int(3.0 * sample_rate)):
-        t = i / sample_rate
-        f0 = child_f0 + 20 * math.sin(2 * math.pi * 4 * t)  # More pitch variation
-        value = 0
-        for h in range(1, 20):
-            h_freq = f0 * h
-            amp = 1.0 / h
-            for f in child_formants:
-                resonance = 1.0 / (1 + ((h_freq - f) / 100) ** 2)
-                amp *= (1 + 2 * resonance)
-            value += amp * math.sin(2 * math.pi * h_freq * t)
-        child_samples.append(int(32767 * 0.15 * value))
+    f0 = child_f0 + 20 * np.sin(2 * np.pi * 4 * t)  # More pitch variation
+    value = harmonic_series(f0, t, 20, formant_amplitude(child_formants, [100] * 3, gain=2.0))
     filepath = batch_dir / "child_speech_pattern.wav"
-    write_wav(filepath, child_samples)
+    write_wav(filepath, _to_samples(value, 0.15))
     files.append(filepath)
 
     # 6. Elderly voice simulation (lower HNR, tremor)
     print("  Generating elderly voice pattern...")
-    elderly_samples = []
-    for i in range(int(3.0 * sample_rate)):
-        t = i / sample_rate
-        # Tremor (slow pitch oscillation)
-        f0 = 150 + 8 * math.sin(2 * math.pi * 5 * t)
-        # Reduced harmonic energy, more noise
-        value = 0.5 * math.sin(2 * math.pi * f0 * t)
-        value += 0.2 * math.sin(2 * math.pi * f0 * 2 * t)
-        value += 0.15 * (random.random() * 2 - 1)  # Breathiness
-        elderly_samples.append(int(32767 * 0.4 * value))
+    # Tremor (slow pitch oscillation)
+    f0 = 150 + 8 * np.sin(2 * np.pi * 5 * t)
+    # Reduced harmonic energy, more noise
+    value = 0.5 * np.sin(2 * np.pi * f0 * t)
+    value += 0.2 * np.sin(2 * np.pi * f0 * 2 * t)
+    value += 0.15 * (_rng.random(n) * 2 - 1)  # Breathiness
     filepath = batch_dir / "elderly_voice_tremor.wav"
-    write_wav(filepath, elderly_samples)
+    write_wav(filepath, _to_samples(value, 0.4))
     files.append(filepath)
 
     # 7. Sustained vowel /a/ for clinical analysis (3 seconds)
@@ -792,20 +733,16 @@ def generate_batch_5():
 
     # 8. Maximum phonation time test pattern
     print("  Generating maximum phonation time pattern...")
-    mpt_samples = []
     total_duration = 10.0  # 10 seconds
-    for i in range(int(total_duration * sample_rate)):
-        t = i / sample_rate
-        # Gradual decrease in amplitude and increase in breathiness
-        decay = 1.0 - 0.3 * (t / total_duration)
-        breathiness = 0.1 + 0.3 * (t / total_duration)
-
-        f0 = 120 - 20 * (t / total_duration)  # Slight pitch drop
-        value = decay * sum((1/h) * math.sin(2 * math.pi * f0 * h * t) for h in range(1, 10))
-        value += breathiness * (random.random() * 2 - 1)
-        mpt_samples.append(int(32767 * 0.4 * value))
+    t_mpt = _time_axis(total_duration, sample_rate)
+    # Gradual decrease in amplitude and increase in breathiness
+    decay = 1.0 - 0.3 * (t_mpt / total_duration)
+    breathiness = 0.1 + 0.3 * (t_mpt / total_duration)
+    f0 = 120 - 20 * (t_mpt / total_duration)  # Slight pitch drop
+    value = decay * harmonic_series(f0, t_mpt, 10, lambda h, _: 1 / h)
+    value += breathiness * (_rng.random(len(t_mpt)) * 2 - 1)
     filepath = batch_dir / "maximum_phonation_time.wav"
-    write_wav(filepath, mpt_samples)
+    write_wav(filepath, _to_samples(value, 0.4))
     files.append(filepath)
 
     # 9. Diadochokinetic rate pattern (pa-ta-ka)
@@ -814,10 +751,10 @@ def generate_batch_5():
     syllables = ['p', 't', 'k']
     for rep in range(10):  # 10 repetitions
         for syl in syllables:
-            ddk_samples.extend(generate_stop_consonant(syl, 0.05))
-            ddk_samples.extend(generate_vowel('ɑ', 0.1))
+            ddk_samples.append(generate_stop_consonant(syl, 0.05))
+            ddk_samples.append(generate_vowel('ɑ', 0.1))
     filepath = batch_dir / "diadochokinetic_pataka.wav"
-    write_wav(filepath, ddk_samples)
+    write_wav(filepath, np.concatenate(ddk_samples))
     files.append(filepath)
 
     # 10. Reading passage simulation (varied prosody)
@@ -831,33 +768,275 @@ def generate_batch_5():
         (0.4, 'level'),     # Short phrase
         (1.2, 'falling'),   # Final statement
     ]
+    contours = {
+        'falling': lambda t, d: 180 - 60 * (t / d),
+        'rising': lambda t, d: 140 + 50 * (t / d),
+        'level': lambda t, d: np.full_like(t, 150),
+    }
 
     for duration, contour in phrases:
-        for i in range(int(duration * sample_rate)):
-            t = i / sample_rate
-            progress = t / duration
-
-            if contour == 'falling':
-                f0 = 180 - 60 * progress
-            elif contour == 'rising':
-                f0 = 140 + 50 * progress
-            else:
-                f0 = 150
-
-            value = sum((1/h) * math.sin(2 * math.pi * f0 * h * t) for h in range(1, 10))
-            passage_samples.append(int(32767 * 0.35 * value))
-
+        passage_samples.append(
+            generate_glide(lambda t: contours[contour](t, duration), duration, scale=0.35)
+        )
         # Pause between phrases
-        passage_samples.extend(generate_silence(0.2))
+        passage_samples.append(generate_silence(0.2))
 
     filepath = batch_dir / "reading_passage_prosody.wav"
-    write_wav(filepath, passage_samples)
+    write_wav(filepath, np.concatenate(passage_samples))
     files.append(filepath)
 
     print(f"  Created {len(files)} clinical/research files")
     return files
 
 
+# =============================================================================
+# LARGE SYNTHETIC CORPORA
+# =============================================================================
+
+# Relative frequency of segment kinds in corpus recordings
+SEGMENT_KINDS = {"vowel": 0.55, "fricative": 0.25, "pause": 0.20}
+_KIND_CODES = {"pause": 0, "vowel": 1, "fricative": 2}
+
+
+def plan_segments(duration: float, intervals_per_second: float,
+                  rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    """
+    Draw a random sequence of phone-sized segments covering `duration`.
+    Segment lengths are gamma distributed around 1 / intervals_per_second.
+    """
+    mean = 1.0 / intervals_per_second
+    # Draw a generous number of segments at once, then trim to the duration
+    n_guess = int(duration * intervals_per_second * 1.2) + 16
+    lengths = rng.gamma(4.0, mean / 4.0, n_guess)
+    ends = np.cumsum(lengths)
+    while ends[-1] < duration:
+        more = rng.gamma(4.0, mean / 4.0, n_guess)
+        ends = np.concatenate([ends, ends[-1] + np.cumsum(more)])
+    n = int(np.searchsorted(ends, duration)) + 1
+    ends = ends[:n]
+    ends[-1] = duration
+    starts = np.concatenate([[0.0], ends[:-1]])
+
+    kinds = list(SEGMENT_KINDS)
+    kind = rng.choice(kinds, size=n, p=list(SEGMENT_KINDS.values()))
+    vowels = np.array(list(VOWEL_FORMANTS))
+    fricatives = np.array(list(FRICATIVE_PARAMS))
+    labels = np.where(
+        kind == "vowel", rng.choice(vowels, n),
+        np.where(kind == "fricative", rng.choice(fricatives, n), ""),
+    )
+
+    # Slowly drifting speaker F0 with per-segment jitter
+    base_f0 = rng.uniform(90, 220)
+    f0 = base_f0 * (1 + 0.15 * np.sin(2 * np.pi * starts / rng.uniform(2, 6))) \
+        * rng.uniform(0.95, 1.05, n)
+
+    return {
+        "starts": starts,
+        "ends": ends,
+        "kind": np.array([_KIND_CODES[k] for k in kind], dtype=np.int8),
+        "labels": labels,
+        "f0": f0,
+    }
+
+
+def synthesize_segments(plan: Dict[str, np.ndarray], sample_rate: int,
+                        rng: np.random.Generator) -> Iterable[np.ndarray]:
+    """Render a segment plan in CHUNK_SECONDS chunks with continuous phase."""
+    starts = plan["starts"]
+    n_total = int(round(plan["ends"][-1] * sample_rate))
+    formants = np.array([VOWEL_FORMANTS.get(str(l), [500, 1500, 2500]) for l in plan["labels"]],
+                        dtype=np.float64)
+    fric = np.array([FRICATIVE_PARAMS.get(str(l), (2000, 6000, 0.2))[2] for l in plan["labels"]])
+    bandwidths = np.array(VOWEL_BANDWIDTHS, dtype=np.float64)
+    nyquist = sample_rate / 2
+    ramp = 0.005 * sample_rate  # 5 ms on/off ramps avoid clicks at boundaries
+
+    phase_offset = 0.0
+    step = int(CHUNK_SECONDS * sample_rate)
+    for c0 in range(0, n_total, step):
+        idx = np.arange(c0, min(c0 + step, n_total))
+        t = idx / sample_rate
+        seg = np.searchsorted(starts, t, side="right") - 1
+        kind = plan["kind"][seg]
+
+        f0 = plan["f0"][seg] * (1 + 0.02 * np.sin(2 * np.pi * 5 * t))
+        phase = phase_offset + 2 * np.pi * np.cumsum(f0) / sample_rate
+        phase_offset = phase[-1]
+
+        voiced = np.zeros_like(t)
+        seg_formants = formants[seg]
+        for harmonic in range(1, 30):
+            h_freq = f0 * harmonic
+            amp = 1.0 / harmonic
+            for k in range(3):
+                distance = (h_freq - seg_formants[:, k]) / bandwidths[k]
+                amp = amp * (1 + 3.0 / (1.0 + distance ** 2))
+            voiced += np.where(h_freq < nyquist, amp, 0.0) * np.sin(harmonic * phase)
+
+        noise = (rng.random(len(t)) * 2 - 1) * fric[seg]
+        value = np.where(kind == 1, 0.15 * voiced, np.where(kind == 2, noise, 0.0))
+
+        seg_start = np.round(starts[seg] * sample_rate)
+        seg_end = np.round(plan["ends"][seg] * sample_rate)
+        env = np.clip(np.minimum(idx - seg_start, seg_end - 1 - idx) / ramp, 0.0, 1.0)
+        yield _to_samples(value * env, 1.0)
+
+
+def group_words(plan: Dict[str, np.ndarray], rng: np.random.Generator) -> Tuple[list, list, list]:
+    """Group consecutive non-pause segments into words of 2-6 phones."""
+    starts, ends, labels = [], [], []
+    word_start = None
+    remaining = 0
+    word_count = 0
+
+    for s, e, kind in zip(plan["starts"], plan["ends"], plan["kind"]):
+        if kind == 0 or remaining == 0:
+            if word_start is not None:
+                starts.append(word_start)
+                ends.append(last_end)
+                labels.append(f"w{word_count}")
+                word_count += 1
+            word_start = None
+            if kind == 0:
+                starts.append(s)
+                ends.append(e)
+                labels.append("")
+                continue
+            remaining = int(rng.integers(2, 7))
+        if word_start is None:
+            word_start = s
+        last_end = e
+        remaining -= 1
+
+    if word_start is not None:
+        starts.append(word_start)
+        ends.append(last_end)
+        labels.append(f"w{word_count}")
+
+    # Fill gaps left by word boundaries so the tier covers the whole file
+    filled_s, filled_e, filled_l = [], [], []
+    cursor = 0.0
+    for s, e, l in zip(starts, ends, labels):
+        if s > cursor + 1e-9:
+            filled_s.append(cursor)
+            filled_e.append(s)
+            filled_l.append("")
+        filled_s.append(s)
+        filled_e.append(e)
+        filled_l.append(l)
+        cursor = e
+    return filled_s, filled_e, filled_l
+
+
+def write_textgrid(filepath: Path, duration: float,
+                   tiers: Dict[str, Tuple[Iterable[float], Iterable[float], Iterable[str]]]) -> Path:
+    """Write interval tiers to a long-format Praat TextGrid."""
+    lines = [
+        'File type = "ooTextFile"',
+        'Object class = "TextGrid"',
+        '',
+        'xmin = 0',
+        f'xmax = {duration}',
+        'tiers? <exists>',
+        f'size = {len(tiers)}',
+        'item []:',
+    ]
+
+    for tier_idx, (name, (starts, ends, labels)) in enumerate(tiers.items(), 1):
+        starts, ends, labels = list(starts), list(ends), list(labels)
+        lines.append(f'    item [{tier_idx}]:')
+        lines.append('        class = "IntervalTier"')
+        lines.append(f'        name = "{name}"')
+        lines.append('        xmin = 0')
+        lines.append(f'        xmax = {duration}')
+        lines.append(f'        intervals: size = {len(starts)}')
+        for i, (s, e, l) in enumerate(zip(starts, ends, labels), 1):
+            lines.append(f'        intervals [{i}]:')
+            lines.append(f'            xmin = {s:.6f}')
+            lines.append(f'            xmax = {e:.6f}')
+            lines.append(f'            text = "{l}"')
+
+    Path(filepath).write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return Path(filepath)
+
+
+def generate_corpus_file(job: dict) -> dict:
+    """Generate one corpus recording and its TextGrid (runs in a worker process)."""
+    rng = np.random.default_rng(job["seed"])
+    plan = plan_segments(job["duration"], job["intervals_per_second"], rng)
+
+    wav_path = Path(job["wav_path"])
+    write_wav_stream(wav_path, synthesize_segments(plan, job["sample_rate"], rng),
+                     job["sample_rate"])
+
+    words = group_words(plan, rng)
+    textgrid_path = wav_path.with_suffix(".TextGrid")
+    write_textgrid(textgrid_path, job["duration"], {
+        "phones": (plan["starts"], plan["ends"], plan["labels"]),
+        "words": words,
+    })
+
+    return {
+        "name": wav_path.name,
+        "textgrid": textgrid_path.name,
+        "seed": job["seed"],
+        "duration": job["duration"],
+        "sample_rate": job["sample_rate"],
+        "phone_intervals": len(plan["starts"]),
+        "word_intervals": len(words[0]),
+        "size_kb": round(wav_path.stat().st_size / 1024, 2),
+    }
+
+
+def generate_corpus(output_dir: Path, num_files: int, duration: float, sample_rate: int = 16000,
+                    intervals_per_second: float = 12.0, seed: int = 0,
+                    workers: Optional[int] = None) -> Path:
+    """
+    Generate `num_files` recordings of `duration` seconds with matching
+    TextGrids in parallel. Each file is seeded from `seed` and its index,
+    so a corpus is reproducible regardless of the number of workers.
+    Returns the path of the corpus manifest.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    seeds = np.random.SeedSequence(seed).generate_state(num_files)
+    width = len(str(max(num_files - 1, 1)))
+    jobs = [
+        {
+            "wav_path": str(output_dir / f"corpus_{i:0{width}d}.wav"),
+            "seed": int(seeds[i]),
+            "duration": duration,
+            "sample_rate": sample_rate,
+            "intervals_per_second": intervals_per_second,
+        }
+        for i in range(num_files)
+    ]
+
+    workers = workers or os.cpu_count() or 1
+    files = []
+    with Pool(processes=min(workers, num_files)) as pool:
+        for i, info in enumerate(pool.imap(generate_corpus_file, jobs), 1):
+            files.append(info)
+            print(f"  [{i}/{num_files}] {info['name']} "
+                  f"({info['size_kb'] / 1024:.1f} MB, {info['phone_intervals']} intervals)")
+
+    manifest = {
+        "generated": datetime.now().isoformat(),
+        "seed": seed,
+        "total_files": len(files),
+        "total_duration_s": duration * len(files),
+        "total_size_mb": round(sum(f["size_kb"] for f in files) / 1024, 2),
+        "sample_rate": sample_rate,
+        "intervals_per_second": intervals_per_second,
+        "files": files,
+    }
+    manifest_path = output_dir / "corpus_manifest.json"
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest_path
+
+
 # =============================================================================
 # MAIN
 # =============================================================================
@@ -897,12 +1076,41 @@ def generate_manifest(all_files: dict):
     return manifest_path
 
 
-def main():
-    """Generate all test batches."""
+def main(argv: Optional[List[str]] = None):
+    """Generate all test batches, or a synthetic corpus with --corpus."""
+    parser = argparse.ArgumentParser(description="LinguAI test data generator")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible output")
+    parser.add_argument("--corpus", type=Path, help="Generate a load-testing corpus into this directory")
+    parser.add_argument("--files", type=int, default=10, help="Corpus: number of recordings")
+    parser.add_argument("--duration", type=float, default=60.0, help="Corpus: seconds per recording")
+    parser.add_argument("--sample-rate", type=int, default=16000, help="Corpus: sample rate (Hz)")
+    parser.add_argument("--intervals-per-second", type=float, default=12.0,
+                        help="Corpus: phone-tier TextGrid density")
+    parser.add_argument("--workers", type=int, help="Corpus: worker processes (default: all CPUs)")
+    args = parser.parse_args(argv)
+
+    if args.corpus:
+        print("=" * 60)
+        print("LinguAI Corpus Generator")
+        print("=" * 60)
+        manifest_path = generate_corpus(
+            args.corpus, args.files, args.duration, args.sample_rate,
+            args.intervals_per_second, args.seed or 0, args.workers,
+        )
+        print(f"\nManifest: {manifest_path}")
+        return 0
+
+    set_seed(args.seed)
+
     print("=" * 60)
     print("LinguAI Comprehensive Test Generator")
     print("=" * 60)
 
+    # Ensure directories exist
+    BATCH_DIR.mkdir(parents=True, exist_ok=True)
+    for i in range(1, 6):
+        (BATCH_DIR / f"batch_{i}").mkdir(exist_ok=True)
+
     all_files = {}
 
     # Generate all batches
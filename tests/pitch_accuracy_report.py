@@ -0,0 +1,178 @@
+"""
+LinguAI Pitch Accuracy Report
+Compares the fast pitch tracker (get_pitch(mode="fast")) with Praat's
+autocorrelation method on the stress-test batches.
+
+Both trackers run on the same frame times, so frames are compared one to
+one. Per file and overall it reports:
+  - voicing decision error (VDE): share of frames voiced by one tracker only
+  - gross pitch error (GPE): share of frames voiced by both whose F0
+    differs by more than 20%
+  - median absolute difference in cents over the remaining frames
+  - run time of each tracker
+
+Usage:
+    python tests/pitch_accuracy_report.py
+    python tests/pitch_accuracy_report.py --batches batch_3 batch_5 --time-step 0.005
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Configuration
+TEST_DIR = Path(__file__).parent
+REPO_ROOT = TEST_DIR.parent
+LOGS_DIR = TEST_DIR / "logs"
+BATCHES_DIR = TEST_DIR / "data" / "stress_test_batches"
+
+sys.path.insert(0, str(REPO_ROOT / "core"))
+
+from linguai_core import get_pitch, load_sound  # noqa: E402
+
+# F0 differences above this ratio count as gross errors
+GROSS_ERROR_RATIO = 1.2
+
+
+@dataclass
+class FileAccuracy:
+    """Agreement between the two trackers on one file"""
+    file: str
+    frames: int
+    praat_voiced: int
+    fast_voiced: int
+    voicing_errors: int
+    both_voiced: int
+    gross_errors: int
+    median_cents: Optional[float]
+    praat_ms: float
+    fast_ms: float
+
+
+@dataclass
+class AccuracyReport:
+    """Full accuracy report"""
+    timestamp: str
+    settings: dict
+    summary: dict = field(default_factory=dict)
+    files: List[Dict] = field(default_factory=list)
+
+    def save(self, filepath: Path) -> Path:
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        with open(filepath, "w") as f:
+            json.dump(asdict(self), f, indent=2)
+        return filepath
+
+
+def compare_file(path: Path, time_step: float, pitch_floor: float,
+                 pitch_ceiling: float) -> tuple[FileAccuracy, np.ndarray]:
+    """Run both trackers on a file. Returns the comparison and the fine errors in cents."""
+    sound = load_sound(path)
+    settings = dict(time_step=time_step, pitch_floor=pitch_floor, pitch_ceiling=pitch_ceiling)
+
+    start = time.perf_counter()
+    praat = get_pitch(sound, **settings)
+    praat_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    fast = get_pitch(sound, mode="fast", **settings)
+    fast_ms = (time.perf_counter() - start) * 1000
+
+    praat_voiced = ~np.isnan(praat.frequencies)
+    fast_voiced = ~np.isnan(fast.frequencies)
+    both = praat_voiced & fast_voiced
+    cents = np.abs(1200 * np.log2(fast.frequencies[both] / praat.frequencies[both]))
+    gross = cents > 1200 * np.log2(GROSS_ERROR_RATIO)
+    fine = cents[~gross]
+
+    result = FileAccuracy(
+        file=str(path.relative_to(BATCHES_DIR)),
+        frames=len(praat.times),
+        praat_voiced=int(praat_voiced.sum()),
+        fast_voiced=int(fast_voiced.sum()),
+        voicing_errors=int((praat_voiced != fast_voiced).sum()),
+        both_voiced=int(both.sum()),
+        gross_errors=int(gross.sum()),
+        median_cents=round(float(np.median(fine)), 2) if len(fine) else None,
+        praat_ms=round(praat_ms, 3),
+        fast_ms=round(fast_ms, 3),
+    )
+    return result, fine
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the comparison over the stress-test batches."""
+    parser = argparse.ArgumentParser(description="Fast pitch tracker accuracy against Praat")
+    parser.add_argument("--batches", nargs="+", help="Batch directories to include (default: all)")
+    parser.add_argument("--time-step", type=float, default=0.01)
+    parser.add_argument("--pitch-floor", type=float, default=75.0)
+    parser.add_argument("--pitch-ceiling", type=float, default=600.0)
+    parser.add_argument("--output", type=Path, help="Where to write the JSON report")
+    args = parser.parse_args(argv)
+
+    batches = args.batches or sorted(p.name for p in BATCHES_DIR.iterdir() if p.is_dir())
+    files = sorted(path for batch in batches for path in (BATCHES_DIR / batch).glob("*.wav"))
+    if not files:
+        print(f"No WAV files found in {BATCHES_DIR}; run comprehensive_test_generator.py first")
+        return 1
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    settings = {
+        "time_step": args.time_step,
+        "pitch_floor": args.pitch_floor,
+        "pitch_ceiling": args.pitch_ceiling,
+        "gross_error_ratio": GROSS_ERROR_RATIO,
+    }
+    report = AccuracyReport(timestamp=timestamp, settings=settings)
+
+    print("=" * 96)
+    print("LinguAI Pitch Accuracy Report: fast (YIN) vs Praat (ac)")
+    print("=" * 96)
+    print(f"{'file':<44} {'frames':>6} {'VDE':>7} {'GPE':>7} {'cents':>7} {'praat ms':>9} {'fast ms':>8}")
+
+    fine_errors = []
+    for path in files:
+        result, fine = compare_file(path, args.time_step, args.pitch_floor, args.pitch_ceiling)
+        report.files.append(asdict(result))
+        fine_errors.append(fine)
+
+        gpe = result.gross_errors / result.both_voiced if result.both_voiced else 0.0
+        cents = f"{result.median_cents:.1f}" if result.median_cents is not None else "-"
+        print(f"{result.file:<44} {result.frames:>6} {result.voicing_errors / result.frames:>7.1%} "
+              f"{gpe:>7.1%} {cents:>7} {result.praat_ms:>9.1f} {result.fast_ms:>8.1f}")
+
+    frames = sum(r["frames"] for r in report.files)
+    both_voiced = sum(r["both_voiced"] for r in report.files)
+    praat_ms = sum(r["praat_ms"] for r in report.files)
+    fast_ms = sum(r["fast_ms"] for r in report.files)
+    all_fine = np.concatenate(fine_errors)
+    report.summary = {
+        "files": len(report.files),
+        "frames": frames,
+        "voicing_decision_error": round(sum(r["voicing_errors"] for r in report.files) / frames, 4),
+        "gross_pitch_error": round(sum(r["gross_errors"] for r in report.files) / max(both_voiced, 1), 4),
+        "median_cents": round(float(np.median(all_fine)), 2) if len(all_fine) else None,
+        "praat_ms": round(praat_ms, 1),
+        "fast_ms": round(fast_ms, 1),
+        "speedup": round(praat_ms / fast_ms, 2) if fast_ms else None,
+    }
+
+    summary = report.summary
+    print("-" * 96)
+    print(f"Overall: VDE {summary['voicing_decision_error']:.1%}, GPE {summary['gross_pitch_error']:.1%}, "
+          f"median {summary['median_cents']} cents, {summary['praat_ms']:.0f} ms -> "
+          f"{summary['fast_ms']:.0f} ms ({summary['speedup']}x)")
+
+    output = args.output or LOGS_DIR / f"pitch_accuracy_{timestamp}.json"
+    print(f"\nReport saved to: {report.save(output)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,35 @@
 """
 LinguAI Stress Test Runner
 Runs all 48 test files through the backend API and validates results.
+
+With --load it instead drives the API with concurrent traffic, either
+closed loop (a fixed number of virtual users) or open loop (Poisson
+arrivals at a fixed rate), and reports latency percentiles, throughput,
+error rate and per-endpoint saturation curves.
+
+Usage:
+    python tests/stress_test_runner.py
+    python tests/stress_test_runner.py --load --concurrency 1 2 4 8 --duration 30
+    python tests/stress_test_runner.py --load --rate 2 5 10 --profile mixed
+    python tests/stress_test_runner.py --load --start-server --workers 4
 """
 
 import os
 import sys
+import math
 import json
 import time
+import random
+import argparse
+import threading
+import subprocess
 import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass, field, asdict
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 # Configuration
 TEST_DIR = Path(__file__).parent
@@ -50,21 +67,25 @@ class StressTestReport:
     results: List[Dict] = field(default_factory=list)
     summary_by_batch: Dict[str, Dict] = field(default_factory=dict)
     summary_by_endpoint: Dict[str, Dict] = field(default_factory=dict)
+    load_test: Dict[str, Any] = field(default_factory=dict)
 
-    def add_result(self, result: TestResult):
-        self.results.append(asdict(result))
+    def count_status(self, status: str, file_size_kb: float):
         self.total_tests += 1
-        self.total_data_processed_mb += result.file_size_kb / 1024
+        self.total_data_processed_mb += file_size_kb / 1024
 
-        if result.status == "PASS":
+        if status == "PASS":
             self.passed += 1
-        elif result.status == "FAIL":
+        elif status == "FAIL":
             self.failed += 1
-        elif result.status == "TIMEOUT":
+        elif status == "TIMEOUT":
             self.timeouts += 1
         else:
             self.errors += 1
 
+    def add_result(self, result: TestResult):
+        self.results.append(asdict(result))
+        self.count_status(result.status, result.file_size_kb)
+
         # Update batch summary
         if result.batch not in self.summary_by_batch:
             self.summary_by_batch[result.batch] = {"total": 0, "passed": 0, "failed": 0}
@@ -348,20 +369,327 @@ def check_backend_health(logger: StressTestLogger) -> bool:
     return False
 
 
-def main():
+# =============================================================================
+# LOAD TESTING
+# =============================================================================
+
+ANALYZE = "/api/v1/analyze"
+
+# Each profile is a list of (weight, endpoints) choices. All endpoints of a
+# choice are requested concurrently for the same file, the way the frontend
+# fires its spectrogram, pitch and formant queries when a file is opened.
+LOAD_PROFILES: Dict[str, List[Tuple[float, List[str]]]] = {
+    "open_file": [
+        (1.0, [f"{ANALYZE}/spectrogram", f"{ANALYZE}/pitch", f"{ANALYZE}/formants"]),
+    ],
+    "mixed": [
+        (0.4, [f"{ANALYZE}/spectrogram"]),
+        (0.3, [f"{ANALYZE}/pitch"]),
+        (0.2, [f"{ANALYZE}/formants"]),
+        (0.1, [f"{ANALYZE}/intensity"]),
+    ],
+}
+for _name in ["spectrogram", "formants", "pitch", "waveform", "intensity", "voice-quality"]:
+    LOAD_PROFILES[_name] = [(1.0, [f"{ANALYZE}/{_name}"])]
+
+
+@dataclass
+class LoadSample:
+    """Outcome of one request issued by the load generator"""
+    endpoint: str
+    status: str  # PASS, FAIL, ERROR, TIMEOUT
+    latency_ms: float
+    completed_at: float  # Seconds since the start of the run
+    file_size_kb: float
+
+
+def classify_status(status_code: int, data: dict) -> str:
+    """Map an upload outcome to a stress-test status."""
+    if status_code == 0:
+        return "TIMEOUT" if "timed out" in str(data.get("error", "")) else "ERROR"
+    return "PASS" if status_code == 200 else "FAIL"
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = min(max(math.ceil(pct / 100 * len(sorted_values)), 1), len(sorted_values))
+    return sorted_values[rank - 1]
+
+
+def summarize_samples(samples: List[LoadSample], window_s: float) -> Dict[str, Any]:
+    """Latency percentiles, throughput and error rate for a set of samples."""
+    latencies = sorted(s.latency_ms for s in samples)
+    errors = sum(1 for s in samples if s.status != "PASS")
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "throughput_rps": round(len(samples) / window_s, 3) if window_s > 0 else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+class LoadGenerator:
+    """Issues weighted, concurrent request groups against the backend."""
+
+    def __init__(self, files: List[Path], profile: List[Tuple[float, List[str]]],
+                 timeout: int = 120, seed: Optional[int] = None):
+        self.files = files
+        self.profile = profile
+        self.timeout = timeout
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._samples: List[LoadSample] = []
+        self._samples_lock = threading.Lock()
+        self._t0 = 0.0
+
+    def _choose(self) -> Tuple[Path, List[str]]:
+        with self._rng_lock:
+            filepath = self._rng.choice(self.files)
+            weights = [w for w, _ in self.profile]
+            endpoints = self._rng.choices([e for _, e in self.profile], weights)[0]
+        return filepath, endpoints
+
+    def _request(self, endpoint: str, filepath: Path, issued_at: float):
+        status_code, data, _ = upload_file_to_api(endpoint, filepath, self.timeout)
+        now = time.perf_counter()
+        sample = LoadSample(
+            endpoint=endpoint.split("/")[-1],
+            status=classify_status(status_code, data),
+            latency_ms=(now - issued_at) * 1000,
+            completed_at=now - self._t0,
+            file_size_kb=filepath.stat().st_size / 1024,
+        )
+        with self._samples_lock:
+            self._samples.append(sample)
+
+    def _request_group(self, issued_at: Optional[float] = None):
+        filepath, endpoints = self._choose()
+        issued_at = issued_at if issued_at is not None else time.perf_counter()
+        if len(endpoints) == 1:
+            self._request(endpoints[0], filepath, issued_at)
+            return
+
+        threads = [
+            threading.Thread(target=self._request, args=(e, filepath, issued_at))
+            for e in endpoints
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def run_closed(self, concurrency: int, duration: float) -> List[LoadSample]:
+        """Run `concurrency` virtual users back to back for `duration` seconds."""
+        self._samples = []
+        self._t0 = time.perf_counter()
+        deadline = self._t0 + duration
+
+        def user():
+            while time.perf_counter() < deadline:
+                self._request_group()
+
+        users = [threading.Thread(target=user) for _ in range(concurrency)]
+        for u in users:
+            u.start()
+        for u in users:
+            u.join()
+        return self._samples
+
+    def run_open(self, rate: float, duration: float, max_in_flight: int = 256) -> List[LoadSample]:
+        """
+        Start request groups as a Poisson process at `rate` per second.
+        Latency is measured from the scheduled arrival, so a saturated
+        server shows up as queueing delay instead of a lower arrival rate.
+        """
+        self._samples = []
+        self._t0 = time.perf_counter()
+        deadline = self._t0 + duration
+        next_arrival = self._t0
+
+        with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+            while True:
+                with self._rng_lock:
+                    next_arrival += self._rng.expovariate(rate)
+                if next_arrival >= deadline:
+                    break
+                delay = next_arrival - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self._request_group, next_arrival)
+        return self._samples
+
+
+def run_load_level(generator: LoadGenerator, mode: str, level: float,
+                   duration: float, warmup: float) -> Tuple[List[LoadSample], float]:
+    """Run one load level and return the samples completed after warmup."""
+    if mode == "open":
+        samples = generator.run_open(level, warmup + duration)
+    else:
+        samples = generator.run_closed(int(level), warmup + duration)
+    measured = [s for s in samples if s.completed_at >= warmup]
+    window = max(max((s.completed_at for s in measured), default=warmup) - warmup, 1e-9)
+    return measured, window
+
+
+def start_local_server(port: int, workers: int, logger: StressTestLogger) -> subprocess.Popen:
+    """Launch uvicorn from the backend directory and wait until it is healthy."""
+    backend_dir = TEST_DIR.parent / "backend"
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning"],
+        cwd=backend_dir,
+    )
+    for _ in range(120):
+        if proc.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {proc.returncode}")
+        try:
+            with urllib.request.urlopen(f"{BACKEND_URL}/health", timeout=1):
+                logger.info(f"Started uvicorn on port {port} ({workers} worker(s))")
+                return proc
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.5)
+    proc.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 60s")
+
+
+def load_test_files(max_file_kb: Optional[float]) -> List[Path]:
+    """Collect the stress-test files listed in the manifest that exist locally."""
+    with open(BATCH_DIR / "manifest.json") as f:
+        manifest = json.load(f)
+
+    files = []
+    for batch_info in manifest["batches"].values():
+        for file_info in batch_info["files"]:
+            filepath = TEST_DIR / file_info["path"]
+            if not filepath.exists():
+                continue
+            if max_file_kb is not None and file_info["size_kb"] > max_file_kb:
+                continue
+            files.append(filepath)
+    return files
+
+
+def run_load_test(args, logger: StressTestLogger, report: StressTestReport) -> int:
+    """Drive the backend at each requested load level and fill report.load_test."""
+    mode = "open" if args.rate else "closed"
+    levels = args.rate or args.concurrency
+    files = load_test_files(args.max_file_kb)
+    if not files:
+        logger.error("No test files found. Run comprehensive_test_generator.py first.")
+        return 1
+
+    generator = LoadGenerator(files, LOAD_PROFILES[args.profile], args.timeout, args.seed)
+    level_name = "rate_rps" if mode == "open" else "concurrency"
+    logger.info(f"Load test: {mode} loop, profile '{args.profile}', {len(files)} files, "
+                f"{args.duration}s per level after {args.warmup}s warmup")
+
+    overall_start = time.time()
+    level_summaries = []
+    curves: Dict[str, List[Dict]] = {}
+
+    for level in levels:
+        logger.section(f"{level_name.upper()}: {level:g}")
+        samples, window = run_load_level(generator, mode, level, args.duration, args.warmup)
+
+        for sample in samples:
+            report.count_status(sample.status, sample.file_size_kb)
+
+        overall = summarize_samples(samples, window)
+        by_endpoint = {}
+        for endpoint in sorted({s.endpoint for s in samples}):
+            endpoint_samples = [s for s in samples if s.endpoint == endpoint]
+            by_endpoint[endpoint] = summarize_samples(endpoint_samples, window)
+            curves.setdefault(endpoint, []).append({level_name: level, **by_endpoint[endpoint]})
+
+        level_summaries.append({level_name: level, "overall": overall, "by_endpoint": by_endpoint})
+        logger.info(f"{overall['requests']} requests, {overall['throughput_rps']} req/s, "
+                    f"p50 {overall['p50_ms']}ms, p95 {overall['p95_ms']}ms, "
+                    f"p99 {overall['p99_ms']}ms, errors {overall['error_rate']:.1%}")
+        for endpoint, stats in by_endpoint.items():
+            logger.info(f"  {endpoint}: {stats['throughput_rps']} req/s, "
+                        f"p95 {stats['p95_ms']}ms, errors {stats['error_rate']:.1%}")
+
+    report.total_duration_ms = (time.time() - overall_start) * 1000
+    report.load_test = {
+        "mode": mode,
+        "profile": args.profile,
+        "level_name": level_name,
+        "duration_s": args.duration,
+        "warmup_s": args.warmup,
+        "files": len(files),
+        "levels": level_summaries,
+        "saturation_curves": curves,
+    }
+    return 0
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="LinguAI stress and load tests")
+    parser.add_argument("--url", default=BACKEND_URL, help="Backend base URL")
+    parser.add_argument("--load", action="store_true",
+                        help="Run a concurrent load test instead of the functional pass")
+    parser.add_argument("--profile", choices=sorted(LOAD_PROFILES), default="open_file",
+                        help="Endpoint mix to generate")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Closed-loop virtual users, one run per value")
+    parser.add_argument("--rate", type=float, nargs="+",
+                        help="Open-loop arrival rates (groups/s); overrides --concurrency")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds per level")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Discarded seconds per level")
+    parser.add_argument("--timeout", type=int, default=120, help="Per-request timeout (s)")
+    parser.add_argument("--max-file-kb", type=float, help="Skip test files larger than this")
+    parser.add_argument("--seed", type=int, help="Seed for file and endpoint selection")
+    parser.add_argument("--start-server", action="store_true",
+                        help="Launch a local uvicorn instance for the run")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
     """Run stress tests on all batches."""
+    global BACKEND_URL
+    args = parse_args(argv)
+    BACKEND_URL = f"http://127.0.0.1:{args.port}" if args.start_server else args.url.rstrip("/")
+
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_file = LOGS_DIR / f"stress_test_{timestamp}.log"
-    report_file = f"stress_test_report_{timestamp}.json"
+    kind = "load_test" if args.load else "stress_test"
+    log_file = LOGS_DIR / f"{kind}_{timestamp}.log"
+    report_file = f"{kind}_report_{timestamp}.json"
 
     logger = StressTestLogger(log_file)
     report = StressTestReport(timestamp=timestamp)
 
+    server = start_local_server(args.port, args.workers, logger) if args.start_server else None
+    try:
+        return run(args, logger, report, report_file, log_file)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+def run(args, logger: StressTestLogger, report: StressTestReport,
+        report_file: str, log_file: Path) -> int:
     # Check backend
     if not check_backend_health(logger):
         logger.error(f"Start backend with: cd backend && source venv/bin/activate && uvicorn app.main:app --reload")
         return 1
 
+    if args.load:
+        status = run_load_test(args, logger, report)
+        saved_path = report.save(report_file)
+        logger.info(f"\nReport saved to: {saved_path}")
+        logger.info(f"Log saved to: {log_file}")
+        return status
+
     # Load manifest
     manifest_path = BATCH_DIR / "manifest.json"
     if not manifest_path.exists():